@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { createClient } from '@supabase/supabase-js';
+import { withRouteMetrics } from '@/lib/metrics';
 
 // Create a Supabase client with the service role key to bypass RLS
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL!;
@@ -15,7 +16,8 @@ const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey, {
   }
 });
 
-export async function POST(request: NextRequest) {
+export const POST = withRouteMetrics('/api/adjustments-test', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     const body = await request.json();
     console.log('Test adjustment creation request:', body);
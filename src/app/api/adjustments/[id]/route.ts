@@ -1,7 +1,9 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(
+export const GET = withRouteMetrics('/api/adjustments/[id]', handleGet);
+async function handleGet(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -45,7 +47,8 @@ export async function GET(
   }
 }
 
-export async function PUT(
+export const PUT = withRouteMetrics('/api/adjustments/[id]', handlePut);
+async function handlePut(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -106,7 +109,8 @@ export async function PUT(
   }
 }
 
-export async function DELETE(
+export const DELETE = withRouteMetrics('/api/adjustments/[id]', handleDelete);
+async function handleDelete(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -1,7 +1,10 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function POST(request: NextRequest) {
+export const POST = withRouteMetrics('/api/adjustments/approve', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     const body = await request.json();
     console.log('Received adjustment approval request:', body);
@@ -86,6 +89,7 @@ export async function POST(request: NextRequest) {
     }
 
     console.log('Successfully updated adjustments:', updates.length);
+    invalidateCacheTags('inventory');
     return NextResponse.json(updates);
   } catch (error) {
     console.error('Unexpected error in adjustment approval:', error);
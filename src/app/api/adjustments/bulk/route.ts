@@ -1,11 +1,53 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { chunk, applyWithBisect } from '@/lib/batch';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function POST(request: NextRequest) {
+// Rows per insert RPC and ids per product lookup (keeps the query string bounded)
+const INSERT_CHUNK_SIZE = 500;
+const LOOKUP_CHUNK_SIZE = 200;
+
+const ADJUSTMENT_TYPES = ['increase', 'decrease', 'recount'];
+const ADJUSTMENT_REASONS = [
+  'stock_found', 'return_from_customer', 'supplier_credit', 'production_yield', 'counting_error',
+  'damage', 'theft', 'expiry', 'quality_issue', 'shrinkage', 'sample_used', 'disposal',
+  'cycle_count', 'physical_inventory', 'system_error', 'reconciliation'
+];
+const ADJUSTMENT_STATUSES = ['pending', 'approved', 'rejected', 'draft'];
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+const validateAdjustment = (adjustment: any): string | null => {
+  if (!adjustment || typeof adjustment !== 'object') return 'Adjustment must be an object';
+  if (!adjustment.product_id) return 'Product ID is required';
+  if (typeof adjustment.product_id !== 'string' || !UUID_PATTERN.test(adjustment.product_id)) {
+    return `Product with ID ${adjustment.product_id} not found`;
+  }
+  if (!adjustment.adjustment_type) return 'Adjustment type is required';
+  if (!ADJUSTMENT_TYPES.includes(adjustment.adjustment_type)) {
+    return `Adjustment type must be one of: ${ADJUSTMENT_TYPES.join(', ')}`;
+  }
+  if (adjustment.quantity_after === undefined || adjustment.quantity_before === undefined) {
+    return 'Both quantity_before and quantity_after are required';
+  }
+  if (isNaN(parseInt(adjustment.quantity_before)) || isNaN(parseInt(adjustment.quantity_after))) {
+    return 'quantity_before and quantity_after must be numbers';
+  }
+  if (!adjustment.reason) return 'Reason is required';
+  if (!ADJUSTMENT_REASONS.includes(adjustment.reason)) {
+    return `Reason must be one of: ${ADJUSTMENT_REASONS.join(', ')}`;
+  }
+  if (adjustment.status && !ADJUSTMENT_STATUSES.includes(adjustment.status)) {
+    return `Status must be one of: ${ADJUSTMENT_STATUSES.join(', ')}`;
+  }
+  return null;
+};
+
+export const POST = withRouteMetrics('/api/adjustments/bulk', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     const body = await request.json();
-    console.log('Received bulk adjustment creation request:', body);
-    
+
     // Validate required fields
     if (!body.adjustments || !Array.isArray(body.adjustments)) {
       return NextResponse.json(
@@ -20,96 +62,101 @@ export async function POST(request: NextRequest) {
 
     console.log('Creating bulk adjustments:', adjustmentsToCreate.length, 'items');
 
-    const createdAdjustments = [];
-    const errors = [];
-    
-    for (let i = 0; i < adjustmentsToCreate.length; i++) {
-      const adjustmentRequest = adjustmentsToCreate[i];
-      
-      try {
-        // Validate individual adjustment
-        if (!adjustmentRequest.product_id) {
-          errors.push(`Adjustment ${i + 1}: Product ID is required`);
-          continue;
-        }
-        
-        if (!adjustmentRequest.adjustment_type) {
-          errors.push(`Adjustment ${i + 1}: Adjustment type is required`);
-          continue;
-        }
-        
-        if (adjustmentRequest.quantity_after === undefined || adjustmentRequest.quantity_before === undefined) {
-          errors.push(`Adjustment ${i + 1}: Both quantity_before and quantity_after are required`);
-          continue;
-        }
-        
-        if (!adjustmentRequest.reason) {
-          errors.push(`Adjustment ${i + 1}: Reason is required`);
-          continue;
-        }
+    // Errors are collected per input position and reported in input order
+    const rowErrors: (string | null)[] = new Array(adjustmentsToCreate.length).fill(null);
+    const created: any[] = new Array(adjustmentsToCreate.length);
 
-        // Verify the product exists
-        const { data: productExists, error: productError } = await supabase
-          .from('products')
-          .select('id, name, sku')
-          .eq('id', adjustmentRequest.product_id)
-          .single();
-        
-        if (productError || !productExists) {
-          errors.push(`Adjustment ${i + 1}: Product with ID ${adjustmentRequest.product_id} not found`);
-          continue;
-        }
-        
-        // Calculate quantity change
-        const quantityChange = adjustmentRequest.quantity_after - adjustmentRequest.quantity_before;
-        
-        // Create adjustment record
-        const adjustmentData = {
+    // Step 1: validate every row in memory
+    const validIndexes: number[] = [];
+    adjustmentsToCreate.forEach((adjustment: any, index: number) => {
+      const validationError = validateAdjustment(adjustment);
+      if (validationError) {
+        rowErrors[index] = validationError;
+      } else {
+        validIndexes.push(index);
+      }
+    });
+
+    // Step 2: resolve product existence for the whole batch at once
+    const productIds = Array.from(new Set(validIndexes.map(index => adjustmentsToCreate[index].product_id as string)));
+    const existingProducts = new Set<string>();
+
+    for (const ids of chunk(productIds, LOOKUP_CHUNK_SIZE)) {
+      const { data, error } = await supabase
+        .from('products')
+        .select('id')
+        .in('id', ids);
+
+      if (error) {
+        console.error('Error resolving products for bulk adjustments:', error);
+        return NextResponse.json(
+          { error: 'Internal server error', details: error.message },
+          { status: 500 }
+        );
+      }
+
+      for (const product of data || []) {
+        existingProducts.add(product.id);
+      }
+    }
+
+    const pending: { index: number; row: Record<string, unknown> }[] = [];
+    for (const index of validIndexes) {
+      const adjustmentRequest = adjustmentsToCreate[index];
+      if (!existingProducts.has(adjustmentRequest.product_id)) {
+        rowErrors[index] = `Product with ID ${adjustmentRequest.product_id} not found`;
+        continue;
+      }
+
+      pending.push({
+        index,
+        row: {
           product_id: adjustmentRequest.product_id,
           adjustment_type: adjustmentRequest.adjustment_type,
           reason: adjustmentRequest.reason,
           quantity_before: parseInt(adjustmentRequest.quantity_before),
           quantity_after: parseInt(adjustmentRequest.quantity_after),
-          quantity_change: quantityChange,
           location: adjustmentRequest.location || 'Main Warehouse',
           reference: adjustmentRequest.reference || batchReference,
-          notes: adjustmentRequest.notes 
+          notes: adjustmentRequest.notes
             ? (batchNotes ? `${batchNotes}\n\n${adjustmentRequest.notes}` : adjustmentRequest.notes)
             : batchNotes,
           created_by: adjustmentRequest.created_by || 'system',
           status: adjustmentRequest.status || 'pending',
           cost_impact: adjustmentRequest.cost_impact || 0
-        };
-
-        const { data, error } = await supabase
-          .from('stock_adjustments')
-          .insert(adjustmentData)
-          .select(`
-            *,
-            products (
-              name,
-              sku,
-              barcode
-            )
-          `)
-          .single();
-
-        if (error) {
-          console.error(`Error creating adjustment ${i + 1}:`, error);
-          errors.push(`Adjustment ${i + 1}: ${error.message}`);
-          continue;
         }
-        
-        if (data) {
-          createdAdjustments.push(data);
+      });
+    }
+
+    // Step 3: insert in chunks; each RPC call is a single transaction, and a rejected
+    // chunk is split until the offending rows are isolated
+    for (const rows of chunk(pending, INSERT_CHUNK_SIZE)) {
+      await applyWithBisect(
+        rows,
+        async (batch) => {
+          const { data, error } = await supabase.rpc('bulk_insert_stock_adjustments', {
+            p_adjustments: batch.map(entry => entry.row)
+          });
+
+          if (error) return error.message;
+
+          for (const result of data || []) {
+            created[batch[result.row_index].index] = result.adjustment;
+          }
+          return null;
+        },
+        (entry, error) => {
+          console.error(`Error creating adjustment ${entry.index + 1}:`, error);
+          rowErrors[entry.index] = error;
         }
-        
-      } catch (err) {
-        console.error(`Unexpected error creating adjustment ${i + 1}:`, err);
-        errors.push(`Adjustment ${i + 1}: Unexpected error - ${err instanceof Error ? err.message : 'Unknown error'}`);
-      }
+      );
     }
 
+    const createdAdjustments = created.filter(Boolean);
+    const errors = rowErrors
+      .map((error, index) => error && `Adjustment ${index + 1}: ${error}`)
+      .filter((error): error is string => Boolean(error));
+
     // Return results
     const response = {
       created: createdAdjustments,
@@ -125,7 +172,7 @@ export async function POST(request: NextRequest) {
 
     if (createdAdjustments.length === 0) {
       return NextResponse.json(
-        { 
+        {
           error: 'No adjustments were created',
           details: errors
         },
@@ -133,11 +180,12 @@ export async function POST(request: NextRequest) {
       );
     }
 
+    invalidateCacheTags('inventory');
     return NextResponse.json(response, { status: 201 });
   } catch (error) {
     console.error('Unexpected error in bulk adjustment creation:', error);
     return NextResponse.json(
-      { 
+      {
         error: 'Internal server error',
         details: error instanceof Error ? error.message : 'Unknown error'
       },
@@ -1,7 +1,9 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/adjustments/by-product', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     console.log('Fetching adjustments by product...');
     
@@ -1,7 +1,9 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/adjustments', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     const { searchParams } = new URL(request.url);
     const product_id = searchParams.get('product_id');
@@ -99,7 +101,8 @@ export async function GET(request: NextRequest) {
   }
 }
 
-export async function POST(request: NextRequest) {
+export const POST = withRouteMetrics('/api/adjustments', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     const body = await request.json();
     console.log('Received adjustment creation request:', body);
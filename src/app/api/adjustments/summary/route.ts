@@ -1,39 +1,34 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(request: NextRequest) {
-  try {
-    console.log('Fetching adjustments summary...');
-    
-    // Check if table exists first
-    const { data: testData, error: testError } = await supabase
-      .from('stock_adjustments')
-      .select('id')
-      .limit(1);
-
-    if (testError) {
-      console.error('Error testing stock_adjustments table:', testError);
-      // Return empty summary if table doesn't exist
-      return NextResponse.json({
-        totalAdjustments: 0,
-        pendingAdjustments: 0,
-        approvedAdjustments: 0,
-        rejectedAdjustments: 0,
-        totalIncreases: 0,
-        totalDecreases: 0,
-        totalCostImpact: 0,
-        adjustmentsToday: 0,
-        adjustmentsThisWeek: 0,
-        adjustmentsThisMonth: 0
-      });
-    }
+const EMPTY_SUMMARY = {
+  totalAdjustments: 0,
+  pendingAdjustments: 0,
+  approvedAdjustments: 0,
+  rejectedAdjustments: 0,
+  totalIncreases: 0,
+  totalDecreases: 0,
+  totalCostImpact: 0,
+  adjustmentsToday: 0,
+  adjustmentsThisWeek: 0,
+  adjustmentsThisMonth: 0
+};
 
-    // Get all adjustments for calculations
-    const { data: adjustments, error } = await supabase
-      .from('stock_adjustments')
-      .select('*');
+// Composed from the daily rollups maintained by stock_adjustments triggers, so the
+// cost does not grow with the number of adjustments. Days are UTC calendar days.
+export const GET = withRouteMetrics('/api/adjustments/summary', handleGet);
+async function handleGet(request: NextRequest) {
+  try {
+    const { data: summary, error } = await supabase.rpc('get_stock_adjustment_summary');
 
     if (error) {
+      // Return empty summary if the adjustments schema has not been migrated yet
+      if (error.code === 'PGRST202' || error.code === '42P01') {
+        console.error('Adjustments summary is not available:', error);
+        return NextResponse.json(EMPTY_SUMMARY);
+      }
+
       console.error('Error fetching adjustments for summary:', error);
       return NextResponse.json(
         { error: 'Failed to fetch adjustments summary' },
@@ -41,25 +36,6 @@ export async function GET(request: NextRequest) {
       );
     }
 
-    const now = new Date();
-    const today = new Date(now.getFullYear(), now.getMonth(), now.getDate());
-    const weekStart = new Date(today.getTime() - (today.getDay() * 24 * 60 * 60 * 1000));
-    const monthStart = new Date(now.getFullYear(), now.getMonth(), 1);
-
-    const summary = {
-      totalAdjustments: adjustments.length,
-      pendingAdjustments: adjustments.filter(a => a.status === 'pending').length,
-      approvedAdjustments: adjustments.filter(a => a.status === 'approved').length,
-      rejectedAdjustments: adjustments.filter(a => a.status === 'rejected').length,
-      totalIncreases: adjustments.filter(a => a.quantity_change > 0).length,
-      totalDecreases: adjustments.filter(a => a.quantity_change < 0).length,
-      totalCostImpact: adjustments.reduce((sum, a) => sum + (a.cost_impact || 0), 0),
-      adjustmentsToday: adjustments.filter(a => new Date(a.created_at) >= today).length,
-      adjustmentsThisWeek: adjustments.filter(a => new Date(a.created_at) >= weekStart).length,
-      adjustmentsThisMonth: adjustments.filter(a => new Date(a.created_at) >= monthStart).length
-    };
-
-    console.log('Calculated summary:', summary);
     return NextResponse.json(summary);
   } catch (error) {
     console.error('Unexpected error in summary:', error);
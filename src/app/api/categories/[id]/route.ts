@@ -1,9 +1,12 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { createServerSupabaseAnonymousClient } from '@/lib/supabaseServer';
 import { CategoryUpdate } from '@/types/database';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
 
 // GET /api/categories/[id]
-export async function GET(
+export const GET = withRouteMetrics('/api/categories/[id]', handleGet);
+async function handleGet(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
@@ -47,7 +50,8 @@ export async function GET(
 }
 
 // PUT /api/categories/[id]
-export async function PUT(
+export const PUT = withRouteMetrics('/api/categories/[id]', handlePut);
+async function handlePut(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
@@ -125,6 +129,7 @@ export async function PUT(
       );
     }
 
+    invalidateCacheTags('categories');
     return NextResponse.json({
       success: true,
       data,
@@ -141,7 +146,8 @@ export async function PUT(
 }
 
 // DELETE /api/categories/[id]
-export async function DELETE(
+export const DELETE = withRouteMetrics('/api/categories/[id]', handleDelete);
+async function handleDelete(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
@@ -203,6 +209,7 @@ export async function DELETE(
       );
     }
 
+    invalidateCacheTags('categories');
     return NextResponse.json({
       success: true,
       message: 'Category deleted successfully'
@@ -1,9 +1,12 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { createServerSupabaseAnonymousClient } from '@/lib/supabaseServer';
 import { Database, CategoryInsert, CategoryFiltersDB } from '@/types/database';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
 
 // GET /api/categories
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/categories', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     const { searchParams } = new URL(request.url);
     const supabase = createServerSupabaseAnonymousClient();
@@ -95,7 +98,8 @@ export async function GET(request: NextRequest) {
 }
 
 // POST /api/categories
-export async function POST(request: NextRequest) {
+export const POST = withRouteMetrics('/api/categories', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     const body = await request.json();
     const supabase = createServerSupabaseAnonymousClient();
@@ -156,6 +160,7 @@ export async function POST(request: NextRequest) {
       );
     }
 
+    invalidateCacheTags('categories');
     return NextResponse.json(
       { success: true, data, message: 'Category created successfully' },
       { status: 201 }
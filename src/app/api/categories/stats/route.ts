@@ -1,34 +1,45 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { createServerSupabaseAnonymousClient } from '@/lib/supabaseServer';
+import { createResponseCache } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
+
+const categoryStatsCache = createResponseCache('/api/categories/stats', {
+  ttlMs: 60_000,
+  staleWhileRevalidateMs: 10 * 60_000,
+  tags: ['categories', 'products']
+});
 
 // GET /api/categories/stats
-export async function GET(request: NextRequest) {
-  try {
-    const supabase = createServerSupabaseAnonymousClient();
+export const GET = withRouteMetrics('/api/categories/stats', handleGet);
+async function handleGet(request: NextRequest) {
+  return categoryStatsCache.serve(request, async () => {
+    try {
+      const supabase = createServerSupabaseAnonymousClient();
     
-    const { data, error } = await supabase
-      .from('category_stats')
-      .select('*')
-      .single();
+      const { data, error } = await supabase
+        .from('category_stats')
+        .select('*')
+        .single();
+
+      if (error) {
+        console.error('Database error:', error);
+        return NextResponse.json(
+          { success: false, error: error.message },
+          { status: 500 }
+        );
+      }
 
-    if (error) {
-      console.error('Database error:', error);
+      return NextResponse.json({
+        success: true,
+        data
+      });
+    
+    } catch (error) {
+      console.error('API error:', error);
       return NextResponse.json(
-        { success: false, error: error.message },
+        { success: false, error: 'Internal server error' },
         { status: 500 }
       );
     }
-
-    return NextResponse.json({
-      success: true,
-      data
-    });
-    
-  } catch (error) {
-    console.error('API error:', error);
-    return NextResponse.json(
-      { success: false, error: 'Internal server error' },
-      { status: 500 }
-    );
-  }
+  });
 }
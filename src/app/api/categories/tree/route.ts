@@ -1,32 +1,44 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { createServerSupabaseAnonymousClient } from '@/lib/supabaseServer';
+import { createResponseCache } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
+
+const categoryTreeCache = createResponseCache('/api/categories/tree', {
+  ttlMs: 5 * 60_000,
+  staleWhileRevalidateMs: 60 * 60_000,
+  // Nodes carry product counts
+  tags: ['categories', 'products']
+});
 
 // GET /api/categories/tree
-export async function GET(request: NextRequest) {
-  try {
-    const supabase = createServerSupabaseAnonymousClient();
+export const GET = withRouteMetrics('/api/categories/tree', handleGet);
+async function handleGet(request: NextRequest) {
+  return categoryTreeCache.serve(request, async () => {
+    try {
+      const supabase = createServerSupabaseAnonymousClient();
     
-    const { data, error } = await supabase
-      .rpc('get_category_tree');
+      const { data, error } = await supabase
+        .rpc('get_category_tree');
+
+      if (error) {
+        console.error('Database error:', error);
+        return NextResponse.json(
+          { success: false, error: error.message },
+          { status: 500 }
+        );
+      }
 
-    if (error) {
-      console.error('Database error:', error);
+      return NextResponse.json({
+        success: true,
+        data: data || []
+      });
+    
+    } catch (error) {
+      console.error('API error:', error);
       return NextResponse.json(
-        { success: false, error: error.message },
+        { success: false, error: 'Internal server error' },
         { status: 500 }
       );
     }
-
-    return NextResponse.json({
-      success: true,
-      data: data || []
-    });
-    
-  } catch (error) {
-    console.error('API error:', error);
-    return NextResponse.json(
-      { success: false, error: 'Internal server error' },
-      { status: 500 }
-    );
-  }
+  });
 }
@@ -0,0 +1,177 @@
+import { NextRequest, NextResponse } from 'next/server';
+import {
+  ChangeEvent,
+  ChangeFeedService,
+  ChangeListener,
+  ChangeTopic,
+  CHANGE_TOPICS,
+  CHANGES_PAGE_SIZE,
+  getChangeFeed
+} from '@/services/changes';
+
+// A long-lived stream, never cached or prerendered
+export const dynamic = 'force-dynamic';
+export const runtime = 'nodejs';
+
+const EVENT_NAMES: Record<ChangeTopic, string> = {
+  inventory: 'inventory_update',
+  orders: 'order_status'
+};
+
+// Comment lines keep proxies from closing an idle stream
+const HEARTBEAT_MS = 25 * 1000;
+const RETRY_MS = 3000;
+
+// A row is stamped with its transaction's start time but only becomes visible at
+// commit, so catch-up reads back a little further than the last event seen
+const CATCH_UP_OVERLAP_MS = 30 * 1000;
+
+// Past this many changes per topic the client is better off reloading that topic
+const MAX_CATCH_UP_CHANGES = 5000;
+
+// GET /api/changes/stream?topics=inventory,orders[&since=<ISO>]
+// Server-sent inventory_update and order_status events with row-level deltas.
+// Each event id is the newest change timestamp sent so far; on reconnect
+// (Last-Event-ID) or with ?since= the stream first replays what was missed, or
+// sends a `resync` event naming a topic the client should reload in full.
+// Not wrapped in withRouteMetrics: its histogram would record connection lifetimes.
+export async function GET(request: NextRequest) {
+  const { searchParams } = new URL(request.url);
+
+  const topicsParam = searchParams.get('topics');
+  const topics = (topicsParam ? topicsParam.split(',') : CHANGE_TOPICS) as ChangeTopic[];
+  if (topics.length === 0 || topics.some(topic => !CHANGE_TOPICS.includes(topic))) {
+    return NextResponse.json(
+      { error: `topics must be a comma-separated subset of ${CHANGE_TOPICS.join(', ')}` },
+      { status: 400 }
+    );
+  }
+
+  const since = request.headers.get('last-event-id') || searchParams.get('since');
+  if (since && Number.isNaN(Date.parse(since))) {
+    return NextResponse.json({ error: 'since must be an ISO 8601 timestamp' }, { status: 400 });
+  }
+
+  const encoder = new TextEncoder();
+  let cleanup = () => {};
+
+  const stream = new ReadableStream<Uint8Array>({
+    start(controller) {
+      let closed = false;
+      let lastSeen = since || new Date().toISOString();
+      let catchingUp = false;
+      let gapWhileCatchingUp = false;
+      let buffered: ChangeEvent[] = [];
+
+      const write = (chunk: string) => {
+        if (closed) return;
+        try {
+          controller.enqueue(encoder.encode(chunk));
+        } catch {
+          cleanup();
+        }
+      };
+
+      const send = (event: ChangeEvent) => {
+        if (Date.parse(event.data.timestamp) > Date.parse(lastSeen)) lastSeen = event.data.timestamp;
+        write(`event: ${EVENT_NAMES[event.topic]}\nid: ${lastSeen}\ndata: ${JSON.stringify(event.data)}\n\n`);
+      };
+
+      // The client reloads the topic now, so a later reconnect need not replay from before it
+      const resync = (topic: ChangeTopic) => {
+        const now = new Date().toISOString();
+        if (Date.parse(now) > Date.parse(lastSeen)) lastSeen = now;
+        write(`event: resync\nid: ${lastSeen}\ndata: ${JSON.stringify({ topic })}\n\n`);
+      };
+
+      // Replay one topic's changes since `from`; false when the client must reload it instead
+      const replay = async (topic: ChangeTopic, from: string): Promise<boolean> => {
+        let query = { since: from, afterId: null as string | null, limit: CHANGES_PAGE_SIZE };
+        let replayed = 0;
+
+        while (!closed) {
+          const page = topic === 'inventory'
+            ? await ChangeFeedService.getInventoryChanges(query)
+            : await ChangeFeedService.getOrderChanges(query);
+
+          replayed += page.data.length;
+          if (page.resync || replayed > MAX_CATCH_UP_CHANGES) return false;
+
+          page.data.forEach(data => send({ topic, data } as ChangeEvent));
+          if (!page.hasMore) break;
+          query = { ...query, since: page.cursor.updated_since, afterId: page.cursor.after_id };
+        }
+        return true;
+      };
+
+      // Live events arriving meanwhile are held back and sent after the replay
+      const catchUp = async (from: string) => {
+        catchingUp = true;
+        const replayFrom = new Date(Date.parse(from) - CATCH_UP_OVERLAP_MS).toISOString();
+
+        for (const topic of topics) {
+          try {
+            if (!(await replay(topic, replayFrom))) resync(topic);
+          } catch (error) {
+            console.error(`Change stream catch-up failed for ${topic}:`, error);
+            resync(topic);
+          }
+        }
+
+        const pending = buffered;
+        buffered = [];
+        pending.forEach(send);
+        catchingUp = false;
+
+        if (gapWhileCatchingUp) {
+          gapWhileCatchingUp = false;
+          catchUp(lastSeen);
+        }
+      };
+
+      const listener: ChangeListener = {
+        onChange: event => {
+          if (!topics.includes(event.topic)) return;
+          if (catchingUp) buffered.push(event);
+          else send(event);
+        },
+        onGap: () => {
+          if (catchingUp) gapWhileCatchingUp = true;
+          else catchUp(lastSeen);
+        }
+      };
+
+      const unsubscribe = getChangeFeed().subscribe(listener);
+      const heartbeat = setInterval(() => write(': ping\n\n'), HEARTBEAT_MS);
+
+      cleanup = () => {
+        if (closed) return;
+        closed = true;
+        clearInterval(heartbeat);
+        unsubscribe();
+        try {
+          controller.close();
+        } catch {
+          // Already closed by the client
+        }
+      };
+      request.signal.addEventListener('abort', () => cleanup());
+
+      write(`retry: ${RETRY_MS}\n\n`);
+      if (since) catchUp(since);
+    },
+    cancel() {
+      cleanup();
+    }
+  });
+
+  return new Response(stream, {
+    headers: {
+      'Content-Type': 'text/event-stream; charset=utf-8',
+      'Cache-Control': 'no-cache, no-transform',
+      'Connection': 'keep-alive',
+      // Stop nginx from buffering the stream
+      'X-Accel-Buffering': 'no'
+    }
+  });
+}
@@ -1,7 +1,9 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { createClient } from '@supabase/supabase-js';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/check-adjustments', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     // First, use regular client to check
     const { supabase } = await import('@/lib/supabaseClient');
@@ -1,25 +1,28 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { normalizeSearchQuery, rankedSearch, orderByIds } from '@/lib/search';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/customers/search', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     const { searchParams } = new URL(request.url);
-    const query = searchParams.get('q');
+    const query = normalizeSearchQuery(searchParams.get('q'));
     
-    if (!query || query.trim().length < 2) {
+    if (query.length < 2) {
       return NextResponse.json({
         success: true,
         data: []
       });
     }
     
-    // Search customers by name, email, or phone
-    const { data, error } = await supabase
-      .from('customers')
-      .select('*')
-      .or(`name.ilike.%${query}%,email.ilike.%${query}%,phone.ilike.%${query}%`)
-      .limit(10)
-      .order('name', { ascending: true });
+    // Search customers by name, email, or phone, best matches first
+    const { ids } = await rankedSearch('search_customers', { p_query: query, p_limit: 10 });
+
+    const { data: rows, error } = ids.length > 0
+      ? await supabase.from('customers').select('*').in('id', ids)
+      : { data: [], error: null };
+    const data = orderByIds(rows || [], ids);
     
     if (error) {
       console.error('Error searching customers:', error);
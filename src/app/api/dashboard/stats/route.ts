@@ -1,69 +1,48 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(request: NextRequest) {
-  try {
-    // Get total products count
-    const { count: productsCount } = await supabase
-      .from('products')
-      .select('*', { count: 'exact', head: true });
-
-    // Get total orders count
-    const { count: ordersCount, error: ordersError } = await supabase
-      .from('orders')
-      .select('*', { count: 'exact', head: true });
-    
-    // Default to 0 if there's an error (e.g., table doesn't exist)
-    const totalOrdersCount = ordersError ? 0 : ordersCount;
+// Changes are reported against the latest snapshot at least this many days old
+const COMPARISON_PERIOD_DAYS = 30;
 
-    // Get low stock items count
-    const { data: inventoryItems } = await supabase
-      .from('inventory_items')
-      .select('quantity_available, min_stock_level')
-      .gt('min_stock_level', 0);
+const buildStat = (value: number, previous: number | undefined) => {
+  const change = previous && previous > 0
+    ? Math.round((value - previous) / previous * 100)
+    : 0;
 
-    // Filter items where quantity is less than or equal to min stock level
-    const lowStockItems = (inventoryItems || []).filter(item => 
-      item.quantity_available <= item.min_stock_level
-    );
-    const lowStockCount = lowStockItems.length;
+  return {
+    value,
+    change,
+    changeType: change >= 0 ? 'increase' : 'decrease'
+  };
+};
 
-    // Calculate total revenue (sum of all inventory value)
-    const { data: inventoryValue } = await supabase
-      .from('inventory_items')
-      .select('quantity_available, unit_cost');
+export const GET = withRouteMetrics('/api/dashboard/stats', handleGet);
+async function handleGet(request: NextRequest) {
+  try {
+    // Counters are maintained by triggers (see system/008_dashboard_stats_counters.sql)
+    const { data: stats, error } = await supabase.rpc('get_dashboard_stats', {
+      p_period_days: COMPARISON_PERIOD_DAYS
+    });
 
-    const totalRevenue = inventoryValue?.reduce((sum, item) => {
-      return sum + (item.quantity_available * item.unit_cost);
-    }, 0) || 0;
+    if (error || !stats) {
+      console.error('Dashboard stats error:', error);
+      return NextResponse.json(
+        { error: 'Failed to fetch dashboard stats' },
+        { status: 500 }
+      );
+    }
 
-    // Calculate percentage changes (mock for now since we don't have historical data)
-    const lastMonthProducts = Math.floor((productsCount || 0) * 0.88);
-    const productsChange = lastMonthProducts > 0 
-      ? Math.round(((productsCount || 0) - lastMonthProducts) / lastMonthProducts * 100)
-      : 0;
+    const previous = stats.previous || {};
 
     return NextResponse.json({
-      totalProducts: {
-        value: productsCount || 0,
-        change: productsChange,
-        changeType: productsChange >= 0 ? 'increase' : 'decrease'
-      },
-      totalOrders: {
-        value: totalOrdersCount || 0,
-        change: 0, // No change since we're starting fresh
-        changeType: 'increase'
-      },
-      revenue: {
-        value: totalRevenue,
-        change: 15, // Mock change
-        changeType: 'increase'
-      },
-      lowStockItems: {
-        value: lowStockCount,
-        change: -5, // Mock change
-        changeType: 'decrease'
-      }
+      totalProducts: buildStat(Number(stats.total_products), previous.total_products),
+      totalOrders: buildStat(Number(stats.total_orders), previous.total_orders),
+      // Revenue card shows total inventory value
+      revenue: buildStat(Number(stats.inventory_value), previous.inventory_value),
+      lowStockItems: buildStat(Number(stats.low_stock_items), previous.low_stock_items),
+      comparedTo: previous.snapshot_date || null,
+      updatedAt: stats.updated_at
     });
   } catch (error) {
     console.error('Dashboard stats error:', error);
@@ -1,38 +1,170 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { decodeCursor, encodeCursor, InvalidCursorError } from '@/lib/cursor';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(
+const DEFAULT_PAGE_SIZE = 50;
+const MAX_PAGE_SIZE = 200;
+
+interface LedgerEntry {
+  entry_id: string;
+  source: 'movement' | 'adjustment';
+  entry_type: string;
+  created_at: string;
+  quantity_change: number;
+  quantity_after: number | null;
+  reason: string | null;
+  reference: string | null;
+  location: string | null;
+  status: string;
+  created_by: string | null;
+}
+
+// GET /api/inventory/[id]/history
+// Applied stock movements and adjustments for the item's product, newest first.
+// Query params:
+//   limit            page size (default 50, max 200)
+//   cursor           next_cursor from the previous page
+//   running_balance  'true' to derive newQuantity by walking back from the product's
+//                    current on-hand total (the ledger covers every location, so a
+//                    single item's quantity would not add up) instead of using each
+//                    entry's recorded level
+export const GET = withRouteMetrics('/api/inventory/[id]/history', handleGet);
+async function handleGet(
   request: NextRequest,
-  { params }: { params: { id: string } }
+  { params }: { params: Promise<{ id: string }> }
 ) {
-  console.log('History API called for ID:', params.id);
-  
   try {
-    // Simple response with mock data for now to test JSON parsing
-    const mockHistory = [
-      {
-        date: new Date().toISOString(),
-        action: 'Initial Stock Entry',
-        quantityChanged: 100,
-        newQuantity: 100,
-        user: 'System'
-      },
-      {
-        date: new Date(Date.now() - 86400000).toISOString(), // Yesterday
-        action: 'Stock Adjustment (+20)',
-        quantityChanged: 20,
-        newQuantity: 120,
-        user: 'Admin'
+    const { id } = await params;
+    const { searchParams } = new URL(request.url);
+    const limit = Math.min(Math.max(parseInt(searchParams.get('limit') || '') || DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE);
+    const runningBalance = searchParams.get('running_balance') === 'true';
+    const cursorParam = searchParams.get('cursor');
+
+    let cursor = null;
+    if (cursorParam) {
+      try {
+        cursor = decodeCursor(cursorParam);
+        // Cursors from other listings decode fine but do not fit this ledger's order
+        if (cursor.sort !== 'created_at' || cursor.ascending) {
+          throw new InvalidCursorError();
+        }
+      } catch (error) {
+        if (error instanceof InvalidCursorError) {
+          return NextResponse.json(
+            { success: false, error: error.message },
+            { status: 400 }
+          );
+        }
+        throw error;
+      }
+    }
+
+    const { data: item, error: itemError } = await supabase
+      .from('inventory_items')
+      .select('id, product_id, quantity_on_hand, products(name, sku)')
+      .eq('id', id)
+      .single();
+
+    if (itemError) {
+      if (itemError.code === 'PGRST116') {
+        return NextResponse.json(
+          { success: false, error: 'Inventory item not found' },
+          { status: 404 }
+        );
+      }
+      console.error('Error fetching inventory item:', itemError);
+      return NextResponse.json(
+        { success: false, error: 'Failed to fetch inventory item' },
+        { status: 500 }
+      );
+    }
+
+    // One extra row tells us whether another page exists
+    const { data, error } = await supabase.rpc('get_inventory_history', {
+      p_product_id: item.product_id,
+      ...(cursor ? { p_before_created_at: cursor.value, p_before_id: cursor.id } : {}),
+      p_limit: limit + 1
+    });
+
+    if (error) {
+      console.error('Error fetching inventory history:', error);
+      return NextResponse.json(
+        { success: false, error: 'Failed to fetch inventory history' },
+        { status: 500 }
+      );
+    }
+
+    const entries: LedgerEntry[] = data || [];
+    const hasMore = entries.length > limit;
+    const page = hasMore ? entries.slice(0, limit) : entries;
+
+    // Balance after the newest entry on this page: the product's current on-hand
+    // total across locations on the first page, otherwise carried in the cursor
+    let balance = cursor?.carry ?? 0;
+    if (runningBalance && cursor?.carry === undefined) {
+      const { data: stock, error: stockError } = await supabase
+        .from('inventory_items')
+        .select('quantity_on_hand')
+        .eq('product_id', item.product_id);
+
+      if (stockError) {
+        console.error('Error fetching product stock:', stockError);
+        return NextResponse.json(
+          { success: false, error: 'Failed to fetch inventory history' },
+          { status: 500 }
+        );
       }
-    ];
+      balance = (stock || []).reduce((sum, row) => sum + (row.quantity_on_hand || 0), 0);
+    }
+
+    const history = page.map(entry => {
+      const newQuantity = runningBalance ? balance : entry.quantity_after;
+      // Transfers move stock between locations and leave the product total unchanged
+      const isTransfer = entry.source === 'movement' && entry.entry_type === 'transfer';
+      balance -= isTransfer ? 0 : entry.quantity_change;
+
+      return {
+        id: entry.entry_id,
+        source: entry.source,
+        date: entry.created_at,
+        action: formatMovementAction(entry.entry_type, entry.quantity_change),
+        quantityChanged: entry.quantity_change,
+        newQuantity,
+        reason: entry.reason,
+        reference: entry.reference,
+        location: entry.location,
+        status: entry.status,
+        user: entry.created_by || 'System'
+      };
+    });
+
+    const last = page[page.length - 1];
+    const nextCursor = hasMore && last
+      ? encodeCursor({
+          sort: 'created_at',
+          ascending: false,
+          value: last.created_at,
+          id: last.entry_id,
+          ...(runningBalance ? { carry: balance } : {})
+        })
+      : null;
+
+    const product = Array.isArray(item.products) ? item.products[0] : item.products;
 
     return NextResponse.json({
       success: true,
-      history: mockHistory,
+      history,
       item: {
-        id: params.id,
-        name: 'Test Product',
-        sku: 'TEST-001'
+        id: item.id,
+        name: product?.name,
+        sku: product?.sku,
+        quantity_on_hand: item.quantity_on_hand
+      },
+      pagination: {
+        per_page: limit,
+        has_more: hasMore,
+        next_cursor: nextCursor
       }
     });
     
@@ -58,6 +190,9 @@ function formatMovementAction(movementType: string, quantityChange: number): str
     case 'sale':
       return `Stock Out (-${absChange})`;
     case 'adjustment':
+    case 'increase':
+    case 'decrease':
+    case 'recount':
       return quantityChange >= 0 
         ? `Stock Adjustment (+${absChange})`
         : `Stock Adjustment (-${absChange})`;
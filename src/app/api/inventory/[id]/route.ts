@@ -1,7 +1,10 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(
+export const GET = withRouteMetrics('/api/inventory/[id]', handleGet);
+async function handleGet(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -49,7 +52,8 @@ export async function GET(
   }
 }
 
-export async function PUT(
+export const PUT = withRouteMetrics('/api/inventory/[id]', handlePut);
+async function handlePut(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -71,6 +75,7 @@ export async function PUT(
       );
     }
 
+    invalidateCacheTags('inventory');
     return NextResponse.json(data);
   } catch (error) {
     console.error('Unexpected error:', error);
@@ -81,7 +86,8 @@ export async function PUT(
   }
 }
 
-export async function PATCH(
+export const PATCH = withRouteMetrics('/api/inventory/[id]', handlePatch);
+async function handlePatch(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -152,6 +158,7 @@ export async function PATCH(
     }
 
     console.log('Successfully updated inventory item:', data);
+    invalidateCacheTags('inventory');
     return NextResponse.json({ success: true, data });
   } catch (error) {
     console.error('Unexpected error in PATCH:', error);
@@ -162,7 +169,8 @@ export async function PATCH(
   }
 }
 
-export async function DELETE(
+export const DELETE = withRouteMetrics('/api/inventory/[id]', handleDelete);
+async function handleDelete(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -180,6 +188,7 @@ export async function DELETE(
       );
     }
 
+    invalidateCacheTags('inventory');
     return NextResponse.json({ success: true });
   } catch (error) {
     console.error('Unexpected error:', error);
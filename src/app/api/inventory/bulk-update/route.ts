@@ -1,10 +1,13 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { supabase } from '@/lib/supabaseClient';
+import { inventoryService, BULK_UPDATE_CHUNK_SIZE } from '@/services/inventory';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function PATCH(request: NextRequest) {
+export const PATCH = withRouteMetrics('/api/inventory/bulk-update', handlePatch);
+async function handlePatch(request: NextRequest) {
   try {
     const body = await request.json();
-    const { updates } = body;
+    const { updates, chunkSize } = body;
 
     if (!Array.isArray(updates) || updates.length === 0) {
       return NextResponse.json(
@@ -13,44 +16,14 @@ export async function PATCH(request: NextRequest) {
       );
     }
 
-    const updatedItems = [];
+    const size = Number.isInteger(chunkSize) && chunkSize > 0
+      ? Math.min(chunkSize, BULK_UPDATE_CHUNK_SIZE)
+      : BULK_UPDATE_CHUNK_SIZE;
 
-    // Process each update
-    for (const update of updates) {
-      const { id, quantity, ...otherFields } = update;
+    const result = await inventoryService.bulkUpdateItems(updates, size);
+    invalidateCacheTags('inventory');
 
-      if (!id) {
-        console.warn('Skipping update without ID:', update);
-        continue;
-      }
-
-      try {
-        const { data, error } = await supabase
-          .from('inventory_items')
-          .update({
-            quantity_on_hand: quantity,
-            ...otherFields,
-            updated_at: new Date().toISOString()
-          })
-          .eq('id', id)
-          .select()
-          .single();
-
-        if (error) {
-          console.error(`Error updating inventory item ${id}:`, error);
-          continue;
-        }
-
-        if (data) {
-          updatedItems.push(data);
-        }
-      } catch (itemError) {
-        console.error(`Failed to update item ${id}:`, itemError);
-        continue;
-      }
-    }
-
-    return NextResponse.json(updatedItems);
+    return NextResponse.json(result);
   } catch (error) {
     console.error('Unexpected error in bulk update:', error);
     return NextResponse.json(
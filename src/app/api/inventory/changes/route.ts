@@ -0,0 +1,27 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { ChangeFeedService, parseChangesQuery } from '@/services/changes';
+import { withRouteMetrics } from '@/lib/metrics';
+
+// GET /api/inventory/changes?updated_since=<ISO>[&after_id=<uuid>][&limit=500]
+// Inventory items changed or deleted since a point in time, oldest first, as
+// inventory_update events. Page with the returned cursor while hasMore.
+export const GET = withRouteMetrics('/api/inventory/changes', handleGet);
+async function handleGet(request: NextRequest) {
+  try {
+    const query = parseChangesQuery(new URL(request.url).searchParams);
+    if (typeof query === 'string') {
+      return NextResponse.json({ error: query }, { status: 400 });
+    }
+
+    const changes = await ChangeFeedService.getInventoryChanges(query);
+    return NextResponse.json(changes, {
+      headers: { 'Cache-Control': 'no-store' }
+    });
+  } catch (error) {
+    console.error('Error fetching inventory changes:', error);
+    return NextResponse.json(
+      { error: 'Failed to fetch inventory changes' },
+      { status: 500 }
+    );
+  }
+}
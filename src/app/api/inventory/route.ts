@@ -1,7 +1,10 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/inventory', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     const { searchParams } = new URL(request.url);
     const location_id = searchParams.get('location_id');
@@ -93,7 +96,8 @@ export async function GET(request: NextRequest) {
   }
 }
 
-export async function POST(request: NextRequest) {
+export const POST = withRouteMetrics('/api/inventory', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     const body = await request.json();
     
@@ -111,6 +115,7 @@ export async function POST(request: NextRequest) {
       );
     }
 
+    invalidateCacheTags('inventory');
     return NextResponse.json(data, { status: 201 });
   } catch (error) {
     console.error('Unexpected error:', error);
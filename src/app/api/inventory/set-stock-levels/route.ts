@@ -1,7 +1,10 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function POST(request: NextRequest) {
+export const POST = withRouteMetrics('/api/inventory/set-stock-levels', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     const body = await request.json();
     const { 
@@ -96,6 +99,7 @@ export async function POST(request: NextRequest) {
 
     console.log(`Stock levels update completed. Updated ${updatedCount} items.`);
 
+    invalidateCacheTags('inventory');
     return NextResponse.json({
       success: true,
       message: `Successfully updated stock levels for ${updatedCount} inventory items`,
@@ -117,7 +121,8 @@ export async function POST(request: NextRequest) {
   }
 }
 
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/inventory/set-stock-levels', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     // Get summary of stock levels status
     const { data: summary, error } = await supabase
@@ -1,7 +1,9 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function POST(request: NextRequest) {
+export const POST = withRouteMetrics('/api/inventory/utilities/fix-data', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     console.log('Starting inventory data fix...');
 
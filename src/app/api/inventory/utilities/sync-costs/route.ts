@@ -1,117 +1,40 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
-
-export async function POST(request: NextRequest) {
+import { queueJob, InventorySyncCostsPayload } from '@/services/jobs';
+import { withRouteMetrics } from '@/lib/metrics';
+
+// POST /api/inventory/utilities/sync-costs - Copy product costs onto active inventory items.
+// ?mode=incremental only syncs items whose product changed since the last run.
+// Runs as a background job; poll the returned statusUrl for the result.
+export const POST = withRouteMetrics('/api/inventory/utilities/sync-costs', handlePost);
+async function handlePost(request: NextRequest) {
   try {
-    console.log('Starting cost sync operation...');
-
-    // First, let's get all inventory items with their product information
-    const { data: inventoryItems, error: fetchError } = await supabase
-      .from('inventory_items')
-      .select(`
-        id,
-        product_id,
-        unit_cost,
-        products (
-          cost_price,
-          selling_price
-        )
-      `)
-      .eq('status', 'active');
-
-    if (fetchError) {
-      console.error('Error fetching inventory items:', fetchError);
-      return NextResponse.json(
-        { error: 'Failed to fetch inventory items' },
-        { status: 500 }
-      );
-    }
-
-    console.log(`Found ${inventoryItems?.length || 0} inventory items to process`);
-
-    let updatedCount = 0;
-    const updates = [];
+    const { searchParams } = new URL(request.url);
+    const incremental = searchParams.get('mode') === 'incremental';
 
-    // Process each inventory item
-    for (const item of inventoryItems || []) {
-      const productCostPrice = item.products?.cost_price;
-      const productSellingPrice = item.products?.selling_price;
-      
-      // Determine the best cost value to use
-      let newUnitCost = item.unit_cost;
-      
-      if (productCostPrice && productCostPrice > 0) {
-        newUnitCost = productCostPrice;
-      } else if (productSellingPrice && productSellingPrice > 0 && (!item.unit_cost || item.unit_cost === 0)) {
-        // Use selling price as fallback if no cost is available
-        newUnitCost = productSellingPrice;
-      }
-
-      // Only update if the cost has changed
-      if (newUnitCost !== item.unit_cost) {
-        updates.push({
-          id: item.id,
-          unit_cost: newUnitCost
-        });
-      }
-    }
-
-    console.log(`Preparing to update ${updates.length} inventory items`);
-
-    // Perform batch updates
-    if (updates.length > 0) {
-      // Update in batches to avoid overwhelming the database
-      const batchSize = 50;
-      for (let i = 0; i < updates.length; i += batchSize) {
-        const batch = updates.slice(i, i + batchSize);
-        
-        for (const update of batch) {
-          const { error: updateError } = await supabase
-            .from('inventory_items')
-            .update({ unit_cost: update.unit_cost })
-            .eq('id', update.id);
-
-          if (updateError) {
-            console.error(`Error updating inventory item ${update.id}:`, updateError);
-          } else {
-            updatedCount++;
-          }
-        }
-      }
-    }
-
-    console.log(`Cost sync completed. Updated ${updatedCount} items.`);
+    const job = await queueJob<InventorySyncCostsPayload>('inventory.sync_costs', { incremental });
 
     return NextResponse.json({
       success: true,
-      message: `Successfully synced costs for ${updatedCount} inventory items`,
-      totalProcessed: inventoryItems?.length || 0,
-      updated: updatedCount
-    });
+      jobId: job.id,
+      status: job.status,
+      statusUrl: `/api/jobs/${job.id}`
+    }, { status: 202 });
 
   } catch (error) {
-    console.error('Unexpected error during cost sync:', error);
+    console.error('Error queueing cost sync:', error);
     return NextResponse.json(
-      { error: 'Internal server error during cost sync' },
+      { error: 'Failed to start cost sync' },
       { status: 500 }
     );
   }
 }
 
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/inventory/utilities/sync-costs', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     // Get summary of cost sync status
-    const { data: summary, error } = await supabase
-      .from('inventory_items')
-      .select(`
-        id,
-        unit_cost,
-        products (
-          cost_price,
-          selling_price
-        )
-      `)
-      .eq('status', 'active');
+    const { data: summary, error } = await supabase.rpc('get_inventory_cost_sync_status');
 
     if (error) {
       console.error('Error fetching summary:', error);
@@ -121,24 +44,13 @@ export async function GET(request: NextRequest) {
       );
     }
 
-    const totalItems = summary?.length || 0;
-    const itemsWithZeroCost = summary?.filter(item => !item.unit_cost || item.unit_cost === 0).length || 0;
-    const itemsWithCost = totalItems - itemsWithZeroCost;
-    const itemsNeedingSync = summary?.filter(item => {
-      const productCostPrice = item.products?.cost_price;
-      const productSellingPrice = item.products?.selling_price;
-      const currentCost = item.unit_cost || 0;
-      
-      return (productCostPrice && productCostPrice > 0 && productCostPrice !== currentCost) ||
-             ((!currentCost || currentCost === 0) && productSellingPrice && productSellingPrice > 0);
-    }).length || 0;
-
     return NextResponse.json({
-      totalItems,
-      itemsWithCost,
-      itemsWithZeroCost,
-      itemsNeedingSync,
-      syncRecommended: itemsNeedingSync > 0
+      totalItems: summary.totalItems,
+      itemsWithCost: summary.itemsWithCost,
+      itemsWithZeroCost: summary.itemsWithZeroCost,
+      itemsNeedingSync: summary.itemsNeedingSync,
+      syncRecommended: summary.itemsNeedingSync > 0,
+      lastSync: summary.lastSync
     });
 
   } catch (error) {
@@ -0,0 +1,60 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { JobService } from '@/services/jobs/jobService';
+import { withRouteMetrics } from '@/lib/metrics';
+
+// GET /api/jobs/[id] - Status, progress and (once finished) result of a background job
+export const GET = withRouteMetrics('/api/jobs/[id]', handleGet);
+async function handleGet(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+    const result = await JobService.getJob(id);
+
+    if (!result.success) {
+      return NextResponse.json(
+        { success: false, error: result.message },
+        { status: result.message === 'Job not found' ? 404 : 500 }
+      );
+    }
+
+    return NextResponse.json(
+      { success: true, data: result.data },
+      { headers: { 'Cache-Control': 'no-store' } }
+    );
+  } catch (error) {
+    console.error('Error in GET /api/jobs/[id]:', error);
+    return NextResponse.json(
+      { success: false, error: 'Internal server error' },
+      { status: 500 }
+    );
+  }
+}
+
+// DELETE /api/jobs/[id] - Cancel a queued or running job; a running job stops at its next checkpoint
+export const DELETE = withRouteMetrics('/api/jobs/[id]', handleDelete);
+async function handleDelete(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+    const result = await JobService.cancelJob(id);
+
+    if (!result.success) {
+      return NextResponse.json(
+        { success: false, error: result.message },
+        { status: result.message === 'Job not found or already finished' ? 409 : 500 }
+      );
+    }
+
+    return NextResponse.json({ success: true, data: result.data });
+  } catch (error) {
+    console.error('Error in DELETE /api/jobs/[id]:', error);
+    return NextResponse.json(
+      { success: false, error: 'Internal server error' },
+      { status: 500 }
+    );
+  }
+}
@@ -0,0 +1,44 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { JobService } from '@/services/jobs/jobService';
+import { JobStatus, JobType } from '@/types/jobs';
+import { withRouteMetrics } from '@/lib/metrics';
+
+const JOB_TYPES: JobType[] = ['products.import', 'inventory.populate', 'inventory.sync_costs', 'orders.bulk_fulfill'];
+const JOB_STATUSES: JobStatus[] = ['queued', 'running', 'completed', 'failed', 'cancelled'];
+
+// GET /api/jobs - Most recent background jobs, optionally filtered by type and status
+export const GET = withRouteMetrics('/api/jobs', handleGet);
+async function handleGet(request: NextRequest) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const type = searchParams.get('type') as JobType | null;
+    const status = searchParams.get('status') as JobStatus | null;
+    const limit = Math.min(Math.max(parseInt(searchParams.get('limit') || '20') || 20, 1), 100);
+
+    if (type && !JOB_TYPES.includes(type)) {
+      return NextResponse.json(
+        { success: false, error: `type must be one of: ${JOB_TYPES.join(', ')}` },
+        { status: 400 }
+      );
+    }
+    if (status && !JOB_STATUSES.includes(status)) {
+      return NextResponse.json(
+        { success: false, error: `status must be one of: ${JOB_STATUSES.join(', ')}` },
+        { status: 400 }
+      );
+    }
+
+    const result = await JobService.listJobs({ type: type || undefined, status: status || undefined, limit });
+    if (!result.success) {
+      return NextResponse.json({ success: false, error: result.message }, { status: 500 });
+    }
+
+    return NextResponse.json({ success: true, data: result.data });
+  } catch (error) {
+    console.error('Error in GET /api/jobs:', error);
+    return NextResponse.json(
+      { success: false, error: 'Internal server error' },
+      { status: 500 }
+    );
+  }
+}
@@ -3,9 +3,12 @@ import { NextRequest, NextResponse } from 'next/server';
 // We'll need to implement a general MediaService for individual media operations
 // For now, we'll use the Supabase client directly but structure it properly
 import { supabase } from '@/lib/supabaseClient';
+import { MediaVariantService } from '@/services/media/mediaVariantService';
+import { withRouteMetrics } from '@/lib/metrics';
 
 // GET /api/media/[id]
-export async function GET(
+export const GET = withRouteMetrics('/api/media/[id]', handleGet);
+async function handleGet(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
@@ -47,7 +50,8 @@ export async function GET(
 }
 
 // PUT /api/media/[id]
-export async function PUT(
+export const PUT = withRouteMetrics('/api/media/[id]', handlePut);
+async function handlePut(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
@@ -107,7 +111,8 @@ export async function PUT(
 }
 
 // DELETE /api/media/[id]
-export async function DELETE(
+export const DELETE = withRouteMetrics('/api/media/[id]', handleDelete);
+async function handleDelete(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
@@ -117,7 +122,7 @@ export async function DELETE(
     // First, get the media record to retrieve file path for storage deletion
     const { data: mediaRecord, error: fetchError } = await supabase
       .from('media')
-      .select('file_path, bucket_name')
+      .select('file_path, bucket_name, variants')
       .eq('id', resolvedParams.id)
       .single();
 
@@ -139,7 +144,7 @@ export async function DELETE(
     if (mediaRecord?.file_path) {
       const { error: storageError } = await supabase.storage
         .from(mediaRecord.bucket_name || 'media-files')
-        .remove([mediaRecord.file_path]);
+        .remove([mediaRecord.file_path, ...MediaVariantService.allVariantPaths(mediaRecord.variants)]);
 
       if (storageError) {
         console.warn('Warning: Failed to delete file from storage:', storageError);
@@ -0,0 +1,87 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { supabaseAdmin } from '@/lib/supabaseAdmin';
+import {
+  MediaVariantService,
+  MEDIA_VARIANT_SIZES,
+  IMMUTABLE_CACHE_CONTROL,
+  type MediaVariantSize,
+  type MediaVariants
+} from '@/services/media/mediaVariantService';
+import { withRouteMetrics } from '@/lib/metrics';
+
+// sharp needs the Node.js runtime
+export const runtime = 'nodejs';
+
+// GET /api/media/[id]/variants/[size]
+// Redirects to a pre-sized AVIF or WebP variant (chosen from the Accept header) in
+// storage, so the bytes come from Supabase Storage/CDN rather than through this server.
+// Variants missing for older uploads are generated on first request.
+export const GET = withRouteMetrics('/api/media/[id]/variants/[size]', handleGet);
+async function handleGet(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string; size: string }> }
+) {
+  try {
+    const { id, size } = await params;
+
+    if (!(size in MEDIA_VARIANT_SIZES)) {
+      return NextResponse.json(
+        { success: false, error: `Invalid size. Expected one of: ${Object.keys(MEDIA_VARIANT_SIZES).join(', ')}` },
+        { status: 400 }
+      );
+    }
+
+    const { data: media, error } = await supabaseAdmin
+      .from('media')
+      .select('id, file_path, bucket_name, mime_type, variants, variants_generated_at')
+      .eq('id', id)
+      .single();
+
+    if (error) {
+      if (error.code === 'PGRST116') {
+        return NextResponse.json(
+          { success: false, error: 'Media not found' },
+          { status: 404 }
+        );
+      }
+
+      return NextResponse.json(
+        { success: false, error: error.message },
+        { status: 500 }
+      );
+    }
+
+    const originalUrl = MediaVariantService.publicUrl(media.bucket_name, media.file_path);
+    if (!MediaVariantService.isImage(media.mime_type)) {
+      return NextResponse.redirect(originalUrl, 302);
+    }
+
+    let variants: MediaVariants;
+    try {
+      variants = await MediaVariantService.ensureVariants(media);
+    } catch (generationError) {
+      console.error(`Failed to generate variants for media ${id}:`, generationError);
+      return NextResponse.redirect(originalUrl, 302);
+    }
+
+    const format = MediaVariantService.negotiateFormat(request.headers.get('accept'));
+    const path = variants[size as MediaVariantSize]?.[format];
+    if (!path) {
+      return NextResponse.redirect(originalUrl, 302);
+    }
+
+    // The URL is versioned (?v=) and variant paths never change, so for a given
+    // Accept header the redirect itself can be cached for good
+    const response = NextResponse.redirect(MediaVariantService.publicUrl(media.bucket_name, path), 302);
+    response.headers.set('Cache-Control', IMMUTABLE_CACHE_CONTROL);
+    response.headers.set('Vary', 'Accept');
+    return response;
+
+  } catch (error) {
+    console.error('API error:', error);
+    return NextResponse.json(
+      { success: false, error: 'Internal server error' },
+      { status: 500 }
+    );
+  }
+}
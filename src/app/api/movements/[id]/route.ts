@@ -1,7 +1,10 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(
+export const GET = withRouteMetrics('/api/movements/[id]', handleGet);
+async function handleGet(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -44,7 +47,8 @@ export async function GET(
   }
 }
 
-export async function DELETE(
+export const DELETE = withRouteMetrics('/api/movements/[id]', handleDelete);
+async function handleDelete(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -62,6 +66,7 @@ export async function DELETE(
       );
     }
 
+    invalidateCacheTags('inventory');
     return NextResponse.json({ success: true });
   } catch (error) {
     console.error('Unexpected error:', error);
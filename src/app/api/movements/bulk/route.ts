@@ -1,7 +1,47 @@
 import { NextRequest, NextResponse } from 'next/server';
+import { randomUUID } from 'crypto';
 import { supabase } from '@/lib/supabaseClient';
+import { chunk, applyWithBisect } from '@/lib/batch';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function POST(request: NextRequest) {
+// Rows per insert statement and ids per product lookup (keeps the query string bounded)
+const INSERT_CHUNK_SIZE = 500;
+const LOOKUP_CHUNK_SIZE = 200;
+
+const MOVEMENT_TYPES = ['in', 'out', 'transfer', 'adjustment'];
+const MOVEMENT_REASONS = ['purchase', 'sale', 'transfer', 'adjustment', 'damage', 'return', 'manual'];
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+type MovementRowStatus = 'created' | 'invalid' | 'failed';
+
+interface MovementRowResult {
+  index: number;
+  status: MovementRowStatus;
+  id?: string;
+  movement?: any;
+  error?: string;
+}
+
+const validateMovement = (movement: any): string | null => {
+  if (!movement || typeof movement !== 'object') return 'Movement must be an object';
+  if (typeof movement.product_id !== 'string' || !UUID_PATTERN.test(movement.product_id)) {
+    return 'A valid product_id is required';
+  }
+  if (!MOVEMENT_TYPES.includes(movement.movement_type)) {
+    return `movement_type must be one of: ${MOVEMENT_TYPES.join(', ')}`;
+  }
+  if (!Number.isInteger(movement.quantity) || movement.quantity <= 0) {
+    return 'quantity must be a positive integer';
+  }
+  if (!MOVEMENT_REASONS.includes(movement.reason)) {
+    return `reason must be one of: ${MOVEMENT_REASONS.join(', ')}`;
+  }
+  return null;
+};
+
+export const POST = withRouteMetrics('/api/movements/bulk', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     const body = await request.json();
     const { movements } = body;
@@ -13,57 +53,124 @@ export async function POST(request: NextRequest) {
       );
     }
 
-    const createdMovements = [];
-
-    // Process each movement
-    for (const movement of movements) {
-      const movementData = {
-        product_id: movement.product_id,
-        movement_type: movement.movement_type,
-        quantity: movement.quantity,
-        reason: movement.reason,
-        location_to_id: movement.location_to_id || 'main_warehouse',
-        location_to_name: movement.location_to_name || 'Main Warehouse',
-        location_from_id: movement.location_from_id || null,
-        location_from_name: movement.location_from_name || null,
-        unit_cost: movement.unit_cost || 0,
-        reference_type: movement.reference_type || null,
-        reference_id: movement.reference_id || null,
-        reference_number: movement.reference_number || null,
-        notes: movement.notes || null,
-        created_by: movement.created_by || 'system',
-        status: movement.auto_process ? 'completed' : 'pending'
-      };
-
-      try {
-        const { data, error } = await supabase
-          .from('stock_movements')
-          .insert(movementData)
-          .select(`
-            *,
-            products (
-              name,
-              sku,
-              barcode
-            )
-          `)
-          .single();
-
-        if (error) {
-          console.error('Error creating movement:', error);
-          continue;
-        }
+    const results: MovementRowResult[] = new Array(movements.length);
+    let roundTrips = 0;
 
-        if (data) {
-          createdMovements.push(data);
-        }
-      } catch (itemError) {
-        console.error('Failed to create movement:', itemError);
+    // Step 1: validate every row in memory
+    const validIndexes: number[] = [];
+    movements.forEach((movement: any, index: number) => {
+      const validationError = validateMovement(movement);
+      if (validationError) {
+        results[index] = { index, status: 'invalid', error: validationError };
+      } else {
+        validIndexes.push(index);
+      }
+    });
+
+    // Step 2: resolve product metadata for the whole batch at once
+    const productIds = Array.from(new Set(validIndexes.map(index => movements[index].product_id as string)));
+    const products = new Map<string, { name: string; sku: string; barcode: string }>();
+
+    for (const ids of chunk(productIds, LOOKUP_CHUNK_SIZE)) {
+      roundTrips++;
+      const { data, error } = await supabase
+        .from('products')
+        .select('id, name, sku, barcode')
+        .in('id', ids);
+
+      if (error) {
+        console.error('Error resolving products for bulk movements:', error);
+        return NextResponse.json(
+          { error: 'Failed to resolve products' },
+          { status: 500 }
+        );
+      }
+
+      for (const product of data || []) {
+        products.set(product.id, { name: product.name, sku: product.sku, barcode: product.barcode });
+      }
+    }
+
+    // Step 3: build insert rows; the movement_number column default is only unique
+    // per transaction, so each row gets its own number to allow multi-row inserts.
+    // The batch part is random so concurrent requests (or instances) never collide.
+    const batchStamp = new Date().toISOString().slice(0, 10).replace(/-/g, '');
+    const batchId = randomUUID().replace(/-/g, '').slice(0, 12);
+    const pending: { index: number; row: Record<string, unknown> }[] = [];
+
+    for (const index of validIndexes) {
+      const movement = movements[index];
+      if (!products.has(movement.product_id)) {
+        results[index] = { index, status: 'invalid', error: 'Product not found' };
         continue;
       }
+
+      pending.push({
+        index,
+        row: {
+          movement_number: `MOV-${batchStamp}-${batchId}-${index + 1}`,
+          product_id: movement.product_id,
+          movement_type: movement.movement_type,
+          quantity: movement.quantity,
+          reason: movement.reason,
+          location_to_id: movement.location_to_id || 'main_warehouse',
+          location_to_name: movement.location_to_name || 'Main Warehouse',
+          location_from_id: movement.location_from_id || null,
+          location_from_name: movement.location_from_name || null,
+          unit_cost: movement.unit_cost || 0,
+          reference_type: movement.reference_type || null,
+          reference_id: movement.reference_id || null,
+          reference_number: movement.reference_number || null,
+          notes: movement.notes || null,
+          created_by: movement.created_by || 'system',
+          status: movement.auto_process ? 'completed' : 'pending'
+        }
+      });
     }
 
-    return NextResponse.json(createdMovements, { status: 201 });
+    // Step 4: insert in chunks; rows are matched back by their movement number
+    for (const rows of chunk(pending, INSERT_CHUNK_SIZE)) {
+      roundTrips += await applyWithBisect(
+        rows,
+        async (batch) => {
+          const { data, error } = await supabase
+            .from('stock_movements')
+            .insert(batch.map(entry => entry.row))
+            .select('*');
+
+          if (error) return error.message;
+
+          const byNumber = new Map((data || []).map(movement => [movement.movement_number, movement]));
+          for (const entry of batch) {
+            const created = byNumber.get(entry.row.movement_number);
+            results[entry.index] = {
+              index: entry.index,
+              status: 'created',
+              id: created?.id,
+              movement: created && { ...created, products: products.get(created.product_id) }
+            };
+          }
+          return null;
+        },
+        (entry, error) => {
+          results[entry.index] = { index: entry.index, status: 'failed', error };
+        }
+      );
+    }
+
+    const created = results.filter(result => result.status === 'created');
+    if (created.length > 0) invalidateCacheTags('inventory');
+
+    return NextResponse.json({
+      data: created.map(result => result.movement),
+      results,
+      summary: {
+        requested: movements.length,
+        created: created.length,
+        failed: movements.length - created.length,
+        roundTrips
+      }
+    }, { status: 201 });
   } catch (error) {
     console.error('Unexpected error in bulk movements:', error);
     return NextResponse.json(
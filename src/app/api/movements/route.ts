@@ -1,7 +1,10 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { createServerSupabaseAnonymousClient } from '@/lib/supabaseServer';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/movements', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     const { searchParams } = new URL(request.url);
     const product_id = searchParams.get('product_id');
@@ -78,7 +81,8 @@ export async function GET(request: NextRequest) {
   }
 }
 
-export async function POST(request: NextRequest) {
+export const POST = withRouteMetrics('/api/movements', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     console.log('🔑 Environment check:');
     console.log('  NEXT_PUBLIC_SUPABASE_URL:', !!process.env.NEXT_PUBLIC_SUPABASE_URL);
@@ -205,6 +209,7 @@ export async function POST(request: NextRequest) {
     }
     
     console.log('Movement created successfully:', data);
+    invalidateCacheTags('inventory');
     return NextResponse.json(data, { status: 201 });
   } catch (error) {
     console.error('Unexpected error in movement creation:', error);
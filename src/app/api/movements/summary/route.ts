@@ -1,21 +1,18 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(request: NextRequest) {
+// Composed from the daily rollups maintained by stock_movements triggers, so the
+// cost does not grow with the number of movements. Days are UTC calendar days.
+export const GET = withRouteMetrics('/api/movements/summary', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     const { searchParams } = new URL(request.url);
-    const days = parseInt(searchParams.get('days') || '30');
+    const days = Math.max(parseInt(searchParams.get('days') || '30') || 30, 0);
 
-    // Calculate date range
-    const dateFrom = new Date();
-    dateFrom.setDate(dateFrom.getDate() - days);
-
-    // Get movements for the specified period
-    const { data: movements, error } = await supabase
-      .from('stock_movements')
-      .select('movement_type, quantity, unit_cost, created_at')
-      .gte('created_at', dateFrom.toISOString())
-      .order('created_at', { ascending: false });
+    const { data: summary, error } = await supabase.rpc('get_stock_movement_summary', {
+      p_days: days
+    });
 
     if (error) {
       console.error('Error fetching movements for summary:', error);
@@ -25,32 +22,6 @@ export async function GET(request: NextRequest) {
       );
     }
 
-    const movementsData = movements || [];
-
-    // Calculate summary statistics
-    const now = new Date();
-    const today = new Date(now.getFullYear(), now.getMonth(), now.getDate());
-    const weekStart = new Date(today.getTime() - (today.getDay() * 24 * 60 * 60 * 1000));
-    const monthStart = new Date(now.getFullYear(), now.getMonth(), 1);
-
-    const summary = {
-      totalMovements: movementsData.length,
-      totalStockIn: movementsData
-        .filter(m => m.movement_type === 'in')
-        .reduce((sum, m) => sum + m.quantity, 0),
-      totalStockOut: movementsData
-        .filter(m => m.movement_type === 'out')
-        .reduce((sum, m) => sum + m.quantity, 0),
-      totalValue: movementsData
-        .reduce((sum, m) => sum + (m.quantity * (m.unit_cost || 0)), 0),
-      movementsToday: movementsData
-        .filter(m => new Date(m.created_at) >= today).length,
-      movementsThisWeek: movementsData
-        .filter(m => new Date(m.created_at) >= weekStart).length,
-      movementsThisMonth: movementsData
-        .filter(m => new Date(m.created_at) >= monthStart).length
-    };
-
     return NextResponse.json(summary);
   } catch (error) {
     console.error('Unexpected error:', error);
@@ -1,6 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { OrderService } from '@/services/orders';
 import { supabase } from '@/lib/supabaseClient';
+import { withRouteMetrics } from '@/lib/metrics';
 
 interface FulfillmentRequest {
   status: string;
@@ -12,7 +13,8 @@ interface FulfillmentRequest {
   };
 }
 
-export async function PUT(
+export const PUT = withRouteMetrics('/api/orders/[id]/fulfill', handlePut);
+async function handlePut(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
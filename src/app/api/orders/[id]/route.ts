@@ -1,8 +1,10 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { OrderService } from '@/services/orders';
 import { UpdateOrderRequest } from '@/types';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(
+export const GET = withRouteMetrics('/api/orders/[id]', handleGet);
+async function handleGet(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -27,7 +29,8 @@ export async function GET(
   }
 }
 
-export async function PUT(
+export const PUT = withRouteMetrics('/api/orders/[id]', handlePut);
+async function handlePut(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -54,7 +57,8 @@ export async function PUT(
   }
 }
 
-export async function DELETE(
+export const DELETE = withRouteMetrics('/api/orders/[id]', handleDelete);
+async function handleDelete(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
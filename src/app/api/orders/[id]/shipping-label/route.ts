@@ -1,7 +1,9 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { OrderService } from '@/services/orders';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function POST(
+export const POST = withRouteMetrics('/api/orders/[id]/shipping-label', handlePost);
+async function handlePost(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -1,13 +1,24 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { OrderService } from '@/services/orders';
-import { supabase } from '@/lib/supabaseClient';
+import { OrderFulfillmentService, BulkFulfillmentAction } from '@/services/orders/orderFulfillmentService';
+import { queueJob, BulkFulfillPayload } from '@/services/jobs';
+import { withRouteMetrics } from '@/lib/metrics';
+
+// Selections larger than this run as a background job (as does any request sent
+// with "Prefer: respond-async")
+const BULK_FULFILL_JOB_THRESHOLD = 2000;
+
+// orders.status has no 'packed' value, so there is no mark_packed action
+const ACTIONS = ['start_processing', 'mark_shipped', 'mark_delivered', 'cancel'];
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
 
 interface BulkFulfillmentRequest {
   orderIds: string[];
-  action: 'start_processing' | 'mark_packed' | 'mark_shipped' | 'mark_delivered' | 'cancel';
+  action: BulkFulfillmentAction;
+  idempotencyKey?: string;
 }
 
-export async function PUT(request: NextRequest) {
+export const PUT = withRouteMetrics('/api/orders/bulk-fulfill', handlePut);
+async function handlePut(request: NextRequest) {
   try {
     const body: BulkFulfillmentRequest = await request.json();
     
@@ -32,17 +43,7 @@ export async function PUT(request: NextRequest) {
       );
     }
 
-    // Map action to status
-    const actionToStatus: Record<string, string> = {
-      'start_processing': 'processing',
-      'mark_packed': 'packed',
-      'mark_shipped': 'shipped',
-      'mark_delivered': 'delivered',
-      'cancel': 'cancelled'
-    };
-
-    const newStatus = actionToStatus[body.action];
-    if (!newStatus) {
+    if (!ACTIONS.includes(body.action)) {
       return NextResponse.json(
         { 
           success: false, 
@@ -52,54 +53,46 @@ export async function PUT(request: NextRequest) {
       );
     }
 
-    // Process each order
-    const results = await Promise.all(
-      body.orderIds.map(async (orderId) => {
-        try {
-          const updateData: any = {
-            status: newStatus,
-            updated_at: new Date().toISOString()
-          };
+    // Retrying with the same key (and the same orderIds and action) replays the
+    // chunks that already went through instead of applying them again
+    const idempotencyKey = request.headers.get('idempotency-key') || body.idempotencyKey || null;
 
-          // Set timestamps based on action
-          if (body.action === 'mark_shipped') {
-            updateData.shipped_at = new Date().toISOString();
-          } else if (body.action === 'mark_delivered') {
-            updateData.delivered_at = new Date().toISOString();
-          } else if (body.action === 'cancel') {
-            updateData.cancelled_at = new Date().toISOString();
-          }
+    const orderIds = [...new Set(body.orderIds)];
+    const invalidIds = orderIds.filter(id => typeof id !== 'string' || !UUID_PATTERN.test(id));
+    const validIds = orderIds.filter(id => typeof id === 'string' && UUID_PATTERN.test(id));
 
-          // Update the order
-          const result = await OrderService.updateOrder(orderId, updateData);
+    if (validIds.length > BULK_FULFILL_JOB_THRESHOLD || request.headers.get('prefer')?.includes('respond-async')) {
+      // The job keys its chunks by job id; the request key only dedupes the enqueue
+      const job = await queueJob<BulkFulfillPayload>(
+        'orders.bulk_fulfill',
+        { orderIds: validIds, action: body.action },
+        { idempotencyKey: idempotencyKey ? `orders.bulk_fulfill:${idempotencyKey}` : null }
+      );
 
-          // If successful and action is shipped, create fulfillment record
-          if (result.success && body.action === 'mark_shipped') {
-            await supabase
-              .from('order_fulfillments')
-              .insert({
-                order_id: orderId,
-                fulfillment_status: 'shipped',
-                shipped_at: updateData.shipped_at
-              });
+      return NextResponse.json({
+        success: true,
+        jobId: job.id,
+        status: job.status,
+        statusUrl: `/api/jobs/${job.id}`,
+        invalidOrderIds: invalidIds
+      }, { status: 202 });
+    }
 
-            // Update order items status
-            await supabase
-              .from('order_items')
-              .update({ 
-                status: 'shipped',
-                updated_at: new Date().toISOString()
-              })
-              .eq('order_id', orderId);
-          }
+    // Each chunk is one transaction: its orders, fulfillment records and item
+    // statuses are written together or not at all
+    const fulfillment = await OrderFulfillmentService.bulkUpdateOrders(validIds, body.action, { idempotencyKey });
+    if (!fulfillment.success || !fulfillment.data) {
+      return NextResponse.json(
+        { success: false, message: fulfillment.message, data: null },
+        { status: 500 }
+      );
+    }
 
-          return { orderId, success: result.success, error: result.message };
-        } catch (error) {
-          console.error(`Error processing order ${orderId}:`, error);
-          return { orderId, success: false, error: 'Failed to process order' };
-        }
-      })
-    );
+    const results = [
+      ...fulfillment.data.results,
+      ...invalidIds.map(orderId => ({ orderId: String(orderId), success: false, error: 'Invalid order id' }))
+    ];
+    const replayedChunks = fulfillment.data.replayedChunks;
 
     // Count successful updates
     const processedCount = results.filter(r => r.success).length;
@@ -110,7 +103,9 @@ export async function PUT(request: NextRequest) {
       data: {
         processedCount,
         failedCount,
-        results
+        results,
+        idempotencyKey,
+        replayedChunks
       }
     });
   } catch (error) {
@@ -0,0 +1,27 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { ChangeFeedService, parseChangesQuery } from '@/services/changes';
+import { withRouteMetrics } from '@/lib/metrics';
+
+// GET /api/orders/changes?updated_since=<ISO>[&after_id=<uuid>][&limit=500]
+// Orders changed or deleted since a point in time, oldest first, as
+// order_status events. Page with the returned cursor while hasMore.
+export const GET = withRouteMetrics('/api/orders/changes', handleGet);
+async function handleGet(request: NextRequest) {
+  try {
+    const query = parseChangesQuery(new URL(request.url).searchParams);
+    if (typeof query === 'string') {
+      return NextResponse.json({ error: query }, { status: 400 });
+    }
+
+    const changes = await ChangeFeedService.getOrderChanges(query);
+    return NextResponse.json(changes, {
+      headers: { 'Cache-Control': 'no-store' }
+    });
+  } catch (error) {
+    console.error('Error fetching order changes:', error);
+    return NextResponse.json(
+      { error: 'Failed to fetch order changes' },
+      { status: 500 }
+    );
+  }
+}
@@ -1,7 +1,9 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(
+export const GET = withRouteMetrics('/api/orders/customer/[email]', handleGet);
+async function handleGet(
   request: NextRequest,
   { params }: { params: { email: string } }
 ) {
@@ -1,12 +1,14 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { withRouteMetrics } from '@/lib/metrics';
 
 interface ProcessRefundRequest {
   amount: number;
   method: string;
 }
 
-export async function POST(
+export const POST = withRouteMetrics('/api/orders/returns/[id]/refund', handlePost);
+async function handlePost(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -1,12 +1,15 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { OrderService } from '@/services/orders';
+import { withRouteMetrics } from '@/lib/metrics';
 
 interface UpdateReturnRequest {
   status: 'pending' | 'approved' | 'rejected' | 'shipped_back' | 'received' | 'refunded' | 'cancelled';
   notes?: string;
 }
 
-export async function GET(
+export const GET = withRouteMetrics('/api/orders/returns/[id]', handleGet);
+async function handleGet(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -50,7 +53,8 @@ export async function GET(
   }
 }
 
-export async function PUT(
+export const PUT = withRouteMetrics('/api/orders/returns/[id]', handlePut);
+async function handlePut(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -137,6 +141,7 @@ export async function PUT(
           updated_at: new Date().toISOString()
         })
         .eq('id', currentReturn.order_id);
+      OrderService.invalidateOrderStats();
     }
     
     // Add to order timeline
@@ -166,7 +171,8 @@ export async function PUT(
   }
 }
 
-export async function DELETE(
+export const DELETE = withRouteMetrics('/api/orders/returns/[id]', handleDelete);
+async function handleDelete(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
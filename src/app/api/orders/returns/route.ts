@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { withRouteMetrics } from '@/lib/metrics';
 
 interface CreateReturnRequest {
   orderId: string;
@@ -13,7 +14,8 @@ interface CreateReturnRequest {
   description?: string;
 }
 
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/orders/returns', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     const { searchParams } = new URL(request.url);
     const status = searchParams.get('status');
@@ -66,7 +68,8 @@ export async function GET(request: NextRequest) {
   }
 }
 
-export async function POST(request: NextRequest) {
+export const POST = withRouteMetrics('/api/orders/returns', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     const body: CreateReturnRequest = await request.json();
     
@@ -1,8 +1,10 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { OrderService } from '@/services/orders';
 import { CreateOrderRequest, OrderFilters } from '@/types';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/orders', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     const { searchParams } = new URL(request.url);
     
@@ -63,7 +65,8 @@ export async function GET(request: NextRequest) {
   }
 }
 
-export async function POST(request: NextRequest) {
+export const POST = withRouteMetrics('/api/orders', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     // Parse request body with size limit
     const body: CreateOrderRequest = await request.json();
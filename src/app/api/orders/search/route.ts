@@ -1,35 +1,46 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { normalizeSearchQuery, rankedSearch, orderByIds } from '@/lib/search';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/orders/search', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     const { searchParams } = new URL(request.url);
-    const query = searchParams.get('q');
-    const limit = parseInt(searchParams.get('limit') || '10');
-    const offset = parseInt(searchParams.get('offset') || '0');
+    const query = normalizeSearchQuery(searchParams.get('q'));
+    const limit = Math.min(Math.max(parseInt(searchParams.get('limit') || '10') || 10, 1), 100);
+    const offset = Math.max(parseInt(searchParams.get('offset') || '0') || 0, 0);
 
     if (!query) {
       return NextResponse.json({ error: 'Search query is required' }, { status: 400 });
     }
 
-    // Search orders by order number or shipping address details
-    const { data: orders, error, count } = await supabase
-      .from('orders')
-      .select(`
-        *,
-        items:order_items(*)
-      `, { count: 'exact' })
-      .or(`order_number.ilike.%${query}%,shipping_name.ilike.%${query}%,shipping_address.ilike.%${query}%`)
-      .order('created_at', { ascending: false })
-      .range(offset, offset + limit - 1);
+    // Rank matches on order number, shipping name and address, then load those orders
+    const { ids, total } = await rankedSearch('search_orders', {
+      p_query: query,
+      p_limit: limit,
+      p_offset: offset
+    });
+
+    let orders: any[] = [];
+    if (ids.length > 0) {
+      const { data, error } = await supabase
+        .from('orders')
+        .select(`
+          *,
+          items:order_items(*)
+        `)
+        .in('id', ids);
 
-    if (error) {
-      throw error;
+      if (error) {
+        throw error;
+      }
+      orders = orderByIds(data || [], ids);
     }
 
     return NextResponse.json({
-      orders: orders || [],
-      total: count || 0,
+      orders,
+      total,
       limit,
       offset,
       query
@@ -1,11 +1,16 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { OrderService } from '@/services/orders';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/orders/stats', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     // Only provide basic order statistics
     const result = await OrderService.getOrderStats();
-    return NextResponse.json(result);
+    return NextResponse.json({
+      ...result,
+      cache: OrderService.getOrderStatsCacheMetrics()
+    });
   } catch (error) {
     console.error('Error in GET /api/orders/stats:', error);
     return NextResponse.json(
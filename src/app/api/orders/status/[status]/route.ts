@@ -1,9 +1,11 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { withRouteMetrics } from '@/lib/metrics';
 
 const VALID_STATUSES = ['pending', 'confirmed', 'processing', 'shipped', 'delivered', 'cancelled', 'refunded'];
 
-export async function GET(
+export const GET = withRouteMetrics('/api/orders/status/[status]', handleGet);
+async function handleGet(
   request: NextRequest,
   { params }: { params: { status: string } }
 ) {
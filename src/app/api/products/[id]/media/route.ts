@@ -1,9 +1,19 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabaseAdmin } from '@/lib/supabaseAdmin';
 import { randomUUID } from 'crypto';
+import {
+  MediaVariantService,
+  MEDIA_VARIANT_SIZES,
+  type MediaVariantSize
+} from '@/services/media/mediaVariantService';
+import { withRouteMetrics } from '@/lib/metrics';
+
+// sharp needs the Node.js runtime
+export const runtime = 'nodejs';
 
 // GET /api/products/[id]/media
-export async function GET(
+export const GET = withRouteMetrics('/api/products/[id]/media', handleGet);
+async function handleGet(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
@@ -35,13 +45,25 @@ export async function GET(
       }, { status: 500 });
     }
 
-    // Add URLs to media items
-    const mediaWithUrls = data?.map(media => ({
-      ...media,
-      url: `${process.env.NEXT_PUBLIC_SUPABASE_URL}/storage/v1/object/public/${media.bucket_name}/${media.file_path}`,
-      thumbnail_url: `${process.env.NEXT_PUBLIC_SUPABASE_URL}/storage/v1/object/public/${media.bucket_name}/${media.file_path}?width=150&height=150`,
-      filename: media.file_name
-    })) || [];
+    // Add URLs to media items. Images link to pre-sized variants served with
+    // immutable caching; other files fall back to the original
+    const mediaWithUrls = data?.map(media => {
+      const url = `${process.env.NEXT_PUBLIC_SUPABASE_URL}/storage/v1/object/public/${media.bucket_name}/${media.file_path}`;
+      const isImage = MediaVariantService.isImage(media.mime_type);
+      const variantUrls = isImage
+        ? Object.fromEntries(
+            (Object.keys(MEDIA_VARIANT_SIZES) as MediaVariantSize[]).map(size => [size, MediaVariantService.variantUrl(media, size)])
+          )
+        : {};
+
+      return {
+        ...media,
+        url,
+        thumbnail_url: isImage ? variantUrls.thumbnail : url,
+        variant_urls: variantUrls,
+        filename: media.file_name
+      };
+    }) || [];
 
     return NextResponse.json({
       success: true,
@@ -58,7 +80,8 @@ export async function GET(
 }
 
 // POST /api/products/[id]/media
-export async function POST(
+export const POST = withRouteMetrics('/api/products/[id]/media', handlePost);
+async function handlePost(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
@@ -128,7 +151,7 @@ export async function POST(
       updated_at: new Date().toISOString()
     };
 
-    const { data: media, error: dbError } = await supabaseAdmin
+    const { data: insertedMedia, error: dbError } = await supabaseAdmin
       .from('media')
       .insert(mediaRecord)
       .select()
@@ -143,6 +166,21 @@ export async function POST(
       }, { status: 500 });
     }
 
+    // Generate variants from the bytes we already have. A failure is not fatal:
+    // the variants route generates them on first request instead
+    let media = insertedMedia;
+    if (MediaVariantService.isImage(file.type)) {
+      try {
+        const variants = await MediaVariantService.createVariantsForMedia(
+          insertedMedia,
+          Buffer.from(await file.arrayBuffer())
+        );
+        media = { ...insertedMedia, variants };
+      } catch (variantError) {
+        console.warn(`Failed to generate variants for media ${insertedMedia.id}:`, variantError);
+      }
+    }
+
     return NextResponse.json({
       success: true,
       media: media
@@ -158,7 +196,8 @@ export async function POST(
 }
 
 // DELETE /api/products/[id]/media
-export async function DELETE(
+export const DELETE = withRouteMetrics('/api/products/[id]/media', handleDelete);
+async function handleDelete(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
@@ -184,7 +223,7 @@ export async function DELETE(
         if (media.file_path) {
           const { error } = await supabaseAdmin.storage
             .from(media.bucket_name || 'media-files')
-            .remove([media.file_path]);
+            .remove([media.file_path, ...MediaVariantService.allVariantPaths(media.variants)]);
           
           if (error) {
             console.warn(`Failed to delete file ${media.file_path} from storage:`, error);
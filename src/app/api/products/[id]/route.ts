@@ -1,9 +1,12 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { ProductUpdate } from '@/types/products';
 import { productService } from '@/services/products/productService';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
 
 // GET /api/products/[id]
-export async function GET(
+export const GET = withRouteMetrics('/api/products/[id]', handleGet);
+async function handleGet(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
@@ -27,7 +30,8 @@ export async function GET(
 }
 
 // PUT /api/products/[id]
-export async function PUT(
+export const PUT = withRouteMetrics('/api/products/[id]', handlePut);
+async function handlePut(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
@@ -37,6 +41,7 @@ export async function PUT(
 
     // Use productService to update the product
     const result = await productService.updateProduct(resolvedParams.id, body);
+    if (result.success) invalidateCacheTags('products');
 
     return NextResponse.json(result, {
       status: result.success ? 200 : 404
@@ -52,7 +57,8 @@ export async function PUT(
 }
 
 // DELETE /api/products/[id]
-export async function DELETE(
+export const DELETE = withRouteMetrics('/api/products/[id]', handleDelete);
+async function handleDelete(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
@@ -61,6 +67,7 @@ export async function DELETE(
 
     // Use productService to delete the product
     const result = await productService.deleteProduct(resolvedParams.id);
+    if (result.success) invalidateCacheTags('products');
 
     return NextResponse.json(result, {
       status: result.success ? 200 : 404
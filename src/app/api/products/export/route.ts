@@ -1,8 +1,9 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { supabaseAdmin } from '@/lib/supabaseAdmin';
 import { ProductImportExportService } from '@/services/products/importExportService';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/products/export', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     const { searchParams } = new URL(request.url);
     const format = searchParams.get('format') || 'csv';
@@ -10,60 +11,8 @@ export async function GET(request: NextRequest) {
     const categoryFilter = searchParams.get('category') || undefined;
     const statusFilter = searchParams.get('status') || undefined;
 
-    // Fetch products with filters
-    let query = supabaseAdmin
-      .from('products')
-      .select(`
-        *,
-        categories(id, name, slug),
-        media!product_id(
-          id,
-          file_name,
-          file_path,
-          bucket_name,
-          alt_text,
-          is_primary,
-          created_at
-        )
-      `);
-
-    if (categoryFilter) {
-      query = query.eq('category_id', categoryFilter);
-    }
-
-    if (statusFilter) {
-      query = query.eq('status', statusFilter);
-    }
-
-    query = query.order('created_at', { ascending: false });
-
-    const { data: products, error } = await query;
-
-    if (error) {
-      return NextResponse.json({
-        success: false,
-        error: error.message
-      }, { status: 500 });
-    }
-
-    // Process products to include image URLs
-    const processedProducts = products?.map(product => {
-      const primaryImage = product.media?.find((m: any) => m.is_primary);
-      const allImages = product.media?.map((m: any) => 
-        `${process.env.NEXT_PUBLIC_SUPABASE_URL}/storage/v1/object/public/${m.bucket_name}/${m.file_path}`
-      );
-
-      return {
-        ...product,
-        featured_image_url: primaryImage 
-          ? `${process.env.NEXT_PUBLIC_SUPABASE_URL}/storage/v1/object/public/${primaryImage.bucket_name}/${primaryImage.file_path}`
-          : null,
-        gallery_images: allImages || []
-      };
-    }) || [];
-
-    // Generate CSV
-    const csvContent = await ProductImportExportService.exportToCSV(processedProducts, {
+    // Stream CSV rows page by page as they are fetched
+    const csvStream = ProductImportExportService.streamCSV({
       format: format as 'csv' | 'excel',
       includeImages,
       categoryFilter,
@@ -74,12 +23,12 @@ export async function GET(request: NextRequest) {
     const timestamp = new Date().toISOString().split('T')[0];
     const filename = `products_export_${timestamp}.csv`;
 
-    return new NextResponse(csvContent, {
+    return new NextResponse(csvStream, {
       status: 200,
       headers: {
         'Content-Type': 'text/csv',
         'Content-Disposition': `attachment; filename="${filename}"`,
-        'Content-Length': csvContent.length.toString()
+        'Cache-Control': 'no-store'
       }
     });
 
@@ -92,7 +41,8 @@ export async function GET(request: NextRequest) {
   }
 }
 
-export async function POST(request: NextRequest) {
+export const POST = withRouteMetrics('/api/products/export', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     // Generate and return import template
     const templateContent = ProductImportExportService.generateImportTemplate();
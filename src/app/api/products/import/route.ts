@@ -1,7 +1,25 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { ProductImportExportService } from '@/services/products/importExportService';
+import {
+  ProductImportExportService,
+  IMPORT_CHUNK_SIZE,
+  IMPORT_CONCURRENCY
+} from '@/services/products/importExportService';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import { supabaseAdmin } from '@/lib/supabaseAdmin';
+import { queueJob, PRODUCT_IMPORT_BUCKET, ProductImportPayload } from '@/services/jobs';
+import { randomUUID } from 'crypto';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function POST(request: NextRequest) {
+const MAX_CHUNK_SIZE = 1000;
+const MAX_CONCURRENCY = 8;
+
+const parseLimit = (value: FormDataEntryValue | null, fallback: number, max: number) => {
+  const parsed = parseInt(typeof value === 'string' ? value : '');
+  return Number.isInteger(parsed) && parsed > 0 ? Math.min(parsed, max) : fallback;
+};
+
+export const POST = withRouteMetrics('/api/products/import', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     const formData = await request.formData();
     const file = formData.get('file') as File;
@@ -21,25 +39,97 @@ export async function POST(request: NextRequest) {
       }, { status: 400 });
     }
 
-    // Read file content
-    const fileContent = await file.text();
+    const options = {
+      chunkSize: parseLimit(formData.get('chunkSize'), IMPORT_CHUNK_SIZE, MAX_CHUNK_SIZE),
+      concurrency: parseLimit(formData.get('concurrency'), IMPORT_CONCURRENCY, MAX_CONCURRENCY),
+      totalBytes: file.size
+    };
+
+    // "Prefer: respond-async": keep the file in storage and import it in a background job
+    // that validates, imports and checkpoints; poll the returned statusUrl for progress
+    if (request.headers.get('prefer')?.includes('respond-async')) {
+      const storagePath = `imports/${randomUUID()}.csv`;
+      const { error: uploadError } = await supabaseAdmin.storage
+        .from(PRODUCT_IMPORT_BUCKET)
+        .upload(storagePath, file, { contentType: 'text/csv' });
 
-    // Parse and validate CSV
-    const { data, errors: parseErrors } = await ProductImportExportService.parseCSV(fileContent);
+      if (uploadError) {
+        console.error('Error storing import file:', uploadError);
+        return NextResponse.json({
+          success: false,
+          error: 'Failed to store import file'
+        }, { status: 500 });
+      }
+
+      const job = await queueJob<ProductImportPayload>('products.import', {
+        storagePath,
+        fileName: file.name,
+        totalBytes: file.size,
+        chunkSize: options.chunkSize,
+        concurrency: options.concurrency
+      });
 
-    if (parseErrors.length > 0) {
+      return NextResponse.json({
+        success: true,
+        jobId: job.id,
+        status: job.status,
+        statusUrl: `/api/jobs/${job.id}`
+      }, { status: 202 });
+    }
+
+    // First pass: validate every row so a bad file is rejected before anything is written
+    const validation = await ProductImportExportService.validateCSVStream(file.stream());
+
+    if (validation.errorCount > 0) {
       return NextResponse.json({
         success: false,
         error: 'Validation failed',
-        errors: parseErrors,
+        errors: validation.errors,
         totalRows: 0,
         successCount: 0,
-        errorCount: parseErrors.length
+        errorCount: validation.errorCount
       }, { status: 400 });
     }
 
+    // Clients that accept NDJSON get progress events followed by the final result
+    if (request.headers.get('accept')?.includes('application/x-ndjson')) {
+      const encoder = new TextEncoder();
+      const body = new ReadableStream<Uint8Array>({
+        async start(controller) {
+          const send = (event: object) => controller.enqueue(encoder.encode(JSON.stringify(event) + '\n'));
+          try {
+            const importResult = await ProductImportExportService.importCSVStream(file.stream(), {
+              ...options,
+              onProgress: progress => send({ type: 'progress', ...progress })
+            });
+            send({ type: 'result', ...importResult });
+          } catch (error) {
+            console.error('Import error:', error);
+            send({
+              type: 'result',
+              success: false,
+              error: error instanceof Error ? error.message : 'Import failed',
+              totalRows: 0,
+              successCount: 0,
+              errorCount: 1,
+              errors: [{ row: 0, message: error instanceof Error ? error.message : 'Unknown error' }]
+            });
+          }
+          controller.close();
+        }
+      });
+
+      return new NextResponse(body, {
+        headers: {
+          'Content-Type': 'application/x-ndjson',
+          'Cache-Control': 'no-cache'
+        }
+      });
+    }
+
     // Import products
-    const importResult = await ProductImportExportService.importProducts(data);
+    const importResult = await ProductImportExportService.importCSVStream(file.stream(), options);
+    if (importResult.successCount > 0) invalidateCacheTags('products', 'categories', 'inventory');
 
     return NextResponse.json(importResult, {
       status: importResult.success ? 200 : 207 // 207 Multi-Status for partial success
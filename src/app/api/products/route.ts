@@ -1,9 +1,13 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { ProductInsert, ProductFilters } from '@/types/products';
 import { productService } from '@/services/products/productService';
+import { InvalidCursorError } from '@/lib/cursor';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
 
 // GET /api/products
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/products', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     const { searchParams } = new URL(request.url);
     
@@ -21,6 +25,9 @@ export async function GET(request: NextRequest) {
       sort_order: (searchParams.get('sort_order') as any) || 'desc',
       page: searchParams.get('page') ? parseInt(searchParams.get('page')!) : 1,
       per_page: searchParams.get('limit') ? parseInt(searchParams.get('limit')!) : 20,
+      // Present (even empty) selects keyset pagination; the response carries next_cursor
+      cursor: searchParams.has('cursor') ? searchParams.get('cursor')! : undefined,
+      view: searchParams.get('view') === 'list' ? 'list' : undefined,
     };
 
     // Use productService instead of direct Supabase calls
@@ -29,6 +36,12 @@ export async function GET(request: NextRequest) {
     return NextResponse.json(result);
     
   } catch (error) {
+    if (error instanceof InvalidCursorError) {
+      return NextResponse.json(
+        { success: false, error: error.message },
+        { status: 400 }
+      );
+    }
     console.error('API error:', error);
     return NextResponse.json(
       { success: false, error: 'Internal server error' },
@@ -38,7 +51,8 @@ export async function GET(request: NextRequest) {
 }
 
 // POST /api/products
-export async function POST(request: NextRequest) {
+export const POST = withRouteMetrics('/api/products', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     const body = await request.json();
     
@@ -52,6 +66,7 @@ export async function POST(request: NextRequest) {
 
     // Use productService to create the product
     const result = await productService.createProduct(body);
+    if (result.success) invalidateCacheTags('products');
     
     return NextResponse.json(
       { ...result, message: 'Product created successfully' },
@@ -1,34 +1,45 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { createServerSupabaseAnonymousClient } from '@/lib/supabaseServer';
+import { createResponseCache } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
+
+const productStatsCache = createResponseCache('/api/products/stats', {
+  ttlMs: 60_000,
+  staleWhileRevalidateMs: 10 * 60_000,
+  tags: ['products', 'inventory']
+});
 
 // GET /api/products/stats
-export async function GET(request: NextRequest) {
-  try {
-    const supabase = createServerSupabaseAnonymousClient();
+export const GET = withRouteMetrics('/api/products/stats', handleGet);
+async function handleGet(request: NextRequest) {
+  return productStatsCache.serve(request, async () => {
+    try {
+      const supabase = createServerSupabaseAnonymousClient();
     
-    const { data, error } = await supabase
-      .from('product_stats')
-      .select('*')
-      .single();
+      const { data, error } = await supabase
+        .from('product_stats')
+        .select('*')
+        .single();
+
+      if (error) {
+        console.error('Database error:', error);
+        return NextResponse.json(
+          { success: false, error: error.message },
+          { status: 500 }
+        );
+      }
 
-    if (error) {
-      console.error('Database error:', error);
+      return NextResponse.json({
+        success: true,
+        data
+      });
+    
+    } catch (error) {
+      console.error('API error:', error);
       return NextResponse.json(
-        { success: false, error: error.message },
+        { success: false, error: 'Internal server error' },
         { status: 500 }
       );
     }
-
-    return NextResponse.json({
-      success: true,
-      data
-    });
-    
-  } catch (error) {
-    console.error('API error:', error);
-    return NextResponse.json(
-      { success: false, error: 'Internal server error' },
-      { status: 500 }
-    );
-  }
+  });
 }
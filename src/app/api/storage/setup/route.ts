@@ -1,7 +1,9 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { setupStorageBucket, testStorageConnection } from '@/lib/setupStorage';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/storage/setup', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     console.log('Testing storage connection...');
     
@@ -46,7 +48,8 @@ export async function GET(request: NextRequest) {
   }
 }
 
-export async function POST(request: NextRequest) {
+export const POST = withRouteMetrics('/api/storage/setup', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     // Force bucket creation
     const setupResult = await setupStorageBucket();
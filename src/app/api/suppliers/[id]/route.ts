@@ -1,5 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supplierService } from '@/services/suppliers/supplierService';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
 
 // Define the API response format
 interface ApiResponse<T = any> {
@@ -26,7 +28,8 @@ function createSuccessResponse<T>(data: T, status: number = 200): NextResponse<A
 }
 
 // GET /api/suppliers/[id] - Fetch a specific supplier
-export async function GET(
+export const GET = withRouteMetrics('/api/suppliers/[id]', handleGet);
+async function handleGet(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -52,7 +55,8 @@ export async function GET(
 }
 
 // PUT /api/suppliers/[id] - Update a specific supplier
-export async function PUT(
+export const PUT = withRouteMetrics('/api/suppliers/[id]', handlePut);
+async function handlePut(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -65,6 +69,7 @@ export async function PUT(
     }
 
     const response = await supplierService.updateSupplier(id, body);
+    invalidateCacheTags('suppliers');
     return createSuccessResponse(response.data);
     
   } catch (error: any) {
@@ -83,7 +88,8 @@ export async function PUT(
 }
 
 // DELETE /api/suppliers/[id] - Delete a specific supplier
-export async function DELETE(
+export const DELETE = withRouteMetrics('/api/suppliers/[id]', handleDelete);
+async function handleDelete(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -107,6 +113,7 @@ export async function DELETE(
     // Delete the supplier
     const response = await supplierService.deleteSupplier(id);
     
+    invalidateCacheTags('suppliers');
     return createSuccessResponse(
       { 
         message: `Supplier "${supplierName}" has been successfully deleted`,
@@ -1,5 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supplierService } from '@/services/suppliers/supplierService';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
 
 // Define the API response format
 interface ApiResponse<T = any> {
@@ -26,7 +28,8 @@ function createSuccessResponse<T>(data: T, status: number = 200): NextResponse<A
 }
 
 // GET /api/suppliers - Fetch all suppliers with optional filtering
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/suppliers', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     const { searchParams } = new URL(request.url);
     
@@ -70,7 +73,8 @@ export async function GET(request: NextRequest) {
 }
 
 // POST /api/suppliers - Create a new supplier
-export async function POST(request: NextRequest) {
+export const POST = withRouteMetrics('/api/suppliers', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     const body = await request.json();
     
@@ -80,6 +84,7 @@ export async function POST(request: NextRequest) {
     }
 
     const response = await supplierService.createSupplier(body);
+    invalidateCacheTags('suppliers');
     return createSuccessResponse(response.data, 201);
     
   } catch (error: any) {
@@ -1,5 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supplierService } from '@/services/suppliers/supplierService';
+import { createResponseCache } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
 
 // Define the API response format
 interface ApiResponse<T = any> {
@@ -25,19 +27,28 @@ function createSuccessResponse<T>(data: T, status: number = 200): NextResponse<A
   );
 }
 
+const supplierSummaryCache = createResponseCache('/api/suppliers/summary', {
+  ttlMs: 60_000,
+  staleWhileRevalidateMs: 10 * 60_000,
+  tags: ['suppliers']
+});
+
 // GET /api/suppliers/summary - Get supplier statistics and summary data
-export async function GET(request: NextRequest) {
-  try {
-    const response = await supplierService.getSupplierStats();
+export const GET = withRouteMetrics('/api/suppliers/summary', handleGet);
+async function handleGet(request: NextRequest) {
+  return supplierSummaryCache.serve(request, async () => {
+    try {
+      const response = await supplierService.getSupplierStats();
     
-    if (!response.success) {
-      return createErrorResponse('Failed to fetch supplier summary', 500);
-    }
+      if (!response.success) {
+        return createErrorResponse('Failed to fetch supplier summary', 500);
+      }
     
-    return createSuccessResponse(response.data);
+      return createSuccessResponse(response.data);
     
-  } catch (error: any) {
-    console.error('Error in GET /api/suppliers/summary:', error);
-    return createErrorResponse('Internal server error', 500, error.message);
-  }
+    } catch (error: any) {
+      console.error('Error in GET /api/suppliers/summary:', error);
+      return createErrorResponse('Internal server error', 500, error.message);
+    }
+  });
 }
@@ -0,0 +1,28 @@
+import { NextResponse } from 'next/server';
+import { getResponseCacheMetrics } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
+
+// GET /api/system/cache - Hit/miss counters for the cached API routes on this instance
+export const GET = withRouteMetrics('/api/system/cache', handleGet);
+async function handleGet() {
+  const routes = getResponseCacheMetrics();
+  const totals = routes.reduce(
+    (sum, route) => ({
+      hits: sum.hits + route.hits,
+      staleHits: sum.staleHits + route.staleHits,
+      misses: sum.misses + route.misses,
+      notModified: sum.notModified + route.notModified
+    }),
+    { hits: 0, staleHits: 0, misses: 0, notModified: 0 }
+  );
+  const lookups = totals.hits + totals.staleHits + totals.misses;
+
+  return NextResponse.json({
+    success: true,
+    data: {
+      ...totals,
+      hitRate: lookups > 0 ? (totals.hits + totals.staleHits) / lookups : 0,
+      routes
+    }
+  });
+}
@@ -0,0 +1,16 @@
+import { renderMetrics } from '@/lib/metrics';
+
+// Always render the current counters
+export const dynamic = 'force-dynamic';
+
+// GET /api/system/metrics - Route and Supabase latency histograms for this instance,
+// in the Prometheus text format
+export async function GET() {
+  return new Response(renderMetrics(), {
+    status: 200,
+    headers: {
+      'Content-Type': 'text/plain; version=0.0.4; charset=utf-8',
+      'Cache-Control': 'no-store'
+    }
+  });
+}
@@ -1,7 +1,9 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function POST(request: NextRequest) {
+export const POST = withRouteMetrics('/api/system/sql-test', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     const results: any = {
       timestamp: new Date().toISOString(),
@@ -1,7 +1,9 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET(request: NextRequest) {
+export const GET = withRouteMetrics('/api/test-db', handleGet);
+async function handleGet(request: NextRequest) {
   try {
     // Test 1: Check if products table exists and get some products
     const { data: products, error: productsError } = await supabase
@@ -1,8 +1,11 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
 
 // GET /api/warehouses/[id] - Get single warehouse by ID
-export async function GET(
+export const GET = withRouteMetrics('/api/warehouses/[id]', handleGet);
+async function handleGet(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -42,7 +45,8 @@ export async function GET(
 }
 
 // PUT /api/warehouses/[id] - Update warehouse
-export async function PUT(
+export const PUT = withRouteMetrics('/api/warehouses/[id]', handlePut);
+async function handlePut(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -190,6 +194,7 @@ export async function PUT(
       );
     }
 
+    invalidateCacheTags('warehouses');
     return NextResponse.json({
       data,
       message: 'Warehouse updated successfully'
@@ -205,7 +210,8 @@ export async function PUT(
 }
 
 // DELETE /api/warehouses/[id] - Delete warehouse
-export async function DELETE(
+export const DELETE = withRouteMetrics('/api/warehouses/[id]', handleDelete);
+async function handleDelete(
   request: NextRequest,
   { params }: { params: { id: string } }
 ) {
@@ -276,6 +282,7 @@ export async function DELETE(
       );
     }
 
+    invalidateCacheTags('warehouses');
     return NextResponse.json({
       message: 'Warehouse deleted successfully'
     });
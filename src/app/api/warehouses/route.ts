@@ -1,66 +1,79 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabaseClient';
+import { createResponseCache, invalidateCacheTags } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
+
+const warehouseListCache = createResponseCache('/api/warehouses', {
+  ttlMs: 60_000,
+  staleWhileRevalidateMs: 10 * 60_000,
+  tags: ['warehouses', 'inventory'],
+  params: ['include_inactive', 'city', 'state', 'search']
+});
 
 // GET /api/warehouses - Get all warehouses with optional filters
-export async function GET(request: NextRequest) {
-  try {
-    const { searchParams } = new URL(request.url);
-    const includeInactive = searchParams.get('include_inactive') === 'true';
-    const city = searchParams.get('city');
-    const state = searchParams.get('state');
-    const search = searchParams.get('search');
-
-    let query = supabase
-      .from('warehouses_with_stats')
-      .select('*');
-
-    // Apply filters
-    if (!includeInactive) {
-      query = query.eq('is_active', true);
-    }
+export const GET = withRouteMetrics('/api/warehouses', handleGet);
+async function handleGet(request: NextRequest) {
+  return warehouseListCache.serve(request, async () => {
+    try {
+      const { searchParams } = new URL(request.url);
+      const includeInactive = searchParams.get('include_inactive') === 'true';
+      const city = searchParams.get('city');
+      const state = searchParams.get('state');
+      const search = searchParams.get('search');
+
+      let query = supabase
+        .from('warehouses_with_stats')
+        .select('*');
+
+      // Apply filters
+      if (!includeInactive) {
+        query = query.eq('is_active', true);
+      }
 
-    if (city) {
-      query = query.ilike('city', `%${city}%`);
-    }
+      if (city) {
+        query = query.ilike('city', `%${city}%`);
+      }
 
-    if (state) {
-      query = query.ilike('state', `%${state}%`);
-    }
+      if (state) {
+        query = query.ilike('state', `%${state}%`);
+      }
 
-    if (search) {
-      query = query.or(`name.ilike.%${search}%,code.ilike.%${search}%,description.ilike.%${search}%`);
-    }
+      if (search) {
+        query = query.or(`name.ilike.%${search}%,code.ilike.%${search}%,description.ilike.%${search}%`);
+      }
 
-    // Order by default first, then by name
-    query = query.order('is_default', { ascending: false });
-    query = query.order('name', { ascending: true });
+      // Order by default first, then by name
+      query = query.order('is_default', { ascending: false });
+      query = query.order('name', { ascending: true });
 
-    const { data, error } = await query;
+      const { data, error } = await query;
 
-    if (error) {
-      console.error('Error fetching warehouses:', error);
+      if (error) {
+        console.error('Error fetching warehouses:', error);
+        return NextResponse.json(
+          { error: 'Failed to fetch warehouses', details: error.message },
+          { status: 500 }
+        );
+      }
+
+      return NextResponse.json({
+        data: data || [],
+        total: data?.length || 0
+      });
+
+    } catch (error) {
+      console.error('Unexpected error in warehouses GET:', error);
       return NextResponse.json(
-        { error: 'Failed to fetch warehouses', details: error.message },
+        { error: 'Internal server error' },
         { status: 500 }
       );
     }
-
-    return NextResponse.json({
-      data: data || [],
-      total: data?.length || 0
-    });
-
-  } catch (error) {
-    console.error('Unexpected error in warehouses GET:', error);
-    return NextResponse.json(
-      { error: 'Internal server error' },
-      { status: 500 }
-    );
-  }
+  });
 }
 
 // POST /api/warehouses - Create a new warehouse
-export async function POST(request: NextRequest) {
+export const POST = withRouteMetrics('/api/warehouses', handlePost);
+async function handlePost(request: NextRequest) {
   try {
     const body = await request.json();
     
@@ -144,6 +157,7 @@ export async function POST(request: NextRequest) {
       );
     }
 
+    invalidateCacheTags('warehouses');
     return NextResponse.json({
       data,
       message: 'Warehouse created successfully'
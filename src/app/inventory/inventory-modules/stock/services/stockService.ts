@@ -252,7 +252,9 @@ export class StockService {
         throw new Error(`Failed to bulk update stock: ${response.statusText}`);
       }
       
-      return response.json();
+      // Per-row outcomes are in result.results; callers only need the updated rows
+      const result = await response.json();
+      return result.data || [];
     } catch (error) {
       console.error('Error bulk updating stock:', error);
       throw error;
@@ -2,6 +2,7 @@
 
 import { useState, useEffect } from 'react';
 import { SidebarLayout } from '@/components/layout/Sidebar';
+import { waitForJob } from '@/lib/jobs';
 import { InventoryTable } from '@/components/tables/InventoryTable';
 import { StockAdjustmentModal } from '@/components/forms/StockAdjustmentModal';
 import { Button } from '@/components/ui/button';
@@ -284,8 +285,13 @@ export default function InventoryPage() {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' }
       });
-      const result = await response.json();
-      console.log('Sync result:', result);
+      const { jobId } = await response.json();
+      // Cost sync runs as a background job
+      const job = await waitForJob(jobId);
+      if (job.status !== 'completed') {
+        throw new Error(job.error || `Cost sync ${job.status}`);
+      }
+      console.log('Sync result:', job.result);
       alert('Stock data synced successfully!');
     } catch (error) {
       console.error('Error syncing stock:', error);
@@ -1,5 +1,6 @@
 import { useState, useEffect, useCallback } from 'react';
 import { Order, FulfillmentStatus, FulfillmentAction, ShipmentInfo } from '../types';
+import { waitForJob } from '@/lib/jobs';
 
 export const useOrderFulfillment = () => {
   const [orders, setOrders] = useState<Order[]>([]);
@@ -105,6 +106,17 @@ export const useOrderFulfillment = () => {
       }
 
       const result = await response.json();
+
+      // Large selections are fulfilled by a background job
+      if (response.status === 202) {
+        const job = await waitForJob(result.jobId);
+        if (job.status !== 'completed') {
+          throw new Error(job.error || `Bulk update ${job.status}`);
+        }
+        await fetchPendingOrders();
+        setSelectedOrders(new Set());
+        return { success: true, processedCount: job.result.processedCount };
+      }
       
       if (result.success) {
         // Refresh orders list
@@ -35,7 +35,7 @@ export class OrderFulfillmentApiService {
   static getAvailableActions(status: FulfillmentStatus): FulfillmentAction[] {
     const actions: Record<FulfillmentStatus, FulfillmentAction[]> = {
       confirmed: ['start_processing', 'cancel'],
-      processing: ['mark_packed', 'cancel'],
+      processing: ['mark_shipped', 'cancel'],
       packed: ['mark_shipped', 'cancel'],
       shipped: ['mark_delivered'],
       delivered: []
@@ -8,7 +8,6 @@ export type FulfillmentStatus = 'confirmed' | 'processing' | 'packed' | 'shipped
 
 export type FulfillmentAction = 
   | 'start_processing'
-  | 'mark_packed'
   | 'mark_shipped'
   | 'mark_delivered'
   | 'cancel';
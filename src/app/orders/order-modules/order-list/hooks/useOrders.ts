@@ -1,5 +1,18 @@
-import { useState, useEffect, useCallback } from 'react';
-import { Order, OrderFilters, PaginatedResponse } from '@/types';
+import { useState, useEffect, useCallback, useRef } from 'react';
+import { ChangeTopic, Order, OrderFilters, OrderStatusEvent, PaginatedResponse } from '@/types';
+import { useSocket } from '@/hooks/useSocket';
+
+const ORDER_TOPICS: ChangeTopic[] = ['orders'];
+
+// Changes arriving together cost one page reload
+const RELOAD_DEBOUNCE_MS = 1000;
+
+// Whether an order with these values passes the filters the event can be checked against
+const matchesFilters = (event: OrderStatusEvent, filters: OrderFilters) =>
+  (!filters.status?.length || filters.status.includes(event.status as any)) &&
+  (!filters.payment_status?.length || filters.payment_status.includes(event.paymentStatus as any)) &&
+  (filters.min_amount === undefined || (event.totalAmount ?? 0) >= filters.min_amount) &&
+  (filters.max_amount === undefined || (event.totalAmount ?? 0) <= filters.max_amount);
 
 export const useOrders = () => {
   const [orders, setOrders] = useState<Order[]>([]);
@@ -12,15 +25,20 @@ export const useOrders = () => {
     totalPages: 0
   });
   const [filters, setFilters] = useState<OrderFilters>({});
+  const pageLoadedAtRef = useRef(new Date().toISOString());
+  const reloadTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null);
 
   const fetchOrders = useCallback(async (
     currentFilters: OrderFilters = filters,
     page: number = 1,
-    limit: number = 10
+    limit: number = 10,
+    // Reload in the background, without the loading state
+    background: boolean = false
   ) => {
     try {
-      setLoading(true);
+      if (!background) setLoading(true);
       setError(null);
+      pageLoadedAtRef.current = new Date().toISOString();
 
       const queryParams = new URLSearchParams({
         page: page.toString(),
@@ -76,8 +94,10 @@ export const useOrders = () => {
       const result = await response.json();
       
       if (result.success) {
-        // Refresh orders list
-        await fetchOrders(filters, pagination.page, pagination.limit);
+        // Patch the row in place; other viewers get the change from the feed
+        setOrders(current => current.map(order =>
+          order.id === orderId ? Object.assign({}, order, result.data) : order
+        ));
         return result.data;
       } else {
         throw new Error(result.message || 'Failed to update order');
@@ -85,7 +105,7 @@ export const useOrders = () => {
     } catch (err) {
       throw err;
     }
-  }, [fetchOrders, filters, pagination.page, pagination.limit]);
+  }, []);
 
   const deleteOrder = useCallback(async (orderId: string) => {
     try {
@@ -145,6 +165,57 @@ export const useOrders = () => {
     fetchOrders(filters, pagination.page, pagination.limit);
   }, []); // Empty dependency array for initial load only
 
+  const scheduleReload = useCallback(() => {
+    if (reloadTimerRef.current) clearTimeout(reloadTimerRef.current);
+    reloadTimerRef.current = setTimeout(() => {
+      reloadTimerRef.current = null;
+      fetchOrders(filters, pagination.page, pagination.limit, true);
+    }, RELOAD_DEBOUNCE_MS);
+  }, [fetchOrders, filters, pagination.page, pagination.limit]);
+
+  useEffect(() => () => {
+    if (reloadTimerRef.current) clearTimeout(reloadTimerRef.current);
+  }, []);
+
+  // Apply pushed changes to the visible page; reload it only when the change can
+  // add or remove rows
+  const handleOrderChange = useCallback((event: OrderStatusEvent) => {
+    const onPage = orders.some(order => order.id === event.orderId);
+
+    if (event.operation === 'delete') {
+      if (onPage) scheduleReload();
+      return;
+    }
+
+    if (onPage) {
+      setOrders(current => current.map(order =>
+        order.id === event.orderId
+          ? Object.assign({}, order, {
+              status: event.status,
+              payment_status: event.paymentStatus,
+              total_amount: event.totalAmount,
+              updated_at: event.timestamp
+            })
+          : order
+      ));
+      if (!matchesFilters(event, filters)) scheduleReload();
+      return;
+    }
+
+    if (!matchesFilters(event, filters)) return;
+    const statusFiltered = !!(filters.status?.length || filters.payment_status?.length);
+    const isNew = !!event.createdAt && Date.parse(event.createdAt) >= Date.parse(pageLoadedAtRef.current);
+    // Newest orders come first, so a new order only lands on the first page; with a
+    // status filter an existing order can also move into the results
+    if (statusFiltered || (isNew && pagination.page === 1)) scheduleReload();
+  }, [orders, filters, pagination.page, scheduleReload]);
+
+  useSocket({
+    topics: ORDER_TOPICS,
+    onOrderStatus: handleOrderChange,
+    onResync: scheduleReload
+  });
+
   return {
     orders,
     loading,
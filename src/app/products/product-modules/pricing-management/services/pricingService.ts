@@ -193,104 +193,51 @@ export const pricingService = {
         throw new Error('Update value is required');
       }
 
-      // Get current product data to calculate new prices
-      const { data: products, error: fetchError } = await supabase
-        .from('products')
-        .select('id, name, base_price, selling_price')
-        .in('id', request.product_ids);
-
-      if (fetchError) {
-        throw new Error(fetchError.message);
+      if (!['percentage', 'fixed_amount', 'new_price'].includes(request.update_type)) {
+        throw new Error(`Invalid update type: ${request.update_type}`);
       }
 
-      if (!products || products.length === 0) {
-        throw new Error('No products found for bulk update');
-      }
-
-      // Calculate new prices for each product
-      const updatePromises = products.map(async (product) => {
-        const currentPrice = request.price_type === 'base_price' ? product.base_price : product.selling_price;
-        let newPrice: number;
-
-        switch (request.update_type) {
-          case 'percentage':
-            newPrice = currentPrice * (1 + request.value / 100);
-            break;
-          case 'fixed_amount':
-            newPrice = currentPrice + request.value;
-            break;
-          case 'new_price':
-            newPrice = request.value;
-            break;
-          default:
-            throw new Error(`Invalid update type: ${request.update_type}`);
-        }
-
-        // Ensure price is not negative
-        newPrice = Math.max(0.01, newPrice);
-
-        // Determine which field to update
-        const updateField = request.price_type === 'base_price' ? 'base_price' : 'selling_price';
-        
-        // Update the product in Supabase
-        const { data: updatedProduct, error: updateError } = await supabase
-          .from('products')
-          .update({
-            [updateField]: newPrice,
-            updated_at: new Date().toISOString()
-          })
-          .eq('id', product.id)
-          .select('*')
-          .single();
-
-        if (updateError) {
-          console.error(`Failed to update product ${product.id}:`, updateError);
-          throw new Error(`Failed to update product ${product.name}: ${updateError.message}`);
-        }
+      // Reprice every product and write its price history in one statement;
+      // only products whose price actually changed come back
+      const { data: changes, error } = await supabase.rpc('bulk_update_prices', {
+        p_product_ids: request.product_ids,
+        p_update_type: request.update_type,
+        p_value: request.value,
+        p_price_type: request.price_type,
+        p_change_reason: request.change_reason,
+        p_changed_by: 'current_user'
+      });
 
-        // Create price history entry for this product
-        try {
-          await priceHistoryService.createPriceHistoryEntry({
-            product_id: product.id,
-            old_price: currentPrice,
-            new_price: newPrice,
-            old_cost_price: product.base_price,
-            new_cost_price: updatedProduct.base_price,
-            change_reason: request.change_reason,
-            change_type: 'bulk_update',
-            changed_by: 'current_user'
-          });
-        } catch (historyError) {
-          console.warn(`Failed to create price history for product ${product.id}:`, historyError);
-          // Don't fail the entire operation if history creation fails
-        }
+      if (error) {
+        throw new Error(error.message);
+      }
 
-        // Return ProductPrice format
-        return {
-          id: `${product.id}-${request.price_type}`,
-          product_id: product.id,
-          price_type: request.price_type,
-          amount: newPrice,
-          currency: 'USD',
-          cost_price: updatedProduct.base_price,
-          markup_percentage: updatedProduct.base_price && updatedProduct.selling_price ? 
-            this.calculateMarkup(updatedProduct.base_price, updatedProduct.selling_price) : undefined,
-          profit_margin: updatedProduct.base_price && updatedProduct.selling_price ? 
-            this.calculateProfitMargin(updatedProduct.base_price, updatedProduct.selling_price) : undefined,
-          is_active: true,
-          effective_from: request.effective_from || new Date().toISOString(),
-          created_at: updatedProduct.created_at,
-          updated_at: updatedProduct.updated_at,
-          created_by: 'current_user'
-        } as ProductPrice;
-      });
+      const updatedPrices: ProductPrice[] = (changes || []).map((change: {
+        product_id: string;
+        new_price: number;
+        base_price: number;
+        selling_price: number;
+        updated_at: string;
+      }) => ({
+        id: `${change.product_id}-${request.price_type}`,
+        product_id: change.product_id,
+        price_type: request.price_type,
+        amount: Number(change.new_price),
+        currency: 'USD',
+        cost_price: Number(change.base_price),
+        markup_percentage: change.base_price && change.selling_price ?
+          this.calculateMarkup(Number(change.base_price), Number(change.selling_price)) : undefined,
+        profit_margin: change.base_price && change.selling_price ?
+          this.calculateProfitMargin(Number(change.base_price), Number(change.selling_price)) : undefined,
+        is_active: true,
+        effective_from: request.effective_from || change.updated_at,
+        created_at: change.updated_at,
+        updated_at: change.updated_at,
+        created_by: 'current_user'
+      }));
 
-      // Execute all updates
-      const updatedPrices = await Promise.all(updatePromises);
+      console.log(`Bulk price update changed ${updatedPrices.length} of ${request.product_ids.length} products`);
 
-      console.log(`Successfully updated ${updatedPrices.length} products with bulk price update`);
-      console.log('Price history entries created for all updated products');
-      
       return updatedPrices;
     } catch (error) {
       console.error('Error bulk updating prices:', error);
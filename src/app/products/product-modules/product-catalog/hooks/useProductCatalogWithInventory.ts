@@ -1,8 +1,22 @@
-import { useMemo } from 'react';
+import { useCallback, useEffect, useMemo, useState } from 'react';
 import { useProductCatalog } from './useProductCatalog';
-import { useInventory } from '../../inventory-management/hooks/useInventory';
+import { useSocket } from '@/hooks/useSocket';
+import { applyChanges, fetchChanges, FULL_SYNC_SINCE } from '@/lib/changes';
+import { ChangeTopic, InventoryUpdateEvent } from '@/types';
 import { Product } from '../types';
 
+const INVENTORY_TOPICS: ChangeTopic[] = ['inventory'];
+
+const itemIdOf = (item: InventoryUpdateEvent) => item.itemId;
+
+interface ProductStock {
+  stock: number;
+  reserved: number;
+  minStockLevel: number;
+  location: string;
+  updatedAt: string;
+}
+
 interface EnrichedProduct extends Product {
   // Real-time inventory fields
   realtime_stock: number;
@@ -56,21 +70,74 @@ export const useProductCatalogWithInventory = (): UseProductCatalogWithInventory
     filterProducts
   } = useProductCatalog();
   
-  const {
-    inventory,
-    loading: inventoryLoading,
-    fetchAllInventory
-  } = useInventory();
+  // Inventory items by id: loaded once, then kept current by the change feed
+  const [inventory, setInventory] = useState<Map<string, InventoryUpdateEvent>>(new Map());
+  const [inventoryLoading, setInventoryLoading] = useState(true);
+  const [inventorySince, setInventorySince] = useState<string | null>(null);
+
+  const loadInventory = useCallback(async () => {
+    try {
+      setInventoryLoading(true);
+      const { data, since } = await fetchChanges<InventoryUpdateEvent>('/api/inventory/changes', FULL_SYNC_SINCE);
+      setInventory(applyChanges(new Map(), data, itemIdOf));
+      setInventorySince(since);
+    } catch (err) {
+      console.error('Error loading inventory:', err);
+    } finally {
+      setInventoryLoading(false);
+    }
+  }, []);
+
+  useEffect(() => {
+    loadInventory();
+  }, [loadInventory]);
+
+  useSocket({
+    topics: INVENTORY_TOPICS,
+    since: inventorySince,
+    enabled: inventorySince !== null,
+    onInventoryUpdate: event => setInventory(current => applyChanges(current, [event], itemIdOf)),
+    onResync: () => loadInventory()
+  });
+
+  // Stock per product, summed over its active inventory items
+  const stockByProduct = useMemo(() => {
+    const byProduct = new Map<string, ProductStock>();
+
+    inventory.forEach(item => {
+      if (!item.productId || item.status !== 'active') return;
+
+      const entry = byProduct.get(item.productId);
+      if (!entry) {
+        byProduct.set(item.productId, {
+          stock: item.stock || 0,
+          reserved: item.reserved || 0,
+          minStockLevel: item.minStockLevel || 0,
+          location: item.locationId || 'Unknown',
+          updatedAt: item.timestamp
+        });
+        return;
+      }
+
+      entry.stock += item.stock || 0;
+      entry.reserved += item.reserved || 0;
+      entry.minStockLevel += item.minStockLevel || 0;
+      entry.location = 'Multiple';
+      if (Date.parse(item.timestamp) > Date.parse(entry.updatedAt)) entry.updatedAt = item.timestamp;
+    });
+
+    return byProduct;
+  }, [inventory]);
 
   // Enrich products with real-time inventory data
   const enrichedProducts = useMemo((): EnrichedProduct[] => {
     return products.map(product => {
-      const inventoryItem = inventory.find(inv => inv.product_id === product.id);
+      const inventoryItem = stockByProduct.get(product.id);
       
-      const realtimeStock = inventoryItem?.quantity || product.current_stock || 0;
-      const reservedQuantity = inventoryItem?.reserved_quantity || 0;
+      const realtimeStock = inventoryItem ? inventoryItem.stock : product.current_stock || 0;
+      const reservedQuantity = inventoryItem?.reserved || 0;
       const availableStock = realtimeStock - reservedQuantity;
-      const lowStockThreshold = inventoryItem?.low_stock_threshold || product.min_stock_level || 10;
+      const lowStockThreshold = inventoryItem?.minStockLevel || product.min_stock_level || 10;
       const price = product.selling_price || product.base_price || 0;
       
       // Determine stock status
@@ -92,7 +159,7 @@ export const useProductCatalogWithInventory = (): UseProductCatalogWithInventory
         available_stock: availableStock,
         reserved_quantity: reservedQuantity,
         inventory_location: inventoryItem?.location || 'Unknown',
-        last_inventory_update: inventoryItem?.updated_at || product.updated_at,
+        last_inventory_update: inventoryItem?.updatedAt || product.updated_at,
         low_stock_threshold: lowStockThreshold,
         
         // Computed fields
@@ -106,7 +173,7 @@ export const useProductCatalogWithInventory = (): UseProductCatalogWithInventory
         stock_quantity: realtimeStock
       };
     });
-  }, [products, inventory]);
+  }, [products, stockByProduct]);
 
   // Calculate inventory statistics
   const inventoryStats = useMemo(() => {
@@ -142,9 +209,7 @@ export const useProductCatalogWithInventory = (): UseProductCatalogWithInventory
     return stats;
   }, [enrichedProducts]);
 
-  const refreshInventory = async () => {
-    await fetchAllInventory();
-  };
+  const refreshInventory = loadInventory;
 
   return {
     products: enrichedProducts,
@@ -21,7 +21,8 @@ import {
   Info
 } from 'lucide-react';
 import { toast } from 'sonner';
-import { ImportResult, ImportError } from '@/services/products/importExportService';
+import { ImportResult, ImportError, ImportProgress } from '@/services/products/importExportService';
+import { waitForJob } from '@/lib/jobs';
 
 interface ImportExportDialogProps {
   open: boolean;
@@ -39,6 +40,7 @@ export function ImportExportDialog({ open, onOpenChange, onImportComplete }: Imp
   const [importing, setImporting] = useState(false);
   const [exporting, setExporting] = useState(false);
   const [importResult, setImportResult] = useState<ImportResult | null>(null);
+  const [importProgress, setImportProgress] = useState<ImportProgress | null>(null);
   const [dragOver, setDragOver] = useState(false);
 
   const handleExport = useCallback(async () => {
@@ -108,17 +110,35 @@ export function ImportExportDialog({ open, onOpenChange, onImportComplete }: Imp
 
     setImporting(true);
     setImportResult(null);
+    setImportProgress(null);
 
     try {
       const formData = new FormData();
       formData.append('file', importFile);
 
+      // The import runs as a background job; progress comes from polling the job
       const response = await fetch('/api/products/import', {
         method: 'POST',
+        headers: { Prefer: 'respond-async' },
         body: formData
       });
 
-      const result = await response.json();
+      let result: ImportResult;
+      if (response.status === 202) {
+        const { jobId } = await response.json();
+        const job = await waitForJob(jobId, {
+          onProgress: job => {
+            if (job.progress && 'rowsRead' in job.progress) setImportProgress(job.progress as unknown as ImportProgress);
+          }
+        });
+
+        if (job.status !== 'completed') {
+          throw new Error(job.error || `Import ${job.status}`);
+        }
+        result = job.result;
+      } else {
+        result = await response.json();
+      }
       setImportResult(result);
 
       if (result.success) {
@@ -348,6 +368,20 @@ export function ImportExportDialog({ open, onOpenChange, onImportComplete }: Imp
                   )}
                 </Button>
 
+                {importing && importProgress && (
+                  <div className="space-y-1">
+                    <Progress
+                      value={importProgress.totalBytes
+                        ? Math.min(100, (importProgress.bytesRead / importProgress.totalBytes) * 100)
+                        : 0}
+                    />
+                    <p className="text-sm text-gray-500">
+                      {importProgress.rowsRead} rows read, {importProgress.successCount} imported
+                      {importProgress.errorCount > 0 && `, ${importProgress.errorCount} failed`}
+                    </p>
+                  </div>
+                )}
+
                 {/* Import Results */}
                 {importResult && (
                   <Card className={`border-l-4 ${
@@ -14,68 +14,100 @@ interface HistoryModalProps {
 }
 
 interface StockHistory {
+  id: string;
   date: string;
   action: string;
   quantityChanged: number;
-  newQuantity: number;
+  newQuantity: number | null;
   user: string;
 }
 
 export function HistoryModal({ isOpen, onClose, item }: HistoryModalProps) {
   const [history, setHistory] = useState<StockHistory[]>([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [error, setError] = useState<string | null>(null);
 
+  // Pages are fetched newest first; balances are derived server-side from the
+  // current on-hand quantity and carried forward in the cursor
+  const fetchPage = async (itemId: string, cursor: string | null) => {
+    const params = new URLSearchParams({ running_balance: 'true' });
+    if (cursor) params.set('cursor', cursor);
+    const response = await fetch(`/api/inventory/${itemId}/history?${params}`);
+    
+    // Check if response is ok
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    
+    // Check content type
+    const contentType = response.headers.get('content-type');
+    if (!contentType || !contentType.includes('application/json')) {
+      const text = await response.text();
+      console.error('Non-JSON response:', text);
+      throw new Error('Server returned non-JSON response');
+    }
+    
+    const data = await response.json();
+    if (!data.success || !data.history) {
+      throw new Error(data.error || 'Failed to fetch history');
+    }
+    return data as { history: StockHistory[]; pagination: { next_cursor: string | null } };
+  };
+
+  const handleError = (error: unknown) => {
+    console.error('Error fetching history:', error);
+    if (error instanceof Error) {
+      if (error.message.includes('JSON.parse')) {
+        setError('Server returned invalid response. Please try again.');
+      } else {
+        setError(error.message);
+      }
+    } else {
+      setError('Failed to fetch history');
+    }
+  };
+
   useEffect(() => {
     if (!item) return;
 
+    let cancelled = false;
     const fetchHistory = async () => {
       setLoading(true);
       setError(null);
+      setHistory([]);
+      setNextCursor(null);
       try {
-        console.log('Fetching history for item:', item.id);
-        const response = await fetch(`/api/inventory/${item.id}/history`);
-        
-        // Check if response is ok
-        if (!response.ok) {
-          throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        
-        // Check content type
-        const contentType = response.headers.get('content-type');
-        if (!contentType || !contentType.includes('application/json')) {
-          const text = await response.text();
-          console.error('Non-JSON response:', text);
-          throw new Error('Server returned non-JSON response');
-        }
-        
-        const data = await response.json();
-        console.log('History API response:', data);
-        
-        if (data.success && data.history) {
-          setHistory(data.history);
-        } else {
-          throw new Error(data.error || 'Failed to fetch history');
-        }
+        const data = await fetchPage(item.id, null);
+        if (cancelled) return;
+        setHistory(data.history);
+        setNextCursor(data.pagination?.next_cursor ?? null);
       } catch (error) {
-        console.error('Error fetching history:', error);
-        if (error instanceof Error) {
-          if (error.message.includes('JSON.parse')) {
-            setError('Server returned invalid response. Please try again.');
-          } else {
-            setError(error.message);
-          }
-        } else {
-          setError('Failed to fetch history');
-        }
+        if (!cancelled) handleError(error);
       } finally {
-        setLoading(false);
+        if (!cancelled) setLoading(false);
       }
     };
 
     fetchHistory();
+    return () => { cancelled = true; };
   }, [item]);
 
+  const loadMore = async () => {
+    if (!item || !nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const data = await fetchPage(item.id, nextCursor);
+      setHistory(previous => [...previous, ...data.history]);
+      setNextCursor(data.pagination?.next_cursor ?? null);
+    } catch (error) {
+      handleError(error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (!item) return null;
 
   return (
@@ -114,12 +146,12 @@ export function HistoryModal({ isOpen, onClose, item }: HistoryModalProps) {
               </TableRow>
             </TableHeader>
             <TableBody>
-              {history.map((record, index) => (
-                <TableRow key={index}>
+              {history.map((record) => (
+                <TableRow key={record.id}>
                   <TableCell>{new Date(record.date).toLocaleString()}</TableCell>
                   <TableCell>{record.action}</TableCell>
                   <TableCell>{record.quantityChanged}</TableCell>
-                  <TableCell>{record.newQuantity}</TableCell>
+                  <TableCell>{record.newQuantity ?? '—'}</TableCell>
                   <TableCell>{record.user}</TableCell>
                 </TableRow>
               ))}
@@ -128,6 +160,11 @@ export function HistoryModal({ isOpen, onClose, item }: HistoryModalProps) {
         )}
 
         <DialogFooter>
+          {nextCursor && !loading && !error && (
+            <Button variant="outline" onClick={loadMore} disabled={loadingMore}>
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </Button>
+          )}
           <Button variant="outline" onClick={onClose}>
             Close
           </Button>
@@ -1,102 +1,145 @@
 'use client';
 
 import { useEffect, useRef, useCallback } from 'react';
-import { io, Socket } from 'socket.io-client';
-import { InventoryUpdateEvent, OrderStatusEvent, SystemAlert } from '@/types';
+import { ChangeTopic, InventoryUpdateEvent, OrderStatusEvent, SystemAlert } from '@/types';
 
 interface UseSocketProps {
+  // Feeds to listen to; defaults to both
+  topics?: ChangeTopic[];
+  // Replay changes made since this time when connecting, e.g. the cursor of the
+  // initial load. Later reconnects resume from the last event received.
+  since?: string | null;
+  // Hold the connection until the caller's initial data is loaded
+  enabled?: boolean;
   onInventoryUpdate?: (data: InventoryUpdateEvent) => void;
   onOrderStatus?: (data: OrderStatusEvent) => void;
   onSystemAlert?: (data: SystemAlert) => void;
+  // The server could not replay everything that was missed; reload this topic in full
+  onResync?: (topic: ChangeTopic) => void;
 }
 
-export const useSocket = ({ 
-  onInventoryUpdate, 
-  onOrderStatus, 
-  onSystemAlert 
+const RECONNECT_MIN_MS = 1000;
+const RECONNECT_MAX_MS = 30 * 1000;
+
+// Subscribes to the server-sent change feed (/api/changes/stream)
+export const useSocket = ({
+  topics = ['inventory', 'orders'],
+  since = null,
+  enabled = true,
+  onInventoryUpdate,
+  onOrderStatus,
+  onSystemAlert,
+  onResync
 }: UseSocketProps = {}) => {
-  const socketRef = useRef<Socket | null>(null);
+  const sourceRef = useRef<EventSource | null>(null);
   const isConnectedRef = useRef(false);
+  const inventoryFilterRef = useRef(new Set<string>());
+  const orderFilterRef = useRef(new Set<string>());
 
-  // Initialize socket connection
-  useEffect(() => {
-    if (!process.env.NEXT_PUBLIC_SOCKET_URL) {
-      console.warn('Socket URL not configured');
-      return;
-    }
-
-    socketRef.current = io(process.env.NEXT_PUBLIC_SOCKET_URL, {
-      path: '/socket.io',
-      auth: {
-        token: process.env.NEXT_PUBLIC_API_KEY
-      },
-      transports: ['websocket', 'polling']
-    });
-
-    const socket = socketRef.current;
-
-    // Connection events
-    socket.on('connect', () => {
-      console.log('Socket connected:', socket.id);
-      isConnectedRef.current = true;
-    });
-
-    socket.on('disconnect', () => {
-      console.log('Socket disconnected');
-      isConnectedRef.current = false;
-    });
+  // Handlers are read through a ref so new callbacks don't reopen the stream
+  const handlersRef = useRef({ onInventoryUpdate, onOrderStatus, onSystemAlert, onResync });
+  handlersRef.current = { onInventoryUpdate, onOrderStatus, onSystemAlert, onResync };
 
-    socket.on('connect_error', (error) => {
-      console.error('Socket connection error:', error);
-    });
+  const sinceRef = useRef(since);
+  sinceRef.current = since;
 
-    // Business logic events
-    socket.on('inventory_update', (data: InventoryUpdateEvent) => {
-      onInventoryUpdate?.(data);
-    });
+  const topicsKey = topics.join(',');
 
-    socket.on('order_status', (data: OrderStatusEvent) => {
-      onOrderStatus?.(data);
-    });
+  useEffect(() => {
+    if (!enabled) return;
+
+    let source: EventSource | null = null;
+    let lastEventId = sinceRef.current;
+    let retryTimer: ReturnType<typeof setTimeout> | null = null;
+    let retryDelay = RECONNECT_MIN_MS;
+    let disposed = false;
+
+    const connect = () => {
+      const params = new URLSearchParams({ topics: topicsKey });
+      if (lastEventId) params.set('since', lastEventId);
+
+      source = new EventSource(`/api/changes/stream?${params}`);
+      sourceRef.current = source;
+
+      const read = (event: Event) => {
+        const message = event as MessageEvent;
+        if (message.lastEventId) lastEventId = message.lastEventId;
+        return JSON.parse(message.data);
+      };
+
+      source.onopen = () => {
+        isConnectedRef.current = true;
+        retryDelay = RECONNECT_MIN_MS;
+      };
+
+      source.onerror = () => {
+        isConnectedRef.current = false;
+        // EventSource retries on its own unless the server refused the stream
+        if (source?.readyState === EventSource.CLOSED && !disposed) {
+          source.close();
+          retryTimer = setTimeout(connect, retryDelay);
+          retryDelay = Math.min(retryDelay * 2, RECONNECT_MAX_MS);
+        }
+      };
+
+      source.addEventListener('inventory_update', event => {
+        const data: InventoryUpdateEvent = read(event);
+        const filter = inventoryFilterRef.current;
+        if (filter.size === 0 || !data.productId || filter.has(data.productId)) {
+          handlersRef.current.onInventoryUpdate?.(data);
+        }
+      });
+
+      source.addEventListener('order_status', event => {
+        const data: OrderStatusEvent = read(event);
+        const filter = orderFilterRef.current;
+        if (filter.size === 0 || filter.has(data.orderId)) {
+          handlersRef.current.onOrderStatus?.(data);
+        }
+      });
+
+      source.addEventListener('system_alert', event => {
+        handlersRef.current.onSystemAlert?.(read(event));
+      });
+
+      source.addEventListener('resync', event => {
+        const { topic } = read(event);
+        handlersRef.current.onResync?.(topic);
+      });
+    };
 
-    socket.on('system_alert', (data: SystemAlert) => {
-      onSystemAlert?.(data);
-    });
+    connect();
 
     // Cleanup on unmount
     return () => {
-      socket.disconnect();
-      socketRef.current = null;
+      disposed = true;
+      if (retryTimer) clearTimeout(retryTimer);
+      source?.close();
+      sourceRef.current = null;
       isConnectedRef.current = false;
     };
-  }, [onInventoryUpdate, onOrderStatus, onSystemAlert]);
+  }, [enabled, topicsKey]);
 
-  // Subscribe to inventory updates for a specific product
+  // Only pass inventory updates for these products (all products while none are subscribed)
   const subscribeToInventory = useCallback((productId: string) => {
-    if (socketRef.current && isConnectedRef.current) {
-      socketRef.current.emit('subscribe_inventory', productId);
-    }
+    inventoryFilterRef.current.add(productId);
   }, []);
 
-  // Subscribe to order updates
+  // Only pass status updates for these orders (all orders while none are subscribed)
   const subscribeToOrder = useCallback((orderId: string) => {
-    if (socketRef.current && isConnectedRef.current) {
-      socketRef.current.emit('subscribe_order', orderId);
-    }
+    orderFilterRef.current.add(orderId);
   }, []);
 
   // Unsubscribe from inventory updates
   const unsubscribeFromInventory = useCallback((productId: string) => {
-    if (socketRef.current && isConnectedRef.current) {
-      socketRef.current.emit('unsubscribe_inventory', productId);
-    }
+    inventoryFilterRef.current.delete(productId);
   }, []);
 
-  // Check if socket is connected
+  // Check if the stream is connected
   const isConnected = () => isConnectedRef.current;
 
   return {
-    socket: socketRef.current,
+    source: sourceRef.current,
     isConnected,
     subscribeToInventory,
     subscribeToOrder,
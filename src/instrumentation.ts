@@ -0,0 +1,10 @@
+// Runs once when the Next.js server starts
+
+export async function register() {
+  // Background jobs run in the Node.js server process; set JOB_WORKER_ENABLED=false
+  // on instances that should only serve requests
+  if (process.env.NEXT_RUNTIME === 'nodejs' && process.env.JOB_WORKER_ENABLED !== 'false') {
+    const { startJobWorker } = await import('@/services/jobs/jobWorker');
+    startJobWorker();
+  }
+}
@@ -0,0 +1,59 @@
+// Helpers for applying large batches in a bounded number of round-trips
+
+// Split items into consecutive chunks of at most `size`
+export function chunk<T>(items: T[], size: number): T[][] {
+  const chunks: T[][] = [];
+  for (let i = 0; i < items.length; i += size) {
+    chunks.push(items.slice(i, i + size));
+  }
+  return chunks;
+}
+
+// Run `worker` over items with at most `concurrency` calls in flight.
+// Results are returned in input order. Once `signal` is aborted no new items are
+// started; calls already in flight finish and the abort reason is thrown.
+export async function mapWithConcurrency<T, R>(
+  items: T[],
+  concurrency: number,
+  worker: (item: T, index: number) => Promise<R>,
+  signal?: AbortSignal
+): Promise<R[]> {
+  const results: R[] = new Array(items.length);
+  let next = 0;
+
+  const run = async () => {
+    while (next < items.length && !signal?.aborted) {
+      const index = next++;
+      results[index] = await worker(items[index], index);
+    }
+  };
+
+  await Promise.all(Array.from({ length: Math.min(concurrency, items.length) }, run));
+  signal?.throwIfAborted();
+  return results;
+}
+
+// Apply a set-based write to `rows`. `apply` returns an error message when the
+// database rejects the batch; the batch is then split in half until the rows
+// that cause the failure are isolated and reported through `onRowError`.
+// Returns the number of round-trips used.
+export async function applyWithBisect<T>(
+  rows: T[],
+  apply: (rows: T[]) => Promise<string | null>,
+  onRowError: (row: T, error: string) => void
+): Promise<number> {
+  if (rows.length === 0) return 0;
+
+  const error = await apply(rows);
+  if (!error) return 1;
+
+  if (rows.length === 1) {
+    onRowError(rows[0], error);
+    return 1;
+  }
+
+  const middle = Math.ceil(rows.length / 2);
+  const left = await applyWithBisect(rows.slice(0, middle), apply, onRowError);
+  const right = await applyWithBisect(rows.slice(middle), apply, onRowError);
+  return 1 + left + right;
+}
@@ -0,0 +1,72 @@
+// Client-side helpers for the change feed: the updated_since delta endpoints
+// and applying their events (or /api/changes/stream's) to a local copy
+
+import { ChangesResponse } from '@/types';
+
+// Start of time: reading changes from here returns every current row
+export const FULL_SYNC_SINCE = new Date(0).toISOString();
+
+export interface FetchChangesResult<T> {
+  data: T[];
+  // Newest change read; open the stream (or call again) from here
+  since: string;
+  // Deletes from before the tombstone window may be missing
+  resync: boolean;
+}
+
+/**
+ * Read every page of a delta endpoint (/api/inventory/changes, /api/orders/changes)
+ */
+export async function fetchChanges<T>(
+  endpoint: string,
+  since: string,
+  options: { signal?: AbortSignal } = {}
+): Promise<FetchChangesResult<T>> {
+  const data: T[] = [];
+  let cursor: ChangesResponse<T>['cursor'] = { updated_since: since, after_id: null };
+  let resync = false;
+
+  while (true) {
+    const params = new URLSearchParams({ updated_since: cursor.updated_since });
+    if (cursor.after_id) params.set('after_id', cursor.after_id);
+
+    const response = await fetch(`${endpoint}?${params}`, { signal: options.signal, cache: 'no-store' });
+    if (!response.ok) {
+      throw new Error(`Failed to fetch changes (${response.status})`);
+    }
+
+    const page: ChangesResponse<T> = await response.json();
+    data.push(...page.data);
+    resync = resync || page.resync;
+    cursor = page.cursor;
+    if (!page.hasMore) break;
+  }
+
+  return { data, since: cursor.updated_since, resync };
+}
+
+/**
+ * Apply change events to a map keyed by row id. Events older than the copy
+ * already held are ignored, so replays and overlapping catch-ups are harmless.
+ * Returns the same map when nothing changed.
+ */
+export function applyChanges<T extends { operation: 'upsert' | 'delete'; timestamp: string }>(
+  rows: Map<string, T>,
+  changes: T[],
+  idOf: (change: T) => string
+): Map<string, T> {
+  let next: Map<string, T> | null = null;
+
+  for (const change of changes) {
+    const id = idOf(change);
+    const current = (next || rows).get(id);
+    if (current && Date.parse(current.timestamp) > Date.parse(change.timestamp)) continue;
+    if (!current && change.operation === 'delete') continue;
+
+    next = next || new Map(rows);
+    if (change.operation === 'delete') next.delete(id);
+    else next.set(id, change);
+  }
+
+  return next || rows;
+}
@@ -0,0 +1,129 @@
+// RFC 4180 CSV helpers shared by product import and export
+
+// Incremental CSV tokenizer. Feed it text in arbitrary pieces with push();
+// it returns the records completed so far and keeps partial state (including
+// open quoted fields spanning several lines) until the next piece arrives.
+export class CsvTokenizer {
+  private field = '';
+  private record: string[] = [];
+  private inQuotes = false;
+  // A quote seen inside a quoted field: either an escaped quote or the closing one
+  private quotePending = false;
+  // Last character was CR, so a following LF belongs to the same line break
+  private skipLineFeed = false;
+
+  push(text: string): string[][] {
+    const records: string[][] = [];
+
+    for (let i = 0; i < text.length; i++) {
+      const char = text[i];
+
+      if (this.inQuotes) {
+        if (this.quotePending) {
+          this.quotePending = false;
+          if (char === '"') {
+            this.field += '"';
+            continue;
+          }
+          this.inQuotes = false;
+          // Closing quote: handle this character as unquoted content below
+        } else {
+          if (char === '"') {
+            this.quotePending = true;
+          } else {
+            this.field += char;
+          }
+          continue;
+        }
+      }
+
+      if (this.skipLineFeed) {
+        this.skipLineFeed = false;
+        if (char === '\n') continue;
+      }
+
+      if (char === '"' && this.field === '') {
+        this.inQuotes = true;
+      } else if (char === ',') {
+        this.endField();
+      } else if (char === '\r' || char === '\n') {
+        this.skipLineFeed = char === '\r';
+        this.endRecord(records);
+      } else {
+        this.field += char;
+      }
+    }
+
+    return records;
+  }
+
+  // Flush the last record when the input does not end with a line break
+  finish(): string[][] {
+    const records: string[][] = [];
+    if (this.quotePending) {
+      this.quotePending = false;
+      this.inQuotes = false;
+    }
+    if (this.field !== '' || this.record.length > 0) {
+      this.endRecord(records);
+    }
+    return records;
+  }
+
+  private endField() {
+    this.record.push(this.field);
+    this.field = '';
+  }
+
+  private endRecord(records: string[][]) {
+    this.endField();
+    // Blank lines carry no data
+    if (!(this.record.length === 1 && this.record[0] === '')) {
+      records.push(this.record);
+    }
+    this.record = [];
+  }
+}
+
+// Parse a complete CSV string into records
+export function parseCsv(text: string): string[][] {
+  const tokenizer = new CsvTokenizer();
+  return [...tokenizer.push(text), ...tokenizer.finish()];
+}
+
+// Parse a byte stream into records without holding the whole file in memory.
+// `onBytes` is called with the size of every chunk read, for progress reporting.
+export async function* parseCsvStream(
+  stream: ReadableStream<Uint8Array>,
+  onBytes?: (byteCount: number) => void
+): AsyncGenerator<string[]> {
+  const reader = stream.getReader();
+  const decoder = new TextDecoder();
+  const tokenizer = new CsvTokenizer();
+
+  try {
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      onBytes?.(value.byteLength);
+      yield* tokenizer.push(decoder.decode(value, { stream: true }));
+    }
+    yield* tokenizer.push(decoder.decode());
+    yield* tokenizer.finish();
+  } finally {
+    reader.releaseLock();
+  }
+}
+
+// Quote a field when it contains a delimiter, quote or line break
+export function escapeCsvField(value: unknown): string {
+  const field = value === null || value === undefined ? '' : String(value);
+  if (/[",\r\n]/.test(field)) {
+    return `"${field.replace(/"/g, '""')}"`;
+  }
+  return field;
+}
+
+export function toCsvRow(values: unknown[]): string {
+  return values.map(escapeCsvField).join(',');
+}
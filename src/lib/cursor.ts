@@ -0,0 +1,63 @@
+// Opaque cursors for keyset pagination. A cursor records the sort key and
+// value of the last row on a page plus its id as a tiebreaker; the next page
+// starts strictly after that (value, id) pair.
+
+export class InvalidCursorError extends Error {
+  constructor(message = 'Invalid cursor') {
+    super(message);
+    this.name = 'InvalidCursorError';
+  }
+}
+
+export interface KeysetCursor {
+  sort: string;
+  ascending: boolean;
+  value: string | number;
+  id: string;
+  // Running total carried from the previous page (e.g. a stock balance)
+  carry?: number;
+}
+
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+// base64url, usable from both the server and the browser
+export function encodeCursor(cursor: KeysetCursor): string {
+  const fields: unknown[] = [cursor.sort, cursor.ascending ? 1 : 0, cursor.value, cursor.id];
+  if (cursor.carry !== undefined) fields.push(cursor.carry);
+  const bytes = new TextEncoder().encode(JSON.stringify(fields));
+  let binary = '';
+  bytes.forEach(byte => { binary += String.fromCharCode(byte); });
+  return btoa(binary).replace(/\+/g, '-').replace(/\//g, '_').replace(/=+$/, '');
+}
+
+export function decodeCursor(encoded: string): KeysetCursor {
+  try {
+    const binary = atob(encoded.replace(/-/g, '+').replace(/_/g, '/'));
+    const bytes = Uint8Array.from(binary, char => char.charCodeAt(0));
+    const [sort, ascending, value, id, carry] = JSON.parse(new TextDecoder().decode(bytes));
+
+    if (typeof sort !== 'string' || (typeof value !== 'string' && typeof value !== 'number') ||
+        typeof id !== 'string' || !UUID_PATTERN.test(id) ||
+        (carry !== undefined && (typeof carry !== 'number' || !Number.isFinite(carry)))) {
+      throw new InvalidCursorError();
+    }
+    return carry === undefined
+      ? { sort, ascending: ascending === 1, value, id }
+      : { sort, ascending: ascending === 1, value, id, carry };
+  } catch (error) {
+    throw error instanceof InvalidCursorError ? error : new InvalidCursorError();
+  }
+}
+
+// Quote a value for use inside a PostgREST filter string
+export function quoteFilterValue(value: string | number): string {
+  return `"${String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"')}"`;
+}
+
+// PostgREST `or` filter selecting rows after the cursor:
+// (column, id) > (value, id) for ascending order, < for descending
+export function keysetFilter(cursor: KeysetCursor): string {
+  const op = cursor.ascending ? 'gt' : 'lt';
+  const value = quoteFilterValue(cursor.value);
+  return `${cursor.sort}.${op}.${value},and(${cursor.sort}.eq.${value},id.${op}.${cursor.id})`;
+}
@@ -0,0 +1,32 @@
+// Client-side helpers for routes that answer 202 with a background job id
+
+import { BackgroundJob } from '@/types/jobs';
+
+const TERMINAL_STATUSES = ['completed', 'failed', 'cancelled'];
+
+export interface WaitForJobOptions {
+  intervalMs?: number;
+  onProgress?: (job: Partial<BackgroundJob>) => void;
+  signal?: AbortSignal;
+}
+
+/**
+ * Poll /api/jobs/[id] until the job finishes and return its final state
+ */
+export async function waitForJob(jobId: string, options: WaitForJobOptions = {}): Promise<Partial<BackgroundJob>> {
+  const intervalMs = options.intervalMs ?? 1000;
+
+  while (true) {
+    const response = await fetch(`/api/jobs/${jobId}`, { signal: options.signal, cache: 'no-store' });
+    if (!response.ok) {
+      throw new Error(`Failed to fetch job status (${response.status})`);
+    }
+
+    const { data: job } = await response.json();
+    options.onProgress?.(job);
+    if (TERMINAL_STATUSES.includes(job.status)) return job;
+
+    await new Promise(resolve => setTimeout(resolve, intervalMs));
+    if (options.signal?.aborted) throw new DOMException('Aborted', 'AbortError');
+  }
+}
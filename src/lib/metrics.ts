@@ -0,0 +1,214 @@
+// Request metrics for the API route handlers (server only).
+// withRouteMetrics times each handler and, through the Supabase clients'
+// observed fetch, every Supabase call it makes. Durations are kept as
+// Prometheus histograms and rendered by /api/system/metrics. Set
+// API_SLOW_REQUEST_MS to log requests slower than that with their query breakdown.
+
+import { AsyncLocalStorage } from 'async_hooks';
+import { setSupabaseCallObserver, type SupabaseCall } from '@/lib/supabaseFetch';
+import { getResponseCacheMetrics, type ResponseCacheMetrics } from '@/lib/responseCache';
+
+const BUCKETS_SECONDS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+
+type Labels = Record<string, string>;
+
+interface Series {
+  labels: Labels;
+  counts: number[]; // Per bucket, not cumulative
+  sum: number;
+  count: number;
+}
+
+class Histogram {
+  private series = new Map<string, Series>();
+
+  constructor(readonly name: string, readonly help: string) {}
+
+  observe(labels: Labels, seconds: number) {
+    const key = JSON.stringify(labels);
+    let series = this.series.get(key);
+    if (!series) {
+      series = { labels, counts: new Array(BUCKETS_SECONDS.length).fill(0), sum: 0, count: 0 };
+      this.series.set(key, series);
+    }
+
+    const bucket = BUCKETS_SECONDS.findIndex(bound => seconds <= bound);
+    if (bucket >= 0) series.counts[bucket]++;
+    series.sum += seconds;
+    series.count++;
+  }
+
+  render(): string[] {
+    const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} histogram`];
+    for (const series of this.series.values()) {
+      let cumulative = 0;
+      BUCKETS_SECONDS.forEach((bound, i) => {
+        cumulative += series.counts[i];
+        lines.push(`${this.name}_bucket${formatLabels({ ...series.labels, le: String(bound) })} ${cumulative}`);
+      });
+      lines.push(`${this.name}_bucket${formatLabels({ ...series.labels, le: '+Inf' })} ${series.count}`);
+      lines.push(`${this.name}_sum${formatLabels(series.labels)} ${series.sum}`);
+      lines.push(`${this.name}_count${formatLabels(series.labels)} ${series.count}`);
+    }
+    return lines;
+  }
+}
+
+function formatLabels(labels: Labels): string {
+  const pairs = Object.entries(labels).map(
+    ([key, value]) => `${key}="${value.replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n')}"`
+  );
+  return pairs.length > 0 ? `{${pairs.join(',')}}` : '';
+}
+
+interface RequestContext {
+  route: string;
+  method: string;
+  calls: SupabaseCall[];
+}
+
+interface MetricsState {
+  requestDuration: Histogram;
+  appDuration: Histogram;
+  supabaseDuration: Histogram;
+  slowRequests: Map<string, number>;
+  requestContext: AsyncLocalStorage<RequestContext>;
+}
+
+// One set of metrics per server process, shared by every route bundle
+const globalMetrics = globalThis as unknown as { __apiMetrics?: MetricsState };
+const state: MetricsState = globalMetrics.__apiMetrics ?? (globalMetrics.__apiMetrics = {
+  requestDuration: new Histogram(
+    'http_request_duration_seconds',
+    'API route handler duration'
+  ),
+  appDuration: new Histogram(
+    'http_request_app_duration_seconds',
+    'API route handler time not spent waiting on Supabase (own aggregation, serialization)'
+  ),
+  supabaseDuration: new Histogram(
+    'supabase_query_duration_seconds',
+    'Supabase call duration by calling route'
+  ),
+  slowRequests: new Map(),
+  requestContext: new AsyncLocalStorage<RequestContext>()
+});
+
+setSupabaseCallObserver(call => {
+  const context = state.requestContext.getStore();
+  context?.calls.push(call);
+  state.supabaseDuration.observe(
+    {
+      route: context?.route ?? 'none',
+      method: context?.method ?? 'none',
+      query: call.query,
+      status: String(call.status)
+    },
+    call.durationMs / 1000
+  );
+});
+
+// Wall time covered by at least one call, so parallel queries are not double counted
+function supabaseWallTimeMs(calls: SupabaseCall[]): number {
+  const intervals = calls
+    .map(call => [call.startedAt, call.startedAt + call.durationMs])
+    .sort((a, b) => a[0] - b[0]);
+
+  let total = 0;
+  let end = -Infinity;
+  for (const [start, finish] of intervals) {
+    if (finish <= end) continue;
+    total += finish - Math.max(start, end);
+    end = finish;
+  }
+  return total;
+}
+
+function slowRequestThresholdMs(): number | null {
+  const threshold = parseInt(process.env.API_SLOW_REQUEST_MS || '');
+  return Number.isFinite(threshold) && threshold > 0 ? threshold : null;
+}
+
+/**
+ * Wrap a route handler so its duration and Supabase calls are recorded under `route`
+ */
+export function withRouteMetrics<Args extends unknown[]>(
+  route: string,
+  handler: (...args: Args) => Promise<Response>
+): (...args: Args) => Promise<Response> {
+  return (...args: Args) => {
+    const request = args[0] as Request | undefined;
+    const context: RequestContext = { route, method: request?.method || 'GET', calls: [] };
+
+    return state.requestContext.run(context, async () => {
+      const startedAt = performance.now();
+      let status = 500;
+      try {
+        const response = await handler(...args);
+        status = response.status;
+        return response;
+      } finally {
+        const durationMs = performance.now() - startedAt;
+        const supabaseMs = supabaseWallTimeMs(context.calls);
+        const labels = { route, method: context.method, status: String(status) };
+
+        state.requestDuration.observe(labels, durationMs / 1000);
+        state.appDuration.observe(labels, Math.max(durationMs - supabaseMs, 0) / 1000);
+
+        const threshold = slowRequestThresholdMs();
+        if (threshold !== null && durationMs >= threshold) {
+          const key = `${context.method} ${route}`;
+          state.slowRequests.set(key, (state.slowRequests.get(key) || 0) + 1);
+          console.warn('Slow API request:', JSON.stringify({
+            route,
+            method: context.method,
+            status,
+            durationMs: Math.round(durationMs),
+            supabaseMs: Math.round(supabaseMs),
+            appMs: Math.round(Math.max(durationMs - supabaseMs, 0)),
+            queries: context.calls.map(call => ({
+              query: call.query,
+              status: call.status,
+              offsetMs: Math.round(call.startedAt - startedAt),
+              durationMs: Math.round(call.durationMs)
+            }))
+          }));
+        }
+      }
+    });
+  };
+}
+
+/**
+ * All metrics in the Prometheus text exposition format
+ */
+export function renderMetrics(): string {
+  const lines = [
+    ...state.requestDuration.render(),
+    ...state.appDuration.render(),
+    ...state.supabaseDuration.render(),
+    '# HELP http_slow_requests_total Requests slower than API_SLOW_REQUEST_MS',
+    '# TYPE http_slow_requests_total counter'
+  ];
+  for (const [key, count] of state.slowRequests) {
+    const [method, route] = key.split(' ');
+    lines.push(`http_slow_requests_total${formatLabels({ route, method })} ${count}`);
+  }
+
+  const caches = getResponseCacheMetrics();
+  const cacheCounters: Array<[string, string, keyof ResponseCacheMetrics]> = [
+    ['api_response_cache_hits_total', 'Fresh response cache hits', 'hits'],
+    ['api_response_cache_stale_hits_total', 'Stale responses served while revalidating', 'staleHits'],
+    ['api_response_cache_misses_total', 'Response cache misses', 'misses'],
+    ['api_response_cache_not_modified_total', '304 responses to If-None-Match', 'notModified'],
+    ['api_response_cache_invalidations_total', 'Response cache invalidations', 'invalidations']
+  ];
+  for (const [name, help, field] of cacheCounters) {
+    lines.push(`# HELP ${name} ${help}`, `# TYPE ${name} counter`);
+    for (const cache of caches) {
+      lines.push(`${name}${formatLabels({ route: cache.route })} ${cache[field]}`);
+    }
+  }
+
+  return lines.join('\n') + '\n';
+}
@@ -0,0 +1,225 @@
+// Server-side cache for read-heavy GET route handlers.
+// Each route gets its own TTL; entries past the TTL are still served for the
+// stale-while-revalidate window while one background request refreshes them.
+// Responses carry an ETag so clients can revalidate with If-None-Match and get a
+// 304. Writes invalidate every route sharing one of their tags. Entries are keyed
+// by the query parameters the route declares, and each route keeps at most
+// maxEntries of them.
+//
+// Like TtlCache, each server instance keeps its own entries, so invalidation only
+// reaches the instance that handled the write; the TTL bounds staleness elsewhere.
+
+import { createHash } from 'crypto';
+import { NextRequest, NextResponse } from 'next/server';
+import { TtlCache } from '@/lib/ttlCache';
+
+export type CacheTag = 'categories' | 'products' | 'inventory' | 'suppliers' | 'warehouses';
+
+export interface ResponseCacheOptions {
+  ttlMs: number;
+  staleWhileRevalidateMs: number;
+  tags: CacheTag[];
+  // Query parameters the handler reads; any others (cache busters, typos) share an entry
+  params?: string[];
+  // Upper bound on cached variants of this route (default DEFAULT_MAX_ENTRIES)
+  maxEntries?: number;
+}
+
+const DEFAULT_MAX_ENTRIES = 200;
+
+export interface ResponseCacheMetrics {
+  route: string;
+  tags: CacheTag[];
+  hits: number;
+  staleHits: number;
+  misses: number;
+  notModified: number;
+  invalidations: number;
+  size: number;
+}
+
+interface CachedResponse {
+  body: string;
+  status: number;
+  contentType: string;
+  etag: string;
+  storedAt: number;
+}
+
+// Shared across route bundles (and dev hot reloads) in one server process
+const globalRegistry = globalThis as unknown as { __responseCaches?: Map<string, ResponseCache> };
+const registry = globalRegistry.__responseCaches ?? (globalRegistry.__responseCaches = new Map());
+
+// The declared query parameters in a stable order, so ?a=1&b=2 and ?b=2&a=1
+// share an entry and parameters the handler ignores do not create new ones
+function cacheKey(request: NextRequest, names: string[]): string {
+  const url = new URL(request.url);
+  const params = [...url.searchParams.entries()]
+    .filter(([name]) => names.includes(name))
+    .sort(([a], [b]) => a.localeCompare(b));
+  return `${url.pathname}?${new URLSearchParams(params).toString()}`;
+}
+
+function matchesEtag(request: NextRequest, etag: string): boolean {
+  const header = request.headers.get('if-none-match');
+  if (!header) return false;
+  return header === '*' || header.split(',').some(candidate => candidate.trim() === etag);
+}
+
+export class ResponseCache {
+  private cache: TtlCache<CachedResponse>;
+  private revalidating = new Set<string>();
+  private hits = 0;
+  private staleHits = 0;
+  private misses = 0;
+  private notModified = 0;
+
+  constructor(readonly route: string, private options: ResponseCacheOptions) {
+    // Entries are kept for the whole stale window; freshness is judged by storedAt
+    this.cache = new TtlCache<CachedResponse>(
+      options.ttlMs + options.staleWhileRevalidateMs,
+      options.maxEntries ?? DEFAULT_MAX_ENTRIES
+    );
+  }
+
+  get tags(): CacheTag[] {
+    return this.options.tags;
+  }
+
+  /**
+   * Serve `handler`'s response from the cache. Only 200 responses are cached.
+   */
+  async serve(request: NextRequest, handler: () => Promise<Response>): Promise<Response> {
+    const key = cacheKey(request, this.options.params ?? []);
+    let entry = this.cache.get(key);
+    let state: 'HIT' | 'STALE' | 'MISS';
+
+    if (entry && Date.now() - entry.storedAt < this.options.ttlMs) {
+      state = 'HIT';
+      this.hits++;
+    } else if (entry) {
+      state = 'STALE';
+      this.staleHits++;
+      this.revalidate(key, handler);
+    } else {
+      state = 'MISS';
+      this.misses++;
+      const passthrough: { response?: Response } = {};
+      entry = await this.cache.getOrLoad(
+        key,
+        () => this.capture(handler, response => { passthrough.response = response; }),
+        value => value.status === 200
+      );
+      // Errors are passed through untouched; a request that joined someone else's
+      // failed load runs the handler itself
+      if (passthrough.response) return passthrough.response;
+      if (entry.status !== 200) return handler();
+    }
+
+    return this.respond(request, entry, state);
+  }
+
+  invalidate() {
+    this.cache.invalidate();
+  }
+
+  metrics(): ResponseCacheMetrics {
+    const { invalidations, size } = this.cache.metrics();
+    return {
+      route: this.route,
+      tags: this.options.tags,
+      hits: this.hits,
+      staleHits: this.staleHits,
+      misses: this.misses,
+      notModified: this.notModified,
+      invalidations,
+      size
+    };
+  }
+
+  // Run the handler and snapshot its body; non-200 responses are handed back via
+  // onUncached so they reach the client unchanged
+  private async capture(
+    handler: () => Promise<Response>,
+    onUncached: (response: Response) => void
+  ): Promise<CachedResponse> {
+    const response = await handler();
+    if (response.status !== 200) {
+      onUncached(response);
+      return { body: '', status: response.status, contentType: '', etag: '', storedAt: 0 };
+    }
+
+    const body = await response.text();
+    return {
+      body,
+      status: response.status,
+      contentType: response.headers.get('content-type') || 'application/json',
+      etag: `"${createHash('sha1').update(body).digest('base64url')}"`,
+      storedAt: Date.now()
+    };
+  }
+
+  // Refresh a stale entry in the background, once per key at a time. A write
+  // that lands while refreshing wins: its invalidation discards the result.
+  private revalidate(key: string, handler: () => Promise<Response>) {
+    if (this.revalidating.has(key)) return;
+    this.revalidating.add(key);
+
+    const generation = this.cache.metrics().invalidations;
+    this.capture(handler, () => {})
+      .then(entry => {
+        if (entry.status === 200 && generation === this.cache.metrics().invalidations) {
+          this.cache.set(key, entry);
+        }
+      })
+      .catch(error => console.error(`Background revalidation failed for ${this.route}:`, error))
+      .finally(() => this.revalidating.delete(key));
+  }
+
+  private respond(request: NextRequest, entry: CachedResponse, state: 'HIT' | 'STALE' | 'MISS'): Response {
+    const headers = {
+      'ETag': entry.etag,
+      // Clients revalidate every time (cheap with If-None-Match) and may show
+      // their copy meanwhile, mirroring the server-side stale window
+      'Cache-Control': `private, max-age=0, stale-while-revalidate=${Math.floor(this.options.staleWhileRevalidateMs / 1000)}`,
+      'X-Cache': state
+    };
+
+    if (matchesEtag(request, entry.etag)) {
+      this.notModified++;
+      return new NextResponse(null, { status: 304, headers });
+    }
+
+    return new NextResponse(entry.body, {
+      status: entry.status,
+      headers: { ...headers, 'Content-Type': entry.contentType }
+    });
+  }
+}
+
+/**
+ * Create (or reuse) the cache for a route
+ */
+export function createResponseCache(route: string, options: ResponseCacheOptions): ResponseCache {
+  let cache = registry.get(route);
+  if (!cache) {
+    cache = new ResponseCache(route, options);
+    registry.set(route, cache);
+  }
+  return cache;
+}
+
+/**
+ * Drop every cached response for routes tagged with any of `tags`
+ */
+export function invalidateCacheTags(...tags: CacheTag[]) {
+  for (const cache of registry.values()) {
+    if (cache.tags.some(tag => tags.includes(tag))) {
+      cache.invalidate();
+    }
+  }
+}
+
+export function getResponseCacheMetrics(): ResponseCacheMetrics[] {
+  return [...registry.values()].map(cache => cache.metrics());
+}
@@ -0,0 +1,46 @@
+// Client side of the ranked search RPCs (see system/009_search_functions.sql).
+// The query text is only ever passed as an RPC argument, never spliced into a
+// PostgREST filter string.
+import { supabase } from './supabaseClient';
+
+export const MAX_SEARCH_QUERY_LENGTH = 100;
+
+export interface RankedSearchResult {
+  ids: string[];
+  total: number;
+}
+
+interface RankedSearchRow {
+  id: string;
+  rank: number;
+  total_count: number;
+}
+
+// Trim, collapse whitespace and cap the length of user input
+export function normalizeSearchQuery(query: string | null | undefined): string {
+  return (query || '').trim().replace(/\s+/g, ' ').slice(0, MAX_SEARCH_QUERY_LENGTH);
+}
+
+// Run a ranked search RPC and return the matching ids in relevance order
+export async function rankedSearch(
+  fn: 'search_products' | 'search_orders' | 'search_customers',
+  params: Record<string, unknown>
+): Promise<RankedSearchResult> {
+  const { data, error } = await supabase.rpc(fn, params);
+
+  if (error) {
+    throw new Error(error.message);
+  }
+
+  const rows = (data || []) as RankedSearchRow[];
+  return {
+    ids: rows.map(row => row.id),
+    total: rows.length > 0 ? Number(rows[0].total_count) : 0
+  };
+}
+
+// Put rows fetched with `.in('id', ids)` back into relevance order
+export function orderByIds<T extends { id: string }>(rows: T[], ids: string[]): T[] {
+  const byId = new Map(rows.map(row => [row.id, row]));
+  return ids.map(id => byId.get(id)).filter((row): row is T => row !== undefined);
+}
@@ -1,4 +1,5 @@
 import { createClient } from '@supabase/supabase-js';
+import { observedFetch } from '@/lib/supabaseFetch';
 
 // Admin client with service role key (bypasses RLS)
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL!;
@@ -12,7 +13,8 @@ export const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey, {
   auth: {
     autoRefreshToken: false,
     persistSession: false
-  }
+  },
+  global: { fetch: observedFetch }
 });
 
 export default supabaseAdmin;
@@ -1,4 +1,5 @@
 import { createClient } from '@supabase/supabase-js';
+import { observedFetch } from '@/lib/supabaseFetch';
 
 // Environment variables for Supabase connection
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL;
@@ -12,6 +13,8 @@ if (!supabaseUrl || !supabaseAnonKey) {
 }
 
 // Create and export Supabase client
-export const supabase = createClient(supabaseUrl, supabaseAnonKey);
+export const supabase = createClient(supabaseUrl, supabaseAnonKey, {
+  global: { fetch: observedFetch }
+});
 
 export default supabase;
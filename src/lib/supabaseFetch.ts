@@ -0,0 +1,67 @@
+// fetch used by the Supabase clients. Reports every PostgREST/RPC/storage call
+// to the observer registered by the server-side metrics module; in the browser,
+// or before metrics are loaded, it is plain fetch.
+
+export interface SupabaseCall {
+  query: string; // e.g. "select products", "rpc get_order_stats", "storage media-files"
+  status: number; // 0 when the request failed without a response
+  startedAt: number;
+  durationMs: number; // Until the response headers arrive
+}
+
+type SupabaseCallObserver = (call: SupabaseCall) => void;
+
+const observerSlot = globalThis as unknown as { __supabaseCallObserver?: SupabaseCallObserver };
+
+export function setSupabaseCallObserver(observer: SupabaseCallObserver) {
+  observerSlot.__supabaseCallObserver = observer;
+}
+
+const REST_VERBS: Record<string, string> = {
+  GET: 'select',
+  HEAD: 'count',
+  POST: 'insert',
+  PATCH: 'update',
+  PUT: 'upsert',
+  DELETE: 'delete'
+};
+
+// Label a request by what it touches rather than its full URL, to keep label cardinality bounded
+export function describeSupabaseRequest(url: string, method: string): string {
+  const { pathname } = new URL(url);
+  const segments = pathname.split('/').filter(Boolean);
+
+  if (segments[0] === 'rest') {
+    if (segments[2] === 'rpc') return `rpc ${segments[3]}`;
+    return `${REST_VERBS[method] || method.toLowerCase()} ${segments[2]}`;
+  }
+  if (segments[0] === 'storage') {
+    // storage/v1/object/<bucket>/..., storage/v1/object/public/<bucket>/...
+    const bucket = segments[3] === 'public' || segments[3] === 'sign' ? segments[4] : segments[3];
+    return `storage ${bucket || segments[2]}`;
+  }
+  return segments.slice(0, 2).join('/') || 'unknown';
+}
+
+export const observedFetch: typeof fetch = async (input, init) => {
+  const observer = observerSlot.__supabaseCallObserver;
+  if (!observer) return fetch(input, init);
+
+  const url = typeof input === 'string' ? input : input instanceof URL ? input.href : input.url;
+  const method = (init?.method || (input instanceof Request ? input.method : 'GET')).toUpperCase();
+  const startedAt = performance.now();
+
+  let status = 0;
+  try {
+    const response = await fetch(input, init);
+    status = response.status;
+    return response;
+  } finally {
+    observer({
+      query: describeSupabaseRequest(url, method),
+      status,
+      startedAt,
+      durationMs: performance.now() - startedAt
+    });
+  }
+};
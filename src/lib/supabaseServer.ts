@@ -1,4 +1,5 @@
 import { createClient } from '@supabase/supabase-js';
+import { observedFetch } from '@/lib/supabaseFetch';
 
 // Environment variables for Supabase connection (server-side)
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL;
@@ -23,7 +24,8 @@ export const createServerSupabaseClient = () => {
     global: {
       headers: {
         'X-Client-Info': 'supabase-js-server'
-      }
+      },
+      fetch: observedFetch
     }
   });
 };
@@ -42,6 +44,7 @@ export const createServerSupabaseAnonymousClient = () => {
     auth: {
       autoRefreshToken: false,
       persistSession: false
-    }
+    },
+    global: { fetch: observedFetch }
   });
 };
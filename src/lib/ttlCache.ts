@@ -0,0 +1,110 @@
+// Small in-process cache with per-entry expiry and hit/miss counters.
+// Each server instance keeps its own copy, so invalidation only reaches the
+// instance that performed the write; the TTL bounds staleness everywhere else.
+// With maxEntries set, adding past the cap drops expired entries first and then
+// the least recently used ones.
+
+export interface TtlCacheMetrics {
+  hits: number;
+  misses: number;
+  invalidations: number;
+  size: number;
+}
+
+interface CacheEntry<T> {
+  value: T;
+  expiresAt: number;
+}
+
+export class TtlCache<T> {
+  private entries = new Map<string, CacheEntry<T>>();
+  // Loads in progress, so concurrent misses for the same key share one query
+  private pending = new Map<string, Promise<T>>();
+  private hits = 0;
+  private misses = 0;
+  private invalidations = 0;
+
+  constructor(private ttlMs: number, private maxEntries = Infinity) {}
+
+  get(key: string): T | undefined {
+    const entry = this.entries.get(key);
+    if (entry && entry.expiresAt > Date.now()) {
+      this.hits++;
+      // Map order doubles as recency order for eviction
+      this.entries.delete(key);
+      this.entries.set(key, entry);
+      return entry.value;
+    }
+    if (entry) this.entries.delete(key);
+    this.misses++;
+    return undefined;
+  }
+
+  set(key: string, value: T) {
+    this.entries.delete(key);
+    if (this.entries.size >= this.maxEntries) this.evict();
+    this.entries.set(key, { value, expiresAt: Date.now() + this.ttlMs });
+  }
+
+  // Return the cached value or load and cache it. `shouldCache` lets callers
+  // skip caching failed results.
+  async getOrLoad(
+    key: string,
+    load: () => Promise<T>,
+    shouldCache: (value: T) => boolean = () => true
+  ): Promise<T> {
+    const cached = this.get(key);
+    if (cached !== undefined) return cached;
+
+    const inFlight = this.pending.get(key);
+    if (inFlight) return inFlight;
+
+    const generation = this.invalidations;
+    const promise = load()
+      .then(value => {
+        // A write that happened while loading makes this result stale
+        if (shouldCache(value) && generation === this.invalidations) {
+          this.set(key, value);
+        }
+        return value;
+      })
+      .finally(() => {
+        if (this.pending.get(key) === promise) this.pending.delete(key);
+      });
+
+    this.pending.set(key, promise);
+    return promise;
+  }
+
+  invalidate(key?: string) {
+    this.invalidations++;
+    if (key === undefined) {
+      this.entries.clear();
+      this.pending.clear();
+    } else {
+      this.entries.delete(key);
+      this.pending.delete(key);
+    }
+  }
+
+  // Make room for one entry: sweep expired entries, then drop the least recently used
+  private evict() {
+    const now = Date.now();
+    for (const [key, entry] of this.entries) {
+      if (entry.expiresAt <= now) this.entries.delete(key);
+    }
+    for (const key of this.entries.keys()) {
+      if (this.entries.size < this.maxEntries) break;
+      this.entries.delete(key);
+    }
+  }
+
+  metrics(): TtlCacheMetrics {
+    return {
+      hits: this.hits,
+      misses: this.misses,
+      invalidations: this.invalidations,
+      size: this.entries.size
+    };
+  }
+}
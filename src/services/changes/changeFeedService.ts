@@ -0,0 +1,214 @@
+import { RealtimeChannel, RealtimePostgresChangesPayload } from '@supabase/supabase-js';
+import { supabaseAdmin } from '@/lib/supabaseAdmin';
+import {
+  ChangeOperation,
+  ChangeTopic,
+  ChangesResponse,
+  InventoryUpdateEvent,
+  OrderStatusEvent
+} from '@/types';
+
+export type { ChangeTopic };
+
+export const CHANGE_TOPICS: ChangeTopic[] = ['inventory', 'orders'];
+
+export type ChangeEvent =
+  | { topic: 'inventory'; data: InventoryUpdateEvent }
+  | { topic: 'orders'; data: OrderStatusEvent };
+
+export interface ChangeListener {
+  onChange(event: ChangeEvent): void;
+  // Realtime was disconnected and may have dropped events; catch up from the last one seen
+  onGap(): void;
+}
+
+export const CHANGES_PAGE_SIZE = 500;
+export const MAX_CHANGES_PAGE_SIZE = 1000;
+
+// deleted_rows keeps tombstones for 7 days (system/011_change_feed.sql)
+export const CHANGE_RETENTION_MS = 7 * 24 * 60 * 60 * 1000;
+
+// Keep the Realtime channel open this long after the last listener leaves, so a
+// page navigation does not tear it down and rejoin
+const IDLE_DISCONNECT_MS = 30 * 1000;
+
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+const toNumber = (value: unknown): number | null =>
+  value === null || value === undefined ? null : Number(value);
+
+// Rows from Realtime and from the get_*_changes RPCs share column names
+const toInventoryEvent = (row: any, operation: ChangeOperation, timestamp: string): InventoryUpdateEvent => ({
+  itemId: row.id,
+  operation,
+  productId: row.product_id ?? null,
+  locationId: row.location_id ?? null,
+  stock: toNumber(row.quantity_on_hand),
+  reserved: toNumber(row.quantity_reserved),
+  available: toNumber(row.quantity_available),
+  minStockLevel: toNumber(row.min_stock_level),
+  status: row.status ?? null,
+  timestamp
+});
+
+const toOrderEvent = (row: any, operation: ChangeOperation, timestamp: string): OrderStatusEvent => ({
+  orderId: row.id,
+  operation,
+  orderNumber: row.order_number ?? null,
+  status: row.status ?? null,
+  paymentStatus: row.payment_status ?? null,
+  totalAmount: toNumber(row.total_amount),
+  createdAt: row.created_at ?? null,
+  timestamp
+});
+
+const fromRealtime = <T>(
+  payload: RealtimePostgresChangesPayload<Record<string, any>>,
+  map: (row: any, operation: ChangeOperation, timestamp: string) => T
+): T => {
+  if (payload.eventType === 'DELETE') {
+    return map({ id: payload.old.id }, 'delete', payload.commit_timestamp);
+  }
+  return map(payload.new, 'upsert', payload.new.updated_at || payload.commit_timestamp);
+};
+
+/**
+ * Fans Realtime row changes on inventory_items and orders out to this process's
+ * stream connections. One channel per server process, opened on the first
+ * listener and closed once the last one has gone.
+ */
+export class ChangeFeed {
+  private listeners = new Set<ChangeListener>();
+  private channel: RealtimeChannel | null = null;
+  private idleTimer: ReturnType<typeof setTimeout> | null = null;
+  private interrupted = false;
+
+  subscribe(listener: ChangeListener): () => void {
+    this.listeners.add(listener);
+    if (this.idleTimer) clearTimeout(this.idleTimer);
+    this.idleTimer = null;
+    if (!this.channel) this.connect();
+
+    return () => {
+      this.listeners.delete(listener);
+      if (this.listeners.size === 0 && !this.idleTimer) {
+        this.idleTimer = setTimeout(() => this.disconnect(), IDLE_DISCONNECT_MS);
+        this.idleTimer.unref?.();
+      }
+    };
+  }
+
+  private publish(event: ChangeEvent) {
+    this.listeners.forEach(listener => {
+      try {
+        listener.onChange(event);
+      } catch (error) {
+        console.error('Change feed listener failed:', error);
+      }
+    });
+  }
+
+  private connect() {
+    this.interrupted = false;
+    this.channel = supabaseAdmin
+      .channel('change-feed')
+      .on('postgres_changes', { event: '*', schema: 'public', table: 'inventory_items' }, payload => {
+        this.publish({ topic: 'inventory', data: fromRealtime(payload, toInventoryEvent) });
+      })
+      .on('postgres_changes', { event: '*', schema: 'public', table: 'orders' }, payload => {
+        this.publish({ topic: 'orders', data: fromRealtime(payload, toOrderEvent) });
+      })
+      .subscribe((status, error) => {
+        if (status === 'SUBSCRIBED') {
+          // Realtime rejoins by itself; changes made while it was away have to be read back
+          if (this.interrupted) this.listeners.forEach(listener => listener.onGap());
+          this.interrupted = false;
+        } else if (status === 'CHANNEL_ERROR' || status === 'TIMED_OUT') {
+          console.error(`Change feed channel ${status}:`, error);
+          this.interrupted = true;
+        }
+      });
+  }
+
+  private disconnect() {
+    this.idleTimer = null;
+    if (this.listeners.size > 0 || !this.channel) return;
+    supabaseAdmin.removeChannel(this.channel);
+    this.channel = null;
+  }
+}
+
+// One feed per server process, shared by every route bundle
+const globalFeed = globalThis as unknown as { __changeFeed?: ChangeFeed };
+
+export function getChangeFeed(): ChangeFeed {
+  return globalFeed.__changeFeed ?? (globalFeed.__changeFeed = new ChangeFeed());
+}
+
+export interface ChangesQuery {
+  since: string;
+  afterId: string | null;
+  limit: number;
+}
+
+/**
+ * Read updated_since, after_id and limit from a delta endpoint's query string.
+ * Returns an error message when they are missing or malformed.
+ */
+export function parseChangesQuery(searchParams: URLSearchParams): ChangesQuery | string {
+  const since = searchParams.get('updated_since');
+  if (!since || Number.isNaN(Date.parse(since))) {
+    return 'updated_since must be an ISO 8601 timestamp';
+  }
+
+  const afterId = searchParams.get('after_id');
+  if (afterId && !UUID_PATTERN.test(afterId)) {
+    return 'after_id must be a UUID';
+  }
+
+  const limit = parseInt(searchParams.get('limit') || String(CHANGES_PAGE_SIZE));
+  if (!Number.isInteger(limit) || limit < 1) {
+    return 'limit must be a positive integer';
+  }
+
+  return { since, afterId: afterId || null, limit: Math.min(limit, MAX_CHANGES_PAGE_SIZE) };
+}
+
+/**
+ * Keyset reads of rows changed (or deleted) after a point in time, oldest first
+ */
+export class ChangeFeedService {
+  static async getInventoryChanges(query: ChangesQuery): Promise<ChangesResponse<InventoryUpdateEvent>> {
+    return this.getChanges('get_inventory_changes', toInventoryEvent, query);
+  }
+
+  static async getOrderChanges(query: ChangesQuery): Promise<ChangesResponse<OrderStatusEvent>> {
+    return this.getChanges('get_order_changes', toOrderEvent, query);
+  }
+
+  private static async getChanges<T extends { timestamp: string }>(
+    rpc: string,
+    map: (row: any, operation: ChangeOperation, timestamp: string) => T,
+    { since, afterId, limit }: ChangesQuery
+  ): Promise<ChangesResponse<T>> {
+    const { data: rows, error } = await supabaseAdmin.rpc(rpc, {
+      p_since: since,
+      p_after_id: afterId,
+      p_limit: limit
+    });
+
+    if (error) throw new Error(`Failed to read changes: ${error.message}`);
+
+    const changes: any[] = rows || [];
+    const last = changes[changes.length - 1];
+
+    return {
+      data: changes.map(row => map(row, row.operation, row.changed_at)),
+      cursor: last
+        ? { updated_since: last.changed_at, after_id: last.id }
+        : { updated_since: since, after_id: afterId },
+      hasMore: changes.length === limit,
+      resync: Date.now() - Date.parse(since) > CHANGE_RETENTION_MS
+    };
+  }
+}
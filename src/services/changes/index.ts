@@ -0,0 +1,11 @@
+export {
+  ChangeFeed,
+  ChangeFeedService,
+  getChangeFeed,
+  parseChangesQuery,
+  CHANGE_TOPICS,
+  CHANGES_PAGE_SIZE,
+  MAX_CHANGES_PAGE_SIZE,
+  CHANGE_RETENTION_MS
+} from './changeFeedService';
+export type { ChangeTopic, ChangeEvent, ChangeListener, ChangesQuery } from './changeFeedService';
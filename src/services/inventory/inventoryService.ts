@@ -1,4 +1,5 @@
 import { supabase } from '@/lib/supabaseClient';
+import { chunk, applyWithBisect } from '@/lib/batch';
 
 // Updated types for inventory management
 export interface InventoryItem {
@@ -69,13 +70,103 @@ export interface Adjustment {
   created_by: string;
 }
 
+export interface BulkInventoryUpdate {
+  id: string;
+  quantity?: number;
+  [field: string]: unknown;
+}
+
+export type BulkUpdateRowStatus = 'updated' | 'not_found' | 'invalid' | 'failed';
+
+export interface BulkUpdateRowResult {
+  index: number;
+  id: string | null;
+  status: BulkUpdateRowStatus;
+  error?: string;
+}
+
+export interface BulkUpdateResult {
+  data: InventoryItem[];
+  results: BulkUpdateRowResult[];
+  summary: {
+    requested: number;
+    updated: number;
+    failed: number;
+    roundTrips: number;
+  };
+}
+
+// Fields accepted by the bulk_update_inventory_items RPC
+const BULK_UPDATABLE_FIELDS: Record<string, 'integer' | 'number' | 'string' | 'date'> = {
+  quantity: 'integer',
+  quantity_on_hand: 'integer',
+  quantity_reserved: 'integer',
+  quantity_allocated: 'integer',
+  quantity_incoming: 'integer',
+  min_stock_level: 'integer',
+  max_stock_level: 'integer',
+  reorder_point: 'integer',
+  reorder_quantity: 'integer',
+  unit_cost: 'number',
+  location_id: 'string',
+  location_name: 'string',
+  status: 'string',
+  batch_number: 'string',
+  lot_number: 'string',
+  last_counted_date: 'date',
+  last_counted_by: 'string'
+};
+
+// Nullable fields may be cleared with an explicit null
+const BULK_NULLABLE_FIELDS = new Set([
+  'max_stock_level', 'location_name', 'batch_number', 'lot_number', 'last_counted_date', 'last_counted_by'
+]);
+
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+export const BULK_UPDATE_CHUNK_SIZE = 1000;
+
+// Returns an error message for an invalid update, or null when it can be sent to the database
+const validateBulkUpdate = (update: BulkInventoryUpdate): string | null => {
+  if (!update || typeof update !== 'object') return 'Update must be an object';
+  if (typeof update.id !== 'string' || !UUID_PATTERN.test(update.id)) return 'A valid inventory item id is required';
+
+  for (const [field, value] of Object.entries(update)) {
+    if (field === 'id') continue;
+
+    const type = BULK_UPDATABLE_FIELDS[field];
+    if (!type) return `Field "${field}" cannot be bulk updated`;
+    if (value === undefined) continue;
+    if (value === null) {
+      if (BULK_NULLABLE_FIELDS.has(field)) continue;
+      return `Field "${field}" cannot be null`;
+    }
+
+    if (type === 'integer' && (!Number.isInteger(value) || (value as number) < 0)) {
+      return `Field "${field}" must be a non-negative integer`;
+    }
+    if (type === 'number' && (typeof value !== 'number' || !Number.isFinite(value) || value < 0)) {
+      return `Field "${field}" must be a non-negative number`;
+    }
+    if (type === 'string' && typeof value !== 'string') return `Field "${field}" must be a string`;
+    if (type === 'date' && (typeof value !== 'string' || isNaN(Date.parse(value)))) {
+      return `Field "${field}" must be an ISO date`;
+    }
+  }
+
+  return null;
+};
+
 export interface LowStockAlert {
   id: string;
   inventory_item_id: string;
+  product_id?: string;
   current_quantity: number;
   threshold: number;
   status: 'active' | 'resolved';
+  resolved_at?: string;
   created_at: string;
+  updated_at?: string;
 }
 
 // Inventory Items Service
@@ -150,6 +241,89 @@ export const inventoryService = {
     if (error) throw error;
   },
 
+  // Apply many updates in a few set-based round-trips.
+  // Rows are validated up front; a chunk rejected by the database is bisected
+  // until the offending rows are isolated, so one bad row never fails the rest.
+  async bulkUpdateItems(
+    updates: BulkInventoryUpdate[],
+    chunkSize: number = BULK_UPDATE_CHUNK_SIZE
+  ): Promise<BulkUpdateResult> {
+    const results: BulkUpdateRowResult[] = new Array(updates.length);
+    const itemsById = new Map<string, InventoryItem>();
+    let roundTrips = 0;
+
+    // Merge repeated ids in input order so the outcome matches applying them one by one
+    const merged = new Map<string, { update: BulkInventoryUpdate; indexes: number[] }>();
+    updates.forEach((update, index) => {
+      const validationError = validateBulkUpdate(update);
+      if (validationError) {
+        results[index] = {
+          index,
+          id: typeof update?.id === 'string' ? update.id : null,
+          status: 'invalid',
+          error: validationError
+        };
+        return;
+      }
+
+      const existing = merged.get(update.id);
+      if (existing) {
+        existing.update = { ...existing.update, ...update };
+        existing.indexes.push(index);
+      } else {
+        merged.set(update.id, { update: { ...update }, indexes: [index] });
+      }
+    });
+
+    const pending = Array.from(merged.values());
+
+    for (const rows of chunk(pending, chunkSize)) {
+      roundTrips += await applyWithBisect(
+        rows,
+        async (batch) => {
+          const { data, error } = await supabase.rpc('bulk_update_inventory_items', {
+            p_updates: batch.map(entry => entry.update)
+          });
+          if (error) return error.message;
+
+          for (const row of data || []) {
+            const entry = batch[row.row_index];
+            if (row.status === 'updated' && row.item) {
+              itemsById.set(entry.update.id, row.item);
+            }
+            for (const index of entry.indexes) {
+              results[index] = {
+                index,
+                id: entry.update.id,
+                status: row.status,
+                ...(row.error ? { error: row.error } : {})
+              };
+            }
+          }
+          return null;
+        },
+        (entry, error) => {
+          for (const index of entry.indexes) {
+            results[index] = { index, id: entry.update.id, status: 'failed', error };
+          }
+        }
+      );
+    }
+
+    const updated = results.filter(result => result.status === 'updated').length;
+
+    return {
+      data: Array.from(itemsById.values()),
+      results,
+      summary: {
+        requested: updates.length,
+        updated,
+        failed: updates.length - updated,
+        roundTrips
+      }
+    };
+  },
+
   // Search inventory items
   async searchInventoryItems(query: string): Promise<InventoryItem[]> {
     const { data, error } = await supabase
@@ -273,9 +447,13 @@ export const lowStockAlertsService = {
       .select(`
         *,
         inventory_items (
+          location_name,
+          quantity_available,
+          min_stock_level
+        ),
+        products (
           name,
-          sku,
-          category
+          sku
         )
       `)
       .eq('status', 'active')
@@ -289,52 +467,22 @@ export const lowStockAlertsService = {
   async resolveLowStockAlert(id: string): Promise<void> {
     const { error } = await supabase
       .from('low_stock_alerts')
-      .update({ status: 'resolved' })
+      .update({ status: 'resolved', resolved_at: new Date().toISOString() })
       .eq('id', id);
 
     if (error) throw error;
   },
 
-  // Check and create low stock alerts
-  async checkLowStockItems(): Promise<LowStockAlert[]> {
-    // This would typically be handled by a database function or trigger
-    // For now, we'll implement it as a client-side check
-    const { data: items, error } = await supabase
-      .from('inventory_items')
-      .select('*')
-      .lte('quantity', 'low_stock_threshold');
+  // Check and create low stock alerts.
+  // Alerts are also kept current by triggers on inventory_items; this runs a full
+  // evaluation (or one limited to itemIds) and returns the alerts it created.
+  async checkLowStockItems(itemIds?: string[]): Promise<LowStockAlert[]> {
+    const { data, error } = await supabase.rpc('evaluate_low_stock_alerts', {
+      p_item_ids: itemIds && itemIds.length > 0 ? itemIds : null
+    });
 
     if (error) throw error;
-
-    const alerts: LowStockAlert[] = [];
-    for (const item of items || []) {
-      // Check if alert already exists for this item
-      const { data: existingAlert } = await supabase
-        .from('low_stock_alerts')
-        .select('id')
-        .eq('inventory_item_id', item.id)
-        .eq('status', 'active')
-        .single();
-
-      if (!existingAlert) {
-        // Create new alert
-        const { data: newAlert, error: alertError } = await supabase
-          .from('low_stock_alerts')
-          .insert({
-            inventory_item_id: item.id,
-            current_quantity: item.quantity,
-            threshold: item.low_stock_threshold,
-            status: 'active'
-          })
-          .select()
-          .single();
-
-        if (alertError) throw alertError;
-        if (newAlert) alerts.push(newAlert);
-      }
-    }
-
-    return alerts;
+    return data || [];
   }
 };
 
@@ -0,0 +1,29 @@
+import { JobService, EnqueueJobOptions } from './jobService';
+import { getJobWorker } from './jobWorker';
+import { BackgroundJob, JobType } from '@/types/jobs';
+
+export { JobService } from './jobService';
+export type { EnqueueJobOptions, JobFilters } from './jobService';
+export { JobWorker, getJobWorker, startJobWorker } from './jobWorker';
+export { JOB_HANDLERS, JobAbortedError, PRODUCT_IMPORT_BUCKET } from './jobHandlers';
+export type {
+  JobContext,
+  JobHandler,
+  ProductImportPayload,
+  InventoryPopulatePayload,
+  InventorySyncCostsPayload,
+  BulkFulfillPayload
+} from './jobHandlers';
+
+/**
+ * Enqueue a job and wake this process's worker so it starts without waiting for the next poll
+ */
+export async function queueJob<Payload>(
+  type: JobType,
+  payload: Payload,
+  options: EnqueueJobOptions = {}
+): Promise<BackgroundJob<Payload>> {
+  const job = await JobService.enqueue(type, payload, options);
+  getJobWorker().kick();
+  return job;
+}
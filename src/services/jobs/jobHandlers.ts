@@ -0,0 +1,290 @@
+import { supabase } from '@/lib/supabaseClient';
+import { supabaseAdmin } from '@/lib/supabaseAdmin';
+import { applyWithBisect } from '@/lib/batch';
+import { invalidateCacheTags } from '@/lib/responseCache';
+import {
+  ProductImportExportService,
+  ImportCheckpoint,
+  ImportResult
+} from '@/services/products/importExportService';
+import { OrderFulfillmentService, BulkFulfillmentAction } from '@/services/orders/orderFulfillmentService';
+import { BackgroundJob, JobProgress, JobType } from '@/types/jobs';
+
+// Private bucket holding uploaded CSVs until their import job finishes
+export const PRODUCT_IMPORT_BUCKET = 'product-imports';
+
+// Products per populate step (also the id list size of the existing-item lookup)
+const POPULATE_CHUNK_SIZE = 200;
+
+// Failed orders kept in a bulk fulfillment job's result; counts stay exact
+const MAX_REPORTED_FAILURES = 1000;
+
+export interface JobContext<Payload = any, Checkpoint = any> {
+  job: BackgroundJob<Payload>;
+  // Where the previous attempt left off, or null on the first run
+  checkpoint: Checkpoint | null;
+  // Persist progress after a unit of work; throws JobAbortedError once the job
+  // was cancelled or taken over, which stops the handler
+  saveCheckpoint(checkpoint: Checkpoint | null, progress: JobProgress): Promise<void>;
+}
+
+export type JobHandler = (context: JobContext) => Promise<unknown>;
+
+export class JobAbortedError extends Error {
+  constructor(jobId: string) {
+    super(`Job ${jobId} was cancelled or claimed by another worker`);
+    this.name = 'JobAbortedError';
+  }
+}
+
+// products.import
+export interface ProductImportPayload {
+  storagePath: string;
+  fileName: string;
+  totalBytes: number;
+  chunkSize?: number;
+  concurrency?: number;
+}
+
+type ProductImportCheckpoint = { phase: 'import' } & ImportCheckpoint;
+
+async function openImportFile(path: string): Promise<ReadableStream<Uint8Array>> {
+  const { data, error } = await supabaseAdmin.storage
+    .from(PRODUCT_IMPORT_BUCKET)
+    .createSignedUrl(path, 60 * 60);
+  if (error || !data) throw new Error(`Import file unavailable: ${error?.message || path}`);
+
+  const response = await fetch(data.signedUrl);
+  if (!response.ok || !response.body) throw new Error(`Failed to download import file (${response.status})`);
+  return response.body;
+}
+
+const importProducts: JobHandler = async ({ job, checkpoint, saveCheckpoint }: JobContext<ProductImportPayload, ProductImportCheckpoint>) => {
+  const { storagePath, totalBytes, chunkSize, concurrency } = job.payload;
+
+  // Validate the whole file before writing anything, once per job
+  if (!checkpoint) {
+    await saveCheckpoint(null, { phase: 'validating', bytesRead: 0, totalBytes, rowsRead: 0, successCount: 0, errorCount: 0 });
+    const validation = await ProductImportExportService.validateCSVStream(await openImportFile(storagePath));
+
+    if (validation.errorCount > 0) {
+      await supabaseAdmin.storage.from(PRODUCT_IMPORT_BUCKET).remove([storagePath]);
+      return {
+        success: false,
+        error: 'Validation failed',
+        errors: validation.errors,
+        totalRows: 0,
+        successCount: 0,
+        errorCount: validation.errorCount,
+        message: 'Validation failed'
+      };
+    }
+
+    checkpoint = { phase: 'import', lastRow: 1, successCount: 0, errorCount: 0 };
+    await saveCheckpoint(checkpoint, { phase: 'importing', bytesRead: 0, totalBytes, rowsRead: 0, successCount: 0, errorCount: 0 });
+  }
+
+  let latestProgress: JobProgress = {};
+  const result: ImportResult = await ProductImportExportService.importCSVStream(await openImportFile(storagePath), {
+    chunkSize,
+    concurrency,
+    totalBytes,
+    resumeFrom: checkpoint,
+    idSeed: job.id,
+    onProgress: progress => { latestProgress = { phase: 'importing', ...progress }; },
+    onCheckpoint: next => saveCheckpoint({ phase: 'import', ...next }, latestProgress)
+  });
+
+  if (result.successCount > 0) invalidateCacheTags('products', 'categories', 'inventory');
+  await supabaseAdmin.storage.from(PRODUCT_IMPORT_BUCKET).remove([storagePath]);
+  return result;
+};
+
+// inventory.populate
+export interface InventoryPopulatePayload {
+  // 'simple' writes the minimal column set used by the populate-simple utility
+  variant: 'full' | 'simple';
+}
+
+interface InventoryPopulateCheckpoint {
+  lastProductId: string | null;
+  total: number;
+  processed: number;
+  created: number;
+  skipped: number;
+  failed: number;
+}
+
+const inventoryItemFor = (product: any, variant: InventoryPopulatePayload['variant']) => {
+  const base = {
+    product_id: product.id,
+    location_id: 'main_warehouse',
+    location_name: 'Main Warehouse',
+    quantity_on_hand: product.stock_quantity || 0,
+    min_stock_level: product.min_stock_level || 0,
+    unit_cost: product.cost_price || 0,
+    status: 'active'
+  };
+  if (variant === 'simple') return base;
+
+  return {
+    ...base,
+    quantity_reserved: 0,
+    quantity_allocated: 0,
+    quantity_incoming: 0,
+    reorder_point: product.min_stock_level || 0,
+    reorder_quantity: (product.min_stock_level || 0) * 2,
+    is_tracked: true,
+    is_serialized: false,
+    is_perishable: false,
+    requires_quality_check: false,
+    created_by: 'system'
+  };
+};
+
+// Create a main warehouse inventory item for every active product that lacks one,
+// walking products in id order so a retry continues after the last finished chunk
+const populateInventory: JobHandler = async ({ job, checkpoint, saveCheckpoint }: JobContext<InventoryPopulatePayload, InventoryPopulateCheckpoint>) => {
+  const variant = job.payload.variant || 'full';
+  let state = checkpoint;
+
+  if (!state) {
+    const { count, error } = await supabase
+      .from('products')
+      .select('id', { count: 'exact', head: true })
+      .eq('is_active', true);
+    if (error) throw new Error(`Failed to count products: ${error.message}`);
+
+    state = { lastProductId: null, total: count || 0, processed: 0, created: 0, skipped: 0, failed: 0 };
+  }
+
+  while (true) {
+    let query = supabase
+      .from('products')
+      .select('id, stock_quantity, min_stock_level, cost_price')
+      .eq('is_active', true)
+      .order('id', { ascending: true })
+      .limit(POPULATE_CHUNK_SIZE);
+    if (state.lastProductId) query = query.gt('id', state.lastProductId);
+
+    const { data: products, error } = await query;
+    if (error) throw new Error(`Failed to fetch products: ${error.message}`);
+    if (!products || products.length === 0) break;
+
+    const { data: existing, error: existingError } = await supabase
+      .from('inventory_items')
+      .select('product_id')
+      .eq('location_id', 'main_warehouse')
+      .in('product_id', products.map(product => product.id));
+    if (existingError) throw new Error(`Failed to check existing inventory: ${existingError.message}`);
+
+    const stocked = new Set((existing || []).map(item => item.product_id));
+    const missing = products.filter(product => !stocked.has(product.id));
+
+    let created = 0;
+    let failed = 0;
+    await applyWithBisect(
+      missing.map(product => inventoryItemFor(product, variant)),
+      async rows => {
+        const { error: insertError } = await supabase.from('inventory_items').insert(rows);
+        if (insertError) return insertError.message;
+        created += rows.length;
+        return null;
+      },
+      (row, insertError) => {
+        failed++;
+        console.error(`Error creating inventory for product ${row.product_id}:`, insertError);
+      }
+    );
+
+    state = {
+      ...state,
+      lastProductId: products[products.length - 1].id,
+      processed: state.processed + products.length,
+      created: state.created + created,
+      skipped: state.skipped + products.length - missing.length,
+      failed: state.failed + failed
+    };
+    await saveCheckpoint(state, {
+      processed: state.processed,
+      total: state.total,
+      created: state.created,
+      skipped: state.skipped,
+      failed: state.failed
+    });
+  }
+
+  if (state.created > 0) invalidateCacheTags('inventory');
+
+  return {
+    message: 'Inventory population completed',
+    created: state.created,
+    skipped: state.skipped,
+    failed: state.failed,
+    total_products: state.processed
+  };
+};
+
+// inventory.sync_costs
+export interface InventorySyncCostsPayload {
+  incremental: boolean;
+}
+
+// A single statement; a retry simply runs it again
+const syncInventoryCosts: JobHandler = async ({ job }: JobContext<InventorySyncCostsPayload>) => {
+  const { data: result, error } = await supabase.rpc('sync_inventory_costs', {
+    p_incremental: job.payload.incremental === true
+  });
+  if (error) throw new Error(`Failed to sync inventory costs: ${error.message}`);
+
+  if (result.updated > 0) invalidateCacheTags('inventory');
+  return result;
+};
+
+// orders.bulk_fulfill
+export interface BulkFulfillPayload {
+  orderIds: string[];
+  action: BulkFulfillmentAction;
+}
+
+// Chunks are keyed by the job id, so a retry replays the chunks an earlier
+// attempt committed and only applies the rest
+const bulkFulfillOrders: JobHandler = async ({ job, saveCheckpoint }: JobContext<BulkFulfillPayload>) => {
+  const { orderIds, action } = job.payload;
+  let pendingProgress: Promise<void> = Promise.resolve();
+  let aborted: unknown = null;
+  // Cancelling the job (or losing its lease) fails the next checkpoint; stop sending chunks then
+  const controller = new AbortController();
+
+  const result = await OrderFulfillmentService.bulkUpdateOrders(orderIds, action, {
+    idempotencyKey: job.id,
+    signal: controller.signal,
+    onProgress: progress => {
+      pendingProgress = pendingProgress
+        .then(() => saveCheckpoint(null, progress))
+        .catch(error => {
+          aborted = aborted || error;
+          controller.abort(error);
+        });
+    }
+  });
+  await pendingProgress;
+  if (aborted) throw aborted;
+
+  if (!result.success || !result.data) throw new Error(result.message || 'Failed to bulk update orders');
+
+  const { processedCount, failedCount, results, replayedChunks } = result.data;
+  return {
+    processedCount,
+    failedCount,
+    replayedChunks,
+    failures: results.filter(r => !r.success).slice(0, MAX_REPORTED_FAILURES)
+  };
+};
+
+export const JOB_HANDLERS: Record<JobType, JobHandler> = {
+  'products.import': importProducts,
+  'inventory.populate': populateInventory,
+  'inventory.sync_costs': syncInventoryCosts,
+  'orders.bulk_fulfill': bulkFulfillOrders
+};
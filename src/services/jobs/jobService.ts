@@ -0,0 +1,176 @@
+import { supabaseAdmin } from '@/lib/supabaseAdmin';
+import { BackgroundJob, JobProgress, JobStatus, JobType } from '@/types/jobs';
+
+interface ApiResponse<T> {
+  success: boolean;
+  data?: T;
+  message?: string;
+}
+
+export interface EnqueueJobOptions {
+  idempotencyKey?: string | null;
+  maxAttempts?: number;
+  createdBy?: string;
+}
+
+export interface JobFilters {
+  type?: JobType;
+  status?: JobStatus;
+  limit?: number;
+}
+
+// Columns clients see; the checkpoint and lease are worker internals
+const PUBLIC_COLUMNS = 'id, type, status, progress, result, error, attempts, max_attempts, created_by, created_at, started_at, finished_at, updated_at';
+
+/**
+ * Table-backed job queue (background_jobs). Routes enqueue, the JobWorker claims,
+ * checkpoints and finishes jobs.
+ */
+export class JobService {
+  /**
+   * Queue a job. With an idempotency key, a second enqueue returns the first job.
+   */
+  static async enqueue<Payload>(
+    type: JobType,
+    payload: Payload,
+    options: EnqueueJobOptions = {}
+  ): Promise<BackgroundJob<Payload>> {
+    const { data, error } = await supabaseAdmin
+      .from('background_jobs')
+      .insert({
+        type,
+        payload,
+        idempotency_key: options.idempotencyKey || null,
+        max_attempts: options.maxAttempts ?? 3,
+        created_by: options.createdBy || 'system'
+      })
+      .select()
+      .single();
+
+    if (error?.code === '23505' && options.idempotencyKey) {
+      const { data: existing, error: existingError } = await supabaseAdmin
+        .from('background_jobs')
+        .select()
+        .eq('idempotency_key', options.idempotencyKey)
+        .single();
+
+      if (existingError) throw new Error(existingError.message);
+      return existing;
+    }
+
+    if (error) throw new Error(error.message);
+    return data;
+  }
+
+  static async getJob(id: string): Promise<ApiResponse<Partial<BackgroundJob>>> {
+    const { data, error } = await supabaseAdmin
+      .from('background_jobs')
+      .select(PUBLIC_COLUMNS)
+      .eq('id', id)
+      .maybeSingle();
+
+    if (error) {
+      console.error('Error fetching job:', error);
+      return { success: false, message: error.message };
+    }
+    if (!data) {
+      return { success: false, message: 'Job not found' };
+    }
+    return { success: true, data };
+  }
+
+  static async listJobs(filters: JobFilters = {}): Promise<ApiResponse<Partial<BackgroundJob>[]>> {
+    let query = supabaseAdmin
+      .from('background_jobs')
+      .select(PUBLIC_COLUMNS)
+      .order('created_at', { ascending: false })
+      .order('id', { ascending: false })
+      .limit(filters.limit || 20);
+
+    if (filters.type) query = query.eq('type', filters.type);
+    if (filters.status) query = query.eq('status', filters.status);
+
+    const { data, error } = await query;
+    if (error) {
+      console.error('Error listing jobs:', error);
+      return { success: false, message: error.message };
+    }
+    return { success: true, data: data || [] };
+  }
+
+  /**
+   * Cancel a queued or running job. A running job stops at its next checkpoint.
+   */
+  static async cancelJob(id: string): Promise<ApiResponse<Partial<BackgroundJob>>> {
+    const now = new Date().toISOString();
+    const { data, error } = await supabaseAdmin
+      .from('background_jobs')
+      .update({ status: 'cancelled', finished_at: now, locked_by: null, locked_until: null, updated_at: now })
+      .eq('id', id)
+      .in('status', ['queued', 'running'])
+      .select(PUBLIC_COLUMNS)
+      .maybeSingle();
+
+    if (error) {
+      console.error('Error cancelling job:', error);
+      return { success: false, message: error.message };
+    }
+    if (!data) {
+      return { success: false, message: 'Job not found or already finished' };
+    }
+    return { success: true, data };
+  }
+
+  // Worker side
+
+  static async claim(workerId: string, limit: number, leaseSeconds: number): Promise<BackgroundJob[]> {
+    const { data, error } = await supabaseAdmin.rpc('claim_background_jobs', {
+      p_worker: workerId,
+      p_limit: limit,
+      p_lease_seconds: leaseSeconds
+    });
+
+    if (error) throw new Error(error.message);
+    return data || [];
+  }
+
+  /**
+   * Save a checkpoint and renew the lease; false means the job was cancelled
+   * or another worker took it over
+   */
+  static async checkpoint(
+    jobId: string,
+    workerId: string,
+    checkpoint: unknown,
+    progress: JobProgress | null,
+    leaseSeconds: number
+  ): Promise<boolean> {
+    const { data, error } = await supabaseAdmin.rpc('checkpoint_background_job', {
+      p_job_id: jobId,
+      p_worker: workerId,
+      p_checkpoint: checkpoint ?? null,
+      p_progress: progress,
+      p_lease_seconds: leaseSeconds
+    });
+
+    if (error) throw new Error(error.message);
+    return data === true;
+  }
+
+  static async finish(
+    jobId: string,
+    workerId: string,
+    outcome: { result: unknown } | { error: string }
+  ): Promise<void> {
+    const succeeded = 'result' in outcome;
+    const { error } = await supabaseAdmin.rpc('finish_background_job', {
+      p_job_id: jobId,
+      p_worker: workerId,
+      p_succeeded: succeeded,
+      p_result: succeeded ? outcome.result ?? null : null,
+      p_error: succeeded ? null : outcome.error
+    });
+
+    if (error) throw new Error(error.message);
+  }
+}
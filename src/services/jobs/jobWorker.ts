@@ -0,0 +1,138 @@
+// Background job worker (server only).
+// Polls background_jobs, runs up to JOB_WORKER_CONCURRENCY jobs at a time and
+// renews each job's lease while it runs. A worker that dies stops renewing; once
+// the lease runs out another worker claims the job and resumes it from its last
+// checkpoint. Started from src/instrumentation.ts unless JOB_WORKER_ENABLED=false.
+
+import { hostname } from 'os';
+import { randomUUID } from 'crypto';
+import { JobService } from './jobService';
+import { JOB_HANDLERS, JobAbortedError } from './jobHandlers';
+import { BackgroundJob, JobProgress } from '@/types/jobs';
+
+export interface JobWorkerOptions {
+  concurrency: number;
+  pollIntervalMs: number;
+  leaseSeconds: number;
+}
+
+const positiveInt = (value: string | undefined, fallback: number) => {
+  const parsed = parseInt(value || '');
+  return Number.isInteger(parsed) && parsed > 0 ? parsed : fallback;
+};
+
+export const jobWorkerOptionsFromEnv = (): JobWorkerOptions => ({
+  concurrency: positiveInt(process.env.JOB_WORKER_CONCURRENCY, 2),
+  pollIntervalMs: positiveInt(process.env.JOB_WORKER_POLL_MS, 2000),
+  leaseSeconds: positiveInt(process.env.JOB_WORKER_LEASE_SECONDS, 60)
+});
+
+export class JobWorker {
+  readonly id = `${hostname()}:${process.pid}:${randomUUID().slice(0, 8)}`;
+  private running = new Set<string>();
+  private timer: ReturnType<typeof setTimeout> | null = null;
+  private polling = false;
+  private stopped = true;
+
+  constructor(private options: JobWorkerOptions) {}
+
+  start() {
+    if (!this.stopped) return;
+    this.stopped = false;
+    console.log(`Job worker ${this.id} started (concurrency ${this.options.concurrency})`);
+    this.schedule(0);
+  }
+
+  stop() {
+    this.stopped = true;
+    if (this.timer) clearTimeout(this.timer);
+    this.timer = null;
+  }
+
+  // Look for work now instead of at the next poll, e.g. right after an enqueue
+  kick() {
+    if (!this.stopped) this.schedule(0);
+  }
+
+  private schedule(delayMs: number) {
+    if (this.timer) clearTimeout(this.timer);
+    this.timer = setTimeout(() => this.poll(), delayMs);
+    // Never keep the process alive just for polling
+    this.timer.unref?.();
+  }
+
+  private async poll() {
+    if (this.polling || this.stopped) return;
+    this.polling = true;
+
+    try {
+      const free = this.options.concurrency - this.running.size;
+      if (free > 0) {
+        const jobs = await JobService.claim(this.id, free, this.options.leaseSeconds);
+        jobs.forEach(job => this.run(job));
+      }
+    } catch (error) {
+      console.error('Job worker poll failed:', error);
+    } finally {
+      this.polling = false;
+      if (!this.stopped) this.schedule(this.options.pollIntervalMs);
+    }
+  }
+
+  private async run(job: BackgroundJob) {
+    this.running.add(job.id);
+    const { leaseSeconds } = this.options;
+    let owned = true;
+
+    // Keep the lease while a long chunk runs between checkpoints
+    const heartbeat = setInterval(async () => {
+      try {
+        owned = owned && await JobService.checkpoint(job.id, this.id, null, null, leaseSeconds);
+      } catch (error) {
+        console.error(`Failed to renew lease for job ${job.id}:`, error);
+      }
+    }, (leaseSeconds * 1000) / 3);
+    heartbeat.unref?.();
+
+    const saveCheckpoint = async (checkpoint: unknown, progress: JobProgress) => {
+      if (owned) {
+        owned = await JobService.checkpoint(job.id, this.id, checkpoint, progress, leaseSeconds);
+      }
+      if (!owned) throw new JobAbortedError(job.id);
+    };
+
+    try {
+      const handler = JOB_HANDLERS[job.type];
+      if (!handler) throw new Error(`No handler for job type ${job.type}`);
+
+      const result = await handler({ job, checkpoint: job.checkpoint, saveCheckpoint });
+      await JobService.finish(job.id, this.id, { result });
+    } catch (error) {
+      if (error instanceof JobAbortedError) {
+        console.warn(error.message);
+      } else {
+        console.error(`Job ${job.id} (${job.type}) failed on attempt ${job.attempts}:`, error);
+        await JobService.finish(job.id, this.id, {
+          error: error instanceof Error ? error.message : 'Job failed'
+        }).catch(finishError => console.error(`Failed to record failure of job ${job.id}:`, finishError));
+      }
+    } finally {
+      clearInterval(heartbeat);
+      this.running.delete(job.id);
+      this.kick();
+    }
+  }
+}
+
+// One worker per server process, shared by every route bundle
+const globalWorker = globalThis as unknown as { __jobWorker?: JobWorker };
+
+export function getJobWorker(): JobWorker {
+  return globalWorker.__jobWorker ?? (globalWorker.__jobWorker = new JobWorker(jobWorkerOptionsFromEnv()));
+}
+
+export function startJobWorker(): JobWorker {
+  const worker = getJobWorker();
+  worker.start();
+  return worker;
+}
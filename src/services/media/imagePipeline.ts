@@ -0,0 +1,136 @@
+// Image pipeline shared by the processing worker: decode once, then render the
+// optimized image and every thumbnail size from the same bitmap.
+// Uses only APIs available in workers (createImageBitmap, OffscreenCanvas).
+
+import exifr from 'exifr';
+
+export const THUMBNAIL_SIZES = {
+  thumbnail: { width: 150, height: 150 },
+  small: { width: 300, height: 300 },
+  medium: { width: 600, height: 600 },
+  large: { width: 1200, height: 1200 }
+} as const;
+
+export type ThumbnailSize = keyof typeof THUMBNAIL_SIZES;
+
+export type PipelineStep = 'validation' | 'compression' | 'thumbnails' | 'metadata' | 'complete';
+
+export interface PipelineOptions {
+  maxWidth: number;
+  maxHeight: number;
+  quality: number;
+  format: 'webp' | 'jpeg' | 'png';
+  thumbnailQuality: number;
+}
+
+export interface PipelineImage {
+  blob: Blob;
+  width: number;
+  height: number;
+}
+
+export interface PipelineResult {
+  originalDimensions: { width: number; height: number };
+  // Parsed EXIF tags, or null when the image has none
+  exif: Record<string, unknown> | null;
+  optimized: PipelineImage;
+  thumbnails: Record<ThumbnailSize, PipelineImage>;
+}
+
+export class PipelineCancelledError extends Error {
+  constructor() {
+    super('Image processing cancelled');
+    this.name = 'AbortError';
+  }
+}
+
+const MIME_TYPES: Record<PipelineOptions['format'], string> = {
+  webp: 'image/webp',
+  jpeg: 'image/jpeg',
+  png: 'image/png'
+};
+
+// Scale (width, height) down to fit inside the box, never up
+export function fitWithin(width: number, height: number, maxWidth: number, maxHeight: number) {
+  const scale = Math.min(1, maxWidth / width, maxHeight / height);
+  return {
+    width: Math.max(1, Math.round(width * scale)),
+    height: Math.max(1, Math.round(height * scale))
+  };
+}
+
+// Read EXIF tags from the encoded file; null when there are none or they cannot be parsed
+export async function extractExif(source: Blob): Promise<Record<string, unknown> | null> {
+  try {
+    const tags = await exifr.parse(await source.arrayBuffer());
+    return tags && Object.keys(tags).length > 0 ? tags : null;
+  } catch (error) {
+    console.warn('EXIF extraction failed:', error);
+    return null;
+  }
+}
+
+async function render(
+  bitmap: ImageBitmap,
+  box: { width: number; height: number },
+  type: string,
+  quality: number
+): Promise<PipelineImage> {
+  const { width, height } = fitWithin(bitmap.width, bitmap.height, box.width, box.height);
+  const canvas = new OffscreenCanvas(width, height);
+  const context = canvas.getContext('2d');
+  if (!context) throw new Error('2D canvas is not available');
+
+  context.imageSmoothingQuality = 'high';
+  context.drawImage(bitmap, 0, 0, width, height);
+
+  return { blob: await canvas.convertToBlob({ type, quality }), width, height };
+}
+
+export async function processDecodedImage(
+  source: Blob,
+  options: PipelineOptions,
+  onStep: (step: PipelineStep, progress: number) => void,
+  isCancelled: () => boolean
+): Promise<PipelineResult> {
+  const checkCancelled = () => {
+    if (isCancelled()) throw new PipelineCancelledError();
+  };
+
+  onStep('validation', 10);
+  let bitmap: ImageBitmap;
+  try {
+    bitmap = await createImageBitmap(source);
+  } catch {
+    throw new Error('Invalid image file or corrupted data');
+  }
+
+  try {
+    checkCancelled();
+    onStep('metadata', 20);
+    const originalDimensions = { width: bitmap.width, height: bitmap.height };
+    const exif = await extractExif(source);
+
+    onStep('compression', 40);
+    const optimized = await render(
+      bitmap,
+      { width: options.maxWidth, height: options.maxHeight },
+      MIME_TYPES[options.format],
+      options.quality
+    );
+
+    // Largest first, so progress moves with the most expensive work
+    const thumbnails = {} as Record<ThumbnailSize, PipelineImage>;
+    const sizes = (Object.keys(THUMBNAIL_SIZES) as ThumbnailSize[]).reverse();
+    for (let i = 0; i < sizes.length; i++) {
+      checkCancelled();
+      onStep('thumbnails', 70 + Math.round((i / sizes.length) * 30));
+      thumbnails[sizes[i]] = await render(bitmap, THUMBNAIL_SIZES[sizes[i]], 'image/webp', options.thumbnailQuality);
+    }
+
+    onStep('complete', 100);
+    return { originalDimensions, exif, optimized, thumbnails };
+  } finally {
+    bitmap.close();
+  }
+}
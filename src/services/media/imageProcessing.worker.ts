@@ -0,0 +1,38 @@
+/// <reference lib="webworker" />
+// Runs the image pipeline off the main thread. Messages:
+//   in:  { type: 'process', id, file, options } | { type: 'cancel', id }
+//   out: { type: 'progress', id, step, progress } | { type: 'result', id, result }
+//        | { type: 'error', id, message, cancelled }
+
+import { processDecodedImage, PipelineCancelledError } from './imagePipeline';
+
+const cancelled = new Set<number>();
+
+self.onmessage = async (event: MessageEvent) => {
+  const message = event.data;
+
+  if (message.type === 'cancel') {
+    cancelled.add(message.id);
+    return;
+  }
+
+  const { id, file, options } = message;
+  try {
+    const result = await processDecodedImage(
+      file,
+      options,
+      (step, progress) => self.postMessage({ type: 'progress', id, step, progress }),
+      () => cancelled.has(id)
+    );
+    self.postMessage({ type: 'result', id, result });
+  } catch (error) {
+    self.postMessage({
+      type: 'error',
+      id,
+      message: error instanceof Error ? error.message : 'Unknown error',
+      cancelled: error instanceof PipelineCancelledError
+    });
+  } finally {
+    cancelled.delete(id);
+  }
+};
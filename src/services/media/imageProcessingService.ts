@@ -2,6 +2,8 @@
 // Handles image optimization, resizing, thumbnail generation, and metadata extraction
 
 import imageCompression from 'browser-image-compression';
+import { PipelineImage, PipelineOptions, PipelineStep, extractExif } from './imagePipeline';
+import { ImageWorkerPool, defaultPoolSize } from './imageWorkerPool';
 
 export interface ImageProcessingOptions {
   maxWidth?: number;
@@ -47,23 +49,139 @@ export interface ProcessingProgress {
   message: string;
 }
 
+export interface BatchProcessingOptions {
+  concurrency?: number; // Workers decoding images at once (default: cores - 1, at most 4)
+  signal?: AbortSignal; // Aborting rejects the batch with an AbortError and stops all workers
+  onFileComplete?: (fileIndex: number, completed: number, total: number) => void;
+  onFileError?: (fileIndex: number, error: Error) => void;
+  mainThread?: boolean; // Force the sequential main-thread path (benchmarks, debugging)
+}
+
+export interface ProcessedImageResult {
+  optimizedImage: ProcessedImage;
+  thumbnails: Record<keyof ThumbnailSizes, ProcessedImage>;
+  metadata: ImageMetadata;
+}
+
+const STEP_MESSAGES: Record<PipelineStep, string> = {
+  validation: 'Validating image...',
+  metadata: 'Extracting metadata...',
+  compression: 'Optimizing image...',
+  thumbnails: 'Generating thumbnails...',
+  complete: 'Processing complete'
+};
+
+const FILE_EXTENSIONS: Record<string, string> = {
+  'image/webp': 'webp',
+  'image/jpeg': 'jpg',
+  'image/png': 'png'
+};
+
+const isAbortError = (error: unknown) => error instanceof Error && error.name === 'AbortError';
+
 export class ImageProcessingService {
   private static readonly DEFAULT_QUALITY = 0.8;
   private static readonly MAX_FILE_SIZE = 10 * 1024 * 1024; // 10MB
   private static readonly SUPPORTED_FORMATS = ['image/jpeg', 'image/jpg', 'image/png', 'image/webp'];
 
   /**
-   * Process a single image with optimization and thumbnail generation
+   * Process a single image with optimization and thumbnail generation.
+   * Runs in a worker when the browser supports it.
    */
   static async processImage(
     file: File,
     options: ImageProcessingOptions = {},
     onProgress?: (progress: ProcessingProgress) => void
-  ): Promise<{
-    optimizedImage: ProcessedImage;
-    thumbnails: Record<keyof ThumbnailSizes, ProcessedImage>;
-    metadata: ImageMetadata;
-  }> {
+  ): Promise<ProcessedImageResult> {
+    if (!ImageWorkerPool.isSupported()) {
+      return this.processImageOnMainThread(file, options, onProgress);
+    }
+
+    const pool = new ImageWorkerPool(1);
+    try {
+      return await this.processImageInPool(pool, file, options, onProgress);
+    } catch (error) {
+      if (isAbortError(error)) throw error;
+      throw new Error(`Image processing failed: ${error instanceof Error ? error.message : 'Unknown error'}`);
+    } finally {
+      pool.terminate();
+    }
+  }
+
+  /**
+   * Process an image in a worker: one decode, all sizes rendered from the same bitmap
+   */
+  private static async processImageInPool(
+    pool: ImageWorkerPool,
+    file: File,
+    options: ImageProcessingOptions,
+    onProgress?: (progress: ProcessingProgress) => void,
+    signal?: AbortSignal
+  ): Promise<ProcessedImageResult> {
+    this.checkFileConstraints(file);
+
+    const pipelineOptions: PipelineOptions = {
+      maxWidth: options.maxWidth || 1920,
+      maxHeight: options.maxHeight || 1080,
+      quality: options.quality || this.DEFAULT_QUALITY,
+      format: options.format || 'webp',
+      thumbnailQuality: 0.8
+    };
+
+    const result = await pool.run(file, pipelineOptions, {
+      signal,
+      onProgress: (step, progress) => onProgress?.({ step, progress, message: STEP_MESSAGES[step] })
+    });
+
+    const baseName = file.name.replace(/\.[^.]+$/, '');
+    const toProcessedImage = (image: PipelineImage, suffix: string, quality: number): ProcessedImage => {
+      const extension = FILE_EXTENSIONS[image.blob.type] || 'img';
+      const output = new File([image.blob], `${baseName}${suffix}.${extension}`, { type: image.blob.type });
+      return {
+        file: output,
+        width: image.width,
+        height: image.height,
+        size: output.size,
+        format: output.type,
+        quality
+      };
+    };
+
+    const optimizedImage = toProcessedImage(result.optimized, '', pipelineOptions.quality);
+    const thumbnails = {} as Record<keyof ThumbnailSizes, ProcessedImage>;
+    for (const [sizeKey, image] of Object.entries(result.thumbnails)) {
+      thumbnails[sizeKey as keyof ThumbnailSizes] = toProcessedImage(image, `_${sizeKey}`, pipelineOptions.thumbnailQuality);
+    }
+
+    // EXIF was read in the worker along with the other metadata
+    const exifData = result.exif;
+
+    return {
+      optimizedImage,
+      thumbnails,
+      metadata: {
+        originalName: file.name,
+        originalSize: file.size,
+        originalDimensions: result.originalDimensions,
+        processedSize: optimizedImage.size,
+        processedDimensions: { width: optimizedImage.width, height: optimizedImage.height },
+        compressionRatio: ((file.size - optimizedImage.size) / file.size) * 100,
+        format: optimizedImage.format,
+        hasExif: !!exifData,
+        exifData: options.preserveExif ? exifData : undefined,
+        createdAt: new Date().toISOString()
+      }
+    };
+  }
+
+  /**
+   * Main-thread fallback for browsers without OffscreenCanvas in workers
+   */
+  private static async processImageOnMainThread(
+    file: File,
+    options: ImageProcessingOptions = {},
+    onProgress?: (progress: ProcessingProgress) => void
+  ): Promise<ProcessedImageResult> {
     try {
       // Step 1: Validation
       onProgress?.({
@@ -145,6 +263,20 @@ export class ImageProcessingService {
    * Validate image file
    */
   private static async validateImage(file: File): Promise<void> {
+    this.checkFileConstraints(file);
+
+    // Check if file is actually an image
+    try {
+      await this.getImageDimensions(file);
+    } catch (error) {
+      throw new Error('Invalid image file or corrupted data');
+    }
+  }
+
+  /**
+   * Check file type and size without decoding the image
+   */
+  private static checkFileConstraints(file: File): void {
     // Check file type
     if (!this.SUPPORTED_FORMATS.includes(file.type)) {
       throw new Error(`Unsupported file type: ${file.type}. Supported types: ${this.SUPPORTED_FORMATS.join(', ')}`);
@@ -154,13 +286,6 @@ export class ImageProcessingService {
     if (file.size > this.MAX_FILE_SIZE) {
       throw new Error(`File size too large: ${this.formatFileSize(file.size)}. Maximum allowed: ${this.formatFileSize(this.MAX_FILE_SIZE)}`);
     }
-
-    // Check if file is actually an image
-    try {
-      await this.getImageDimensions(file);
-    } catch (error) {
-      throw new Error('Invalid image file or corrupted data');
-    }
   }
 
   /**
@@ -280,59 +405,60 @@ export class ImageProcessingService {
   }
 
   /**
-   * Extract EXIF data from image
+   * Extract EXIF data on the main thread (fallback path only; workers read it themselves)
    */
   private static async extractExifData(file: File): Promise<any> {
-    try {
-      // For browser environment, we'll use a simpler approach
-      // In a full implementation, you'd use exifr library
-      return {
-        extracted: false,
-        reason: 'EXIF extraction not implemented in browser environment'
-      };
-    } catch (error) {
-      console.warn('EXIF extraction failed:', error);
-      return null;
-    }
+    return extractExif(file);
   }
 
   /**
-   * Batch process multiple images
+   * Batch process multiple images on a bounded pool of workers.
+   * Files that fail are skipped (and reported through onFileError); results keep input order.
    */
   static async processImageBatch(
     files: File[],
     options: ImageProcessingOptions = {},
-    onProgress?: (fileIndex: number, progress: ProcessingProgress) => void
-  ): Promise<Array<{
-    originalFile: File;
-    optimizedImage: ProcessedImage;
-    thumbnails: Record<keyof ThumbnailSizes, ProcessedImage>;
-    metadata: ImageMetadata;
-  }>> {
-    const results = [];
-
-    for (let i = 0; i < files.length; i++) {
-      const file = files[i];
-      
+    onProgress?: (fileIndex: number, progress: ProcessingProgress) => void,
+    batchOptions: BatchProcessingOptions = {}
+  ): Promise<Array<ProcessedImageResult & { originalFile: File }>> {
+    const { signal, onFileComplete, onFileError } = batchOptions;
+    const results: Array<ProcessedImageResult & { originalFile: File }> = new Array(files.length);
+    let completed = 0;
+
+    const processOne = async (file: File, index: number, run: () => Promise<ProcessedImageResult>) => {
       try {
-        const result = await this.processImage(
-          file, 
-          options, 
-          (progress) => onProgress?.(i, progress)
-        );
-
-        results.push({
-          originalFile: file,
-          ...result
-        });
-
+        results[index] = { originalFile: file, ...(await run()) };
       } catch (error) {
+        if (isAbortError(error)) throw error;
         console.error(`Failed to process file ${file.name}:`, error);
-        // Continue with other files
+        onFileError?.(index, error instanceof Error ? error : new Error(String(error)));
+      }
+      completed++;
+      onFileComplete?.(index, completed, files.length);
+    };
+
+    if (batchOptions.mainThread || !ImageWorkerPool.isSupported()) {
+      for (let i = 0; i < files.length; i++) {
+        if (signal?.aborted) throw new DOMException('Image processing cancelled', 'AbortError');
+        await processOne(files[i], i, () =>
+          this.processImageOnMainThread(files[i], options, (progress) => onProgress?.(i, progress))
+        );
       }
+      return results.filter(Boolean);
+    }
+
+    const pool = new ImageWorkerPool(batchOptions.concurrency || defaultPoolSize());
+    try {
+      await Promise.all(files.map((file, i) =>
+        processOne(file, i, () =>
+          this.processImageInPool(pool, file, options, (progress) => onProgress?.(i, progress), signal)
+        )
+      ));
+    } finally {
+      pool.terminate();
     }
 
-    return results;
+    return results.filter(Boolean);
   }
 
   /**
@@ -0,0 +1,150 @@
+// Fixed-size pool of image processing workers. Tasks queue until a worker is
+// free, so at most `size` images are decoded at once.
+
+import type { PipelineOptions, PipelineResult, PipelineStep } from './imagePipeline';
+
+export interface WorkerTaskOptions {
+  onProgress?: (step: PipelineStep, progress: number) => void;
+  signal?: AbortSignal;
+}
+
+interface Task {
+  id: number;
+  file: Blob;
+  options: PipelineOptions;
+  onProgress?: WorkerTaskOptions['onProgress'];
+  resolve: (result: PipelineResult) => void;
+  reject: (error: Error) => void;
+  settled: boolean;
+}
+
+interface PoolWorker {
+  worker: Worker;
+  // Task the worker is running; a cancelled task keeps the worker busy until it replies
+  task: Task | null;
+}
+
+const abortError = () => new DOMException('Image processing cancelled', 'AbortError');
+
+// Leave a core for the main thread, and cap memory use from decoded bitmaps
+export function defaultPoolSize(): number {
+  const cores = typeof navigator !== 'undefined' ? navigator.hardwareConcurrency || 2 : 2;
+  return Math.max(1, Math.min(4, cores - 1));
+}
+
+export class ImageWorkerPool {
+  private workers: PoolWorker[] = [];
+  private queue: Task[] = [];
+  private nextId = 1;
+  private terminated = false;
+
+  constructor(private size: number = defaultPoolSize()) {}
+
+  static isSupported(): boolean {
+    return typeof Worker !== 'undefined' &&
+      typeof OffscreenCanvas !== 'undefined' &&
+      typeof createImageBitmap !== 'undefined';
+  }
+
+  run(file: Blob, options: PipelineOptions, taskOptions: WorkerTaskOptions = {}): Promise<PipelineResult> {
+    if (this.terminated) return Promise.reject(new Error('Worker pool has been terminated'));
+    if (taskOptions.signal?.aborted) return Promise.reject(abortError());
+
+    return new Promise<PipelineResult>((resolve, reject) => {
+      const task: Task = {
+        id: this.nextId++,
+        file,
+        options,
+        onProgress: taskOptions.onProgress,
+        resolve,
+        reject,
+        settled: false
+      };
+
+      taskOptions.signal?.addEventListener('abort', () => this.cancel(task), { once: true });
+
+      this.queue.push(task);
+      this.dispatch();
+    });
+  }
+
+  // Stop all workers; queued and running tasks are rejected
+  terminate() {
+    this.terminated = true;
+    for (const task of this.queue) this.settle(task, undefined, abortError());
+    this.queue = [];
+    for (const poolWorker of this.workers) {
+      if (poolWorker.task) this.settle(poolWorker.task, undefined, abortError());
+      poolWorker.worker.terminate();
+    }
+    this.workers = [];
+  }
+
+  private cancel(task: Task) {
+    if (task.settled) return;
+
+    const queued = this.queue.indexOf(task);
+    if (queued >= 0) {
+      this.queue.splice(queued, 1);
+    } else {
+      const owner = this.workers.find(poolWorker => poolWorker.task === task);
+      owner?.worker.postMessage({ type: 'cancel', id: task.id });
+    }
+    this.settle(task, undefined, abortError());
+  }
+
+  private settle(task: Task, result?: PipelineResult, error?: Error) {
+    if (task.settled) return;
+    task.settled = true;
+    if (error) task.reject(error);
+    else task.resolve(result!);
+  }
+
+  private dispatch() {
+    while (this.queue.length > 0) {
+      const poolWorker = this.idleWorker();
+      if (!poolWorker) return;
+
+      const task = this.queue.shift()!;
+      poolWorker.task = task;
+      poolWorker.worker.postMessage({ type: 'process', id: task.id, file: task.file, options: task.options });
+    }
+  }
+
+  private idleWorker(): PoolWorker | undefined {
+    const idle = this.workers.find(poolWorker => !poolWorker.task);
+    if (idle || this.workers.length >= this.size) return idle;
+
+    const poolWorker: PoolWorker = {
+      worker: new Worker(new URL('./imageProcessing.worker.ts', import.meta.url), { type: 'module' }),
+      task: null
+    };
+    poolWorker.worker.onmessage = (event: MessageEvent) => this.handleMessage(poolWorker, event.data);
+    poolWorker.worker.onerror = (event: ErrorEvent) => {
+      if (poolWorker.task) this.settle(poolWorker.task, undefined, new Error(event.message || 'Worker failed'));
+      poolWorker.task = null;
+      this.dispatch();
+    };
+    this.workers.push(poolWorker);
+    return poolWorker;
+  }
+
+  private handleMessage(poolWorker: PoolWorker, message: any) {
+    const task = poolWorker.task;
+    if (!task || message.id !== task.id) return;
+
+    if (message.type === 'progress') {
+      if (!task.settled) task.onProgress?.(message.step, message.progress);
+      return;
+    }
+
+    if (message.type === 'result') {
+      this.settle(task, message.result);
+    } else {
+      this.settle(task, undefined, message.cancelled ? abortError() : new Error(message.message));
+    }
+
+    poolWorker.task = null;
+    this.dispatch();
+  }
+}
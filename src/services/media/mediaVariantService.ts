@@ -0,0 +1,189 @@
+// Server-side image derivatives for product media.
+// Fixed-size WebP and AVIF variants are generated once (on upload, or on the
+// first request for an older image), stored next to the original under
+// `variants/`, and recorded in media.variants. Server only: depends on sharp.
+
+import sharp from 'sharp';
+import { supabaseAdmin } from '@/lib/supabaseAdmin';
+import { mapWithConcurrency } from '@/lib/batch';
+import { THUMBNAIL_SIZES, type ThumbnailSize } from './imagePipeline';
+
+// Same size boxes as the client-side upload pipeline
+export const MEDIA_VARIANT_SIZES = THUMBNAIL_SIZES;
+
+export type MediaVariantSize = ThumbnailSize;
+export type MediaVariantFormat = 'avif' | 'webp';
+
+export interface MediaVariant {
+  width: number;
+  height: number;
+  webp: string; // Storage path
+  avif: string;
+}
+
+export type MediaVariants = Partial<Record<MediaVariantSize, MediaVariant>>;
+
+// Variant paths never change once written, so they can be cached forever
+export const IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable';
+const STORAGE_CACHE_SECONDS = '31536000';
+const UPLOAD_CONCURRENCY = 4;
+
+const ENCODERS: Record<MediaVariantFormat, (image: sharp.Sharp) => sharp.Sharp> = {
+  webp: image => image.webp({ quality: 80 }),
+  avif: image => image.avif({ quality: 50, effort: 4 })
+};
+
+const CONTENT_TYPES: Record<MediaVariantFormat, string> = {
+  webp: 'image/webp',
+  avif: 'image/avif'
+};
+
+interface MediaRecord {
+  id: string;
+  file_path: string;
+  bucket_name: string;
+  mime_type?: string | null;
+  variants?: MediaVariants | null;
+  variants_generated_at?: string | null;
+}
+
+// Generations in progress by media id, shared by every route bundle in this process,
+// so concurrent first requests for an image download and encode it only once
+const globalGenerations = globalThis as unknown as { __mediaVariantGenerations?: Map<string, Promise<MediaVariants>> };
+const pendingGenerations = globalGenerations.__mediaVariantGenerations ??
+  (globalGenerations.__mediaVariantGenerations = new Map());
+
+export class MediaVariantService {
+  static isImage(mimeType?: string | null): boolean {
+    return !!mimeType && mimeType.startsWith('image/') && mimeType !== 'image/svg+xml';
+  }
+
+  static hasVariants(media: Pick<MediaRecord, 'variants'>): boolean {
+    return !!media.variants && Object.keys(media.variants).length > 0;
+  }
+
+  // products/<id>/<usage>/<name>.jpg -> products/<id>/<usage>/variants/<name>_thumbnail.webp
+  static variantPath(filePath: string, size: MediaVariantSize, format: MediaVariantFormat): string {
+    const slash = filePath.lastIndexOf('/');
+    const directory = slash >= 0 ? filePath.slice(0, slash + 1) : '';
+    const baseName = filePath.slice(slash + 1).replace(/\.[^.]+$/, '');
+    return `${directory}variants/${baseName}_${size}.${format}`;
+  }
+
+  static allVariantPaths(variants?: MediaVariants | null): string[] {
+    return Object.values(variants || {}).flatMap(variant => variant ? [variant.webp, variant.avif] : []);
+  }
+
+  /**
+   * Render every size in both formats from one decoded original and upload them
+   */
+  static async generateVariants(original: Buffer, bucketName: string, filePath: string): Promise<MediaVariants> {
+    // Decode once (applying EXIF orientation); each size is rendered from this raw bitmap
+    const { data, info } = await sharp(original, { failOn: 'none' })
+      .rotate()
+      .raw()
+      .toBuffer({ resolveWithObject: true });
+    const decoded = () => sharp(data, { raw: { width: info.width, height: info.height, channels: info.channels } });
+
+    const jobs = (Object.keys(MEDIA_VARIANT_SIZES) as MediaVariantSize[]).flatMap(size =>
+      (Object.keys(ENCODERS) as MediaVariantFormat[]).map(format => ({ size, format }))
+    );
+
+    const variants: MediaVariants = {};
+    await mapWithConcurrency(jobs, UPLOAD_CONCURRENCY, async ({ size, format }) => {
+      const box = MEDIA_VARIANT_SIZES[size];
+      const { data: encoded, info: encodedInfo } = await ENCODERS[format](
+        decoded().resize(box.width, box.height, { fit: 'inside', withoutEnlargement: true })
+      ).toBuffer({ resolveWithObject: true });
+
+      const path = this.variantPath(filePath, size, format);
+      const { error } = await supabaseAdmin.storage
+        .from(bucketName)
+        .upload(path, encoded, {
+          contentType: CONTENT_TYPES[format],
+          cacheControl: STORAGE_CACHE_SECONDS,
+          upsert: true
+        });
+
+      if (error) {
+        throw new Error(`Failed to store ${size} ${format} variant: ${error.message}`);
+      }
+
+      const variant = variants[size] || (variants[size] = { width: encodedInfo.width, height: encodedInfo.height, webp: '', avif: '' });
+      variant[format] = path;
+    });
+
+    return variants;
+  }
+
+  /**
+   * Generate variants for a media row and record them; returns the stored variants
+   */
+  static async createVariantsForMedia(media: MediaRecord, original?: Buffer): Promise<MediaVariants> {
+    let source = original;
+    if (!source) {
+      const { data, error } = await supabaseAdmin.storage
+        .from(media.bucket_name)
+        .download(media.file_path);
+
+      if (error || !data) {
+        throw new Error(`Failed to download original: ${error?.message || 'not found'}`);
+      }
+      source = Buffer.from(await data.arrayBuffer());
+    }
+
+    const variants = await this.generateVariants(source, media.bucket_name, media.file_path);
+
+    const { error } = await supabaseAdmin
+      .from('media')
+      .update({ variants, variants_generated_at: new Date().toISOString() })
+      .eq('id', media.id);
+
+    if (error) {
+      throw new Error(`Failed to record variants: ${error.message}`);
+    }
+
+    return variants;
+  }
+
+  /**
+   * Stored variants for a media row, generating them first when it has none.
+   * All sizes are generated together, so concurrent callers for the same media
+   * share one generation whichever size they asked for.
+   */
+  static async ensureVariants(media: MediaRecord): Promise<MediaVariants> {
+    if (this.hasVariants(media)) return media.variants!;
+
+    const inFlight = pendingGenerations.get(media.id);
+    if (inFlight) return inFlight;
+
+    const generation = this.createVariantsForMedia(media).finally(() => {
+      pendingGenerations.delete(media.id);
+    });
+    pendingGenerations.set(media.id, generation);
+    return generation;
+  }
+
+  // Public storage URL; served by Supabase Storage (and its CDN) with the long cache headers set on upload
+  static publicUrl(bucketName: string, path: string): string {
+    return `${process.env.NEXT_PUBLIC_SUPABASE_URL}/storage/v1/object/public/${bucketName}/${path}`;
+  }
+
+  /**
+   * Stable URL for a variant, served by /api/media/[id]/variants/[size] with immutable
+   * caching; the version changes whenever variants are regenerated
+   */
+  static variantUrl(media: Pick<MediaRecord, 'id' | 'variants_generated_at'>, size: MediaVariantSize): string {
+    const version = media.variants_generated_at ? new Date(media.variants_generated_at).getTime() : 0;
+    return `/api/media/${media.id}/variants/${size}?v=${version}`;
+  }
+
+  // Prefer AVIF when the client accepts it, otherwise WebP
+  static negotiateFormat(accept: string | null): MediaVariantFormat {
+    return accept?.includes('image/avif') ? 'avif' : 'webp';
+  }
+
+  static contentType(format: MediaVariantFormat): string {
+    return CONTENT_TYPES[format];
+  }
+}
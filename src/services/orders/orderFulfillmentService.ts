@@ -1,5 +1,13 @@
 import { supabase } from '@/lib/supabaseClient';
 import { Order } from '@/types';
+import { chunk, mapWithConcurrency } from '@/lib/batch';
+import { OrderService, STOCK_SETTLING_STATUSES } from './orderService';
+
+// Orders per bulk_fulfill_orders call, and calls in flight at once
+export const BULK_FULFILL_CHUNK_SIZE = 500;
+export const BULK_FULFILL_CONCURRENCY = 4;
+
+export type BulkFulfillmentAction = 'start_processing' | 'mark_shipped' | 'mark_delivered' | 'cancel';
 
 interface ApiResponse<T> {
   success: boolean;
@@ -30,6 +38,7 @@ interface BulkUpdateResult {
     success: boolean;
     error?: string;
   }>;
+  replayedChunks: number;
 }
 
 export class OrderFulfillmentService {
@@ -89,6 +98,11 @@ export class OrderFulfillmentService {
         };
       }
 
+      OrderService.invalidateOrderStats();
+      if (STOCK_SETTLING_STATUSES.includes(status)) {
+        OrderService.invalidateOrderStock();
+      }
+
       // Update order items status if needed
       if (['shipped', 'delivered', 'cancelled'].includes(status)) {
         await supabase
@@ -114,53 +128,71 @@ export class OrderFulfillmentService {
   }
 
   /**
-   * Bulk update multiple orders
+   * Bulk update multiple orders.
+   * Orders go to the bulk_fulfill_orders RPC in chunks, each applied in one
+   * transaction, with at most BULK_FULFILL_CONCURRENCY chunks in flight. With an
+   * idempotency key, chunks that already went through are replayed, not reapplied.
+   * Aborting `signal` stops new chunks from being sent.
    */
   static async bulkUpdateOrders(
     orderIds: string[],
-    action: 'start_processing' | 'mark_packed' | 'mark_shipped' | 'mark_delivered' | 'cancel'
+    action: BulkFulfillmentAction,
+    options: {
+      idempotencyKey?: string | null;
+      onProgress?: (progress: { processed: number; total: number; failed: number }) => void;
+      signal?: AbortSignal;
+    } = {}
   ): Promise<ApiResponse<BulkUpdateResult>> {
     try {
-      const actionToStatus: Record<string, string> = {
-        'start_processing': 'processing',
-        'mark_packed': 'packed',
-        'mark_shipped': 'shipped',
-        'mark_delivered': 'delivered',
-        'cancel': 'cancelled'
-      };
+      let processed = 0;
+      let failed = 0;
 
-      const newStatus = actionToStatus[action];
-      const results = await Promise.all(
-        orderIds.map(async (orderId) => {
-          try {
-            const result = await this.updateOrderStatus(orderId, newStatus);
-            return {
-              orderId,
-              success: result.success,
-              error: result.message
-            };
-          } catch (error) {
-            return {
-              orderId,
-              success: false,
-              error: 'Failed to process order'
-            };
-          }
-        })
+      const chunkResults = await mapWithConcurrency(
+        chunk(orderIds, BULK_FULFILL_CHUNK_SIZE),
+        BULK_FULFILL_CONCURRENCY,
+        async (ids, chunkIndex): Promise<{ results: BulkUpdateResult['results']; replayed: boolean }> => {
+          const { data, error } = await supabase.rpc('bulk_fulfill_orders', {
+            p_order_ids: ids,
+            p_action: action,
+            p_idempotency_key: options.idempotencyKey ?? null,
+            p_chunk_index: chunkIndex
+          });
+
+          const chunkResult = error
+            ? { results: ids.map(orderId => ({ orderId, success: false, error: error.message })), replayed: false }
+            : data;
+          if (error) console.error(`Error fulfilling orders chunk ${chunkIndex}:`, error);
+
+          processed += ids.length;
+          failed += chunkResult.results.filter((r: { success: boolean }) => !r.success).length;
+          options.onProgress?.({ processed, total: orderIds.length, failed });
+          return chunkResult;
+        },
+        options.signal
       );
 
+      const results = chunkResults.flatMap(chunkResult => chunkResult.results);
       const processedCount = results.filter(r => r.success).length;
-      const failedCount = results.filter(r => !r.success).length;
+
+      if (processedCount > 0) {
+        OrderService.invalidateOrderStats();
+        if (['mark_shipped', 'mark_delivered', 'cancel'].includes(action)) {
+          OrderService.invalidateOrderStock();
+        }
+      }
 
       return {
         success: true,
         data: {
           processedCount,
-          failedCount,
-          results
+          failedCount: results.length - processedCount,
+          results,
+          replayedChunks: chunkResults.filter(chunkResult => chunkResult.replayed).length
         }
       };
     } catch (error) {
+      // Aborted by the caller: let it see its own reason
+      if (options.signal?.aborted) throw options.signal.reason;
       console.error('Error in bulkUpdateOrders:', error);
       return {
         success: false,
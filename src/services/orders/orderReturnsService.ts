@@ -1,4 +1,5 @@
 import { supabase } from '@/lib/supabaseClient';
+import { OrderService } from './orderService';
 
 interface ApiResponse<T> {
   success: boolean;
@@ -247,6 +248,7 @@ export class OrderReturnsService {
             updated_at: new Date().toISOString()
           })
           .eq('id', data.order_id);
+        OrderService.invalidateOrderStats();
       }
 
       // Add to order timeline
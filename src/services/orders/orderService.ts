@@ -1,4 +1,6 @@
 import { supabase } from '@/lib/supabaseClient';
+import { TtlCache } from '@/lib/ttlCache';
+import { invalidateCacheTags } from '@/lib/responseCache';
 import { Order, CreateOrderRequest, OrderItem, OrderFilters, OrderStats } from '@/types';
 
 interface ApiResponse<T> {
@@ -13,6 +15,15 @@ interface ApiResponse<T> {
   };
 }
 
+// Order stats are served from memory for this long unless an order write invalidates them
+export const ORDER_STATS_TTL_MS = 30_000;
+
+const orderStatsCache = new TtlCache<ApiResponse<OrderStats>>(ORDER_STATS_TTL_MS);
+
+// Moving an order into one of these settles its stock reservations (released on
+// cancel, consumed on ship/deliver; see create_order_function.sql)
+export const STOCK_SETTLING_STATUSES = ['shipped', 'delivered', 'cancelled'];
+
 export class OrderService {
   /**
    * Get all orders with filtering and pagination
@@ -165,176 +176,62 @@ export class OrderService {
    */
   static async createOrder(orderData: CreateOrderRequest): Promise<ApiResponse<Order>> {
     try {
-      // Calculate subtotal from items
-      const subtotal = orderData.items.reduce((sum, item) => {
-        const unitPrice = item.unit_price || 0;
-        return sum + (item.quantity * unitPrice);
-      }, 0);
-
-      // Calculate tax (8% default)
-      const taxAmount = subtotal * 0.08;
-      
-      // Calculate shipping (free over $100, otherwise $10)
-      const shippingAmount = orderData.shipping_amount || (subtotal > 100 ? 0 : 10);
-      
-      // Calculate discount
-      const discountAmount = orderData.discount_amount || 0;
-      
-      // Calculate total
-      const totalAmount = subtotal + taxAmount + shippingAmount - discountAmount;
-
-      // Validate products exist and are active
-      const productIds = orderData.items.map(item => item.product_id);
-      const { data: products, error: productError } = await supabase
-        .from('products')
-        .select('id, name, sku, selling_price, stock_quantity, is_active')
-        .in('id', productIds);
-
-      if (productError) {
-        console.error('Error validating products:', productError);
-        return {
-          success: false,
-          message: 'Failed to validate products'
-        };
-      }
-
-      // Check if all products exist and are active
-      const foundProductIds = products?.map(p => p.id) || [];
-      const missingProducts = productIds.filter(id => !foundProductIds.includes(id));
-      
-      if (missingProducts.length > 0) {
-        return {
-          success: false,
-          message: `Products not found: ${missingProducts.join(', ')}`
-        };
-      }
-
-      // Check if products are active and have sufficient stock
-      const productMap = new Map(products?.map(p => [p.id, p]) || []);
-      const validationErrors = [];
-      
-      for (const item of orderData.items) {
-        const product = productMap.get(item.product_id);
-        
-        if (!product?.is_active) {
-          validationErrors.push(`Product ${product?.name || item.product_id} is not available`);
-          continue;
-        }
-        
-        if (product.stock_quantity < item.quantity) {
-          validationErrors.push(`Insufficient stock for ${product.name}. Available: ${product.stock_quantity}, Requested: ${item.quantity}`);
-          continue;
-        }
-        
-        // Validate price isn't too far from the actual product price (allow 10% variance)
-        const priceVariance = Math.abs(item.unit_price - product.selling_price) / product.selling_price;
-        if (priceVariance > 0.1) {
-          validationErrors.push(`Price for ${product.name} is significantly different from current price`);
-        }
-      }
-      
-      if (validationErrors.length > 0) {
-        return {
-          success: false,
-          message: validationErrors.join(', ')
-        };
-      }
-
-      // Prepare order data
-      const orderInsert = {
-        customer_id: orderData.customer_id,
-        status: 'pending',
-        subtotal,
-        tax_amount: taxAmount,
-        shipping_amount: shippingAmount,
-        discount_amount: discountAmount,
-        total_amount: totalAmount,
-        currency: 'USD',
-        payment_status: 'pending',
-        payment_method: orderData.payment_method,
-        // Shipping address
-        shipping_name: orderData.shipping_address.name,
-        shipping_address_line_1: orderData.shipping_address.address_line_1,
-        shipping_address_line_2: orderData.shipping_address.address_line_2,
-        shipping_city: orderData.shipping_address.city,
-        shipping_state: orderData.shipping_address.state,
-        shipping_postal_code: orderData.shipping_address.postal_code,
-        shipping_country: orderData.shipping_address.country,
-        shipping_phone: orderData.shipping_address.phone,
-        // Billing address (if provided)
-        billing_name: orderData.billing_address?.name,
-        billing_address_line_1: orderData.billing_address?.address_line_1,
-        billing_address_line_2: orderData.billing_address?.address_line_2,
-        billing_city: orderData.billing_address?.city,
-        billing_state: orderData.billing_address?.state,
-        billing_postal_code: orderData.billing_address?.postal_code,
-        billing_country: orderData.billing_address?.country,
-        billing_phone: orderData.billing_address?.phone,
-        notes: orderData.notes
-      };
-
-      // Create order first
-      const { data: order, error: orderError } = await supabase
-        .from('orders')
-        .insert([orderInsert])
-        .select()
-        .single();
+      // Validation, product snapshots, totals, the order and item inserts and the
+      // stock reservation all happen in one transaction inside create_order
+      const { data: result, error } = await supabase.rpc('create_order', {
+        p_order: {
+          customer_id: orderData.customer_id,
+          payment_method: orderData.payment_method,
+          shipping_amount: orderData.shipping_amount,
+          discount_amount: orderData.discount_amount,
+          // Shipping address
+          shipping_name: orderData.shipping_address.name,
+          shipping_address_line_1: orderData.shipping_address.address_line_1,
+          shipping_address_line_2: orderData.shipping_address.address_line_2,
+          shipping_city: orderData.shipping_address.city,
+          shipping_state: orderData.shipping_address.state,
+          shipping_postal_code: orderData.shipping_address.postal_code,
+          shipping_country: orderData.shipping_address.country,
+          shipping_phone: orderData.shipping_address.phone,
+          // Billing address (if provided)
+          billing_name: orderData.billing_address?.name,
+          billing_address_line_1: orderData.billing_address?.address_line_1,
+          billing_address_line_2: orderData.billing_address?.address_line_2,
+          billing_city: orderData.billing_address?.city,
+          billing_state: orderData.billing_address?.state,
+          billing_postal_code: orderData.billing_address?.postal_code,
+          billing_country: orderData.billing_address?.country,
+          billing_phone: orderData.billing_address?.phone,
+          notes: orderData.notes
+        },
+        p_items: orderData.items.map(item => ({
+          product_id: item.product_id,
+          quantity: item.quantity,
+          unit_price: item.unit_price
+        }))
+      });
 
-      if (orderError) {
-        console.error('Error creating order:', orderError);
+      if (error) {
+        console.error('Error creating order:', error);
         return {
           success: false,
-          message: orderError.message
+          message: error.message
         };
       }
 
-      // Create order items
-      const orderItems = orderData.items.map(item => ({
-        order_id: order.id,
-        product_id: item.product_id,
-        product_name: `Product ${item.product_id}`, // This should come from products table
-        product_sku: `SKU-${item.product_id}`, // This should come from products table
-        quantity: item.quantity,
-        unit_price: item.unit_price || 0,
-        total_price: item.quantity * (item.unit_price || 0),
-        status: 'pending'
-      }));
-
-      const { error: itemsError } = await supabase
-        .from('order_items')
-        .insert(orderItems);
-
-      if (itemsError) {
-        console.error('Error creating order items:', itemsError);
-        // Rollback order creation
-        await supabase.from('orders').delete().eq('id', order.id);
+      if (!result?.success) {
         return {
           success: false,
-          message: itemsError.message
+          message: (result?.errors || ['Failed to create order']).join(', ')
         };
       }
 
-      // Fetch the complete order with relations
-      const { data: completeOrder, error: fetchError } = await supabase
-        .from('orders')
-        .select(`
-          *,
-          items:order_items(*)
-        `)
-        .eq('id', order.id)
-        .single();
-
-      if (fetchError) {
-        console.error('Error fetching complete order:', fetchError);
-        return {
-          success: false,
-          message: fetchError.message
-        };
-      }
+      OrderService.invalidateOrderStats();
+      OrderService.invalidateOrderStock();
 
       return {
         success: true,
-        data: completeOrder
+        data: result.order
       };
     } catch (error) {
       console.error('Error in createOrder:', error);
@@ -371,6 +268,11 @@ export class OrderService {
         };
       }
 
+      OrderService.invalidateOrderStats();
+      if (STOCK_SETTLING_STATUSES.includes(updates?.status)) {
+        OrderService.invalidateOrderStock();
+      }
+
       return {
         success: true,
         data: data
@@ -424,6 +326,9 @@ export class OrderService {
           message: `Failed to delete order: ${deleteError.message}`
         };
       }
+
+      OrderService.invalidateOrderStats();
+      OrderService.invalidateOrderStock();
       
       return {
         success: true,
@@ -442,11 +347,26 @@ export class OrderService {
    * Get order statistics
    */
   static async getOrderStats(): Promise<ApiResponse<OrderStats>> {
+    // "Today" starts at local midnight; keying on it rolls the cache over at day change
+    const todayStart = new Date();
+    todayStart.setHours(0, 0, 0, 0);
+    const todayKey = todayStart.toISOString();
+
+    return orderStatsCache.getOrLoad(
+      todayKey,
+      () => OrderService.fetchOrderStats(todayKey),
+      result => result.success
+    );
+  }
+
+  /**
+   * Aggregate order statistics in the database (one row, see get_order_stats)
+   */
+  private static async fetchOrderStats(todayStart: string): Promise<ApiResponse<OrderStats>> {
     try {
-      // Get all orders for stats calculation
-      const { data: orders, error } = await supabase
-        .from('orders')
-        .select('status, payment_status, total_amount, created_at');
+      const { data, error } = await supabase
+        .rpc('get_order_stats', { p_today_start: todayStart })
+        .single();
 
       if (error) {
         console.error('Error fetching order stats:', error);
@@ -456,32 +376,10 @@ export class OrderService {
         };
       }
 
-      const allOrders = orders || [];
-      const today = new Date();
-      today.setHours(0, 0, 0, 0);
-
-      // Get orders from today
-      const todayOrders = allOrders.filter(order => {
-        const orderDate = new Date(order.created_at);
-        orderDate.setHours(0, 0, 0, 0);
-        return orderDate.getTime() === today.getTime();
-      });
-
-      // Calculate stats
-      const stats: OrderStats = {
-        total_orders: allOrders.length,
-        pending_orders: allOrders.filter(o => o.status === 'pending').length,
-        processing_orders: allOrders.filter(o => o.status === 'processing').length,
-        shipped_orders: allOrders.filter(o => o.status === 'shipped').length,
-        delivered_orders: allOrders.filter(o => o.status === 'delivered').length,
-        cancelled_orders: allOrders.filter(o => o.status === 'cancelled').length,
-        total_revenue: allOrders.reduce((sum, o) => sum + (o.total_amount || 0), 0),
-        average_order_value: allOrders.length > 0 
-          ? allOrders.reduce((sum, o) => sum + (o.total_amount || 0), 0) / allOrders.length
-          : 0,
-        orders_today: todayOrders.length,
-        revenue_today: todayOrders.reduce((sum, o) => sum + (o.total_amount || 0), 0)
-      };
+      const row = data as Record<keyof OrderStats, number | string>;
+      const stats = Object.fromEntries(
+        Object.entries(row).map(([key, value]) => [key, Number(value) || 0])
+      ) as unknown as OrderStats;
 
       return {
         success: true,
@@ -496,6 +394,28 @@ export class OrderService {
     }
   }
 
+  /**
+   * Drop cached order statistics after an order is created, updated or deleted
+   */
+  static invalidateOrderStats() {
+    orderStatsCache.invalidate();
+  }
+
+  /**
+   * Drop cached inventory responses after an order write that reserved, released
+   * or consumed stock
+   */
+  static invalidateOrderStock() {
+    invalidateCacheTags('inventory');
+  }
+
+  /**
+   * Hit/miss counters for the order stats cache
+   */
+  static getOrderStatsCacheMetrics() {
+    return orderStatsCache.metrics();
+  }
+
   /**
    * Validate products for order creation
    */
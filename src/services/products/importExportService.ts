@@ -1,7 +1,9 @@
 import { ProductWithCategory } from '@/types/products';
 import { supabase } from '@/lib/supabaseClient';
 import { supabaseAdmin } from '@/lib/supabaseAdmin';
-import { randomUUID } from 'crypto';
+import { parseCsv, parseCsvStream, toCsvRow } from '@/lib/csv';
+import { chunk, applyWithBisect } from '@/lib/batch';
+import { createHash, randomUUID } from 'crypto';
 
 export interface ImportResult {
   success: boolean;
@@ -19,6 +21,45 @@ export interface ImportError {
   data?: any;
 }
 
+export interface ImportProgress {
+  bytesRead: number;
+  totalBytes?: number;
+  rowsRead: number;
+  successCount: number;
+  errorCount: number;
+}
+
+// Every row up to lastRow has been written; counts cover those rows
+export interface ImportCheckpoint {
+  lastRow: number;
+  successCount: number;
+  errorCount: number;
+}
+
+export interface StreamImportOptions {
+  chunkSize?: number;
+  concurrency?: number;
+  totalBytes?: number;
+  onProgress?: (progress: ImportProgress) => void;
+  // Resume a previous run: rows up to resumeFrom.lastRow are skipped and its counts carried over
+  resumeFrom?: ImportCheckpoint;
+  // Derive product ids from this seed and the row number, so re-importing a row is a no-op
+  idSeed?: string;
+  // Called (one at a time, in order) whenever the checkpoint advances
+  onCheckpoint?: (checkpoint: ImportCheckpoint) => Promise<void>;
+}
+
+export const IMPORT_CHUNK_SIZE = 500;
+export const EXPORT_PAGE_SIZE = 1000;
+export const IMPORT_CONCURRENCY = 4;
+
+// Keeps error payloads bounded for very large files; counts stay exact
+const MAX_REPORTED_ERRORS = 1000;
+
+// Category name -> id map shared across imports
+const CATEGORY_CACHE_TTL_MS = 60 * 1000;
+let categoryCache: { map: Map<string, string>; loadedAt: number } | null = null;
+
 export interface ExportOptions {
   format: 'csv' | 'excel';
   includeImages: boolean;
@@ -26,13 +67,127 @@ export interface ExportOptions {
   statusFilter?: string;
 }
 
+// Name-based UUID (version 5 layout, SHA-1 of the name)
+function seededUUID(name: string): string {
+  const hex = createHash('sha1').update(name).digest('hex');
+  return [
+    hex.slice(0, 8),
+    hex.slice(8, 12),
+    '5' + hex.slice(13, 16),
+    ((parseInt(hex.slice(16, 18), 16) & 0x3f) | 0x80).toString(16) + hex.slice(18, 20),
+    hex.slice(20, 32)
+  ].join('-');
+}
+
 export class ProductImportExportService {
   
   /**
    * Export products to CSV format
    */
   static async exportToCSV(products: ProductWithCategory[], options: ExportOptions = { format: 'csv', includeImages: false }): Promise<string> {
-    const headers = [
+    const csvRows = [toCsvRow(this.exportHeaders(options))];
+
+    for (const product of products) {
+      csvRows.push(toCsvRow(this.exportRow(product, options)));
+    }
+
+    return csvRows.join('\n');
+  }
+
+  /**
+   * Stream products as CSV.
+   * Products are fetched in keyset-paginated pages (created_at, id) and each page
+   * is written as soon as it arrives, so memory is bounded by the page size and the
+   * header row goes out before the first query completes.
+   */
+  static streamCSV(options: ExportOptions = { format: 'csv', includeImages: false }, pageSize: number = EXPORT_PAGE_SIZE): ReadableStream<Uint8Array> {
+    const encoder = new TextEncoder();
+    let cursor: { created_at: string; id: string } | null = null;
+    let finished = false;
+
+    return new ReadableStream<Uint8Array>({
+      start: (controller) => {
+        controller.enqueue(encoder.encode(toCsvRow(this.exportHeaders(options))));
+      },
+      pull: async (controller) => {
+        if (finished) return;
+
+        let products: any[];
+        try {
+          products = await this.fetchExportPage(options, cursor, pageSize);
+        } catch (error) {
+          // Headers are already sent, so abort the download rather than truncate it silently
+          console.error('Export page fetch failed:', error);
+          controller.error(error);
+          return;
+        }
+
+        if (products.length > 0) {
+          const rows = products.map(product => '\n' + toCsvRow(this.exportRow(product, options)));
+          controller.enqueue(encoder.encode(rows.join('')));
+          const last = products[products.length - 1];
+          cursor = { created_at: last.created_at, id: last.id };
+        }
+
+        if (products.length < pageSize) {
+          finished = true;
+          controller.close();
+        }
+      }
+    }, { highWaterMark: 1 });
+  }
+
+  /**
+   * Fetch one export page after the given (created_at, id) cursor, newest first
+   */
+  private static async fetchExportPage(
+    options: ExportOptions,
+    cursor: { created_at: string; id: string } | null,
+    pageSize: number
+  ): Promise<any[]> {
+    const media = options.includeImages ? ', media!product_id(file_path, bucket_name, is_primary)' : '';
+    let query = supabaseAdmin
+      .from('products')
+      .select(`*, categories(name)${media}`);
+
+    if (options.categoryFilter) {
+      query = query.eq('category_id', options.categoryFilter);
+    }
+
+    if (options.statusFilter) {
+      query = query.eq('status', options.statusFilter);
+    }
+
+    if (cursor) {
+      query = query.or(
+        `created_at.lt."${cursor.created_at}",and(created_at.eq."${cursor.created_at}",id.lt.${cursor.id})`
+      );
+    }
+
+    const { data, error } = await query
+      .order('created_at', { ascending: false })
+      .order('id', { ascending: false })
+      .limit(pageSize);
+
+    if (error) throw error;
+
+    return (data || []).map(product => {
+      const storageUrl = `${process.env.NEXT_PUBLIC_SUPABASE_URL}/storage/v1/object/public`;
+      const primaryImage = product.media?.find((m: any) => m.is_primary);
+
+      return {
+        ...product,
+        category: product.categories,
+        ...(options.includeImages ? {
+          featured_image_url: primaryImage ? `${storageUrl}/${primaryImage.bucket_name}/${primaryImage.file_path}` : null,
+          gallery_images: product.media?.map((m: any) => `${storageUrl}/${m.bucket_name}/${m.file_path}`) || []
+        } : {})
+      };
+    });
+  }
+
+  private static exportHeaders(options: ExportOptions): string[] {
+    return [
       'Name',
       'Description', 
       'SKU',
@@ -57,43 +212,37 @@ export class ProductImportExportService {
       'Created At',
       'Updated At'
     ];
+  }
 
-    const csvRows = [headers.join(',')];
-
-    for (const product of products) {
-      const row = [
-        this.escapeCsvField(product.name || ''),
-        this.escapeCsvField(product.description || ''),
-        this.escapeCsvField(product.sku || ''),
-        this.escapeCsvField(product.category?.name || ''),
-        product.base_price || 0,
-        product.selling_price || 0,
-        product.stock_quantity || 0,
-        product.min_stock_level || 0,
-        product.status || 'draft',
-        product.is_active || false,
-        product.is_featured || false,
-        product.is_digital || false,
-        product.track_inventory || true,
-        product.requires_shipping || true,
-        product.discount_percentage || 0,
-        product.tax_rate || 0,
-        product.weight || '',
-        product.dimensions || '',
-        product.barcode || '',
-        this.escapeCsvField((product.tags || []).join(';')),
-        ...(options.includeImages ? [
-          product.featured_image_url || '',
-          (product.gallery_images || []).join(';')
-        ] : []),
-        product.created_at || '',
-        product.updated_at || ''
-      ];
-
-      csvRows.push(row.join(','));
-    }
-
-    return csvRows.join('\n');
+  private static exportRow(product: any, options: ExportOptions): unknown[] {
+    return [
+      product.name || '',
+      product.description || '',
+      product.sku || '',
+      product.category?.name || '',
+      product.base_price || 0,
+      product.selling_price || 0,
+      product.stock_quantity || 0,
+      product.min_stock_level || 0,
+      product.status || 'draft',
+      product.is_active || false,
+      product.is_featured || false,
+      product.is_digital || false,
+      product.track_inventory ?? true,
+      product.requires_shipping ?? true,
+      product.discount_percentage || 0,
+      product.tax_rate || 0,
+      product.weight || '',
+      product.dimensions || '',
+      product.barcode || '',
+      (product.tags || []).join(';'),
+      ...(options.includeImages ? [
+        product.featured_image_url || '',
+        (product.gallery_images || []).join(';')
+      ] : []),
+      product.created_at || '',
+      product.updated_at || ''
+    ];
   }
 
   /**
@@ -153,84 +302,231 @@ export class ProductImportExportService {
    * Parse CSV content and validate data
    */
   static async parseCSV(csvContent: string): Promise<{ data: any[], errors: ImportError[] }> {
-    const lines = csvContent.trim().split('\n');
-    const headers = this.parseCsvRow(lines[0]);
+    const [headers = [], ...rows] = parseCsv(csvContent);
     const data: any[] = [];
     const errors: ImportError[] = [];
 
-    // Get categories for validation
-    const { data: categories } = await supabase.from('categories').select('id, name');
-    const categoryMap = new Map(categories?.map(cat => [cat.name.toLowerCase(), cat.id]) || []);
-
-    for (let i = 1; i < lines.length; i++) {
-      const row = this.parseCsvRow(lines[i]);
-      const rowData: any = {};
-      
-      // Map CSV columns to product fields
-      headers.forEach((header, index) => {
-        const cleanHeader = header.replace('*', '').toLowerCase().replace(/\s+/g, '_');
-        rowData[cleanHeader] = row[index] || '';
-      });
-
-      // Validate required fields
-      const rowErrors = this.validateProductRow(rowData, i + 1, categoryMap);
-      
+    const categoryMap = await this.getCategoryMap();
+    const fields = this.mapHeaders(headers);
+
+    rows.forEach((row, index) => {
+      const rowData = this.toRowData(fields, row);
+      const rowErrors = this.validateProductRow(rowData, index + 2, categoryMap);
+
       if (rowErrors.length > 0) {
         errors.push(...rowErrors);
       } else {
-        // Transform data to match database schema
-        const transformedData = this.transformImportData(rowData, categoryMap);
-        data.push(transformedData);
+        data.push(this.transformImportData(rowData, categoryMap));
       }
-    }
+    });
 
     return { data, errors };
   }
 
   /**
-   * Import products from parsed data
+   * Validate a CSV stream without importing it.
+   * Used as a first pass so a file with invalid rows is rejected before anything is written.
    */
-  static async importProducts(data: any[]): Promise<ImportResult> {
-    let successCount = 0;
+  static async validateCSVStream(stream: ReadableStream<Uint8Array>): Promise<{ totalRows: number, errorCount: number, errors: ImportError[] }> {
+    const categoryMap = await this.getCategoryMap();
+    const errors: ImportError[] = [];
+    let fields: string[] | null = null;
+    let totalRows = 0;
     let errorCount = 0;
+
+    for await (const record of parseCsvStream(stream)) {
+      if (!fields) {
+        fields = this.mapHeaders(record);
+        continue;
+      }
+
+      totalRows++;
+      const rowErrors = this.validateProductRow(this.toRowData(fields, record), totalRows + 1, categoryMap);
+      errorCount += rowErrors.length;
+      this.collectErrors(errors, rowErrors);
+    }
+
+    return { totalRows, errorCount, errors };
+  }
+
+  /**
+   * Import products from a CSV stream.
+   * Rows are parsed incrementally and inserted in chunks with bounded concurrency,
+   * so memory stays flat regardless of file size.
+   */
+  static async importCSVStream(stream: ReadableStream<Uint8Array>, options: StreamImportOptions = {}): Promise<ImportResult> {
+    const chunkSize = options.chunkSize || IMPORT_CHUNK_SIZE;
+    const categoryMap = await this.getCategoryMap();
+    const resumeAfterRow = options.resumeFrom?.lastRow ?? 1;
+    const progress: ImportProgress = {
+      bytesRead: 0,
+      totalBytes: options.totalBytes,
+      rowsRead: 0,
+      successCount: options.resumeFrom?.successCount ?? 0,
+      errorCount: options.resumeFrom?.errorCount ?? 0
+    };
     const errors: ImportError[] = [];
+    const writer = this.createChunkWriter(progress, errors, options);
 
-    for (let i = 0; i < data.length; i++) {
-      try {
-        const productData = {
-          ...data[i],
-          id: randomUUID(),
-          created_at: new Date().toISOString(),
-          updated_at: new Date().toISOString()
-        };
-
-        const { error } = await supabaseAdmin
-          .from('products')
-          .insert(productData);
-
-        if (error) {
-          errorCount++;
-          errors.push({
-            row: i + 2, // +2 because of header and 0-based index
-            message: `Database error: ${error.message}`,
-            data: productData
-          });
-        } else {
-          successCount++;
-        }
-      } catch (error) {
-        errorCount++;
-        errors.push({
-          row: i + 2,
-          message: error instanceof Error ? error.message : 'Unknown error',
-          data: data[i]
-        });
+    let fields: string[] | null = null;
+    let pending: { row: number; data: any }[] = [];
+
+    for await (const record of parseCsvStream(stream, bytes => { progress.bytesRead += bytes; })) {
+      if (!fields) {
+        fields = this.mapHeaders(record);
+        continue;
+      }
+
+      progress.rowsRead++;
+      const rowNumber = progress.rowsRead + 1; // +1 for the header row
+      if (rowNumber <= resumeAfterRow) continue;
+
+      const rowData = this.toRowData(fields, record);
+      const rowErrors = this.validateProductRow(rowData, rowNumber, categoryMap);
+
+      if (rowErrors.length > 0) {
+        progress.errorCount++;
+        this.collectErrors(errors, rowErrors);
+        continue;
+      }
+
+      pending.push({ row: rowNumber, data: this.transformImportData(rowData, categoryMap) });
+      if (pending.length >= chunkSize) {
+        await writer.write(pending);
+        pending = [];
       }
     }
 
+    await writer.write(pending);
+    await writer.close();
+
+    return this.buildImportResult(progress.rowsRead, progress, errors);
+  }
+
+  /**
+   * Import products from parsed data
+   */
+  static async importProducts(data: any[], options: StreamImportOptions = {}): Promise<ImportResult> {
+    const progress: ImportProgress = { bytesRead: 0, rowsRead: data.length, successCount: 0, errorCount: 0 };
+    const errors: ImportError[] = [];
+    const writer = this.createChunkWriter(progress, errors, options);
+
+    // +2 because of header and 0-based index
+    const rows = data.map((productData, i) => ({ row: i + 2, data: productData }));
+    for (const rowsChunk of chunk(rows, options.chunkSize || IMPORT_CHUNK_SIZE)) {
+      await writer.write(rowsChunk);
+    }
+    await writer.close();
+
+    return this.buildImportResult(data.length, progress, errors);
+  }
+
+  /**
+   * Insert chunks with at most `concurrency` inserts in flight.
+   * A chunk rejected by the database is bisected so only the offending rows fail.
+   * Chunks can finish out of order; the checkpoint only advances past a chunk once
+   * every earlier chunk has been written too.
+   */
+  private static createChunkWriter(progress: ImportProgress, errors: ImportError[], options: StreamImportOptions) {
+    const concurrency = options.concurrency || IMPORT_CONCURRENCY;
+    const inFlight = new Set<Promise<void>>();
+    const written: { lastRow: number; done: boolean; successCount: number; errorCount: number }[] = [];
+    const checkpoint: ImportCheckpoint = {
+      lastRow: options.resumeFrom?.lastRow ?? 1,
+      successCount: options.resumeFrom?.successCount ?? 0,
+      errorCount: options.resumeFrom?.errorCount ?? 0
+    };
+    let checkpointing = Promise.resolve();
+    let failure: unknown = null;
+
+    const insertChunk = async (rows: { row: number; data: any }[]) => {
+      const now = new Date().toISOString();
+      const records = rows.map(({ row, data }) => ({
+        row,
+        data: {
+          ...data,
+          id: options.idSeed ? seededUUID(`${options.idSeed}:${row}`) : randomUUID(),
+          created_at: now,
+          updated_at: now
+        }
+      }));
+      const counts = { successCount: 0, errorCount: 0 };
+
+      await applyWithBisect(
+        records,
+        async (batch) => {
+          const products = batch.map(record => record.data);
+          // Seeded ids make a retried chunk skip the rows an earlier attempt already wrote
+          const { error } = options.idSeed
+            ? await supabaseAdmin.from('products').upsert(products, { onConflict: 'id', ignoreDuplicates: true })
+            : await supabaseAdmin.from('products').insert(products);
+
+          if (error) return error.message;
+          progress.successCount += batch.length;
+          counts.successCount += batch.length;
+          return null;
+        },
+        (record, error) => {
+          progress.errorCount++;
+          counts.errorCount++;
+          this.collectErrors(errors, [{ row: record.row, message: `Database error: ${error}`, data: record.data }]);
+        }
+      );
+
+      options.onProgress?.({ ...progress });
+      return counts;
+    };
+
+    const advanceCheckpoint = () => {
+      let advanced = false;
+      while (written.length > 0 && written[0].done) {
+        const chunkDone = written.shift()!;
+        checkpoint.lastRow = chunkDone.lastRow;
+        checkpoint.successCount += chunkDone.successCount;
+        checkpoint.errorCount += chunkDone.errorCount;
+        advanced = true;
+      }
+      if (advanced && options.onCheckpoint) {
+        const snapshot = { ...checkpoint };
+        checkpointing = checkpointing.then(() => options.onCheckpoint!(snapshot));
+        return checkpointing;
+      }
+    };
+
+    return {
+      async write(rows: { row: number; data: any }[]) {
+        if (failure) throw failure;
+        if (rows.length === 0) return;
+
+        const entry = { lastRow: rows[rows.length - 1].row, done: false, successCount: 0, errorCount: 0 };
+        written.push(entry);
+
+        const task: Promise<void> = insertChunk(rows)
+          .then(counts => {
+            Object.assign(entry, counts, { done: true });
+            return advanceCheckpoint();
+          })
+          .catch(error => { failure = failure || error; })
+          .finally(() => inFlight.delete(task));
+        inFlight.add(task);
+        if (inFlight.size >= concurrency) {
+          await Promise.race(inFlight);
+        }
+        if (failure) throw failure;
+      },
+      async close() {
+        await Promise.all(inFlight);
+        await checkpointing.catch(error => { failure = failure || error; });
+        if (failure) throw failure;
+      }
+    };
+  }
+
+  private static buildImportResult(totalRows: number, progress: ImportProgress, errors: ImportError[]): ImportResult {
+    const { successCount, errorCount } = progress;
     return {
       success: errorCount === 0,
-      totalRows: data.length,
+      totalRows,
       successCount,
       errorCount,
       errors,
@@ -238,43 +534,40 @@ export class ProductImportExportService {
     };
   }
 
-  /**
-   * Helper methods
-   */
-  private static escapeCsvField(field: string): string {
-    if (field.includes(',') || field.includes('"') || field.includes('\n')) {
-      return `"${field.replace(/"/g, '""')}"`;
+  private static collectErrors(errors: ImportError[], newErrors: ImportError[]) {
+    for (const error of newErrors) {
+      if (errors.length >= MAX_REPORTED_ERRORS) return;
+      errors.push(error);
     }
-    return field;
   }
 
-  private static parseCsvRow(row: string): string[] {
-    const result: string[] = [];
-    let current = '';
-    let inQuotes = false;
-    
-    for (let i = 0; i < row.length; i++) {
-      const char = row[i];
-      
-      if (char === '"') {
-        if (inQuotes && row[i + 1] === '"') {
-          current += '"';
-          i++; // Skip next quote
-        } else {
-          inQuotes = !inQuotes;
-        }
-      } else if (char === ',' && !inQuotes) {
-        result.push(current.trim());
-        current = '';
-      } else {
-        current += char;
-      }
+  private static async getCategoryMap(): Promise<Map<string, string>> {
+    if (categoryCache && Date.now() - categoryCache.loadedAt < CATEGORY_CACHE_TTL_MS) {
+      return categoryCache.map;
     }
-    
-    result.push(current.trim());
-    return result;
+
+    const { data: categories } = await supabase.from('categories').select('id, name');
+    const map = new Map<string, string>(categories?.map(cat => [cat.name.toLowerCase(), cat.id]) || []);
+    categoryCache = { map, loadedAt: Date.now() };
+    return map;
   }
 
+  // Map CSV headers to product field names ("Base Price*" -> "base_price")
+  private static mapHeaders(headers: string[]): string[] {
+    return headers.map(header => header.trim().replace('*', '').toLowerCase().replace(/\s+/g, '_'));
+  }
+
+  private static toRowData(fields: string[], row: string[]): any {
+    const rowData: any = {};
+    fields.forEach((field, index) => {
+      rowData[field] = (row[index] || '').trim();
+    });
+    return rowData;
+  }
+
+  /**
+   * Helper methods
+   */
   private static validateProductRow(rowData: any, rowNumber: number, categoryMap: Map<string, string>): ImportError[] {
     const errors: ImportError[] = [];
 
@@ -1,51 +1,186 @@
 import { ProductFormData, ProductFilters, ProductsResponse, ProductResponse, ProductStatsResponse } from '@/types/products';
 import { supabase } from '@/lib/supabaseClient';
+import { normalizeSearchQuery, rankedSearch, orderByIds } from '@/lib/search';
+import { decodeCursor, encodeCursor, keysetFilter, InvalidCursorError } from '@/lib/cursor';
+
+const PRODUCT_LIST_SELECT = `
+  *,
+  categories(id, name, slug),
+  media!product_id(
+    id,
+    file_name,
+    file_path,
+    bucket_name,
+    alt_text,
+    is_primary,
+    created_at
+  )
+`;
+
+// Lean projection for grids and pickers: the fields a card shows plus the primary image only
+const PRODUCT_LEAN_SELECT = `
+  id,
+  name,
+  slug,
+  sku,
+  selling_price,
+  stock_quantity,
+  status,
+  is_active,
+  featured_image_url,
+  category_id,
+  categories(id, name),
+  media!product_id(
+    id,
+    file_path,
+    bucket_name,
+    alt_text
+  )
+`;
+
+const SORTABLE_COLUMNS = ['name', 'created_at', 'selling_price', 'stock_quantity'];
+
+const selectProducts = (view?: ProductFilters['view']) => {
+  if (view === 'list') {
+    return supabase
+      .from('products')
+      .select(PRODUCT_LEAN_SELECT)
+      .eq('media.is_primary', true)
+      .limit(1, { referencedTable: 'media' });
+  }
+  return supabase
+    .from('products')
+    .select(PRODUCT_LIST_SELECT);
+};
+
+const applyProductFilters = (query: any, filters: ProductFilters) => {
+  if (filters.category_id) {
+    query = query.eq('category_id', filters.category_id);
+  }
+
+  if (filters.status) {
+    query = query.eq('status', filters.status);
+  }
+
+  if (filters.min_price) {
+    query = query.gte('selling_price', filters.min_price);
+  }
+
+  if (filters.max_price) {
+    query = query.lte('selling_price', filters.max_price);
+  }
+
+  if (filters.low_stock === true) {
+    query = query.lte('stock_quantity', 10); // Consider stock <= 10 as low stock
+  }
+
+  return query;
+};
+
+// Text search goes through the ranked search RPC; results are ordered by relevance
+const searchProductsRanked = async (search: string, filters: ProductFilters): Promise<ProductsResponse> => {
+  const perPage = filters.per_page || 50;
+  const page = filters.page || 1;
+
+  const { ids, total } = await rankedSearch('search_products', {
+    p_query: search,
+    p_category_id: filters.category_id || null,
+    p_status: filters.status || null,
+    p_min_price: filters.min_price || null,
+    p_max_price: filters.max_price || null,
+    p_max_stock: filters.low_stock === true ? 10 : null, // Consider stock <= 10 as low stock
+    p_limit: perPage,
+    p_offset: (page - 1) * perPage
+  });
+
+  let products: any[] = [];
+  if (ids.length > 0) {
+    const { data, error } = await selectProducts(filters.view).in('id', ids);
+
+    if (error) {
+      console.error('Supabase error:', error);
+      throw new Error(error.message);
+    }
+    products = orderByIds(data || [], ids);
+  }
+
+  return {
+    success: true,
+    data: products,
+    pagination: {
+      total,
+      page,
+      per_page: perPage,
+      total_pages: Math.ceil(total / perPage)
+    }
+  };
+};
+
+// Keyset pagination: seek past the (sort value, id) of the previous page's last row,
+// so every page costs the same as the first. No total count is computed.
+const getProductsByCursor = async (filters: ProductFilters): Promise<ProductsResponse> => {
+  const perPage = filters.per_page || 50;
+  const sort = filters.sort_by && SORTABLE_COLUMNS.includes(filters.sort_by) ? filters.sort_by : 'created_at';
+  const ascending = filters.sort_by ? filters.sort_order !== 'desc' : false;
+
+  let query = applyProductFilters(selectProducts(filters.view), filters);
+
+  if (filters.cursor) {
+    const cursor = decodeCursor(filters.cursor);
+    if (cursor.sort !== sort || cursor.ascending !== ascending) {
+      throw new InvalidCursorError('Cursor does not match the requested sort order');
+    }
+    query = query.or(keysetFilter(cursor));
+  }
+
+  // One extra row tells us whether another page exists
+  const { data, error } = await query
+    .order(sort, { ascending })
+    .order('id', { ascending })
+    .limit(perPage + 1);
+
+  if (error) {
+    console.error('Supabase error:', error);
+    throw new Error(error.message);
+  }
+
+  const rows = data || [];
+  const hasMore = rows.length > perPage;
+  const products = hasMore ? rows.slice(0, perPage) : rows;
+  const last = products[products.length - 1];
+
+  return {
+    success: true,
+    data: products,
+    pagination: {
+      per_page: perPage,
+      has_more: hasMore,
+      next_cursor: hasMore && last
+        ? encodeCursor({ sort, ascending, value: last[sort], id: last.id })
+        : null
+    }
+  };
+};
 
 const productService = {
-  // Get all products with pagination and filters
+  // Get all products with pagination and filters.
+  // Passing `cursor` (empty for the first page) switches to keyset pagination.
   getProducts: async (filters?: ProductFilters): Promise<ProductsResponse> => {
     try {
-      let query = supabase
-        .from('products')
-        .select(`
-          *,
-          categories(id, name, slug),
-          media!product_id(
-            id,
-            file_name,
-            file_path,
-            bucket_name,
-            alt_text,
-            is_primary,
-            created_at
-          )
-        `);
+      const search = normalizeSearchQuery(filters?.search);
+      if (filters && search) {
+        return await searchProductsRanked(search, filters);
+      }
+
+      if (filters && filters.cursor !== undefined) {
+        return await getProductsByCursor(filters);
+      }
+
+      let query = selectProducts(filters?.view);
       
       // Apply filters
       if (filters) {
-        if (filters.category_id) {
-          query = query.eq('category_id', filters.category_id);
-        }
-        
-        if (filters.search) {
-          query = query.or(`name.ilike.%${filters.search}%, description.ilike.%${filters.search}%, sku.ilike.%${filters.search}%`);
-        }
-        
-        if (filters.status) {
-          query = query.eq('status', filters.status);
-        }
-        
-        if (filters.min_price) {
-          query = query.gte('selling_price', filters.min_price);
-        }
-        
-        if (filters.max_price) {
-          query = query.lte('selling_price', filters.max_price);
-        }
-        
-        if (filters.low_stock === true) {
-          query = query.lte('stock_quantity', 10); // Consider stock <= 10 as low stock
-        }
+        query = applyProductFilters(query, filters);
         
         // Pagination
         if (filters.page && filters.per_page) {
@@ -86,6 +221,7 @@ const productService = {
       };
     } catch (error) {
       console.error('Error fetching products:', error);
+      if (error instanceof InvalidCursorError) throw error;
       throw new Error(error instanceof Error ? error.message : 'Failed to fetch products');
     }
   },
@@ -85,19 +85,45 @@ export interface CreateOrderRequest {
   shippingAddress: string;
 }
 
-// WebSocket Event Types
+// Change feed event types (/api/changes/stream and the updated_since delta endpoints).
+// A 'delete' carries only its id and timestamp; the other fields are null.
+export type ChangeOperation = 'upsert' | 'delete';
+
+export type ChangeTopic = 'inventory' | 'orders';
+
 export interface InventoryUpdateEvent {
-  productId: string;
-  stock: number;
+  itemId: string;
+  operation: ChangeOperation;
+  productId: string | null;
+  locationId: string | null;
+  stock: number | null;
+  reserved: number | null;
+  available: number | null;
+  minStockLevel: number | null;
+  status: string | null;
   timestamp: string;
 }
 
 export interface OrderStatusEvent {
   orderId: string;
-  status: string;
+  operation: ChangeOperation;
+  orderNumber: string | null;
+  status: string | null;
+  paymentStatus: string | null;
+  totalAmount: number | null;
+  createdAt: string | null;
   timestamp: string;
 }
 
+// One page of a delta endpoint; pass cursor back as updated_since/after_id while hasMore
+export interface ChangesResponse<T> {
+  data: T[];
+  cursor: { updated_since: string; after_id: string | null };
+  hasMore: boolean;
+  // The requested point is older than deletes are kept for; reload in full instead
+  resync: boolean;
+}
+
 export interface SystemAlert {
   type: 'warning' | 'error' | 'info';
   message: string;
@@ -138,3 +164,6 @@ export interface InventoryMetrics {
 
 // Re-export order types
 export * from './orders';
+
+// Re-export background job types
+export * from './jobs';
@@ -0,0 +1,46 @@
+// Background job types
+
+export type JobType =
+  | 'products.import'
+  | 'inventory.populate'
+  | 'inventory.sync_costs'
+  | 'orders.bulk_fulfill';
+
+export type JobStatus = 'queued' | 'running' | 'completed' | 'failed' | 'cancelled';
+
+export interface JobProgress {
+  processed?: number;
+  total?: number;
+  message?: string;
+  [key: string]: unknown;
+}
+
+export interface BackgroundJob<Payload = any, Result = any> {
+  id: string;
+  type: JobType;
+  status: JobStatus;
+  payload: Payload;
+  checkpoint: any | null;
+  progress: JobProgress;
+  result: Result | null;
+  error: string | null;
+  idempotency_key: string | null;
+  attempts: number;
+  max_attempts: number;
+  run_after: string;
+  locked_by: string | null;
+  locked_until: string | null;
+  created_by: string | null;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+  updated_at: string;
+}
+
+// Returned (with 202 Accepted) by routes that hand their work to the job queue
+export interface JobAcceptedResponse {
+  success: boolean;
+  jobId: string;
+  status: JobStatus;
+  statusUrl: string;
+}
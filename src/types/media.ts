@@ -35,6 +35,10 @@ export interface Media {
   // Tags and categorization
   tags?: string[];
   
+  // Generated image variants (storage paths keyed by size)
+  variants?: Record<string, { width: number; height: number; webp: string; avif: string }>;
+  variants_generated_at?: string | null;
+  
   // Audit fields
   created_by?: string;
   created_at: string;
@@ -158,6 +158,10 @@ export interface ProductFilters {
   sort_order?: 'asc' | 'desc';
   page?: number;
   limit?: number;
+  // Keyset pagination: opaque cursor from a previous page, empty for the first page
+  cursor?: string;
+  // 'list' returns the lean card projection with only the primary image
+  view?: 'full' | 'list';
 }
 
 // Form Data Types
@@ -0,0 +1,13 @@
+-- Migration: Composite indexes for keyset pagination over products
+-- Created: 2026-10-17
+-- Description: Lets newest-first pages seek directly to (created_at, id) instead of scanning from the start
+
+CREATE INDEX IF NOT EXISTS idx_products_created_at_id
+    ON products(created_at DESC, id DESC);
+
+-- Filtered exports and listings (by category or status) keep the same seek behaviour
+CREATE INDEX IF NOT EXISTS idx_products_category_created_at_id
+    ON products(category_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_products_status_created_at_id
+    ON products(status, created_at DESC, id DESC);
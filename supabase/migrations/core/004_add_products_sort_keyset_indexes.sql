@@ -0,0 +1,14 @@
+-- Migration: Keyset indexes for the remaining product list sort orders
+-- Created: 2026-10-17
+-- Description: Cursor pagination on GET /api/products seeks on (sort column, id);
+-- created_at is covered by 003, these cover name, price and stock sorts
+
+CREATE INDEX IF NOT EXISTS idx_products_name_id
+    ON products(name, id);
+
+CREATE INDEX IF NOT EXISTS idx_products_selling_price_id
+    ON products(selling_price, id);
+
+CREATE INDEX IF NOT EXISTS idx_products_stock_quantity_id
+    ON products(stock_quantity, id);
+
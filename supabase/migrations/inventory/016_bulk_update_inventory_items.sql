@@ -0,0 +1,76 @@
+-- Migration: Set-based bulk update for inventory_items
+-- Created: 2026-10-17
+-- Description: Apply an array of inventory updates in a single statement and report per-row outcomes
+
+-- Each element of p_updates is an object with an "id" and any of the updatable fields below.
+-- "quantity" is accepted as an alias for quantity_on_hand. Fields that are absent are left unchanged.
+-- Returns one row per input element, in input order.
+CREATE OR REPLACE FUNCTION bulk_update_inventory_items(p_updates JSONB)
+RETURNS TABLE (
+    row_index INTEGER,
+    id UUID,
+    status TEXT,
+    error TEXT,
+    item JSONB
+) AS $$
+    WITH input AS (
+        SELECT
+            (e.ordinality - 1)::INTEGER AS row_index,
+            (e.value->>'id')::UUID AS item_id,
+            e.value AS changes
+        FROM jsonb_array_elements(p_updates) WITH ORDINALITY AS e(value, ordinality)
+    ),
+    updated AS (
+        UPDATE inventory_items i
+        SET
+            quantity_on_hand = CASE
+                WHEN u.changes ? 'quantity' THEN (u.changes->>'quantity')::INTEGER
+                WHEN u.changes ? 'quantity_on_hand' THEN (u.changes->>'quantity_on_hand')::INTEGER
+                ELSE i.quantity_on_hand END,
+            quantity_reserved = CASE WHEN u.changes ? 'quantity_reserved'
+                THEN (u.changes->>'quantity_reserved')::INTEGER ELSE i.quantity_reserved END,
+            quantity_allocated = CASE WHEN u.changes ? 'quantity_allocated'
+                THEN (u.changes->>'quantity_allocated')::INTEGER ELSE i.quantity_allocated END,
+            quantity_incoming = CASE WHEN u.changes ? 'quantity_incoming'
+                THEN (u.changes->>'quantity_incoming')::INTEGER ELSE i.quantity_incoming END,
+            min_stock_level = CASE WHEN u.changes ? 'min_stock_level'
+                THEN (u.changes->>'min_stock_level')::INTEGER ELSE i.min_stock_level END,
+            max_stock_level = CASE WHEN u.changes ? 'max_stock_level'
+                THEN (u.changes->>'max_stock_level')::INTEGER ELSE i.max_stock_level END,
+            reorder_point = CASE WHEN u.changes ? 'reorder_point'
+                THEN (u.changes->>'reorder_point')::INTEGER ELSE i.reorder_point END,
+            reorder_quantity = CASE WHEN u.changes ? 'reorder_quantity'
+                THEN (u.changes->>'reorder_quantity')::INTEGER ELSE i.reorder_quantity END,
+            unit_cost = CASE WHEN u.changes ? 'unit_cost'
+                THEN (u.changes->>'unit_cost')::DECIMAL ELSE i.unit_cost END,
+            location_id = CASE WHEN u.changes ? 'location_id'
+                THEN u.changes->>'location_id' ELSE i.location_id END,
+            location_name = CASE WHEN u.changes ? 'location_name'
+                THEN u.changes->>'location_name' ELSE i.location_name END,
+            status = CASE WHEN u.changes ? 'status'
+                THEN u.changes->>'status' ELSE i.status END,
+            batch_number = CASE WHEN u.changes ? 'batch_number'
+                THEN u.changes->>'batch_number' ELSE i.batch_number END,
+            lot_number = CASE WHEN u.changes ? 'lot_number'
+                THEN u.changes->>'lot_number' ELSE i.lot_number END,
+            last_counted_date = CASE WHEN u.changes ? 'last_counted_date'
+                THEN (u.changes->>'last_counted_date')::TIMESTAMPTZ ELSE i.last_counted_date END,
+            last_counted_by = CASE WHEN u.changes ? 'last_counted_by'
+                THEN u.changes->>'last_counted_by' ELSE i.last_counted_by END,
+            updated_at = NOW()
+        FROM input u
+        WHERE i.id = u.item_id
+        RETURNING u.row_index, to_jsonb(i.*) AS item
+    )
+    SELECT
+        u.row_index,
+        u.item_id,
+        CASE WHEN up.item IS NULL THEN 'not_found' ELSE 'updated' END,
+        CASE WHEN up.item IS NULL THEN 'Inventory item not found' END,
+        up.item
+    FROM input u
+    LEFT JOIN updated up ON up.row_index = u.row_index
+    ORDER BY u.row_index;
+$$ LANGUAGE sql;
+
+COMMENT ON FUNCTION bulk_update_inventory_items(JSONB) IS 'Applies a batch of inventory_items updates in one statement; ids must be unique within a batch';
@@ -0,0 +1,54 @@
+-- Migration: Set-based bulk insert for stock_adjustments
+-- Created: 2026-10-17
+-- Description: Insert a batch of validated adjustments in one statement (one transaction) and return them with product details
+
+-- Each element of p_adjustments holds the stock_adjustments columns to insert; the caller has
+-- already validated the rows and resolved their products. Either every row is inserted or,
+-- if any row violates a constraint, none is. Returns one row per input element, in input order.
+CREATE OR REPLACE FUNCTION bulk_insert_stock_adjustments(p_adjustments JSONB)
+RETURNS TABLE (
+    row_index INTEGER,
+    adjustment JSONB
+) AS $$
+    -- Ids are generated up front so inserted rows can be matched back to their input position
+    WITH input AS MATERIALIZED (
+        SELECT
+            (e.ordinality - 1)::INTEGER AS row_index,
+            gen_random_uuid() AS adjustment_id,
+            e.value AS a
+        FROM jsonb_array_elements(p_adjustments) WITH ORDINALITY AS e(value, ordinality)
+    ),
+    inserted AS (
+        INSERT INTO stock_adjustments (
+            id, product_id, adjustment_type, reason,
+            quantity_before, quantity_after, quantity_change,
+            location, reference, notes, created_by, status, cost_impact
+        )
+        SELECT
+            i.adjustment_id,
+            (i.a->>'product_id')::UUID,
+            i.a->>'adjustment_type',
+            i.a->>'reason',
+            (i.a->>'quantity_before')::INTEGER,
+            (i.a->>'quantity_after')::INTEGER,
+            (i.a->>'quantity_after')::INTEGER - (i.a->>'quantity_before')::INTEGER,
+            COALESCE(i.a->>'location', 'Main Warehouse'),
+            i.a->>'reference',
+            i.a->>'notes',
+            COALESCE(i.a->>'created_by', 'system'),
+            COALESCE(i.a->>'status', 'pending'),
+            COALESCE((i.a->>'cost_impact')::DECIMAL, 0)
+        FROM input i
+        ORDER BY i.row_index
+        RETURNING *
+    )
+    SELECT
+        i.row_index,
+        to_jsonb(ins) || jsonb_build_object(
+            'products', jsonb_build_object('name', p.name, 'sku', p.sku, 'barcode', p.barcode)
+        )
+    FROM inserted ins
+    JOIN input i ON i.adjustment_id = ins.id
+    LEFT JOIN products p ON p.id = ins.product_id
+    ORDER BY i.row_index;
+$$ LANGUAGE sql;
@@ -0,0 +1,111 @@
+-- Migration: Low stock alerts maintained set-based and incrementally
+-- Created: 2026-10-17
+-- Description: low_stock_alerts table, evaluate_low_stock_alerts() engine and inventory_items triggers
+
+-- An item is low on stock when min_stock_level > 0 AND quantity_available <= min_stock_level
+-- (the same rule the dashboard uses). At most one alert per item is active at a time.
+CREATE TABLE IF NOT EXISTS low_stock_alerts (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    inventory_item_id UUID NOT NULL REFERENCES inventory_items(id) ON DELETE CASCADE,
+    product_id UUID REFERENCES products(id) ON DELETE CASCADE,
+    current_quantity INTEGER NOT NULL,
+    threshold INTEGER NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'active',
+    resolved_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+
+    CONSTRAINT valid_low_stock_alert_status CHECK (status IN ('active', 'resolved'))
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_low_stock_alerts_active_item
+    ON low_stock_alerts(inventory_item_id)
+    WHERE status = 'active';
+CREATE INDEX IF NOT EXISTS idx_low_stock_alerts_status_created_at
+    ON low_stock_alerts(status, created_at DESC);
+
+-- Only low items are indexed, so a full evaluation reads the crossing set, not every SKU
+CREATE INDEX IF NOT EXISTS idx_inventory_items_low_stock
+    ON inventory_items(id)
+    WHERE min_stock_level > 0 AND quantity_available <= min_stock_level;
+
+-- Upsert active alerts for low items and resolve alerts for items that recovered.
+-- p_item_ids limits the evaluation to those items; NULL evaluates everything.
+-- Returns the alerts created by this call.
+CREATE OR REPLACE FUNCTION evaluate_low_stock_alerts(p_item_ids UUID[] DEFAULT NULL)
+RETURNS SETOF low_stock_alerts AS $$
+BEGIN
+    UPDATE low_stock_alerts a
+    SET status = 'resolved',
+        resolved_at = NOW(),
+        updated_at = NOW()
+    FROM inventory_items i
+    WHERE a.status = 'active'
+      AND a.inventory_item_id = i.id
+      AND (p_item_ids IS NULL OR i.id = ANY(p_item_ids))
+      AND NOT (i.min_stock_level > 0 AND i.quantity_available <= i.min_stock_level);
+
+    RETURN QUERY
+    WITH upserted AS (
+        INSERT INTO low_stock_alerts (inventory_item_id, product_id, current_quantity, threshold, status)
+        SELECT i.id, i.product_id, i.quantity_available, i.min_stock_level, 'active'
+        FROM inventory_items i
+        WHERE i.min_stock_level > 0
+          AND i.quantity_available <= i.min_stock_level
+          AND (p_item_ids IS NULL OR i.id = ANY(p_item_ids))
+        ON CONFLICT (inventory_item_id) WHERE status = 'active' DO UPDATE
+        SET current_quantity = EXCLUDED.current_quantity,
+            threshold = EXCLUDED.threshold,
+            updated_at = NOW()
+        WHERE low_stock_alerts.current_quantity IS DISTINCT FROM EXCLUDED.current_quantity
+           OR low_stock_alerts.threshold IS DISTINCT FROM EXCLUDED.threshold
+        -- xmax is 0 only for freshly inserted rows
+        RETURNING low_stock_alerts.*, (low_stock_alerts.xmax = 0) AS is_new
+    )
+    SELECT u.id, u.inventory_item_id, u.product_id, u.current_quantity, u.threshold,
+           u.status, u.resolved_at, u.created_at, u.updated_at
+    FROM upserted u
+    WHERE u.is_new;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Incremental evaluation: re-check only the items a statement touched, and only
+-- when their available quantity or threshold actually changed
+CREATE OR REPLACE FUNCTION low_stock_alerts_inventory_changed()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_item_ids UUID[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(n.id) INTO v_item_ids
+        FROM new_rows n
+        WHERE n.min_stock_level > 0 AND n.quantity_available <= n.min_stock_level;
+    ELSE
+        SELECT array_agg(n.id) INTO v_item_ids
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        WHERE n.quantity_available IS DISTINCT FROM o.quantity_available
+           OR n.min_stock_level IS DISTINCT FROM o.min_stock_level;
+    END IF;
+
+    IF v_item_ids IS NOT NULL THEN
+        PERFORM evaluate_low_stock_alerts(v_item_ids);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS low_stock_alerts_inventory_insert ON inventory_items;
+DROP TRIGGER IF EXISTS low_stock_alerts_inventory_update ON inventory_items;
+CREATE TRIGGER low_stock_alerts_inventory_insert
+    AFTER INSERT ON inventory_items REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION low_stock_alerts_inventory_changed();
+CREATE TRIGGER low_stock_alerts_inventory_update
+    AFTER UPDATE ON inventory_items REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION low_stock_alerts_inventory_changed();
+
+-- Raise alerts for items that are already low
+SELECT evaluate_low_stock_alerts();
+
+-- Verify
+SELECT 'low stock alerts created' as migration_status;
@@ -0,0 +1,93 @@
+-- Migration: Inventory history ledger
+-- Created: 2026-10-17
+-- Description: Per-product history merging stock_movements and stock_adjustments into one
+-- time-ordered ledger, read newest first with keyset pagination
+
+-- Composite indexes matching the ledger order, so each page reads only its own rows
+-- from each source no matter how long the product's history is
+CREATE INDEX IF NOT EXISTS idx_stock_movements_product_created
+    ON stock_movements (product_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_stock_adjustments_product_created
+    ON stock_adjustments (product_id, created_at DESC, id DESC);
+
+-- Superseded by the composite indexes above (same leading column)
+DROP INDEX IF EXISTS idx_stock_movements_product_id;
+
+-- Returns up to p_limit entries strictly older than (p_before_created_at, p_before_id),
+-- newest first. Only entries that changed stock are included: completed movements and
+-- approved adjustments (pending ones have not been applied yet, and cancelled, rejected
+-- or draft ones never will be), so walking back from the on-hand quantity is exact.
+-- quantity_change is signed; quantity_after is the recorded level when the source row
+-- has one.
+CREATE OR REPLACE FUNCTION get_inventory_history(
+    p_product_id UUID,
+    p_before_created_at TIMESTAMPTZ DEFAULT 'infinity',
+    p_before_id UUID DEFAULT 'ffffffff-ffff-ffff-ffff-ffffffffffff',
+    p_limit INTEGER DEFAULT 50
+)
+RETURNS TABLE (
+    entry_id UUID,
+    source TEXT,
+    entry_type TEXT,
+    created_at TIMESTAMPTZ,
+    quantity_change INTEGER,
+    quantity_after INTEGER,
+    reason TEXT,
+    reference TEXT,
+    location TEXT,
+    status TEXT,
+    created_by TEXT
+) AS $$
+    -- Each branch is an index range scan stopping after p_limit rows; the merge then
+    -- sorts at most 2 * p_limit rows
+    SELECT *
+    FROM (
+        (
+            SELECT
+                m.id,
+                'movement'::TEXT,
+                m.movement_type::TEXT,
+                m.created_at,
+                CASE m.movement_type
+                    WHEN 'in' THEN m.quantity
+                    WHEN 'out' THEN -m.quantity
+                    ELSE COALESCE(m.quantity_after - m.quantity_before, m.quantity)
+                END,
+                m.quantity_after,
+                m.reason::TEXT,
+                m.reference_number::TEXT,
+                COALESCE(m.location_to_name, m.location_to_id)::TEXT,
+                m.status::TEXT,
+                m.created_by::TEXT
+            FROM stock_movements m
+            WHERE m.product_id = p_product_id
+              AND (m.created_at, m.id) < (p_before_created_at, p_before_id)
+              AND m.status = 'completed'
+            ORDER BY m.created_at DESC, m.id DESC
+            LIMIT p_limit
+        )
+        UNION ALL
+        (
+            SELECT
+                a.id,
+                'adjustment'::TEXT,
+                a.adjustment_type::TEXT,
+                a.created_at,
+                a.quantity_change,
+                a.quantity_after,
+                a.reason::TEXT,
+                a.reference::TEXT,
+                a.location::TEXT,
+                a.status::TEXT,
+                a.created_by::TEXT
+            FROM stock_adjustments a
+            WHERE a.product_id = p_product_id
+              AND (a.created_at, a.id) < (p_before_created_at, p_before_id)
+              AND a.status = 'approved'
+            ORDER BY a.created_at DESC, a.id DESC
+            LIMIT p_limit
+        )
+    ) AS ledger
+    ORDER BY 4 DESC, 1 DESC
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,290 @@
+-- Migration: Daily rollups for stock movements and adjustments
+-- Created: 2026-10-17
+-- Description: Per-day counts and totals for stock_movements and stock_adjustments, kept
+-- current by statement-level triggers, and summary RPCs that compose any window from them
+-- for /api/movements/summary and /api/adjustments/summary
+
+-- Days are UTC calendar days. Each day and key is spread over 16 slot rows that are
+-- summed on read: a backend writes only its own slot (pg_backend_pid() % 16), as in
+-- dashboard_stats_slots, so concurrent ledger writers rarely queue on one rollup row.
+-- Rows written by refresh live in slot 0; a slot's figures can go negative when a row
+-- is updated or deleted from another backend than the one that inserted it.
+CREATE TABLE IF NOT EXISTS stock_movement_daily_rollups (
+    day DATE NOT NULL,
+    movement_type VARCHAR(20) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    slot SMALLINT NOT NULL DEFAULT 0 CHECK (slot >= 0 AND slot < 16),
+    movement_count BIGINT NOT NULL DEFAULT 0,
+    total_quantity BIGINT NOT NULL DEFAULT 0,
+    total_value DECIMAL(18,4) NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, movement_type, status, slot)
+);
+
+-- direction is the sign of quantity_change: increase, decrease or none
+CREATE TABLE IF NOT EXISTS stock_adjustment_daily_rollups (
+    day DATE NOT NULL,
+    adjustment_type VARCHAR(20) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    direction VARCHAR(10) NOT NULL,
+    slot SMALLINT NOT NULL DEFAULT 0 CHECK (slot >= 0 AND slot < 16),
+    adjustment_count BIGINT NOT NULL DEFAULT 0,
+    total_quantity_change BIGINT NOT NULL DEFAULT 0,
+    total_cost_impact DECIMAL(18,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, adjustment_type, status, direction, slot)
+);
+
+CREATE OR REPLACE FUNCTION ledger_rollup_day(p_created_at TIMESTAMPTZ)
+RETURNS DATE AS $$
+    SELECT (COALESCE(p_created_at, NOW()) AT TIME ZONE 'UTC')::DATE;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION adjustment_direction(p_quantity_change INTEGER)
+RETURNS VARCHAR AS $$
+    SELECT CASE
+        WHEN p_quantity_change > 0 THEN 'increase'
+        WHEN p_quantity_change < 0 THEN 'decrease'
+        ELSE 'none'
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Rebuild both rollups from the base tables (initial backfill, TRUNCATE, drift repair)
+CREATE OR REPLACE FUNCTION refresh_stock_movement_rollups()
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM stock_movement_daily_rollups;
+    INSERT INTO stock_movement_daily_rollups (day, movement_type, status, movement_count, total_quantity, total_value)
+    SELECT
+        ledger_rollup_day(created_at), movement_type, status,
+        COUNT(*), SUM(quantity), SUM(quantity * COALESCE(unit_cost, 0))
+    FROM stock_movements
+    GROUP BY 1, 2, 3;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION refresh_stock_adjustment_rollups()
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM stock_adjustment_daily_rollups;
+    INSERT INTO stock_adjustment_daily_rollups (day, adjustment_type, status, direction, adjustment_count, total_quantity_change, total_cost_impact)
+    SELECT
+        ledger_rollup_day(created_at), adjustment_type, status, adjustment_direction(quantity_change),
+        COUNT(*), SUM(quantity_change), SUM(COALESCE(cost_impact, 0))
+    FROM stock_adjustments
+    GROUP BY 1, 2, 3, 4;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Add (or subtract) grouped deltas to this backend's slot of the rollups. Deltas
+-- arrive as a JSONB array of {day, <keys>, count, quantity, value} and are applied in
+-- key order, so concurrent statements that do share a slot lock rows in the same order.
+CREATE OR REPLACE FUNCTION apply_stock_movement_rollup_delta(p_delta JSONB)
+RETURNS VOID AS $$
+    INSERT INTO stock_movement_daily_rollups AS r (day, movement_type, status, slot, movement_count, total_quantity, total_value)
+    SELECT
+        (d->>'day')::DATE, d->>'movement_type', d->>'status', pg_backend_pid() % 16,
+        (d->>'count')::BIGINT, (d->>'quantity')::BIGINT, (d->>'value')::DECIMAL
+    FROM jsonb_array_elements(COALESCE(p_delta, '[]'::jsonb)) AS d
+    ORDER BY 1, 2, 3
+    ON CONFLICT (day, movement_type, status, slot) DO UPDATE SET
+        movement_count = r.movement_count + EXCLUDED.movement_count,
+        total_quantity = r.total_quantity + EXCLUDED.total_quantity,
+        total_value = r.total_value + EXCLUDED.total_value;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION apply_stock_adjustment_rollup_delta(p_delta JSONB)
+RETURNS VOID AS $$
+    INSERT INTO stock_adjustment_daily_rollups AS r (day, adjustment_type, status, direction, slot, adjustment_count, total_quantity_change, total_cost_impact)
+    SELECT
+        (d->>'day')::DATE, d->>'adjustment_type', d->>'status', d->>'direction', pg_backend_pid() % 16,
+        (d->>'count')::BIGINT, (d->>'quantity')::BIGINT, (d->>'value')::DECIMAL
+    FROM jsonb_array_elements(COALESCE(p_delta, '[]'::jsonb)) AS d
+    ORDER BY 1, 2, 3, 4
+    ON CONFLICT (day, adjustment_type, status, direction, slot) DO UPDATE SET
+        adjustment_count = r.adjustment_count + EXCLUDED.adjustment_count,
+        total_quantity_change = r.total_quantity_change + EXCLUDED.total_quantity_change,
+        total_cost_impact = r.total_cost_impact + EXCLUDED.total_cost_impact;
+$$ LANGUAGE sql;
+
+-- Statement-level triggers: one grouped upsert per statement however many rows it touched,
+-- with old rows counted negatively. Transition tables cannot be shared between events, so
+-- each event gets its own trigger; plpgsql only plans the branch that runs, so one function
+-- can name both transition tables.
+CREATE OR REPLACE FUNCTION stock_movement_rollups_changed()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_delta JSONB;
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        PERFORM refresh_stock_movement_rollups();
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        SELECT jsonb_agg(g) INTO v_delta FROM (
+            SELECT ledger_rollup_day(created_at) AS day, movement_type, status,
+                   COUNT(*) AS count, SUM(quantity) AS quantity, SUM(quantity * COALESCE(unit_cost, 0)) AS value
+            FROM new_rows GROUP BY 1, 2, 3
+        ) g;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT jsonb_agg(g) INTO v_delta FROM (
+            SELECT ledger_rollup_day(created_at) AS day, movement_type, status,
+                   -COUNT(*) AS count, -SUM(quantity) AS quantity, -SUM(quantity * COALESCE(unit_cost, 0)) AS value
+            FROM old_rows GROUP BY 1, 2, 3
+        ) g;
+    ELSE
+        SELECT jsonb_agg(g) INTO v_delta FROM (
+            SELECT day, movement_type, status,
+                   SUM(sign) AS count, SUM(sign * quantity) AS quantity, SUM(sign * value) AS value
+            FROM (
+                SELECT ledger_rollup_day(created_at) AS day, movement_type, status, 1 AS sign,
+                       quantity, quantity * COALESCE(unit_cost, 0) AS value
+                FROM new_rows
+                UNION ALL
+                SELECT ledger_rollup_day(created_at), movement_type, status, -1,
+                       quantity, quantity * COALESCE(unit_cost, 0)
+                FROM old_rows
+            ) changes
+            GROUP BY 1, 2, 3
+            -- Updates that leave every rollup key and total alone (notes, updated_at) write nothing
+            HAVING SUM(sign) <> 0 OR SUM(sign * quantity) <> 0 OR SUM(sign * value) <> 0
+        ) g;
+    END IF;
+
+    PERFORM apply_stock_movement_rollup_delta(v_delta);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION stock_adjustment_rollups_changed()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_delta JSONB;
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        PERFORM refresh_stock_adjustment_rollups();
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        SELECT jsonb_agg(g) INTO v_delta FROM (
+            SELECT ledger_rollup_day(created_at) AS day, adjustment_type, status, adjustment_direction(quantity_change) AS direction,
+                   COUNT(*) AS count, SUM(quantity_change) AS quantity, SUM(COALESCE(cost_impact, 0)) AS value
+            FROM new_rows GROUP BY 1, 2, 3, 4
+        ) g;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT jsonb_agg(g) INTO v_delta FROM (
+            SELECT ledger_rollup_day(created_at) AS day, adjustment_type, status, adjustment_direction(quantity_change) AS direction,
+                   -COUNT(*) AS count, -SUM(quantity_change) AS quantity, -SUM(COALESCE(cost_impact, 0)) AS value
+            FROM old_rows GROUP BY 1, 2, 3, 4
+        ) g;
+    ELSE
+        SELECT jsonb_agg(g) INTO v_delta FROM (
+            SELECT day, adjustment_type, status, direction,
+                   SUM(sign) AS count, SUM(sign * quantity) AS quantity, SUM(sign * value) AS value
+            FROM (
+                SELECT ledger_rollup_day(created_at) AS day, adjustment_type, status,
+                       adjustment_direction(quantity_change) AS direction, 1 AS sign,
+                       quantity_change AS quantity, COALESCE(cost_impact, 0) AS value
+                FROM new_rows
+                UNION ALL
+                SELECT ledger_rollup_day(created_at), adjustment_type, status,
+                       adjustment_direction(quantity_change), -1,
+                       quantity_change, COALESCE(cost_impact, 0)
+                FROM old_rows
+            ) changes
+            GROUP BY 1, 2, 3, 4
+            HAVING SUM(sign) <> 0 OR SUM(sign * quantity) <> 0 OR SUM(sign * value) <> 0
+        ) g;
+    END IF;
+
+    PERFORM apply_stock_adjustment_rollup_delta(v_delta);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS stock_movement_rollups_insert ON stock_movements;
+DROP TRIGGER IF EXISTS stock_movement_rollups_update ON stock_movements;
+DROP TRIGGER IF EXISTS stock_movement_rollups_delete ON stock_movements;
+DROP TRIGGER IF EXISTS stock_movement_rollups_truncate ON stock_movements;
+CREATE TRIGGER stock_movement_rollups_insert
+    AFTER INSERT ON stock_movements REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stock_movement_rollups_changed();
+CREATE TRIGGER stock_movement_rollups_update
+    AFTER UPDATE ON stock_movements REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stock_movement_rollups_changed();
+CREATE TRIGGER stock_movement_rollups_delete
+    AFTER DELETE ON stock_movements REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stock_movement_rollups_changed();
+CREATE TRIGGER stock_movement_rollups_truncate
+    AFTER TRUNCATE ON stock_movements
+    FOR EACH STATEMENT EXECUTE FUNCTION stock_movement_rollups_changed();
+
+DROP TRIGGER IF EXISTS stock_adjustment_rollups_insert ON stock_adjustments;
+DROP TRIGGER IF EXISTS stock_adjustment_rollups_update ON stock_adjustments;
+DROP TRIGGER IF EXISTS stock_adjustment_rollups_delete ON stock_adjustments;
+DROP TRIGGER IF EXISTS stock_adjustment_rollups_truncate ON stock_adjustments;
+CREATE TRIGGER stock_adjustment_rollups_insert
+    AFTER INSERT ON stock_adjustments REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stock_adjustment_rollups_changed();
+CREATE TRIGGER stock_adjustment_rollups_update
+    AFTER UPDATE ON stock_adjustments REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stock_adjustment_rollups_changed();
+CREATE TRIGGER stock_adjustment_rollups_delete
+    AFTER DELETE ON stock_adjustments REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stock_adjustment_rollups_changed();
+CREATE TRIGGER stock_adjustment_rollups_truncate
+    AFTER TRUNCATE ON stock_adjustments
+    FOR EACH STATEMENT EXECUTE FUNCTION stock_adjustment_rollups_changed();
+
+-- Summaries. Today, this week (starting Sunday) and this month are UTC calendar windows;
+-- every figure sums the slot rows for each day and key, never the ledgers themselves.
+CREATE OR REPLACE FUNCTION get_stock_movement_summary(p_days INTEGER DEFAULT 30)
+RETURNS JSONB AS $$
+    WITH bounds AS (
+        SELECT
+            ledger_rollup_day(NOW()) AS today,
+            ledger_rollup_day(NOW()) - EXTRACT(DOW FROM ledger_rollup_day(NOW()))::INTEGER AS week_start,
+            DATE_TRUNC('month', ledger_rollup_day(NOW()))::DATE AS month_start,
+            ledger_rollup_day(NOW() - MAKE_INTERVAL(days => p_days)) AS window_start
+    )
+    SELECT jsonb_build_object(
+        'totalMovements', COALESCE(SUM(r.movement_count) FILTER (WHERE r.day >= b.window_start), 0),
+        'totalStockIn', COALESCE(SUM(r.total_quantity) FILTER (WHERE r.day >= b.window_start AND r.movement_type = 'in'), 0),
+        'totalStockOut', COALESCE(SUM(r.total_quantity) FILTER (WHERE r.day >= b.window_start AND r.movement_type = 'out'), 0),
+        'totalValue', COALESCE(SUM(r.total_value) FILTER (WHERE r.day >= b.window_start), 0),
+        'movementsToday', COALESCE(SUM(r.movement_count) FILTER (WHERE r.day >= b.today), 0),
+        'movementsThisWeek', COALESCE(SUM(r.movement_count) FILTER (WHERE r.day >= b.week_start), 0),
+        'movementsThisMonth', COALESCE(SUM(r.movement_count) FILTER (WHERE r.day >= b.month_start), 0)
+    )
+    FROM bounds b
+    LEFT JOIN stock_movement_daily_rollups r
+        ON r.day >= LEAST(b.window_start, b.week_start, b.month_start);
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_stock_adjustment_summary()
+RETURNS JSONB AS $$
+    WITH bounds AS (
+        SELECT
+            ledger_rollup_day(NOW()) AS today,
+            ledger_rollup_day(NOW()) - EXTRACT(DOW FROM ledger_rollup_day(NOW()))::INTEGER AS week_start,
+            DATE_TRUNC('month', ledger_rollup_day(NOW()))::DATE AS month_start
+    )
+    SELECT jsonb_build_object(
+        'totalAdjustments', COALESCE(SUM(r.adjustment_count), 0),
+        'pendingAdjustments', COALESCE(SUM(r.adjustment_count) FILTER (WHERE r.status = 'pending'), 0),
+        'approvedAdjustments', COALESCE(SUM(r.adjustment_count) FILTER (WHERE r.status = 'approved'), 0),
+        'rejectedAdjustments', COALESCE(SUM(r.adjustment_count) FILTER (WHERE r.status = 'rejected'), 0),
+        'totalIncreases', COALESCE(SUM(r.adjustment_count) FILTER (WHERE r.direction = 'increase'), 0),
+        'totalDecreases', COALESCE(SUM(r.adjustment_count) FILTER (WHERE r.direction = 'decrease'), 0),
+        'totalCostImpact', COALESCE(SUM(r.total_cost_impact), 0),
+        'adjustmentsToday', COALESCE(SUM(r.adjustment_count) FILTER (WHERE r.day >= b.today), 0),
+        'adjustmentsThisWeek', COALESCE(SUM(r.adjustment_count) FILTER (WHERE r.day >= b.week_start), 0),
+        'adjustmentsThisMonth', COALESCE(SUM(r.adjustment_count) FILTER (WHERE r.day >= b.month_start), 0)
+    )
+    FROM bounds b
+    LEFT JOIN stock_adjustment_daily_rollups r ON TRUE;
+$$ LANGUAGE sql STABLE;
+
+-- Backfill from existing rows
+SELECT refresh_stock_movement_rollups();
+SELECT refresh_stock_adjustment_rollups();
@@ -0,0 +1,134 @@
+-- Migration: Set-based inventory cost sync
+-- Created: 2026-10-17
+-- Description: Sync inventory_items.unit_cost from product prices in one statement, with an incremental mode
+
+-- One row per sync; the incremental mode picks up products changed since the last run
+CREATE TABLE IF NOT EXISTS inventory_cost_sync_runs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    mode VARCHAR(20) NOT NULL CHECK (mode IN ('full', 'incremental')),
+    started_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    changed_since TIMESTAMP WITH TIME ZONE,
+    items_processed INTEGER NOT NULL,
+    items_updated INTEGER NOT NULL,
+    duration_ms INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_inventory_cost_sync_runs_started_at
+    ON inventory_cost_sync_runs(started_at DESC);
+
+-- Incremental syncs look up recently changed products
+CREATE INDEX IF NOT EXISTS idx_products_updated_at ON products(updated_at);
+
+-- The product stock_quantity rollup only depends on quantities, status and product;
+-- without this, every cost update also rewrote (and re-timestamped) its product
+DROP TRIGGER IF EXISTS trigger_sync_product_stock_quantity ON inventory_items;
+CREATE TRIGGER trigger_sync_product_stock_quantity
+    AFTER INSERT OR DELETE OR UPDATE OF quantity_on_hand, quantity_reserved, quantity_allocated, status, product_id
+    ON inventory_items
+    FOR EACH ROW
+    EXECUTE FUNCTION sync_product_stock_quantity();
+
+-- Cost precedence, as in the original sync: the product's cost_price when set,
+-- otherwise its selling_price but only for items that have no cost yet
+CREATE OR REPLACE FUNCTION inventory_synced_unit_cost(
+    p_unit_cost DECIMAL,
+    p_cost_price DECIMAL,
+    p_selling_price DECIMAL
+)
+RETURNS DECIMAL AS $$
+    SELECT CASE
+        WHEN p_cost_price > 0 THEN p_cost_price
+        WHEN p_selling_price > 0 AND COALESCE(p_unit_cost, 0) = 0 THEN p_selling_price
+        ELSE p_unit_cost
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Sync unit_cost for active inventory items from their products.
+-- p_incremental limits the sync to products updated since the last run started
+-- (less a minute of overlap for writes that committed late); it falls back to a
+-- full sync when there is no previous run.
+-- Returns { mode, changedSince, processed, updated, durationMs }.
+CREATE OR REPLACE FUNCTION sync_inventory_costs(p_incremental BOOLEAN DEFAULT false)
+RETURNS JSONB AS $$
+DECLARE
+    v_started_at TIMESTAMP WITH TIME ZONE := clock_timestamp();
+    v_since TIMESTAMP WITH TIME ZONE;
+    v_processed INTEGER;
+    v_updated INTEGER;
+    v_duration_ms INTEGER;
+BEGIN
+    IF p_incremental THEN
+        SELECT MAX(started_at) - INTERVAL '1 minute' INTO v_since
+        FROM inventory_cost_sync_runs;
+    END IF;
+
+    WITH candidates AS (
+        SELECT
+            i.id,
+            i.unit_cost,
+            inventory_synced_unit_cost(i.unit_cost, p.cost_price, p.selling_price) AS new_unit_cost
+        FROM inventory_items i
+        JOIN products p ON p.id = i.product_id
+        WHERE i.status = 'active'
+          AND (v_since IS NULL OR p.updated_at >= v_since)
+    ),
+    updated AS (
+        UPDATE inventory_items i
+        SET unit_cost = c.new_unit_cost
+        FROM candidates c
+        WHERE i.id = c.id
+          AND c.new_unit_cost IS DISTINCT FROM c.unit_cost
+        RETURNING i.id
+    )
+    SELECT
+        (SELECT COUNT(*) FROM candidates),
+        (SELECT COUNT(*) FROM updated)
+    INTO v_processed, v_updated;
+
+    v_duration_ms := (EXTRACT(EPOCH FROM clock_timestamp() - v_started_at) * 1000)::INTEGER;
+
+    INSERT INTO inventory_cost_sync_runs (
+        mode, started_at, changed_since, items_processed, items_updated, duration_ms
+    ) VALUES (
+        CASE WHEN v_since IS NULL THEN 'full' ELSE 'incremental' END,
+        v_started_at, v_since, v_processed, v_updated, v_duration_ms
+    );
+
+    RETURN jsonb_build_object(
+        'mode', CASE WHEN v_since IS NULL THEN 'full' ELSE 'incremental' END,
+        'changedSince', v_since,
+        'processed', v_processed,
+        'updated', v_updated,
+        'durationMs', v_duration_ms
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Counters for GET /api/inventory/utilities/sync-costs, computed in one pass
+CREATE OR REPLACE FUNCTION get_inventory_cost_sync_status()
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'totalItems', COUNT(*),
+        'itemsWithCost', COUNT(*) FILTER (WHERE COALESCE(i.unit_cost, 0) <> 0),
+        'itemsWithZeroCost', COUNT(*) FILTER (WHERE COALESCE(i.unit_cost, 0) = 0),
+        'itemsNeedingSync', COUNT(*) FILTER (
+            WHERE inventory_synced_unit_cost(i.unit_cost, p.cost_price, p.selling_price)
+                IS DISTINCT FROM i.unit_cost
+        ),
+        'lastSync', (
+            SELECT jsonb_build_object(
+                'mode', r.mode,
+                'startedAt', r.started_at,
+                'processed', r.items_processed,
+                'updated', r.items_updated,
+                'durationMs', r.duration_ms
+            )
+            FROM inventory_cost_sync_runs r
+            ORDER BY r.started_at DESC
+            LIMIT 1
+        )
+    )
+    FROM inventory_items i
+    LEFT JOIN products p ON p.id = i.product_id
+    WHERE i.status = 'active';
+$$ LANGUAGE sql STABLE;
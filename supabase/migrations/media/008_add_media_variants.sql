@@ -0,0 +1,18 @@
+-- Migration: Add server-generated image variants to media
+-- Created: 2026-10-17
+-- Description: Records the WebP/AVIF derivatives stored next to each original image
+-- (thumbnail, small, medium, large) so listings can link pre-sized files instead of
+-- resizing the original on every request
+
+ALTER TABLE media
+    ADD COLUMN IF NOT EXISTS variants JSONB NOT NULL DEFAULT '{}'::jsonb,
+    ADD COLUMN IF NOT EXISTS variants_generated_at TIMESTAMPTZ;
+
+-- Shape: { "<size>": { "width": int, "height": int, "webp": "<path>", "avif": "<path>" } }
+COMMENT ON COLUMN media.variants IS 'Storage paths of generated image variants keyed by size';
+COMMENT ON COLUMN media.variants_generated_at IS 'When variants were last generated; used to version variant URLs';
+
+-- Backfill queue: active images that still need variants
+CREATE INDEX IF NOT EXISTS idx_media_missing_variants
+    ON media (created_at)
+    WHERE variants_generated_at IS NULL AND media_type = 'image' AND is_active = TRUE;
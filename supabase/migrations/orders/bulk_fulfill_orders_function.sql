@@ -0,0 +1,146 @@
+-- ============================================================================
+-- SET-BASED BULK FULFILLMENT
+-- ============================================================================
+-- bulk_fulfill_orders applies one fulfillment action to a batch of orders in a
+-- handful of statements: the order status update, the fulfillment records for
+-- shipped orders and the order item statuses. /api/orders/bulk-fulfill splits
+-- large selections into chunks and calls it once per chunk.
+--
+-- With an idempotency key, each (key, chunk) is applied at most once; a retry
+-- gets the stored result back instead of writing again.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS bulk_fulfillment_requests (
+    idempotency_key TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    action VARCHAR(30) NOT NULL,
+    order_ids UUID[] NOT NULL,
+    result JSONB,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (idempotency_key, chunk_index)
+);
+
+CREATE INDEX IF NOT EXISTS idx_bulk_fulfillment_requests_created_at
+    ON bulk_fulfillment_requests(created_at);
+
+-- ============================================================================
+-- ORDER TOTALS TRIGGER
+-- ============================================================================
+-- Totals only depend on the items' total_price, so status-only item updates
+-- (one per item in a bulk fulfillment) no longer rewrite the parent order.
+-- ============================================================================
+
+DROP TRIGGER IF EXISTS update_order_totals_on_item_change_trigger ON order_items;
+CREATE TRIGGER update_order_totals_on_item_change_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF total_price, order_id ON order_items
+    FOR EACH ROW
+    EXECUTE FUNCTION update_order_totals_on_item_change();
+
+-- ============================================================================
+-- BULK FULFILL ORDERS
+-- ============================================================================
+-- p_action is one of start_processing, mark_shipped, mark_delivered or cancel
+-- (orders.status has no 'packed' value). Orders already in the target status are
+-- reported as processed without being written again, so a retry without a key
+-- does not duplicate fulfillment records either.
+--
+-- Returns { results: [{ orderId, success, error? }], replayed } with one result
+-- per element of p_order_ids, in input order.
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION bulk_fulfill_orders(
+    p_order_ids UUID[],
+    p_action TEXT,
+    p_idempotency_key TEXT DEFAULT NULL,
+    p_chunk_index INTEGER DEFAULT 0
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_status TEXT;
+    v_now TIMESTAMP WITH TIME ZONE := NOW();
+    v_claimed INTEGER;
+    v_previous bulk_fulfillment_requests%ROWTYPE;
+    v_result JSONB;
+BEGIN
+    v_status := CASE p_action
+        WHEN 'start_processing' THEN 'processing'
+        WHEN 'mark_shipped' THEN 'shipped'
+        WHEN 'mark_delivered' THEN 'delivered'
+        WHEN 'cancel' THEN 'cancelled'
+    END;
+
+    IF v_status IS NULL THEN
+        RAISE EXCEPTION 'Invalid action: %', p_action;
+    END IF;
+
+    IF p_idempotency_key IS NOT NULL THEN
+        -- A concurrent call with the same key waits here until the first one commits
+        INSERT INTO bulk_fulfillment_requests (idempotency_key, chunk_index, action, order_ids)
+        VALUES (p_idempotency_key, p_chunk_index, p_action, p_order_ids)
+        ON CONFLICT DO NOTHING;
+        GET DIAGNOSTICS v_claimed = ROW_COUNT;
+
+        IF v_claimed = 0 THEN
+            SELECT * INTO v_previous
+            FROM bulk_fulfillment_requests
+            WHERE idempotency_key = p_idempotency_key AND chunk_index = p_chunk_index;
+
+            IF v_previous.action <> p_action OR v_previous.order_ids <> p_order_ids THEN
+                RAISE EXCEPTION 'Idempotency key % was already used for a different request', p_idempotency_key;
+            END IF;
+
+            RETURN v_previous.result || jsonb_build_object('replayed', true);
+        END IF;
+    END IF;
+
+    -- Lock in id order so overlapping bulk requests cannot deadlock
+    PERFORM 1 FROM orders WHERE id = ANY(p_order_ids) ORDER BY id FOR UPDATE;
+
+    WITH updated AS (
+        UPDATE orders o
+        SET status = v_status,
+            shipped_at = CASE WHEN v_status = 'shipped' THEN v_now ELSE o.shipped_at END,
+            delivered_at = CASE WHEN v_status = 'delivered' THEN v_now ELSE o.delivered_at END,
+            cancelled_at = CASE WHEN v_status = 'cancelled' THEN v_now ELSE o.cancelled_at END,
+            updated_at = v_now
+        WHERE o.id = ANY(p_order_ids)
+          AND o.status IS DISTINCT FROM v_status
+        RETURNING o.id
+    ),
+    fulfillments AS (
+        INSERT INTO order_fulfillments (order_id, fulfillment_status, shipped_at)
+        SELECT u.id, 'shipped', v_now
+        FROM updated u
+        WHERE v_status = 'shipped'
+    ),
+    items AS (
+        UPDATE order_items i
+        SET status = v_status,
+            updated_at = v_now
+        FROM updated u
+        WHERE i.order_id = u.id
+          AND v_status IN ('shipped', 'delivered', 'cancelled')
+    )
+    SELECT jsonb_build_object(
+        'results', COALESCE(jsonb_agg(
+            CASE WHEN o.id IS NULL
+                THEN jsonb_build_object('orderId', e.order_id, 'success', false, 'error', 'Order not found')
+                ELSE jsonb_build_object('orderId', e.order_id, 'success', true)
+            END
+            ORDER BY e.ordinality
+        ), '[]'::JSONB),
+        'replayed', false
+    )
+    INTO v_result
+    FROM unnest(p_order_ids) WITH ORDINALITY AS e(order_id, ordinality)
+    LEFT JOIN orders o ON o.id = e.order_id;
+
+    IF p_idempotency_key IS NOT NULL THEN
+        UPDATE bulk_fulfillment_requests
+        SET result = v_result
+        WHERE idempotency_key = p_idempotency_key AND chunk_index = p_chunk_index;
+    END IF;
+
+    RETURN v_result;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,398 @@
+-- ============================================================================
+-- ATOMIC ORDER CREATION WITH STOCK RESERVATION
+-- ============================================================================
+-- create_order validates the items, snapshots product name/SKU/price, inserts
+-- the order and its items and reserves stock, all in one transaction and one
+-- round-trip. Inventory and product rows are locked in id order while stock is
+-- checked, so concurrent checkouts for the same product queue up instead of
+-- both seeing the same available quantity.
+--
+-- Reservations are recorded per inventory location and settled by triggers:
+-- released when the order is cancelled or deleted, consumed (on-hand reduced
+-- and a sale movement recorded) when it ships or is delivered.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS order_stock_reservations (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    order_id UUID NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+    inventory_item_id UUID NOT NULL REFERENCES inventory_items(id) ON DELETE CASCADE,
+    product_id UUID NOT NULL,
+    quantity INTEGER NOT NULL CHECK (quantity > 0),
+    status VARCHAR(20) NOT NULL DEFAULT 'reserved'
+        CHECK (status IN ('reserved', 'released', 'consumed')),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_order_stock_reservations_order
+    ON order_stock_reservations(order_id) WHERE status = 'reserved';
+
+-- ============================================================================
+-- CREATE ORDER
+-- ============================================================================
+-- p_order holds the orders columns (customer, payment, shipping/billing address,
+-- notes, optional shipping_amount/discount_amount). p_items is an array of
+-- { product_id, quantity, unit_price? }; unit_price defaults to the current
+-- selling price and may differ from it by at most 10%.
+--
+-- Returns { success: true, order: { ...order, items: [...] } } or
+-- { success: false, errors: [...] } without writing anything.
+-- ============================================================================
+
+-- One row per element of p_items, numbered from 1
+CREATE OR REPLACE FUNCTION order_request_lines(p_items JSONB)
+RETURNS TABLE (
+    line_no INTEGER,
+    product_id UUID,
+    quantity INTEGER,
+    requested_price DECIMAL(10,2)
+) AS $$
+    SELECT
+        e.ordinality::INTEGER,
+        (e.value->>'product_id')::UUID,
+        (e.value->>'quantity')::INTEGER,
+        (e.value->>'unit_price')::DECIMAL
+    FROM jsonb_array_elements(p_items) WITH ORDINALITY AS e(value, ordinality);
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION create_order(
+    p_order JSONB,
+    p_items JSONB,
+    p_tax_rate DECIMAL DEFAULT 0.08
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_errors TEXT[];
+    v_subtotal DECIMAL(12,2);
+    v_shipping DECIMAL(12,2);
+    v_discount DECIMAL(12,2);
+    v_tax DECIMAL(12,2);
+    v_order orders%ROWTYPE;
+BEGIN
+    IF p_items IS NULL OR jsonb_array_length(p_items) = 0 THEN
+        RETURN jsonb_build_object('success', FALSE, 'errors', jsonb_build_array('Order must contain at least one item'));
+    END IF;
+
+    -- Lock the active inventory rows, then their products, each in id order, so
+    -- concurrent orders cannot both pass the stock check. Inventory comes first
+    -- because every other stock writer takes the product lock through
+    -- trigger_sync_product_stock_quantity after its inventory row; the opposite
+    -- order could deadlock against them.
+    PERFORM 1 FROM inventory_items
+    WHERE product_id IN (SELECT product_id FROM order_request_lines(p_items))
+      AND status = 'active'
+    ORDER BY id
+    FOR UPDATE;
+
+    PERFORM 1 FROM products
+    WHERE id IN (SELECT product_id FROM order_request_lines(p_items))
+    ORDER BY id
+    FOR UPDATE;
+
+    -- Same checks and messages as the previous client-side validation; a product
+    -- ordered on several lines is checked against its combined quantity
+    WITH requested AS (
+        SELECT product_id, SUM(quantity) AS quantity
+        FROM order_request_lines(p_items)
+        GROUP BY product_id
+    ),
+    available AS (
+        SELECT product_id, SUM(quantity_available) AS quantity
+        FROM inventory_items
+        WHERE product_id IN (SELECT product_id FROM requested)
+          AND status = 'active'
+        GROUP BY product_id
+    )
+    SELECT array_agg(message ORDER BY line_no) INTO v_errors
+    FROM (
+        SELECT l.line_no, 'Invalid quantity for product ' || l.product_id AS message
+        FROM order_request_lines(p_items) l
+        WHERE l.quantity IS NULL OR l.quantity <= 0
+        UNION ALL
+        SELECT MIN(l.line_no), 'Products not found: ' || string_agg(DISTINCT l.product_id::TEXT, ', ')
+        FROM order_request_lines(p_items) l
+        LEFT JOIN products p ON p.id = l.product_id
+        WHERE p.id IS NULL
+        HAVING COUNT(*) > 0
+        UNION ALL
+        SELECT MIN(l.line_no), 'Product ' || p.name || ' is not available'
+        FROM order_request_lines(p_items) l
+        JOIN products p ON p.id = l.product_id
+        WHERE NOT COALESCE(p.is_active, FALSE)
+        GROUP BY p.id, p.name
+        UNION ALL
+        SELECT MIN(l.line_no),
+               'Insufficient stock for ' || p.name || '. Available: ' || COALESCE(a.quantity, 0) || ', Requested: ' || r.quantity
+        FROM requested r
+        JOIN order_request_lines(p_items) l ON l.product_id = r.product_id
+        JOIN products p ON p.id = r.product_id
+        LEFT JOIN available a ON a.product_id = r.product_id
+        WHERE COALESCE(p.is_active, FALSE) AND COALESCE(a.quantity, 0) < r.quantity
+        GROUP BY p.id, p.name, a.quantity, r.quantity
+        UNION ALL
+        SELECT l.line_no, 'Price for ' || p.name || ' is significantly different from current price'
+        FROM order_request_lines(p_items) l
+        JOIN products p ON p.id = l.product_id
+        WHERE COALESCE(p.is_active, FALSE)
+          AND l.requested_price IS NOT NULL
+          AND p.selling_price > 0
+          AND ABS(l.requested_price - p.selling_price) / p.selling_price > 0.1
+    ) problems;
+
+    IF v_errors IS NOT NULL THEN
+        RETURN jsonb_build_object('success', FALSE, 'errors', to_jsonb(v_errors));
+    END IF;
+
+    SELECT COALESCE(SUM(l.quantity * COALESCE(l.requested_price, p.selling_price)), 0)
+    INTO v_subtotal
+    FROM order_request_lines(p_items) l
+    JOIN products p ON p.id = l.product_id;
+
+    v_tax := ROUND(v_subtotal * p_tax_rate, 2);
+    -- Free shipping over $100, otherwise $10, unless the caller sets an amount
+    v_shipping := COALESCE((p_order->>'shipping_amount')::DECIMAL, CASE WHEN v_subtotal > 100 THEN 0 ELSE 10 END);
+    v_discount := COALESCE((p_order->>'discount_amount')::DECIMAL, 0);
+
+    INSERT INTO orders (
+        customer_id, status, subtotal, tax_amount, shipping_amount, discount_amount, total_amount,
+        currency, payment_status, payment_method,
+        shipping_name, shipping_address_line_1, shipping_address_line_2, shipping_city,
+        shipping_state, shipping_postal_code, shipping_country, shipping_phone,
+        billing_name, billing_address_line_1, billing_address_line_2, billing_city,
+        billing_state, billing_postal_code, billing_country, billing_phone,
+        notes
+    )
+    VALUES (
+        p_order->>'customer_id', 'pending', v_subtotal, v_tax, v_shipping, v_discount,
+        v_subtotal + v_tax + v_shipping - v_discount,
+        'USD', 'pending', p_order->>'payment_method',
+        p_order->>'shipping_name', p_order->>'shipping_address_line_1', p_order->>'shipping_address_line_2', p_order->>'shipping_city',
+        p_order->>'shipping_state', p_order->>'shipping_postal_code', COALESCE(p_order->>'shipping_country', 'USA'), p_order->>'shipping_phone',
+        p_order->>'billing_name', p_order->>'billing_address_line_1', p_order->>'billing_address_line_2', p_order->>'billing_city',
+        p_order->>'billing_state', p_order->>'billing_postal_code', p_order->>'billing_country', p_order->>'billing_phone',
+        p_order->>'notes'
+    )
+    RETURNING * INTO v_order;
+
+    -- The totals are computed above; skip the per-item totals trigger, which would
+    -- otherwise update the order (and run the settle trigger) once per item
+    PERFORM set_config('app.skip_order_totals', 'on', TRUE);
+
+    INSERT INTO order_items (order_id, product_id, product_name, product_sku, quantity, unit_price, total_price, status)
+    SELECT
+        v_order.id,
+        l.product_id::TEXT,
+        p.name,
+        p.sku,
+        l.quantity,
+        COALESCE(l.requested_price, p.selling_price),
+        l.quantity * COALESCE(l.requested_price, p.selling_price),
+        'pending'
+    FROM order_request_lines(p_items) l
+    JOIN products p ON p.id = l.product_id
+    ORDER BY l.line_no;
+
+    PERFORM set_config('app.skip_order_totals', 'off', TRUE);
+
+    -- Reserve each product's quantity across its active locations, fullest first
+    WITH requested AS (
+        SELECT product_id, SUM(quantity) AS quantity
+        FROM order_request_lines(p_items)
+        GROUP BY product_id
+    ),
+    locations AS (
+        SELECT
+            i.id,
+            i.product_id,
+            i.quantity_available,
+            r.quantity AS requested,
+            SUM(i.quantity_available) OVER (
+                PARTITION BY i.product_id
+                ORDER BY i.quantity_available DESC, i.id
+            ) - i.quantity_available AS reserved_before
+        FROM inventory_items i
+        JOIN requested r ON r.product_id = i.product_id
+        WHERE i.status = 'active' AND i.quantity_available > 0
+    ),
+    allocation AS (
+        SELECT id, product_id, LEAST(quantity_available, requested - reserved_before) AS quantity
+        FROM locations
+        WHERE requested > reserved_before
+    ),
+    reserved AS (
+        UPDATE inventory_items i
+        SET quantity_reserved = i.quantity_reserved + a.quantity,
+            updated_at = NOW()
+        FROM allocation a
+        WHERE i.id = a.id
+        RETURNING a.id, a.product_id, a.quantity
+    )
+    INSERT INTO order_stock_reservations (order_id, inventory_item_id, product_id, quantity)
+    SELECT v_order.id, id, product_id, quantity
+    FROM reserved;
+
+    RETURN jsonb_build_object(
+        'success', TRUE,
+        'order', (
+            SELECT to_jsonb(o) || jsonb_build_object(
+                'items', COALESCE((
+                    SELECT jsonb_agg(to_jsonb(i) ORDER BY i.created_at, i.id)
+                    FROM order_items i
+                    WHERE i.order_id = o.id
+                ), '[]'::jsonb)
+            )
+            FROM orders o
+            WHERE o.id = v_order.id
+        )
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- ORDER TOTALS ON ITEM CHANGES
+-- ============================================================================
+-- Same as before, except that it does nothing while app.skip_order_totals is on
+-- for the transaction: create_order inserts every item with the final totals
+-- already on the order.
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION update_order_totals_on_item_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    order_record RECORD;
+BEGIN
+    IF current_setting('app.skip_order_totals', TRUE) = 'on' THEN
+        RETURN NULL;
+    END IF;
+
+    -- Get the order ID (works for INSERT, UPDATE, DELETE)
+    IF TG_OP = 'DELETE' THEN
+        SELECT id INTO order_record FROM orders WHERE id = OLD.order_id;
+    ELSE
+        SELECT id INTO order_record FROM orders WHERE id = NEW.order_id;
+    END IF;
+
+    -- Update the order totals
+    UPDATE orders
+    SET subtotal = (
+        SELECT COALESCE(SUM(total_price), 0)
+        FROM order_items
+        WHERE order_id = order_record.id
+    ),
+    total_amount = subtotal + tax_amount + shipping_amount - discount_amount,
+    updated_at = NOW()
+    WHERE id = order_record.id;
+
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    ELSE
+        RETURN NEW;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- SETTLE RESERVATIONS ON STATUS CHANGES
+-- ============================================================================
+-- Statement-level, so bulk status updates settle every order in one pass.
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION settle_order_stock_reservations()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Cancelled before shipping: give the stock back
+    WITH released AS (
+        UPDATE order_stock_reservations r
+        SET status = 'released', updated_at = NOW()
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        WHERE r.order_id = n.id
+          AND r.status = 'reserved'
+          AND n.status = 'cancelled' AND o.status <> 'cancelled'
+        RETURNING r.inventory_item_id, r.quantity
+    ),
+    per_item AS (
+        SELECT inventory_item_id, SUM(quantity) AS quantity
+        FROM released
+        GROUP BY inventory_item_id
+    )
+    UPDATE inventory_items i
+    SET quantity_reserved = GREATEST(i.quantity_reserved - p.quantity, 0),
+        updated_at = NOW()
+    FROM per_item p
+    WHERE i.id = p.inventory_item_id;
+
+    -- Shipped or delivered: the reserved units leave the warehouse
+    WITH consumed AS (
+        UPDATE order_stock_reservations r
+        SET status = 'consumed', updated_at = NOW()
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        WHERE r.order_id = n.id
+          AND r.status = 'reserved'
+          AND n.status IN ('shipped', 'delivered') AND o.status NOT IN ('shipped', 'delivered')
+        RETURNING r.inventory_item_id, r.product_id, r.quantity, n.id AS order_id, n.order_number
+    ),
+    per_item AS (
+        SELECT inventory_item_id, SUM(quantity) AS quantity
+        FROM consumed
+        GROUP BY inventory_item_id
+    ),
+    deducted AS (
+        UPDATE inventory_items i
+        SET quantity_reserved = GREATEST(i.quantity_reserved - p.quantity, 0),
+            quantity_on_hand = i.quantity_on_hand - p.quantity,
+            last_movement_date = NOW(),
+            last_movement_type = 'out',
+            updated_at = NOW()
+        FROM per_item p
+        WHERE i.id = p.inventory_item_id
+        RETURNING i.id, i.location_id, i.location_name
+    )
+    INSERT INTO stock_movements (
+        movement_number, movement_type, product_id, location_from_id, location_from_name,
+        quantity, reason, reference_type, reference_id, reference_number, status, created_by
+    )
+    SELECT
+        'MOV-' || TO_CHAR(NOW(), 'YYYYMMDD') || '-' || SUBSTRING(REPLACE(gen_random_uuid()::TEXT, '-', '') FOR 12),
+        'out', c.product_id, d.location_id, d.location_name,
+        c.quantity, 'sale', 'order', c.order_id, c.order_number, 'completed', 'system'
+    FROM consumed c
+    JOIN deducted d ON d.id = c.inventory_item_id;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Reservations deleted with their order still hold stock; release it
+CREATE OR REPLACE FUNCTION release_deleted_order_stock_reservations()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE inventory_items i
+    SET quantity_reserved = GREATEST(i.quantity_reserved - p.quantity, 0),
+        updated_at = NOW()
+    FROM (
+        SELECT inventory_item_id, SUM(quantity) AS quantity
+        FROM old_rows
+        WHERE status = 'reserved'
+        GROUP BY inventory_item_id
+    ) p
+    WHERE i.id = p.inventory_item_id;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS settle_order_stock_reservations_trigger ON orders;
+CREATE TRIGGER settle_order_stock_reservations_trigger
+    AFTER UPDATE ON orders
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION settle_order_stock_reservations();
+
+DROP TRIGGER IF EXISTS release_deleted_order_stock_reservations_trigger ON order_stock_reservations;
+CREATE TRIGGER release_deleted_order_stock_reservations_trigger
+    AFTER DELETE ON order_stock_reservations
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION release_deleted_order_stock_reservations();
@@ -0,0 +1,95 @@
+-- ============================================================================
+-- ORDER ANALYTICS AGGREGATION
+-- ============================================================================
+-- Computes every figure shown by /api/orders/analytics in one set-based pass
+-- over the orders in the requested date range: totals, status breakdown,
+-- average order value, top customers, daily trend and payment methods.
+-- ============================================================================
+
+-- Covering index so the range scan can be served from the index alone; it
+-- carries every column the function reads, shipping_name included
+DROP INDEX IF EXISTS idx_orders_created_at_analytics;
+CREATE INDEX idx_orders_created_at_analytics
+    ON orders(created_at)
+    INCLUDE (status, total_amount, payment_method, customer_id, shipping_name);
+
+CREATE OR REPLACE FUNCTION get_order_analytics(
+    p_start_date TIMESTAMPTZ DEFAULT NULL,
+    p_end_date TIMESTAMPTZ DEFAULT NULL,
+    p_top_customers INTEGER DEFAULT 5,
+    p_trend_days INTEGER DEFAULT 30
+)
+RETURNS JSONB AS $$
+    WITH filtered AS MATERIALIZED (
+        SELECT status, total_amount, payment_method, customer_id, shipping_name, created_at
+        FROM orders
+        WHERE (p_start_date IS NULL OR created_at >= p_start_date)
+          AND (p_end_date IS NULL OR created_at <= p_end_date)
+    ),
+    totals AS (
+        SELECT
+            COUNT(*) AS total_orders,
+            COALESCE(SUM(total_amount), 0) AS total_revenue,
+            COALESCE(ROUND(AVG(total_amount), 2), 0) AS average_order_value
+        FROM filtered
+    ),
+    by_status AS (
+        SELECT COALESCE(jsonb_object_agg(status, order_count), '{}'::JSONB) AS value
+        FROM (
+            SELECT status, COUNT(*) AS order_count
+            FROM filtered
+            GROUP BY status
+        ) s
+    ),
+    top_customers AS (
+        SELECT COALESCE(jsonb_agg(c ORDER BY c.total_spent DESC), '[]'::JSONB) AS value
+        FROM (
+            SELECT
+                customer_id AS id,
+                MAX(shipping_name) AS name,
+                COUNT(*) AS order_count,
+                SUM(total_amount) AS total_spent
+            FROM filtered
+            GROUP BY customer_id
+            ORDER BY total_spent DESC
+            LIMIT p_top_customers
+        ) c
+    ),
+    trend AS (
+        -- Most recent days of the period, returned in chronological order
+        SELECT COALESCE(jsonb_agg(d ORDER BY d.date), '[]'::JSONB) AS value
+        FROM (
+            SELECT
+                (created_at AT TIME ZONE 'UTC')::DATE AS date,
+                COUNT(*) AS order_count,
+                SUM(total_amount) AS daily_revenue
+            FROM filtered
+            GROUP BY 1
+            ORDER BY 1 DESC
+            LIMIT p_trend_days
+        ) d
+    ),
+    by_payment_method AS (
+        SELECT COALESCE(
+            jsonb_object_agg(method, jsonb_build_object('count', order_count, 'total', total)),
+            '{}'::JSONB
+        ) AS value
+        FROM (
+            SELECT COALESCE(payment_method, 'unknown') AS method, COUNT(*) AS order_count, SUM(total_amount) AS total
+            FROM filtered
+            GROUP BY 1
+        ) p
+    )
+    SELECT jsonb_build_object(
+        'total_orders', totals.total_orders,
+        'total_revenue', totals.total_revenue,
+        'average_order_value', totals.average_order_value,
+        'orders_by_status', by_status.value,
+        'top_customers', top_customers.value,
+        'orders_trend', trend.value,
+        'revenue_by_payment_method', by_payment_method.value
+    )
+    FROM totals, by_status, top_customers, trend, by_payment_method;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION get_order_analytics(TIMESTAMPTZ, TIMESTAMPTZ, INTEGER, INTEGER) IS 'Order analytics for a created_at range in a single round-trip';
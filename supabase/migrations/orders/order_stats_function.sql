@@ -0,0 +1,35 @@
+-- ============================================================================
+-- ORDER STATS AGGREGATION
+-- ============================================================================
+-- Returns every counter shown by /api/orders/stats as a single row, computed
+-- with one grouped pass over orders instead of shipping all rows to the client.
+-- p_today_start is supplied by the caller so "today" follows the server's
+-- local day boundary, as it did before.
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION get_order_stats(p_today_start TIMESTAMPTZ)
+RETURNS TABLE (
+    total_orders BIGINT,
+    pending_orders BIGINT,
+    processing_orders BIGINT,
+    shipped_orders BIGINT,
+    delivered_orders BIGINT,
+    cancelled_orders BIGINT,
+    total_revenue NUMERIC,
+    average_order_value NUMERIC,
+    orders_today BIGINT,
+    revenue_today NUMERIC
+) AS $$
+    SELECT
+        COUNT(*),
+        COUNT(*) FILTER (WHERE status = 'pending'),
+        COUNT(*) FILTER (WHERE status = 'processing'),
+        COUNT(*) FILTER (WHERE status = 'shipped'),
+        COUNT(*) FILTER (WHERE status = 'delivered'),
+        COUNT(*) FILTER (WHERE status = 'cancelled'),
+        COALESCE(SUM(total_amount), 0),
+        COALESCE(AVG(COALESCE(total_amount, 0)), 0),
+        COUNT(*) FILTER (WHERE created_at >= p_today_start AND created_at < p_today_start + INTERVAL '1 day'),
+        COALESCE(SUM(total_amount) FILTER (WHERE created_at >= p_today_start AND created_at < p_today_start + INTERVAL '1 day'), 0)
+    FROM orders;
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,76 @@
+-- Migration: Set-based bulk repricing
+-- Created: 2026-10-17
+-- Description: Reprice a set of products and record their price history in a single statement
+
+-- Applies one percentage, fixed_amount or new_price update to every product in p_product_ids.
+-- p_price_type 'base_price' reprices base_price; any other price type reprices selling_price.
+-- New prices are rounded to cents and floored at 0.01. Products whose price does not change
+-- are left untouched and get no history row. The update and the price_history insert run
+-- in one statement, so they commit or roll back together.
+-- Returns one row per repriced product with just the fields that changed.
+-- Targets the price_history table from 20241230_create_price_history_table.sql.
+CREATE OR REPLACE FUNCTION bulk_update_prices(
+    p_product_ids UUID[],
+    p_update_type TEXT,
+    p_value NUMERIC,
+    p_price_type TEXT DEFAULT 'retail_price',
+    p_change_reason TEXT DEFAULT 'Bulk price update',
+    p_changed_by TEXT DEFAULT 'system'
+)
+RETURNS TABLE (
+    product_id UUID,
+    old_price NUMERIC,
+    new_price NUMERIC,
+    base_price NUMERIC,
+    selling_price NUMERIC,
+    updated_at TIMESTAMPTZ
+) AS $$
+    WITH targets AS (
+        -- Lock in id order so concurrent bulk updates over overlapping sets cannot deadlock
+        SELECT
+            p.id,
+            p.base_price AS old_base_price,
+            CASE WHEN p_price_type = 'base_price' THEN p.base_price ELSE p.selling_price END AS old_price
+        FROM products p
+        WHERE p.id = ANY(p_product_ids)
+        ORDER BY p.id
+        FOR UPDATE
+    ),
+    priced AS (
+        SELECT
+            t.id,
+            t.old_base_price,
+            t.old_price,
+            GREATEST(0.01, ROUND(CASE p_update_type
+                WHEN 'percentage' THEN t.old_price * (1 + p_value / 100)
+                WHEN 'fixed_amount' THEN t.old_price + p_value
+                WHEN 'new_price' THEN p_value
+            END, 2)) AS new_price
+        FROM targets t
+        WHERE p_update_type IN ('percentage', 'fixed_amount', 'new_price')
+    ),
+    updated AS (
+        UPDATE products p
+        SET
+            base_price = CASE WHEN p_price_type = 'base_price' THEN pr.new_price ELSE p.base_price END,
+            selling_price = CASE WHEN p_price_type = 'base_price' THEN p.selling_price ELSE pr.new_price END,
+            updated_at = NOW()
+        FROM priced pr
+        WHERE p.id = pr.id
+          AND pr.new_price <> pr.old_price
+        RETURNING p.id, pr.old_price, pr.new_price, pr.old_base_price, p.base_price, p.selling_price, p.updated_at
+    ),
+    history AS (
+        INSERT INTO price_history (
+            product_id, old_price, new_price, old_cost_price, new_cost_price,
+            change_reason, change_type, changed_by, changed_at
+        )
+        SELECT
+            u.id, u.old_price, u.new_price, u.old_base_price, u.base_price,
+            p_change_reason, 'bulk_update', p_changed_by, u.updated_at
+        FROM updated u
+    )
+    SELECT u.id, u.old_price, u.new_price, u.base_price, u.selling_price, u.updated_at
+    FROM updated u
+    ORDER BY u.id;
+$$ LANGUAGE sql;
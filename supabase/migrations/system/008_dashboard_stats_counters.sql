@@ -0,0 +1,256 @@
+-- Migration: Incrementally maintained dashboard stats
+-- Created: 2026-10-17
+-- Description: Slotted counters for /api/dashboard/stats kept current by
+-- statement-level triggers on products, orders and inventory_items, plus daily
+-- snapshots used for period-over-period change percentages.
+
+-- Current totals, spread over 16 slot rows that are summed on read. Each backend
+-- writes only its own slot (pg_backend_pid() % 16), so concurrent writers rarely
+-- share a row lock and a transaction never holds two slots.
+CREATE TABLE IF NOT EXISTS dashboard_stats_slots (
+    slot SMALLINT PRIMARY KEY CHECK (slot >= 0 AND slot < 16),
+    total_products BIGINT NOT NULL DEFAULT 0,
+    total_orders BIGINT NOT NULL DEFAULT 0,
+    low_stock_items BIGINT NOT NULL DEFAULT 0,
+    inventory_value DECIMAL(16,4) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+INSERT INTO dashboard_stats_slots (slot)
+SELECT generate_series(0, 15)
+ON CONFLICT (slot) DO NOTHING;
+
+-- Current totals as one row
+CREATE OR REPLACE VIEW dashboard_stats_totals AS
+SELECT
+    COALESCE(SUM(total_products), 0)::BIGINT AS total_products,
+    COALESCE(SUM(total_orders), 0)::BIGINT AS total_orders,
+    COALESCE(SUM(low_stock_items), 0)::BIGINT AS low_stock_items,
+    COALESCE(SUM(inventory_value), 0)::DECIMAL(16,4) AS inventory_value,
+    MAX(updated_at) AS updated_at
+FROM dashboard_stats_slots;
+
+-- One row per day with the totals as first observed that day
+CREATE TABLE IF NOT EXISTS dashboard_stats_snapshots (
+    snapshot_date DATE PRIMARY KEY,
+    total_products BIGINT NOT NULL,
+    total_orders BIGINT NOT NULL,
+    low_stock_items BIGINT NOT NULL,
+    inventory_value DECIMAL(16,4) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Recompute every counter from the base tables (initial backfill, TRUNCATE, drift repair).
+-- The totals go into slot 0 and every other slot is zeroed.
+CREATE OR REPLACE FUNCTION refresh_dashboard_stats()
+RETURNS VOID AS $$
+BEGIN
+    UPDATE dashboard_stats_slots s SET
+        total_products = CASE WHEN s.slot = 0 THEN t.total_products ELSE 0 END,
+        total_orders = CASE WHEN s.slot = 0 THEN t.total_orders ELSE 0 END,
+        low_stock_items = CASE WHEN s.slot = 0 THEN t.low_stock_items ELSE 0 END,
+        inventory_value = CASE WHEN s.slot = 0 THEN t.inventory_value ELSE 0 END,
+        updated_at = NOW()
+    FROM (
+        SELECT
+            (SELECT COUNT(*) FROM products) AS total_products,
+            (SELECT COUNT(*) FROM orders) AS total_orders,
+            (SELECT COUNT(*) FROM inventory_items
+                WHERE min_stock_level > 0 AND quantity_available <= min_stock_level) AS low_stock_items,
+            (SELECT COALESCE(SUM(quantity_available * unit_cost), 0) FROM inventory_items) AS inventory_value
+    ) t;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION apply_dashboard_stats_delta(
+    p_products BIGINT DEFAULT 0,
+    p_orders BIGINT DEFAULT 0,
+    p_low_stock BIGINT DEFAULT 0,
+    p_inventory_value DECIMAL DEFAULT 0
+)
+RETURNS VOID AS $$
+BEGIN
+    -- Skip the row lock entirely when a statement did not change any counter
+    IF p_products = 0 AND p_orders = 0 AND p_low_stock = 0 AND p_inventory_value = 0 THEN
+        RETURN;
+    END IF;
+
+    UPDATE dashboard_stats_slots SET
+        total_products = total_products + p_products,
+        total_orders = total_orders + p_orders,
+        low_stock_items = low_stock_items + p_low_stock,
+        inventory_value = inventory_value + p_inventory_value,
+        updated_at = NOW()
+    WHERE slot = pg_backend_pid() % 16;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Statement-level triggers: one counter update per statement, however many rows it touched.
+-- Transition tables cannot be shared between events, so each event gets its own trigger.
+CREATE OR REPLACE FUNCTION dashboard_stats_products_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM apply_dashboard_stats_delta(p_products => (SELECT COUNT(*) FROM new_rows));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM apply_dashboard_stats_delta(p_products => -(SELECT COUNT(*) FROM old_rows));
+    ELSE
+        PERFORM refresh_dashboard_stats();
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION dashboard_stats_orders_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM apply_dashboard_stats_delta(p_orders => (SELECT COUNT(*) FROM new_rows));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM apply_dashboard_stats_delta(p_orders => -(SELECT COUNT(*) FROM old_rows));
+    ELSE
+        PERFORM refresh_dashboard_stats();
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION dashboard_stats_inventory_changed()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_low_stock BIGINT := 0;
+    v_value DECIMAL := 0;
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        PERFORM refresh_dashboard_stats();
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT
+            v_low_stock + COUNT(*) FILTER (WHERE min_stock_level > 0 AND quantity_available <= min_stock_level),
+            v_value + COALESCE(SUM(quantity_available * unit_cost), 0)
+        INTO v_low_stock, v_value
+        FROM new_rows;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT
+            v_low_stock - COUNT(*) FILTER (WHERE min_stock_level > 0 AND quantity_available <= min_stock_level),
+            v_value - COALESCE(SUM(quantity_available * unit_cost), 0)
+        INTO v_low_stock, v_value
+        FROM old_rows;
+    END IF;
+
+    PERFORM apply_dashboard_stats_delta(p_low_stock => v_low_stock, p_inventory_value => v_value);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS dashboard_stats_products_insert ON products;
+DROP TRIGGER IF EXISTS dashboard_stats_products_delete ON products;
+DROP TRIGGER IF EXISTS dashboard_stats_products_truncate ON products;
+CREATE TRIGGER dashboard_stats_products_insert
+    AFTER INSERT ON products REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_stats_products_changed();
+CREATE TRIGGER dashboard_stats_products_delete
+    AFTER DELETE ON products REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_stats_products_changed();
+CREATE TRIGGER dashboard_stats_products_truncate
+    AFTER TRUNCATE ON products
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_stats_products_changed();
+
+DROP TRIGGER IF EXISTS dashboard_stats_orders_insert ON orders;
+DROP TRIGGER IF EXISTS dashboard_stats_orders_delete ON orders;
+DROP TRIGGER IF EXISTS dashboard_stats_orders_truncate ON orders;
+CREATE TRIGGER dashboard_stats_orders_insert
+    AFTER INSERT ON orders REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_stats_orders_changed();
+CREATE TRIGGER dashboard_stats_orders_delete
+    AFTER DELETE ON orders REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_stats_orders_changed();
+CREATE TRIGGER dashboard_stats_orders_truncate
+    AFTER TRUNCATE ON orders
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_stats_orders_changed();
+
+DROP TRIGGER IF EXISTS dashboard_stats_inventory_insert ON inventory_items;
+DROP TRIGGER IF EXISTS dashboard_stats_inventory_update ON inventory_items;
+DROP TRIGGER IF EXISTS dashboard_stats_inventory_delete ON inventory_items;
+DROP TRIGGER IF EXISTS dashboard_stats_inventory_truncate ON inventory_items;
+CREATE TRIGGER dashboard_stats_inventory_insert
+    AFTER INSERT ON inventory_items REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_stats_inventory_changed();
+CREATE TRIGGER dashboard_stats_inventory_update
+    AFTER UPDATE ON inventory_items REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_stats_inventory_changed();
+CREATE TRIGGER dashboard_stats_inventory_delete
+    AFTER DELETE ON inventory_items REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_stats_inventory_changed();
+CREATE TRIGGER dashboard_stats_inventory_truncate
+    AFTER TRUNCATE ON inventory_items
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_stats_inventory_changed();
+
+-- Record today's snapshot if it does not exist yet
+CREATE OR REPLACE FUNCTION capture_dashboard_stats_snapshot()
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO dashboard_stats_snapshots (snapshot_date, total_products, total_orders, low_stock_items, inventory_value)
+    SELECT CURRENT_DATE, total_products, total_orders, low_stock_items, inventory_value
+    FROM dashboard_stats_totals
+    ON CONFLICT (snapshot_date) DO NOTHING;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Current totals plus the latest snapshot at least p_period_days old.
+-- Also captures today's snapshot on the first read of the day, so history
+-- accumulates even where pg_cron is not available.
+CREATE OR REPLACE FUNCTION get_dashboard_stats(p_period_days INTEGER DEFAULT 30)
+RETURNS JSONB AS $$
+DECLARE
+    v_result JSONB;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM dashboard_stats_snapshots WHERE snapshot_date = CURRENT_DATE) THEN
+        PERFORM capture_dashboard_stats_snapshot();
+    END IF;
+
+    SELECT jsonb_build_object(
+        'total_products', s.total_products,
+        'total_orders', s.total_orders,
+        'low_stock_items', s.low_stock_items,
+        'inventory_value', s.inventory_value,
+        'updated_at', s.updated_at,
+        'previous', (
+            SELECT jsonb_build_object(
+                'snapshot_date', p.snapshot_date,
+                'total_products', p.total_products,
+                'total_orders', p.total_orders,
+                'low_stock_items', p.low_stock_items,
+                'inventory_value', p.inventory_value
+            )
+            FROM dashboard_stats_snapshots p
+            WHERE p.snapshot_date <= CURRENT_DATE - p_period_days
+            ORDER BY p.snapshot_date DESC
+            LIMIT 1
+        )
+    )
+    INTO v_result
+    FROM dashboard_stats_totals s;
+
+    RETURN v_result;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill the counters from existing data and take the first snapshot
+SELECT refresh_dashboard_stats();
+SELECT capture_dashboard_stats_snapshot();
+
+-- Take the daily snapshot at midnight when pg_cron is installed
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule('dashboard-stats-snapshot', '0 0 * * *', 'SELECT capture_dashboard_stats_snapshot()');
+    END IF;
+END $$;
+
+-- Verify
+SELECT 'dashboard stats counters created' as migration_status;
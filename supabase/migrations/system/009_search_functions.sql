@@ -0,0 +1,186 @@
+-- Migration: Indexed, ranked search for products, orders and customers
+-- Created: 2026-10-17
+-- Description: Full-text (tsvector) and trigram indexes plus one ranked search
+-- RPC per entity. Each RPC returns matching ids ordered by relevance together
+-- with the total match count; callers fetch the rows they need by id.
+--
+-- Matching: every word of the query must prefix-match a word of the document
+-- (indexed with GIN on a tsvector expression, works from the first keystroke),
+-- or, for queries of 3+ characters, the query appears anywhere in the main
+-- text columns (GIN trigram index, keeps the old substring behaviour).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Prefix tsquery from free text: "blue sh" -> 'blue':* & 'sh':*
+-- Only alphanumeric runs are kept, so user input can never inject tsquery syntax.
+CREATE OR REPLACE FUNCTION search_prefix_query(p_query TEXT)
+RETURNS tsquery AS $$
+    SELECT to_tsquery('simple', string_agg(word || ':*', ' & '))
+    FROM regexp_split_to_table(lower(COALESCE(p_query, '')), '[^[:alnum:]]+') AS word
+    WHERE word <> '';
+$$ LANGUAGE sql IMMUTABLE;
+
+-- ILIKE pattern matching the query literally anywhere in a value
+CREATE OR REPLACE FUNCTION search_contains_pattern(p_query TEXT)
+RETURNS TEXT AS $$
+    SELECT '%' || replace(replace(replace(p_query, '\', '\\'), '%', '\%'), '_', '\_') || '%';
+$$ LANGUAGE sql IMMUTABLE;
+
+-- ============================================================================
+-- PRODUCTS
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION product_search_document(p_name TEXT, p_sku TEXT, p_description TEXT)
+RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('simple', COALESCE(p_name, '')), 'A')
+        || setweight(to_tsvector('simple', COALESCE(p_sku, '')), 'A')
+        || setweight(to_tsvector('simple', COALESCE(p_description, '')), 'C');
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE INDEX IF NOT EXISTS idx_products_search_document
+    ON products USING GIN (product_search_document(name, sku, description));
+CREATE INDEX IF NOT EXISTS idx_products_name_trgm ON products USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_products_sku_trgm ON products USING GIN (sku gin_trgm_ops);
+
+CREATE OR REPLACE FUNCTION search_products(
+    p_query TEXT,
+    p_category_id UUID DEFAULT NULL,
+    p_status TEXT DEFAULT NULL,
+    p_min_price NUMERIC DEFAULT NULL,
+    p_max_price NUMERIC DEFAULT NULL,
+    p_max_stock INTEGER DEFAULT NULL,
+    p_limit INTEGER DEFAULT 50,
+    p_offset INTEGER DEFAULT 0
+)
+RETURNS TABLE (id UUID, rank REAL, total_count BIGINT) AS $$
+    WITH matches AS (
+        SELECT
+            p.id,
+            p.created_at,
+            COALESCE(ts_rank_cd(product_search_document(p.name, p.sku, p.description), search_prefix_query(p_query)), 0)
+                + similarity(p.name, p_query)
+                + CASE WHEN lower(p.sku) = lower(p_query) THEN 1 ELSE 0 END AS rank
+        FROM products p
+        WHERE (
+                product_search_document(p.name, p.sku, p.description) @@ search_prefix_query(p_query)
+                OR (char_length(p_query) >= 3 AND (p.name ILIKE search_contains_pattern(p_query) OR p.sku ILIKE search_contains_pattern(p_query)))
+              )
+          AND (p_category_id IS NULL OR p.category_id = p_category_id)
+          AND (p_status IS NULL OR p.status = p_status)
+          AND (p_min_price IS NULL OR p.selling_price >= p_min_price)
+          AND (p_max_price IS NULL OR p.selling_price <= p_max_price)
+          AND (p_max_stock IS NULL OR p.stock_quantity <= p_max_stock)
+    )
+    SELECT m.id, m.rank::REAL, COUNT(*) OVER () AS total_count
+    FROM matches m
+    ORDER BY m.rank DESC, m.created_at DESC, m.id
+    LIMIT p_limit OFFSET p_offset;
+$$ LANGUAGE sql STABLE;
+
+-- ============================================================================
+-- ORDERS
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION order_search_document(
+    p_order_number TEXT,
+    p_shipping_name TEXT,
+    p_address TEXT,
+    p_city TEXT
+)
+RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('simple', COALESCE(p_order_number, '')), 'A')
+        || setweight(to_tsvector('simple', COALESCE(p_shipping_name, '')), 'A')
+        || setweight(to_tsvector('simple', COALESCE(p_address, '') || ' ' || COALESCE(p_city, '')), 'C');
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE INDEX IF NOT EXISTS idx_orders_search_document
+    ON orders USING GIN (order_search_document(order_number, shipping_name, shipping_address_line_1, shipping_city));
+CREATE INDEX IF NOT EXISTS idx_orders_order_number_trgm ON orders USING GIN (order_number gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_orders_shipping_name_trgm ON orders USING GIN (shipping_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_orders_shipping_address_trgm ON orders USING GIN (shipping_address_line_1 gin_trgm_ops);
+
+CREATE OR REPLACE FUNCTION search_orders(
+    p_query TEXT,
+    p_limit INTEGER DEFAULT 10,
+    p_offset INTEGER DEFAULT 0
+)
+RETURNS TABLE (id UUID, rank REAL, total_count BIGINT) AS $$
+    WITH matches AS (
+        SELECT
+            o.id,
+            o.created_at,
+            COALESCE(ts_rank_cd(order_search_document(o.order_number, o.shipping_name, o.shipping_address_line_1, o.shipping_city), search_prefix_query(p_query)), 0)
+                + GREATEST(similarity(o.order_number, p_query), similarity(o.shipping_name, p_query))
+                + CASE WHEN lower(o.order_number) = lower(p_query) THEN 1 ELSE 0 END AS rank
+        FROM orders o
+        WHERE order_search_document(o.order_number, o.shipping_name, o.shipping_address_line_1, o.shipping_city) @@ search_prefix_query(p_query)
+           OR (char_length(p_query) >= 3 AND (
+                o.order_number ILIKE search_contains_pattern(p_query)
+                OR o.shipping_name ILIKE search_contains_pattern(p_query)
+                OR o.shipping_address_line_1 ILIKE search_contains_pattern(p_query)
+           ))
+    )
+    SELECT m.id, m.rank::REAL, COUNT(*) OVER () AS total_count
+    FROM matches m
+    ORDER BY m.rank DESC, m.created_at DESC, m.id
+    LIMIT p_limit OFFSET p_offset;
+$$ LANGUAGE sql STABLE;
+
+-- ============================================================================
+-- CUSTOMERS (only when the full orders schema with a customers table is installed)
+-- ============================================================================
+
+DO $migration$
+BEGIN
+    IF to_regclass('public.customers') IS NULL THEN
+        RAISE NOTICE 'customers table not found, skipping customer search';
+        RETURN;
+    END IF;
+
+    EXECUTE $sql$
+        CREATE OR REPLACE FUNCTION customer_search_document(p_name TEXT, p_email TEXT, p_phone TEXT)
+        RETURNS tsvector AS $fn$
+            SELECT setweight(to_tsvector('simple', COALESCE(p_name, '')), 'A')
+                || setweight(to_tsvector('simple', COALESCE(p_email, '')), 'A')
+                || setweight(to_tsvector('simple', COALESCE(p_phone, '')), 'B');
+        $fn$ LANGUAGE sql IMMUTABLE
+    $sql$;
+
+    EXECUTE 'CREATE INDEX IF NOT EXISTS idx_customers_search_document
+        ON customers USING GIN (customer_search_document(name, email, phone))';
+    EXECUTE 'CREATE INDEX IF NOT EXISTS idx_customers_name_trgm ON customers USING GIN (name gin_trgm_ops)';
+    EXECUTE 'CREATE INDEX IF NOT EXISTS idx_customers_email_trgm ON customers USING GIN (email gin_trgm_ops)';
+    EXECUTE 'CREATE INDEX IF NOT EXISTS idx_customers_phone_trgm ON customers USING GIN (phone gin_trgm_ops)';
+
+    EXECUTE $sql$
+        CREATE OR REPLACE FUNCTION search_customers(
+            p_query TEXT,
+            p_limit INTEGER DEFAULT 10,
+            p_offset INTEGER DEFAULT 0
+        )
+        RETURNS TABLE (id UUID, rank REAL, total_count BIGINT) AS $fn$
+            WITH matches AS (
+                SELECT
+                    c.id,
+                    c.name,
+                    COALESCE(ts_rank_cd(customer_search_document(c.name, c.email, c.phone), search_prefix_query(p_query)), 0)
+                        + GREATEST(similarity(c.name, p_query), similarity(c.email, p_query))
+                        + CASE WHEN lower(c.email) = lower(p_query) THEN 1 ELSE 0 END AS rank
+                FROM customers c
+                WHERE customer_search_document(c.name, c.email, c.phone) @@ search_prefix_query(p_query)
+                   OR (char_length(p_query) >= 3 AND (
+                        c.name ILIKE search_contains_pattern(p_query)
+                        OR c.email ILIKE search_contains_pattern(p_query)
+                        OR c.phone ILIKE search_contains_pattern(p_query)
+                   ))
+            )
+            SELECT m.id, m.rank::REAL, COUNT(*) OVER () AS total_count
+            FROM matches m
+            ORDER BY m.rank DESC, m.name, m.id
+            LIMIT p_limit OFFSET p_offset;
+        $fn$ LANGUAGE sql STABLE
+    $sql$;
+END $migration$;
+
+-- Verify
+SELECT 'search indexes and functions created' as migration_status;
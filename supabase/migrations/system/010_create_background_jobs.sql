@@ -0,0 +1,155 @@
+-- Migration: Background job queue
+-- Created: 2026-10-17
+-- Description: Table-backed queue for long-running API operations (imports, inventory utilities,
+-- bulk fulfillment) with leases, checkpoints and retries
+
+CREATE TABLE IF NOT EXISTS background_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    type VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued'
+        CHECK (status IN ('queued', 'running', 'completed', 'failed', 'cancelled')),
+    payload JSONB NOT NULL DEFAULT '{}',
+
+    -- Handler state saved after each chunk; a retried job resumes from here
+    checkpoint JSONB,
+    progress JSONB NOT NULL DEFAULT '{}',
+    result JSONB,
+    error TEXT,
+
+    -- Same key, same job: enqueueing twice returns the existing job
+    idempotency_key TEXT UNIQUE,
+
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+
+    -- Lease held by the worker running the job; an expired lease means the worker died
+    locked_by TEXT,
+    locked_until TIMESTAMP WITH TIME ZONE,
+
+    created_by TEXT DEFAULT 'system',
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- Claim scans: queued jobs that are due, running jobs whose lease ran out
+CREATE INDEX IF NOT EXISTS idx_background_jobs_queued
+    ON background_jobs(run_after, created_at) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_background_jobs_running
+    ON background_jobs(locked_until) WHERE status = 'running';
+
+-- Listing recent jobs, optionally by type
+CREATE INDEX IF NOT EXISTS idx_background_jobs_created_at
+    ON background_jobs(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_background_jobs_type_created_at
+    ON background_jobs(type, created_at DESC, id DESC);
+
+-- Hand up to p_limit jobs to p_worker for p_lease_seconds. Jobs whose worker stopped
+-- renewing its lease are picked up again and keep their checkpoint, unless that run
+-- used their last attempt: those are marked failed instead of being retried forever.
+-- SKIP LOCKED lets several workers claim concurrently without blocking on each other.
+CREATE OR REPLACE FUNCTION claim_background_jobs(
+    p_worker TEXT,
+    p_limit INTEGER DEFAULT 1,
+    p_lease_seconds INTEGER DEFAULT 60
+)
+RETURNS SETOF background_jobs AS $$
+    UPDATE background_jobs
+    SET status = 'failed',
+        error = COALESCE(error, 'Lease expired after the last attempt'),
+        finished_at = NOW(),
+        locked_by = NULL,
+        locked_until = NULL,
+        updated_at = NOW()
+    WHERE id IN (
+        SELECT id
+        FROM background_jobs
+        WHERE status = 'running'
+          AND locked_until < NOW()
+          AND attempts >= max_attempts
+        FOR UPDATE SKIP LOCKED
+    );
+
+    WITH claimable AS (
+        SELECT id
+        FROM background_jobs
+        WHERE (status = 'queued' AND run_after <= NOW())
+           OR (status = 'running' AND locked_until < NOW() AND attempts < max_attempts)
+        ORDER BY created_at
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE background_jobs j
+    SET status = 'running',
+        attempts = j.attempts + 1,
+        locked_by = p_worker,
+        locked_until = NOW() + make_interval(secs => p_lease_seconds),
+        started_at = COALESCE(j.started_at, NOW()),
+        updated_at = NOW()
+    FROM claimable c
+    WHERE j.id = c.id
+    RETURNING j.*;
+$$ LANGUAGE sql;
+
+-- Save a checkpoint and progress and renew the lease. Returns false when the
+-- worker no longer owns the job (lease lost or job cancelled), so it stops.
+CREATE OR REPLACE FUNCTION checkpoint_background_job(
+    p_job_id UUID,
+    p_worker TEXT,
+    p_checkpoint JSONB,
+    p_progress JSONB,
+    p_lease_seconds INTEGER DEFAULT 60
+)
+RETURNS BOOLEAN AS $$
+    WITH renewed AS (
+        UPDATE background_jobs
+        SET checkpoint = COALESCE(p_checkpoint, checkpoint),
+            progress = COALESCE(p_progress, progress),
+            locked_until = NOW() + make_interval(secs => p_lease_seconds),
+            updated_at = NOW()
+        WHERE id = p_job_id
+          AND status = 'running'
+          AND locked_by = p_worker
+        RETURNING id
+    )
+    SELECT EXISTS (SELECT 1 FROM renewed);
+$$ LANGUAGE sql;
+
+-- Record the outcome of a run. A failed run is queued again with exponential backoff
+-- until max_attempts is reached; its checkpoint is kept so the retry resumes.
+CREATE OR REPLACE FUNCTION finish_background_job(
+    p_job_id UUID,
+    p_worker TEXT,
+    p_succeeded BOOLEAN,
+    p_result JSONB DEFAULT NULL,
+    p_error TEXT DEFAULT NULL
+)
+RETURNS background_jobs AS $$
+    UPDATE background_jobs
+    SET status = CASE
+            WHEN p_succeeded THEN 'completed'
+            WHEN attempts < max_attempts THEN 'queued'
+            ELSE 'failed'
+        END,
+        result = CASE WHEN p_succeeded THEN p_result ELSE result END,
+        error = p_error,
+        run_after = CASE
+            WHEN p_succeeded THEN run_after
+            ELSE NOW() + make_interval(secs => 10 * power(2, attempts - 1))
+        END,
+        finished_at = CASE WHEN p_succeeded OR attempts >= max_attempts THEN NOW() END,
+        locked_by = NULL,
+        locked_until = NULL,
+        updated_at = NOW()
+    WHERE id = p_job_id
+      AND status = 'running'
+      AND locked_by = p_worker
+    RETURNING *;
+$$ LANGUAGE sql;
+
+-- Private bucket for CSV files waiting on a products.import job
+INSERT INTO storage.buckets (id, name, public)
+VALUES ('product-imports', 'product-imports', false)
+ON CONFLICT (id) DO NOTHING;
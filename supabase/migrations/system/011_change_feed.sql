@@ -0,0 +1,150 @@
+-- Migration: Change feed for inventory and orders
+-- Created: 2026-10-17
+-- Description: Publishes inventory_items and orders to Supabase Realtime, keeps tombstones for
+-- deleted rows and adds updated_since delta queries for clients catching up after a reconnect
+
+-- Row changes reach the app server through Realtime, which streams them on to
+-- open dashboards (/api/changes/stream)
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_publication WHERE pubname = 'supabase_realtime') THEN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_publication_tables
+            WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = 'inventory_items'
+        ) THEN
+            ALTER PUBLICATION supabase_realtime ADD TABLE inventory_items;
+        END IF;
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_publication_tables
+            WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = 'orders'
+        ) THEN
+            ALTER PUBLICATION supabase_realtime ADD TABLE orders;
+        END IF;
+    END IF;
+END $$;
+
+-- Delta scans walk (updated_at, id) from the client's cursor
+CREATE INDEX IF NOT EXISTS idx_inventory_items_updated_at_id ON inventory_items(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_orders_updated_at_id ON orders(updated_at, id);
+
+-- A deleted row has no updated_at left to find it by, so deletes leave a tombstone.
+-- Tombstones older than a week are purged; clients further behind reload in full.
+CREATE TABLE IF NOT EXISTS deleted_rows (
+    table_name TEXT NOT NULL,
+    row_id UUID NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (table_name, deleted_at, row_id)
+);
+
+CREATE OR REPLACE FUNCTION record_deleted_rows()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO deleted_rows (table_name, row_id)
+    SELECT TG_TABLE_NAME, id FROM deleted;
+
+    DELETE FROM deleted_rows
+    WHERE table_name = TG_TABLE_NAME
+      AND deleted_at < NOW() - INTERVAL '7 days';
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Statement-level so a bulk delete writes its tombstones in one insert
+DROP TRIGGER IF EXISTS trigger_record_deleted_inventory_items ON inventory_items;
+CREATE TRIGGER trigger_record_deleted_inventory_items
+    AFTER DELETE ON inventory_items
+    REFERENCING OLD TABLE AS deleted
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_deleted_rows();
+
+DROP TRIGGER IF EXISTS trigger_record_deleted_orders ON orders;
+CREATE TRIGGER trigger_record_deleted_orders
+    AFTER DELETE ON orders
+    REFERENCING OLD TABLE AS deleted
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_deleted_rows();
+
+-- Inventory rows changed or deleted after (p_since, p_after_id), oldest first.
+-- Pass the last row's changed_at and id back in to read the next page.
+CREATE OR REPLACE FUNCTION get_inventory_changes(
+    p_since TIMESTAMP WITH TIME ZONE,
+    p_after_id UUID DEFAULT NULL,
+    p_limit INTEGER DEFAULT 500
+)
+RETURNS TABLE (
+    id UUID,
+    operation TEXT,
+    product_id UUID,
+    location_id VARCHAR,
+    quantity_on_hand INTEGER,
+    quantity_reserved INTEGER,
+    quantity_available INTEGER,
+    min_stock_level INTEGER,
+    status VARCHAR,
+    changed_at TIMESTAMP WITH TIME ZONE
+) AS $$
+    WITH changes AS (
+        (
+            SELECT i.id, 'upsert' AS operation, i.product_id, i.location_id,
+                   i.quantity_on_hand, i.quantity_reserved, i.quantity_available,
+                   i.min_stock_level, i.status, i.updated_at AS changed_at
+            FROM inventory_items i
+            WHERE (i.updated_at, i.id) > (p_since, COALESCE(p_after_id, '00000000-0000-0000-0000-000000000000'::UUID))
+            ORDER BY i.updated_at, i.id
+            LIMIT p_limit
+        )
+        UNION ALL
+        (
+            SELECT d.row_id, 'delete', NULL, NULL, NULL, NULL, NULL, NULL, NULL, d.deleted_at
+            FROM deleted_rows d
+            WHERE d.table_name = 'inventory_items'
+              AND (d.deleted_at, d.row_id) > (p_since, COALESCE(p_after_id, '00000000-0000-0000-0000-000000000000'::UUID))
+            ORDER BY d.deleted_at, d.row_id
+            LIMIT p_limit
+        )
+    )
+    SELECT * FROM changes
+    ORDER BY changed_at, id
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- Orders changed or deleted after (p_since, p_after_id), oldest first
+CREATE OR REPLACE FUNCTION get_order_changes(
+    p_since TIMESTAMP WITH TIME ZONE,
+    p_after_id UUID DEFAULT NULL,
+    p_limit INTEGER DEFAULT 500
+)
+RETURNS TABLE (
+    id UUID,
+    operation TEXT,
+    order_number VARCHAR,
+    status VARCHAR,
+    payment_status VARCHAR,
+    total_amount DECIMAL,
+    created_at TIMESTAMP WITH TIME ZONE,
+    changed_at TIMESTAMP WITH TIME ZONE
+) AS $$
+    WITH changes AS (
+        (
+            SELECT o.id, 'upsert' AS operation, o.order_number, o.status, o.payment_status,
+                   o.total_amount, o.created_at, o.updated_at AS changed_at
+            FROM orders o
+            WHERE (o.updated_at, o.id) > (p_since, COALESCE(p_after_id, '00000000-0000-0000-0000-000000000000'::UUID))
+            ORDER BY o.updated_at, o.id
+            LIMIT p_limit
+        )
+        UNION ALL
+        (
+            SELECT d.row_id, 'delete', NULL, NULL, NULL, NULL, NULL, d.deleted_at
+            FROM deleted_rows d
+            WHERE d.table_name = 'orders'
+              AND (d.deleted_at, d.row_id) > (p_since, COALESCE(p_after_id, '00000000-0000-0000-0000-000000000000'::UUID))
+            ORDER BY d.deleted_at, d.row_id
+            LIMIT p_limit
+        )
+    )
+    SELECT * FROM changes
+    ORDER BY changed_at, id
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark for PATCH /api/inventory/bulk-update.
+
+Compares the legacy per-row loop (one PostgREST update round-trip per item)
+against the batched bulk_update_inventory_items RPC, and optionally the route
+itself. Runs against the local Supabase stack from local_supabase.py.
+
+Usage:
+    python tests/bench_inventory_bulk_update.py --rows 5000
+    python tests/bench_inventory_bulk_update.py --rows 5000 --route http://127.0.0.1:3100
+"""
+
+import argparse
+import asyncio
+import time
+
+import aiohttp
+
+from local_supabase import LocalSupabase
+
+
+class BulkUpdateBenchmark:
+    def __init__(self, api_url, service_key):
+        self.rest_url = f'{api_url}/rest/v1'
+        self.headers = {
+            'apikey': service_key,
+            'Authorization': f'Bearer {service_key}',
+            'Content-Type': 'application/json',
+        }
+
+    async def fetch_item_ids(self, session, rows):
+        """Pick the inventory items to update"""
+        url = f'{self.rest_url}/inventory_items?select=id&order=id&limit={rows}'
+        async with session.get(url, headers=self.headers) as response:
+            response.raise_for_status()
+            return [row['id'] for row in await response.json()]
+
+    @staticmethod
+    def build_updates(ids, offset):
+        return [{'id': item_id, 'quantity': (i + offset) % 500} for i, item_id in enumerate(ids)]
+
+    async def run_legacy_loop(self, session, updates):
+        """One update().eq('id').select().single() round-trip per item, as the old route did"""
+        headers = {**self.headers, 'Prefer': 'return=representation',
+                   'Accept': 'application/vnd.pgrst.object+json'}
+        updated = 0
+        for update in updates:
+            url = f"{self.rest_url}/inventory_items?id=eq.{update['id']}"
+            async with session.patch(url, json={'quantity_on_hand': update['quantity']}, headers=headers) as response:
+                if response.status == 200:
+                    updated += 1
+        return updated
+
+    async def run_batched_rpc(self, session, updates, chunk_size):
+        """Chunked calls to the set-based RPC"""
+        updated = 0
+        for i in range(0, len(updates), chunk_size):
+            chunk = updates[i:i + chunk_size]
+            async with session.post(f'{self.rest_url}/rpc/bulk_update_inventory_items',
+                                    json={'p_updates': chunk}, headers=self.headers) as response:
+                response.raise_for_status()
+                updated += sum(1 for row in await response.json() if row['status'] == 'updated')
+        return updated
+
+    @staticmethod
+    async def run_route(session, base_url, updates):
+        """Through the Next.js route handler"""
+        async with session.patch(f'{base_url}/api/inventory/bulk-update', json={'updates': updates}) as response:
+            response.raise_for_status()
+            return (await response.json())['summary']['updated']
+
+
+async def timed(label, rows, coroutine):
+    started = time.perf_counter()
+    updated = await coroutine
+    elapsed = time.perf_counter() - started
+    rate = rows / elapsed if elapsed else 0
+    print(f"{label:<24}{rows:>8}{updated:>9}{elapsed:>10.2f}s{rate:>12.0f}")
+    return rate
+
+
+async def main(args):
+    local = LocalSupabase()
+    local.status = local.read_status()
+    bench = BulkUpdateBenchmark(local.status['API_URL'], local.status['SERVICE_ROLE_KEY'])
+
+    async with aiohttp.ClientSession() as session:
+        ids = await bench.fetch_item_ids(session, args.rows)
+        rows = len(ids)
+        print(f"Benchmarking bulk update of {rows} inventory items (chunk size {args.chunk_size})")
+        print(f"\n{'Engine':<24}{'Rows':>8}{'Updated':>9}{'Time':>11}{'Rows/sec':>12}")
+        print('-' * 64)
+
+        legacy = await timed('legacy per-row loop', rows,
+                             bench.run_legacy_loop(session, bench.build_updates(ids, 1)))
+        batched = await timed('batched RPC', rows,
+                              bench.run_batched_rpc(session, bench.build_updates(ids, 2), args.chunk_size))
+        if args.route:
+            await timed('route handler', rows,
+                        bench.run_route(session, args.route, bench.build_updates(ids, 3)))
+
+        if legacy:
+            print(f"\nSpeedup (batched RPC vs legacy loop): {batched / legacy:.1f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark inventory bulk update engines')
+    parser.add_argument('--rows', type=int, default=5000, help='Number of inventory items to update')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Rows per RPC call')
+    parser.add_argument('--route', help='Base URL of a running app to also benchmark the route handler')
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Local Supabase stand-in for benchmarking the API without a hosted project.
+
+Starts the local Supabase stack described by supabase/config.toml (Postgres +
+PostgREST on 127.0.0.1), loads the schema from scripts/complete-migration.sql
+and the module migrations, seeds a deterministic synthetic data set and can
+launch the Next.js app pointed at it. Requires the Supabase CLI, Docker, psql
+and npm on the PATH.
+
+Usage:
+    python tests/local_supabase.py up --products 10000 --orders 1000000
+    python tests/local_supabase.py env
+    python tests/local_supabase.py down
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIGRATIONS_DIR = os.path.join(REPO_ROOT, 'supabase', 'migrations')
+
+# Applied in order after a reset; mirrors the execution order in supabase/migrations/README.md
+SCHEMA_FILES = [
+    os.path.join(REPO_ROOT, 'scripts', 'complete-migration.sql'),
+    os.path.join(MIGRATIONS_DIR, 'core', '002_add_status_to_categories.sql'),
+    os.path.join(MIGRATIONS_DIR, 'core', '002_create_products.sql'),
+    os.path.join(MIGRATIONS_DIR, 'core', '003_add_products_keyset_indexes.sql'),
+    os.path.join(MIGRATIONS_DIR, 'core', '004_add_products_sort_keyset_indexes.sql'),
+    os.path.join(MIGRATIONS_DIR, 'media', '007_create_media_table.sql'),
+    os.path.join(MIGRATIONS_DIR, 'media', '008_add_media_variants.sql'),
+    os.path.join(MIGRATIONS_DIR, 'inventory', '014_create_warehouses.sql'),
+    os.path.join(MIGRATIONS_DIR, 'inventory', '012_create_updated_inventory_items.sql'),
+    os.path.join(MIGRATIONS_DIR, 'inventory', '013_create_stock_movements_simple.sql'),
+    os.path.join(MIGRATIONS_DIR, 'inventory', '015_create_stock_adjustments.sql'),
+    os.path.join(MIGRATIONS_DIR, 'inventory', '016_bulk_update_inventory_items.sql'),
+    os.path.join(MIGRATIONS_DIR, 'inventory', '017_bulk_insert_stock_adjustments.sql'),
+    os.path.join(MIGRATIONS_DIR, 'inventory', '018_create_low_stock_alerts.sql'),
+    os.path.join(MIGRATIONS_DIR, 'inventory', '019_create_inventory_history.sql'),
+    os.path.join(MIGRATIONS_DIR, 'inventory', '020_create_ledger_daily_rollups.sql'),
+    os.path.join(MIGRATIONS_DIR, 'inventory', '021_sync_inventory_costs.sql'),
+    os.path.join(MIGRATIONS_DIR, 'pricing', '20241230_create_price_history_table.sql'),
+    os.path.join(MIGRATIONS_DIR, 'pricing', '006_bulk_update_prices.sql'),
+    os.path.join(MIGRATIONS_DIR, 'orders', 'simplified_orders_migration.sql'),
+    os.path.join(MIGRATIONS_DIR, 'orders', 'add_order_fulfillment_tables.sql'),
+    os.path.join(MIGRATIONS_DIR, 'orders', 'order_analytics_function.sql'),
+    os.path.join(MIGRATIONS_DIR, 'orders', 'order_stats_function.sql'),
+    os.path.join(MIGRATIONS_DIR, 'orders', 'create_order_function.sql'),
+    os.path.join(MIGRATIONS_DIR, 'orders', 'bulk_fulfill_orders_function.sql'),
+    os.path.join(MIGRATIONS_DIR, 'system', '008_dashboard_stats_counters.sql'),
+    os.path.join(MIGRATIONS_DIR, 'system', '009_search_functions.sql'),
+    os.path.join(MIGRATIONS_DIR, 'system', '010_create_background_jobs.sql'),
+    os.path.join(MIGRATIONS_DIR, 'system', '011_change_feed.sql'),
+]
+
+# complete-migration.sql does not define the shared updated_at trigger function
+# that the products migration relies on
+BOOTSTRAP_SQL = """
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Services the API routes don't need; skipping them keeps startup fast
+EXCLUDED_SERVICES = 'studio,inbucket,imgproxy,edge-runtime,logflare,vector,supavisor'
+
+# Seed data is generated server-side with generate_series so a million orders
+# load in seconds. Triggers are disabled while seeding: the per-row order number
+# and totals triggers would otherwise turn the load quadratic.
+SEED_SQL = """
+SELECT setseed(0.42);
+
+ALTER TABLE products DISABLE TRIGGER USER;
+ALTER TABLE orders DISABLE TRIGGER USER;
+ALTER TABLE order_items DISABLE TRIGGER USER;
+ALTER TABLE inventory_items DISABLE TRIGGER USER;
+
+TRUNCATE order_items, orders, inventory_items, products, categories CASCADE;
+
+INSERT INTO categories (name, slug, description, sort_order, is_active, path)
+SELECT 'Category ' || g, 'category-' || g, 'Synthetic category ' || g, g, true, 'Category ' || g
+FROM generate_series(1, :categories) AS g;
+
+INSERT INTO products (name, description, slug, category_id, sku, barcode, brand,
+                      base_price, selling_price, cost_price, stock_quantity,
+                      min_stock_level, status, is_active, created_at)
+SELECT
+    'Product ' || g,
+    'Synthetic product ' || g,
+    'product-' || g,
+    c.id,
+    'SKU-' || lpad(g::text, 8, '0'),
+    lpad((g * 7919)::text, 12, '0'),
+    'Brand ' || (g % 50),
+    round((5 + random() * 495)::numeric, 2),
+    round((5 + random() * 495)::numeric, 2),
+    round((2 + random() * 200)::numeric, 2),
+    (random() * 500)::int,
+    10,
+    CASE WHEN g % 10 = 0 THEN 'draft' ELSE 'published' END,
+    true,
+    NOW() - (g % 365) * INTERVAL '1 day'
+FROM generate_series(1, :products) AS g
+JOIN (SELECT id, row_number() OVER (ORDER BY sort_order) - 1 AS rn FROM categories) c
+  ON c.rn = g % :categories;
+
+UPDATE categories c
+SET product_count = counts.n
+FROM (SELECT category_id, COUNT(*)::int AS n FROM products
+      WHERE status = 'published' AND is_active = true GROUP BY category_id) counts
+WHERE counts.category_id = c.id;
+
+INSERT INTO inventory_items (product_id, quantity_on_hand, min_stock_level, reorder_point, unit_cost)
+SELECT id, stock_quantity, min_stock_level, min_stock_level * 2, COALESCE(cost_price, 0)
+FROM products;
+
+INSERT INTO orders (order_number, customer_id, status, payment_status, payment_method,
+                    subtotal, tax_amount, shipping_amount, total_amount,
+                    shipping_name, shipping_address_line_1, shipping_city,
+                    shipping_state, shipping_postal_code, created_at, updated_at)
+SELECT
+    'BENCH-' || lpad(g::text, 8, '0'),
+    'customer_' || (g % 20000),
+    (ARRAY['pending', 'confirmed', 'processing', 'shipped', 'delivered', 'cancelled'])[1 + g % 6],
+    (ARRAY['pending', 'paid', 'paid', 'paid', 'failed'])[1 + g % 5],
+    (ARRAY['credit_card', 'paypal', 'bank_transfer'])[1 + g % 3],
+    0, 0, 5, 0,
+    'Customer ' || (g % 20000),
+    g || ' Bench Street',
+    'Bench City',
+    'BC',
+    lpad((g % 99999)::text, 5, '0'),
+    NOW() - (g % 525600) * INTERVAL '1 minute',
+    NOW() - (g % 525600) * INTERVAL '1 minute'
+FROM generate_series(1, :orders) AS g;
+
+INSERT INTO order_items (order_id, product_id, product_name, product_sku,
+                         quantity, unit_price, total_price, status)
+SELECT o.id, p.id::text, p.name, p.sku, q.qty, p.selling_price, p.selling_price * q.qty, 'pending'
+FROM (SELECT id, row_number() OVER (ORDER BY order_number) AS n FROM orders) o
+CROSS JOIN generate_series(0, :items_per_order - 1) AS k
+CROSS JOIN LATERAL (SELECT 1 + ((o.n + k) % 4)::int AS qty) q
+JOIN (SELECT id, name, sku, selling_price, row_number() OVER (ORDER BY sku) - 1 AS rn FROM products) p
+  ON p.rn = (o.n * 7 + k * 13) % :products;
+
+UPDATE orders o
+SET subtotal = t.subtotal,
+    total_amount = t.subtotal + o.shipping_amount
+FROM (SELECT order_id, SUM(total_price) AS subtotal FROM order_items GROUP BY order_id) t
+WHERE t.order_id = o.id;
+
+ALTER TABLE products ENABLE TRIGGER USER;
+ALTER TABLE orders ENABLE TRIGGER USER;
+ALTER TABLE order_items ENABLE TRIGGER USER;
+ALTER TABLE inventory_items ENABLE TRIGGER USER;
+
+-- Dashboard counters and low stock alerts are trigger-maintained, so rebuild them after the trigger-less bulk load
+SELECT refresh_dashboard_stats();
+SELECT count(*) FROM evaluate_low_stock_alerts();
+
+ANALYZE;
+"""
+
+
+class LocalSupabase:
+    """Manage a local Supabase stack and the Next.js app for repeatable benchmarks"""
+
+    def __init__(self, workdir=REPO_ROOT):
+        self.workdir = workdir
+        self.status = {}
+        self.app_process = None
+
+    def _run(self, args, **kwargs):
+        return subprocess.run(args, cwd=self.workdir, check=True, text=True, **kwargs)
+
+    def start(self, reset=True):
+        """Start the stack and optionally reset the database to an empty state"""
+        print("Starting local Supabase stack...")
+        self._run(['supabase', 'start', '-x', EXCLUDED_SERVICES])
+        if reset:
+            self._run(['supabase', 'db', 'reset', '--local'])
+        self.status = self.read_status()
+        return self.status
+
+    def stop(self):
+        """Stop the app (if started) and the local stack"""
+        self.stop_app()
+        self._run(['supabase', 'stop'])
+
+    def read_status(self):
+        """Read API URL, keys and DB URL from `supabase status -o env`"""
+        output = self._run(['supabase', 'status', '-o', 'env'], capture_output=True).stdout
+        status = {}
+        for line in output.splitlines():
+            if '=' not in line:
+                continue
+            key, value = line.split('=', 1)
+            status[key.strip()] = value.strip().strip('"')
+        return status
+
+    def psql(self, sql=None, file=None, variables=None):
+        """Run SQL (inline or from a file) against the local database"""
+        args = ['psql', self.status['DB_URL'], '-q', '-v', 'ON_ERROR_STOP=1']
+        for name, value in (variables or {}).items():
+            args += ['-v', f'{name}={value}']
+        if file:
+            args += ['-f', file]
+            return self._run(args)
+        return self._run(args, input=sql)
+
+    def apply_schema(self):
+        """Load the schema from the migration scripts"""
+        print("Applying schema...")
+        self.psql(BOOTSTRAP_SQL)
+        for path in SCHEMA_FILES:
+            print(f"  {os.path.relpath(path, REPO_ROOT)}")
+            self.psql(file=path)
+
+    def seed(self, categories=20, products=10000, orders=100000, items_per_order=2):
+        """Seed a deterministic synthetic data set"""
+        print(f"Seeding {categories} categories, {products} products, "
+              f"{orders} orders x {items_per_order} items...")
+        started = time.time()
+        self.psql(SEED_SQL, variables={
+            'categories': categories,
+            'products': products,
+            'orders': orders,
+            'items_per_order': items_per_order,
+        })
+        print(f"Seeded in {time.time() - started:.1f}s")
+
+    def env(self):
+        """Environment variables that point the Next.js app at the local stack"""
+        return {
+            'NEXT_PUBLIC_SUPABASE_URL': self.status['API_URL'],
+            'NEXT_PUBLIC_SUPABASE_ANON_KEY': self.status['ANON_KEY'],
+            'SUPABASE_SERVICE_ROLE_KEY': self.status['SERVICE_ROLE_KEY'],
+        }
+
+    def start_app(self, port=3100, dev=False, timeout=180):
+        """Build and start the Next.js app against the local stack and wait until it answers"""
+        env = {**os.environ, **self.env()}
+        if dev:
+            args = ['npx', 'next', 'dev', '--port', str(port)]
+        else:
+            # Benchmark the production build; dev mode compiles routes on first hit
+            self._run(['npm', 'run', 'build'], env=env)
+            args = ['npx', 'next', 'start', '--port', str(port)]
+
+        print(f"Starting Next.js on port {port}...")
+        self.app_process = subprocess.Popen(args, cwd=self.workdir, env=env)
+
+        base_url = f'http://127.0.0.1:{port}'
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.app_process.poll() is not None:
+                raise RuntimeError('Next.js exited before becoming ready')
+            try:
+                urllib.request.urlopen(f'{base_url}/api/orders?limit=1', timeout=5)
+                return base_url
+            except urllib.error.HTTPError:
+                # Any HTTP response means the server is up
+                return base_url
+            except (urllib.error.URLError, OSError):
+                time.sleep(1)
+
+        self.stop_app()
+        raise RuntimeError(f'Next.js did not become ready within {timeout}s')
+
+    def stop_app(self):
+        if self.app_process and self.app_process.poll() is None:
+            self.app_process.terminate()
+            try:
+                self.app_process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.app_process.kill()
+        self.app_process = None
+
+    def up(self, reset=True, seed=True, **seed_options):
+        """Start, load the schema and seed in one call"""
+        self.start(reset=reset)
+        if reset:
+            self.apply_schema()
+        if seed:
+            self.seed(**seed_options)
+        return self.env()
+
+
+def add_seed_arguments(parser):
+    """Seed-size options shared with the service test harness"""
+    parser.add_argument('--categories', type=int, default=20, help='Synthetic categories to seed')
+    parser.add_argument('--products', type=int, default=10000, help='Synthetic products to seed')
+    parser.add_argument('--orders', type=int, default=100000, help='Synthetic orders to seed')
+    parser.add_argument('--items-per-order', type=int, default=2, help='Line items per synthetic order')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Supabase stand-in for API benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    up = subparsers.add_parser('up', help='Start the stack, load the schema and seed it')
+    add_seed_arguments(up)
+    up.add_argument('--keep-data', action='store_true', help='Skip the reset, schema load and seed')
+    up.add_argument('--serve', action='store_true', help='Also build and start the Next.js app')
+    up.add_argument('--port', type=int, default=3100)
+
+    subparsers.add_parser('env', help='Print env vars pointing the app at the local stack')
+    subparsers.add_parser('down', help='Stop the local stack')
+    args = parser.parse_args()
+
+    local = LocalSupabase()
+    if args.command == 'up':
+        local.up(
+            reset=not args.keep_data,
+            seed=not args.keep_data,
+            categories=args.categories,
+            products=args.products,
+            orders=args.orders,
+            items_per_order=args.items_per_order,
+        )
+        if args.serve:
+            base_url = local.start_app(args.port)
+            print(f"App ready at {base_url} (Ctrl+C to stop)")
+            try:
+                local.app_process.wait()
+            except KeyboardInterrupt:
+                local.stop_app()
+    elif args.command == 'env':
+        local.status = local.read_status()
+        for key, value in local.env().items():
+            print(f'{key}={value}')
+    elif args.command == 'down':
+        local.stop()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+'use client';
+
+import React, { useState } from 'react';
+import { Button } from '@/components/ui/button';
+import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
+import { ImageProcessingService } from '@/services/media/imageProcessingService';
+
+// Benchmarks ImageProcessingService on synthetic photos: images/sec and main-thread
+// blocking for a single upload and a gallery batch, on the worker pool vs the
+// sequential main-thread path.
+
+interface BenchmarkRow {
+  scenario: string;
+  mode: 'workers' | 'main thread';
+  images: number;
+  seconds: number;
+  imagesPerSecond: number;
+  blockingMs: number; // Sum of long-task time beyond 50ms (Total Blocking Time)
+  longestTaskMs: number;
+  maxFrameLagMs: number; // Worst delay of a 16ms timer, i.e. how long the UI froze
+}
+
+const IMAGE_WIDTH = 3000;
+const IMAGE_HEIGHT = 2000;
+
+// A noisy gradient compresses like a photo rather than a flat fill
+async function createSyntheticImage(index: number): Promise<File> {
+  const canvas = document.createElement('canvas');
+  canvas.width = IMAGE_WIDTH;
+  canvas.height = IMAGE_HEIGHT;
+  const context = canvas.getContext('2d')!;
+
+  const gradient = context.createLinearGradient(0, 0, IMAGE_WIDTH, IMAGE_HEIGHT);
+  gradient.addColorStop(0, `hsl(${(index * 47) % 360}, 70%, 50%)`);
+  gradient.addColorStop(1, `hsl(${(index * 47 + 180) % 360}, 70%, 30%)`);
+  context.fillStyle = gradient;
+  context.fillRect(0, 0, IMAGE_WIDTH, IMAGE_HEIGHT);
+
+  const noise = context.getImageData(0, 0, IMAGE_WIDTH, IMAGE_HEIGHT);
+  for (let i = 0; i < noise.data.length; i += 4) {
+    const delta = (Math.random() - 0.5) * 40;
+    noise.data[i] += delta;
+    noise.data[i + 1] += delta;
+    noise.data[i + 2] += delta;
+  }
+  context.putImageData(noise, 0, 0);
+
+  const blob = await new Promise<Blob>((resolve) => canvas.toBlob(b => resolve(b!), 'image/jpeg', 0.9));
+  return new File([blob], `synthetic-${index}.jpg`, { type: 'image/jpeg' });
+}
+
+async function measure(
+  scenario: string,
+  mode: BenchmarkRow['mode'],
+  files: File[]
+): Promise<BenchmarkRow> {
+  let blockingMs = 0;
+  let longestTaskMs = 0;
+  const observer = typeof PerformanceObserver !== 'undefined' &&
+    PerformanceObserver.supportedEntryTypes?.includes('longtask')
+    ? new PerformanceObserver((list) => {
+        for (const entry of list.getEntries()) {
+          blockingMs += Math.max(0, entry.duration - 50);
+          longestTaskMs = Math.max(longestTaskMs, entry.duration);
+        }
+      })
+    : null;
+  observer?.observe({ type: 'longtask' });
+
+  let maxFrameLagMs = 0;
+  let expected = performance.now() + 16;
+  const lagProbe = setInterval(() => {
+    const now = performance.now();
+    maxFrameLagMs = Math.max(maxFrameLagMs, now - expected);
+    expected = now + 16;
+  }, 16);
+
+  const started = performance.now();
+  const results = await ImageProcessingService.processImageBatch(files, {}, undefined, {
+    mainThread: mode === 'main thread'
+  });
+  const seconds = (performance.now() - started) / 1000;
+
+  clearInterval(lagProbe);
+  // Let the observer deliver entries queued during the run
+  await new Promise(resolve => setTimeout(resolve, 100));
+  observer?.disconnect();
+
+  return {
+    scenario,
+    mode,
+    images: results.length,
+    seconds,
+    imagesPerSecond: results.length / seconds,
+    blockingMs,
+    longestTaskMs,
+    maxFrameLagMs
+  };
+}
+
+export default function ImageProcessingBenchmark() {
+  const [batchSize, setBatchSize] = useState(50);
+  const [running, setRunning] = useState(false);
+  const [status, setStatus] = useState('');
+  const [rows, setRows] = useState<BenchmarkRow[]>([]);
+
+  const run = async () => {
+    setRunning(true);
+    setRows([]);
+    try {
+      setStatus(`Generating ${batchSize} synthetic ${IMAGE_WIDTH}x${IMAGE_HEIGHT} images...`);
+      const files: File[] = [];
+      for (let i = 0; i < batchSize; i++) {
+        files.push(await createSyntheticImage(i));
+      }
+
+      const scenarios: Array<[string, File[]]> = [['single upload', files.slice(0, 1)], [`batch of ${files.length}`, files]];
+      for (const [scenario, scenarioFiles] of scenarios) {
+        for (const mode of ['workers', 'main thread'] as const) {
+          setStatus(`Running ${scenario} (${mode})...`);
+          const row = await measure(scenario, mode, scenarioFiles);
+          setRows(previous => [...previous, row]);
+        }
+      }
+      setStatus('Done');
+    } catch (error) {
+      setStatus(`Benchmark failed: ${error instanceof Error ? error.message : 'Unknown error'}`);
+    } finally {
+      setRunning(false);
+    }
+  };
+
+  return (
+    <div className="container mx-auto p-6 space-y-6">
+      <Card>
+        <CardHeader>
+          <CardTitle>Image Processing Benchmark</CardTitle>
+        </CardHeader>
+        <CardContent className="space-y-4">
+          <div className="flex items-center gap-4">
+            <label className="text-sm">
+              Batch size{' '}
+              <input
+                type="number"
+                min={1}
+                max={200}
+                value={batchSize}
+                onChange={(e) => setBatchSize(Math.max(1, parseInt(e.target.value) || 1))}
+                className="border rounded px-2 py-1 w-20"
+                disabled={running}
+              />
+            </label>
+            <Button onClick={run} disabled={running}>
+              {running ? 'Running...' : 'Run benchmark'}
+            </Button>
+          </div>
+          {status && <p className="text-sm text-gray-600">{status}</p>}
+
+          {rows.length > 0 && (
+            <table className="w-full text-sm">
+              <thead>
+                <tr className="text-left border-b">
+                  <th className="py-2">Scenario</th>
+                  <th>Mode</th>
+                  <th>Images</th>
+                  <th>Seconds</th>
+                  <th>Images/sec</th>
+                  <th>Blocking (ms)</th>
+                  <th>Longest task (ms)</th>
+                  <th>Max frame lag (ms)</th>
+                </tr>
+              </thead>
+              <tbody>
+                {rows.map((row) => (
+                  <tr key={`${row.scenario}-${row.mode}`} className="border-b">
+                    <td className="py-2">{row.scenario}</td>
+                    <td>{row.mode}</td>
+                    <td>{row.images}</td>
+                    <td>{row.seconds.toFixed(2)}</td>
+                    <td>{row.imagesPerSecond.toFixed(2)}</td>
+                    <td>{row.blockingMs.toFixed(0)}</td>
+                    <td>{row.longestTaskMs.toFixed(0)}</td>
+                    <td>{row.maxFrameLagMs.toFixed(0)}</td>
+                  </tr>
+                ))}
+              </tbody>
+            </table>
+          )}
+        </CardContent>
+      </Card>
+    </div>
+  );
+}
@@ -1,8 +1,18 @@
 import asyncio
 import aiohttp
+import argparse
 import json
+import math
 from datetime import datetime
-import sys
+
+from local_supabase import LocalSupabase, add_seed_arguments
+
+# Endpoints exercised by the load mode (method, endpoint)
+LOAD_ENDPOINTS = [
+    ('GET', '/api/orders'),
+    ('GET', '/api/orders/search?q=test'),
+    ('GET', '/api/orders/status/pending'),
+]
 
 class ModuleServiceTester:
     def __init__(self, base_url='http://localhost:3000'):
@@ -323,6 +333,123 @@ class ModuleServiceTester:
         # Display results
         self.display_results()
     
+    async def _timed_call(self, session, method, endpoint, started_at, stats):
+        """Run a single API call and record its latency against the endpoint"""
+        loop = asyncio.get_running_loop()
+        result = await self.test_api_call(session, method, endpoint)
+        latency = loop.time() - started_at
+
+        entry = stats.setdefault(endpoint, {'latencies': [], 'errors': 0, 'statuses': {}})
+        entry['latencies'].append(latency)
+        status = result['status'] if result else None
+        entry['statuses'][str(status)] = entry['statuses'].get(str(status), 0) + 1
+        if status is None or status >= 400:
+            entry['errors'] += 1
+
+    async def _open_loop(self, session, rate, duration, stats):
+        """Issue requests on a fixed schedule regardless of how fast the server answers.
+
+        Latency is measured from the scheduled start time, so queueing caused by a
+        slow server shows up in the numbers instead of silently lowering the load.
+        """
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / rate
+        start = loop.time()
+        tasks = []
+        i = 0
+
+        while i * interval < duration:
+            scheduled = start + i * interval
+            delay = scheduled - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            method, endpoint = LOAD_ENDPOINTS[i % len(LOAD_ENDPOINTS)]
+            tasks.append(asyncio.create_task(
+                self._timed_call(session, method, endpoint, scheduled, stats)
+            ))
+            i += 1
+
+        await asyncio.gather(*tasks)
+
+    async def _closed_loop(self, session, users, rate, duration, stats):
+        """Run virtual users that each wait for a response before sending the next request"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration
+        # Per-user pacing; a rate of 0 means every user sends as fast as it can
+        interval = users / rate if rate else 0
+
+        async def virtual_user(user_index):
+            i = user_index
+            next_start = loop.time()
+            while loop.time() < deadline:
+                method, endpoint = LOAD_ENDPOINTS[i % len(LOAD_ENDPOINTS)]
+                await self._timed_call(session, method, endpoint, loop.time(), stats)
+                i += 1
+                if interval:
+                    next_start += interval
+                    delay = next_start - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+        await asyncio.gather(*(virtual_user(u) for u in range(users)))
+
+    async def run_load(self, users=10, rate=50.0, duration=30.0, open_loop=True):
+        """Run the order endpoints under concurrent load and report latency percentiles"""
+        print("Starting Module-Level Load Test...")
+        print(f"Testing against: {self.base_url}")
+        print(f"Mode: {'open-loop' if open_loop else 'closed-loop'}, "
+              f"users: {users}, rate: {rate}/s, duration: {duration}s")
+        print("=" * 60)
+
+        stats = {}
+        # The connector limit caps in-flight requests at the number of virtual users
+        connector = aiohttp.TCPConnector(limit=users)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            if open_loop:
+                await self._open_loop(session, rate, duration, stats)
+            else:
+                await self._closed_loop(session, users, rate, duration, stats)
+            elapsed = loop.time() - started
+
+        self.display_load_results(stats, elapsed)
+        return stats
+
+    @staticmethod
+    def _percentile(sorted_values, pct):
+        """Nearest-rank percentile of an already sorted list"""
+        if not sorted_values:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+        return sorted_values[rank - 1]
+
+    def display_load_results(self, stats, elapsed):
+        """Display per-endpoint throughput and latency percentiles"""
+        print("\n" + "=" * 60)
+        print("LOAD TEST RESULTS")
+        print("=" * 60)
+        print(f"\nWall time: {elapsed:.2f}s")
+
+        header = f"{'Endpoint':<32}{'Reqs':>7}{'Errs':>6}{'Req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+        print("\n" + header)
+        print("-" * len(header))
+
+        for endpoint, entry in stats.items():
+            latencies = sorted(entry['latencies'])
+            count = len(latencies)
+            throughput = count / elapsed if elapsed else 0
+            p50, p95, p99 = (self._percentile(latencies, p) * 1000 for p in (50, 95, 99))
+            worst = latencies[-1] * 1000 if latencies else 0
+            print(f"{endpoint:<32}{count:>7}{entry['errors']:>6}{throughput:>9.1f}"
+                  f"{p50:>8.0f}ms{p95:>7.0f}ms{p99:>7.0f}ms{worst:>7.0f}ms")
+
+            self.results.append({
+                'test': f'load {endpoint}',
+                'passed': entry['errors'] == 0,
+                'details': f"Status counts: {entry['statuses']}"
+            })
+
     def display_results(self):
         """Display test results summary"""
         print("\n" + "=" * 60)
@@ -353,8 +480,42 @@ class ModuleServiceTester:
             print(f"... and {len(passed_tests) - 10} more")
 
 if __name__ == "__main__":
-    # Check if server URL is provided as argument
-    base_url = sys.argv[1] if len(sys.argv) > 1 else 'http://localhost:3000'
-    
-    tester = ModuleServiceTester(base_url)
-    asyncio.run(tester.run_tests())
+    parser = argparse.ArgumentParser(description='Module-level service tests for the orders API')
+    parser.add_argument('base_url', nargs='?', default='http://localhost:3000')
+    parser.add_argument('--load', action='store_true', help='Run the concurrent load mode instead of the functional tests')
+    parser.add_argument('--users', type=int, default=10, help='Concurrent virtual users (max in-flight requests)')
+    parser.add_argument('--rate', type=float, default=50.0, help='Target request rate per second (0 = unpaced, closed-loop only)')
+    parser.add_argument('--duration', type=float, default=30.0, help='Test duration in seconds')
+    parser.add_argument('--closed-loop', action='store_true', help='Wait for each response before a user sends the next request')
+    parser.add_argument('--local', action='store_true', help='Run against a seeded local Supabase stack instead of base_url')
+    parser.add_argument('--keep-data', action='store_true', help='With --local, reuse the existing local data set')
+    parser.add_argument('--port', type=int, default=3100, help='With --local, port for the Next.js app')
+    add_seed_arguments(parser)
+    args = parser.parse_args()
+
+    if not args.closed_loop and args.rate <= 0:
+        parser.error('--rate must be positive in open-loop mode')
+
+    local = None
+    base_url = args.base_url
+    if args.local:
+        local = LocalSupabase()
+        local.up(
+            reset=not args.keep_data,
+            seed=not args.keep_data,
+            categories=args.categories,
+            products=args.products,
+            orders=args.orders,
+            items_per_order=args.items_per_order,
+        )
+        base_url = local.start_app(args.port)
+
+    try:
+        tester = ModuleServiceTester(base_url)
+        if args.load:
+            asyncio.run(tester.run_load(args.users, args.rate, args.duration, not args.closed_loop))
+        else:
+            asyncio.run(tester.run_tests())
+    finally:
+        if local:
+            local.stop_app()